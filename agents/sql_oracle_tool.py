@@ -48,7 +48,8 @@ class OracleSQLTool(BaseTool):
 
     def __init__(self, connector: Optional[OracleConnector] = None, **kwargs: Any):
         super().__init__(**kwargs)
-        self._connector = connector or OracleConnector()
+        # Consultas do agente são só leitura: DSN de leitura (fallback: primário)
+        self._connector = connector or OracleConnector(target="read")
 
     def _run(self, sql: str, limit: int = 200) -> List[Dict[str, Any]]:
         # 1) Limpa markdown fences e ; antes de validar
@@ -0,0 +1,148 @@
+# benchmarks/bench_backends.py
+
+"""
+Benchmark de latência por página - Oracle x DuckDB (Parquet local)
+
+- Cada página = métodos públicos do(s) repositório(s) da view, com os filtros
+  padrão do dashboard (mesmas chamadas do warm-up, repositories/warmup.py)
+- Sem cache: query_dicts vai direto ao connector (run_select) e o recorte
+  analítico fica desligado, então o tempo é o do banco + fetch (pior caso,
+  primeiro render depois de uma carga)
+- Mesmo SQL nos dois backends: no DuckDB ele passa pela tradução de
+  connector/sql_dialect.py (o tempo de tradução entra na medição)
+- Latência da página = soma das consultas (render em série); mediana de --runs
+
+Pré-requisitos: Oracle acessível (config/database.ini) e Parquet gravado pelos
+controllers ([PARQUET] enabled = true). Backend indisponível é reportado e pulado.
+
+Uso:
+    python benchmarks/bench_backends.py [--runs 5] [--engines oracle,duckdb] [--parquet-root data/parquet]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+from connector.duckdb_connector import DuckDBConnector
+from connector.oracle_connector import OracleConnector
+from repositories.warmup import default_calls, repository_classes
+
+# Repositório -> página do dashboard que o usa
+PAGES = {
+    "KpiRepository": "Home",
+    "DashboardOperacionalRepository": "Operacional",
+    "DashboardAnaliticoRepository": "Analítico",
+    "DashboardPreditivoRepository": "Preditivo",
+    "RentabilidadeIntegradaRepository": "Rentabilidade",
+    "PosVendaRepository": "Pós-Vendas",
+    "PerformanceFilialRepository": "Performance",
+    "ClientesRepository": "Clientes",
+}
+
+
+def direct_repository(cls: type, connector: Any, timings: List[float]) -> Any:
+    """Repositório com query_dicts direto no connector (sem cache), acumulando os tempos."""
+
+    class Direct(cls):
+        def query_dicts(self, sql: str, params: Optional[Dict[str, Any]] = None,
+                        _caller: Optional[str] = None, variants: Optional[Dict[str, str]] = None):
+            sql = (variants or {}).get(engine_of(connector), sql)
+            t0 = time.perf_counter()
+            rows, _ = connector.run_select(sql, params or {})
+            timings.append(time.perf_counter() - t0)
+            return rows
+
+        def from_slice(self, *args: Any, **kwargs: Any) -> None:
+            return None
+
+    return Direct(engine=engine_of(connector))
+
+
+def engine_of(connector: Any) -> str:
+    return "duckdb" if isinstance(connector, DuckDBConnector) else "oracle"
+
+
+def open_connector(engine: str, config_file: str, parquet_root: str) -> Any:
+    if engine == "duckdb":
+        connector = DuckDBConnector(parquet_root)
+    else:
+        connector = OracleConnector(config_file=config_file, target="read")
+    connector.init_connection_pool()
+    return connector
+
+
+def bench_engine(connector: Any, runs: int) -> Dict[str, Dict[str, float]]:
+    """{página: {mediana_ms, queries}} para um backend."""
+    classes = {cls.__name__: cls for cls in repository_classes()}
+    calls = default_calls()
+    per_page: Dict[str, List[float]] = defaultdict(list)
+    queries: Dict[str, int] = defaultdict(int)
+
+    # 1ª passada só aquece (views do DuckDB, statement cache do Oracle)
+    for run in range(runs + 1):
+        totals: Dict[str, float] = defaultdict(float)
+        for call in calls:
+            cls_name, method = call.name.split(".", 1)
+            page = PAGES.get(cls_name, cls_name)
+            timings: List[float] = []
+            repo = direct_repository(classes[cls_name], connector, timings)
+            getattr(repo, method)(**call.kwargs)
+            totals[page] += sum(timings)
+            if run == 0:
+                queries[page] += len(timings)
+        if run:
+            for page, total in totals.items():
+                per_page[page].append(total)
+
+    return {page: {"ms": statistics.median(v) * 1000, "queries": queries[page]} for page, v in per_page.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência por página: Oracle x DuckDB sobre Parquet")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--engines", default="oracle,duckdb")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--parquet-root", default=os.path.join(ROOT, "data", "parquet"))
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for engine in [e.strip() for e in args.engines.split(",") if e.strip()]:
+        try:
+            connector = open_connector(engine, args.config, args.parquet_root)
+            results[engine] = bench_engine(connector, args.runs)
+        except Exception as e:
+            print(f"{engine}: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+
+    if not results:
+        return
+
+    engines = list(results)
+    pages = sorted({p for r in results.values() for p in r}, key=lambda p: list(PAGES.values()).index(p)
+                   if p in PAGES.values() else len(PAGES))
+    header = f"{'página (ms)':<16}{'queries':>8}" + "".join(f"{e:>12}" for e in engines)
+    if len(engines) == 2:
+        header += f"{'razão':>10}"
+    print(f"Mediana de {args.runs} execuções, sem cache")
+    print(header)
+    for page in pages:
+        line = f"{page:<16}{next(r[page]['queries'] for r in results.values() if page in r):>8}"
+        values = [results[e].get(page, {}).get("ms") for e in engines]
+        line += "".join(f"{v:>12.1f}" if v is not None else f"{'-':>12}" for v in values)
+        if len(engines) == 2 and None not in values:
+            line += f"{values[0] / max(values[1], 1e-9):>9.1f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# benchmarks/bench_chart_payload.py
+
+"""
+Payload dos gráficos de série diária - série inteira x reduzida (utils/downsampling.py)
+
+- Séries: receita diária sintética (sazonalidade semanal/anual, ruído e picos raros)
+  com 1 a 10 anos; com --parquet-root, também as séries diárias reais do
+  DashboardPreditivoRepository (DuckDB, período --dt-ini a --dt-fim, dias sem
+  venda = 0 como na view)
+- Por série e método: pontos, KB do JSON da figura plotly (o que vai ao navegador),
+  ms da redução e da figura (px.line + JSON), e fidelidade aos picos:
+    pico  = maior valor desenhado / maior valor real (1.00 = pico mantido)
+    top10 = fração dos 10 maiores dias que continuam no gráfico
+
+Uso:
+    python benchmarks/bench_chart_payload.py [--max-points 800] [--parquet-root data/parquet]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from typing import Iterator, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+from utils.downsampling import METHODS, downsample
+
+YEARS = (1, 3, 5, 10)
+
+
+def synthetic(years: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dias = pd.date_range("2016-01-01", periods=365 * years, freq="D")
+    t = np.arange(len(dias))
+    y = 10_000 * (1 + 0.3 * np.sin(2 * np.pi * t / 365)) * np.where(dias.dayofweek >= 5, 0.4, 1.0)
+    y = y * rng.lognormal(0, 0.25, len(dias))
+    spikes = rng.choice(len(dias), size=max(years * 3, 3), replace=False)
+    y[spikes] *= rng.uniform(4, 8, len(spikes))
+    return pd.DataFrame({"DIA": dias, "Y": y})
+
+
+def real_series(parquet_root: str, dt_ini: date, dt_fim: date) -> Iterator[Tuple[str, pd.DataFrame]]:
+    from bench_backends import direct_repository
+    from connector.duckdb_connector import DuckDBConnector
+    from repositories.dashboard_preditivo_repository import DashboardPreditivoRepository
+
+    duck = DuckDBConnector(parquet_root)
+    duck.refresh_views()
+    repo = direct_repository(DashboardPreditivoRepository, duck, [])
+    full = pd.DataFrame({"DIA": pd.date_range(dt_ini, dt_fim, freq="D")})
+    for method in ("serie_diaria_veiculos_unidades", "serie_diaria_pecas_receita", "serie_diaria_servicos_receita"):
+        df = pd.DataFrame(getattr(repo, method)(dt_ini, dt_fim))
+        if df.empty:
+            continue
+        df["DIA"] = pd.to_datetime(df["DIA"])
+        df["Y"] = df["Y"].astype(float)
+        yield method, full.merge(df, on="DIA", how="left").fillna({"Y": 0.0})
+
+
+def payload(df: pd.DataFrame) -> Tuple[int, float]:
+    t0 = time.perf_counter()
+    fig = px.line(df, x="DIA", y="Y")
+    size = len(pio.to_json(fig, validate=False).encode("utf-8"))
+    return size, (time.perf_counter() - t0) * 1000
+
+
+def report(name: str, df: pd.DataFrame, max_points: int) -> None:
+    raw_kb, raw_ms = payload(df)
+    print(f"{name:<34}{'inteira':<9}{len(df):>8}{raw_kb / 1024:>9.1f}{'':>9}{raw_ms:>9.1f}{1:>7.2f}{1:>7.2f}")
+    top = set(df.nlargest(10, "Y")["DIA"])
+    for method in METHODS:
+        t0 = time.perf_counter()
+        small, _ = downsample(df, "DIA", "Y", max_points, method)
+        reduce_ms = (time.perf_counter() - t0) * 1000
+        kb, ms = payload(small)
+        peak = small["Y"].max() / max(df["Y"].max(), 1e-9)
+        kept = len(top & set(small["DIA"])) / max(len(top), 1)
+        print(f"{'':<34}{method:<9}{len(small):>8}{kb / 1024:>9.1f}{reduce_ms:>9.1f}{ms:>9.1f}{peak:>7.2f}{kept:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload dos gráficos: série inteira x reduzida")
+    parser.add_argument("--max-points", type=int, default=800)
+    parser.add_argument("--parquet-root", help="Também mede as séries reais (DuckDB sobre o Parquet)")
+    parser.add_argument("--dt-ini", type=date.fromisoformat, default=date(2021, 1, 1))
+    parser.add_argument("--dt-fim", type=date.fromisoformat, default=date(2025, 12, 31))
+    args = parser.parse_args()
+
+    print(f"orçamento: {args.max_points} pontos")
+    print(f"{'série':<34}{'método':<9}{'pontos':>8}{'KB':>9}{'ms red.':>9}{'ms fig.':>9}{'pico':>7}{'top10':>7}")
+    for years in YEARS:
+        report(f"sintética {years} ano(s)", synthetic(years), args.max_points)
+
+    if args.parquet_root:
+        if not os.path.isdir(args.parquet_root):
+            print(f"duckdb: sem Parquet em {args.parquet_root}")
+            return
+        for name, df in real_series(args.parquet_root, args.dt_ini, args.dt_fim):
+            report(name, df, args.max_points)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# benchmarks/bench_index_usage.py
+
+"""
+Uso de índices - método do repositório -> índice esperado (connector/index_plan.py)
+
+- Carga de trabalho = SQL que os métodos públicos dos repositórios mandam ao banco
+  com os filtros padrão (mesmas chamadas do warm-up, repositories/warmup.py), no
+  caminho padrão do dashboard (agregados ligados)
+- Peso de cada método = tempo total registrado em logs/query_telemetry.jsonl
+  (quando existe): a ordem do relatório é a do custo real no dashboard
+- Para cada tabela BRZ_* / AGG_* lida pelo método:
+    índice  = índice do plano declarado para o método (ou "-" = sem índice no plano)
+    pred.   = a 1ª coluna do índice aparece num predicado da consulta (senão o índice não serve)
+    cobre   = todas as colunas da tabela citadas na consulta estão no índice
+              (resposta só pelo índice); senão lista as que faltam
+- Com Oracle acessível (--explain): EXPLAIN PLAN de cada consulta e os índices
+  que o otimizador escolheu de fato
+- Confere também que todo índice do plano está na migração (sql/migrations/)
+
+Uso:
+    python benchmarks/bench_index_usage.py [--explain]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Set, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+from bench_logical_reads import recorded
+from connector.data_version import tables_in
+from connector.index_plan import DROPPED_INDEXES, INDEX_PLAN, IndexSpec, indexes_for
+from connector.migrations import discover
+from connector.oracle_connector import OracleConnector
+from repositories.warmup import default_calls, repository_classes
+
+TELEMETRY = os.path.join(ROOT, "logs", "query_telemetry.jsonl")
+
+TABLE_DDL = re.compile(r"^\s*(?:CREATE|ALTER)\s+TABLE\s+(\w+)\s*(?:ADD\s*)?\((.*)\)\s*$", re.S | re.I)
+COLUMN_DEF = re.compile(r"^\s*([A-Z_][A-Z_0-9]*)\s+(?:NUMBER|VARCHAR2|CHAR|DATE|TIMESTAMP)", re.M)
+
+PLAN_SQL = """
+SELECT OPERATION, OPTIONS, OBJECT_NAME
+FROM PLAN_TABLE
+WHERE STATEMENT_ID = :sid AND OPERATION = 'INDEX'
+ORDER BY ID
+"""
+
+
+def table_columns() -> Dict[str, Set[str]]:
+    """Colunas de cada tabela segundo as migrações (CREATE TABLE + ALTER TABLE ADD)."""
+    out: Dict[str, Set[str]] = defaultdict(set)
+    for migration in discover():
+        for statement in migration.statements:
+            m = TABLE_DDL.match(statement)
+            if m:
+                out[m.group(1).upper()].update(COLUMN_DEF.findall(m.group(2)))
+    return dict(out)
+
+
+def weights() -> Dict[str, Tuple[int, float]]:
+    """(chamadas, ms totais) por método, do log de telemetria (vazio se não houver)."""
+    out: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+    if not os.path.exists(TELEMETRY):
+        return {}
+    with open(TELEMETRY, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("cache_hit"):
+                continue
+            acc = out[rec.get("caller", "?")]
+            acc[0] += 1
+            acc[1] += float(rec.get("wall_ms") or 0.0)
+    return {k: (int(v[0]), v[1]) for k, v in out.items()}
+
+
+def workload() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(Classe.método, SQL, binds) das consultas do dashboard (SQL repetido conta 1x por método)."""
+    classes = {cls.__name__: cls for cls in repository_classes()}
+    seen: Set[Tuple[str, str]] = set()
+    out: List[Tuple[str, str, Dict[str, Any]]] = []
+    for call in default_calls():
+        cls_name, method = call.name.split(".", 1)
+        for sql, params in recorded(classes[cls_name], [(method, call.kwargs)]):
+            if (call.name, sql) not in seen:
+                seen.add((call.name, sql))
+                out.append((call.name, sql, params))
+    return out
+
+
+def in_predicate(column: str, sql: str) -> bool:
+    return re.search(rf"\b{column}\s*(>=|<=|<>|!=|=|>|<|\bBETWEEN\b|\bIN\b)", sql, re.I) is not None
+
+
+def check(spec: IndexSpec, sql: str, columns: Set[str]) -> Tuple[bool, List[str]]:
+    """(1ª coluna em predicado, colunas da tabela citadas e fora do índice)."""
+    # Literais fora: texto de rótulo ('Veículos (custo)') não é coluna
+    tokens = set(re.findall(r"\b[A-Z_][A-Z_0-9]*\b", re.sub(r"'[^']*'", "''", sql).upper()))
+    missing = sorted((tokens & columns) - set(spec.columns))
+    return in_predicate(spec.leading, sql), missing
+
+
+def explain_indexes(cursor: Any, sql: str, params: Dict[str, Any]) -> List[str]:
+    sid = f"ix-{uuid.uuid4().hex[:12]}"
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{sid}' FOR {sql}", params)
+    try:
+        cursor.execute(PLAN_SQL, {"sid": sid})
+        return [f"{r[2]} ({r[1]})" for r in cursor.fetchall()]
+    finally:
+        cursor.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :sid", {"sid": sid})
+
+
+def report(cursor: Any = None) -> int:
+    """Imprime método -> tabela -> índice esperado; retorna acessos sem índice utilizável."""
+    columns = table_columns()
+    weight = weights()
+    queries = workload()
+    queries.sort(key=lambda q: -weight.get(q[0], (0, 0.0))[1])
+
+    print(f"{'peso (ms)':>10}  {'método':<74}{'tabela':<26}{'índice esperado':<28}{'pred.':<7}cobre")
+    problems = 0
+    for name, sql, params in queries:
+        calls, ms = weight.get(name, (0, 0.0))
+        peso = f"{ms:,.0f}" if calls else "-"
+        expected = indexes_for(name)
+        for table in sorted(tables_in(sql)):
+            specs = [s for s in expected if s.table == table]
+            if not specs:
+                print(f"{peso:>10}  {name:<74}{table:<26}{'-':<28}")
+                continue
+            for spec in specs:
+                pred, missing = check(spec, sql, columns.get(table, set()))
+                problems += not pred
+                cobre = "sim" if not missing else f"não ({', '.join(missing)})"
+                print(f"{peso:>10}  {name:<74}{table:<26}{spec.name:<28}{'ok' if pred else 'NÃO':<7}{cobre}")
+        if cursor is not None:
+            try:
+                used = explain_indexes(cursor, sql, params)
+                print(f"{'':>10}  {'  plano Oracle:':<74}{', '.join(used) or 'sem índice (FULL SCAN)'}")
+            except Exception as e:
+                print(f"{'':>10}  {'  plano Oracle:':<74}erro: {str(e).splitlines()[0]}")
+
+    # Coerência plano x carga x migração
+    methods = {name for name, _, _ in queries}
+    migration_text = "\n".join(s for m in discover() for s in m.statements)
+    print()
+    for spec in INDEX_PLAN:
+        if not methods.intersection(spec.used_by):
+            print(f"⚠️ {spec.name}: nenhum método da carga usa")
+        if spec.name not in migration_text:
+            print(f"⚠️ {spec.name}: fora das migrações (sql/migrations/)")
+    for name, motivo in DROPPED_INDEXES.items():
+        print(f"🗑️ {name}: {motivo}")
+    print(f"\nAcessos cujo índice esperado não tem a 1ª coluna em predicado: {problems}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Método do repositório -> índice esperado")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--explain", action="store_true", help="Confere o índice escolhido no Oracle (EXPLAIN PLAN)")
+    args = parser.parse_args()
+
+    if not args.explain:
+        report()
+        return
+
+    connector = OracleConnector(config_file=args.config, target="read")
+    try:
+        with connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                report(cursor)
+            finally:
+                cursor.close()
+    except Exception as e:
+        print(f"oracle: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+        report()
+
+
+if __name__ == "__main__":
+    main()
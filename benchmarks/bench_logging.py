@@ -0,0 +1,180 @@
+# benchmarks/bench_logging.py
+
+"""
+Benchmark do overhead de log - padrão antigo x LoggerController atual
+
+- Antigo (réplica fiel): inspect.currentframe() + os.getlogin() + f-string a cada
+  chamada, logger único compartilhado com um FileHandler por arquivo de log
+  (toda mensagem é gravada em todos os arquivos, de forma síncrona)
+- Atual: logger por componente, formatação preguiçosa, gate de nível e
+  escrita em background (QueueHandler -> QueueListener)
+
+Cenários:
+- por query: sequência de logs de um BaseRepository.query_dicts (repo + connector)
+- por linha inserida: ETL de um controller (logs fixos + erro de validação em ~1% das linhas)
+
+Uso:
+    python benchmarks/bench_logging.py [--queries 2000] [--rows 200000] [--level INFO]
+"""
+
+from __future__ import annotations
+
+import argparse
+import getpass
+import inspect
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import utils.logger_controller as logger_controller
+from utils.logger_controller import LoggerController
+
+# Componentes que tinham arquivo em logs/ (cada um adicionava um FileHandler ao logger compartilhado)
+COMPONENTS = [
+    "OracleConnector", "BaseRepository", "EstoquePecasController", "EstoqueVeiculosController",
+    "HistServicosController", "HistVendasPecasController", "HistVendasVeiculosController", "CSVHandler",
+]
+
+SQL = "SELECT FILIAL, SUM(VALOR_VENDA) AS RECEITA FROM BRZ_HIST_VENDAS_VEICULOS WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim GROUP BY FILIAL"
+PARAMS = {"dt_ini": "2025-01-01", "dt_fim": "2025-12-31"}
+
+
+# -------------------------
+# Réplica do LoggerController antigo
+# -------------------------
+class LegacyLoggerController:
+    def __init__(self, logfile: str):
+        self.logger = logging.getLogger("LegacyLoggerController")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        handler = logging.FileHandler(logfile, encoding='utf-8')
+        handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(filename)s - %(funcName)s:%(lineno)d - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'))
+        self.logger.addHandler(handler)
+
+    def log(self, codename, codepath, functionname, linenumber, status, message=""):
+        try:
+            user = os.getlogin()
+        except OSError:
+            # Em containers sem terminal o original levantava OSError; mantemos o custo da chamada
+            user = getpass.getuser()
+        log_message = (
+            f"User: {user} | Code Name: {codename} | "
+            f"Code Path: {codepath} | Function Name: {functionname} | "
+            f"Line Number: {linenumber} | Status: {status}"
+        )
+        if message:
+            log_message += f" | {message}"
+        self.logger.debug(log_message)
+
+    def close(self):
+        for h in list(self.logger.handlers):
+            h.close()
+            self.logger.removeHandler(h)
+
+
+def legacy_query(log: LegacyLoggerController, n_rows: int = 12):
+    path = os.path.dirname(__file__)
+    context = inspect.currentframe()
+    log.log("BaseRepository", path, __name__, context.f_lineno, "INFO:    ", f"📊 query_dicts: {SQL[:120]}...")
+    log.log("BaseRepository", path, __name__, context.f_lineno, "INFO:    ", f"Params: {PARAMS}")
+    context = inspect.currentframe()
+    log.log("OracleConnector", path, __name__, context.f_lineno, "INFO:", "🔄 Estabelecendo conexão Oracle...")
+    context = inspect.currentframe()
+    log.log("OracleConnector", path, __name__, context.f_lineno, "INFO:", f"🔗 DSN gerado: host:1521/service")
+    context = inspect.currentframe()
+    log.log("OracleConnector", path, __name__, context.f_lineno, "SUCESSO!", "✅ Conexão Oracle estabelecida com sucesso")
+    context = inspect.currentframe()
+    log.log("OracleConnector", path, __name__, context.f_lineno, "INFO:", "Conexão fechada")
+    context = inspect.currentframe()
+    log.log("BaseRepository", path, __name__, context.f_lineno, "SUCESSO! ", f"✅ query_dicts OK: {n_rows} registros retornados")
+
+
+def current_query(repo: LoggerController, conn: LoggerController, n_rows: int = 12):
+    repo.info("📊 query_dicts: %s...", SQL[:120])
+    repo.debug("Params: %s", PARAMS)
+    conn.debug("🔄 Estabelecendo conexão Oracle...")
+    conn.debug("🔗 DSN gerado: %s", "host:1521/service")
+    conn.debug("✅ Conexão Oracle estabelecida com sucesso")
+    conn.debug("Conexão fechada")
+    repo.info("✅ query_dicts OK: %s registros retornados", n_rows)
+
+
+def legacy_etl(log: LegacyLoggerController, rows: int):
+    path = os.path.dirname(__file__)
+    context = inspect.currentframe()
+    log.log("Controller", path, __name__, context.f_lineno, "INFO:", f"Iniciando ETL: bases/arquivo.csv")
+    log.log("Controller", path, __name__, context.f_lineno, "INFO:", f"[Controller] Linhas lidas do CSV: {rows}")
+    for i in range(rows):
+        if i % 100 == 0:
+            context = inspect.currentframe()
+            log.log("Controller", path, __name__, context.f_lineno, "ERRO!!!",
+                    f"[Controller] Linha ignorada por erro de validação: linha {i}")
+    context = inspect.currentframe()
+    log.log("Controller", path, __name__, context.f_lineno, "INFO:", f"[Controller] Inseridos no Oracle: {rows}")
+
+
+def current_etl(log: LoggerController, rows: int):
+    log.info("Iniciando ETL: %s", "bases/arquivo.csv")
+    log.info("[%s] Linhas lidas do CSV: %s", "Controller", rows)
+    for i in range(rows):
+        if i % 100 == 0:
+            log.error("[%s] Linha ignorada por erro de validação: linha %s", "Controller", i)
+    log.info("[%s] Inseridos no Oracle: %s", "Controller", rows)
+
+
+def _timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Overhead de log: padrão antigo x LoggerController")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--level", default="INFO", help="Nível do LoggerController atual (DEBUG/INFO/WARNING)")
+    args = parser.parse_args()
+
+    logger_controller.set_level(args.level)
+
+    with tempfile.TemporaryDirectory(prefix="bench_logging_") as tmp:
+        legacy = [LegacyLoggerController(os.path.join(tmp, f"legacy_{c}.txt")) for c in COMPONENTS]
+        log_legacy = legacy[-1]
+
+        repo = LoggerController(os.path.join(tmp, "BaseRepository.txt"))
+        conn = LoggerController(os.path.join(tmp, "OracleConnector.txt"))
+        ctrl = LoggerController(os.path.join(tmp, "Controller.txt"))
+
+        # Por query
+        t_legacy_q = _timed(lambda: [legacy_query(log_legacy) for _ in range(args.queries)])
+        t_current_q = _timed(lambda: [current_query(repo, conn) for _ in range(args.queries)])
+
+        # Por linha inserida
+        t_legacy_r = _timed(legacy_etl, log_legacy, args.rows)
+        t_current_r = _timed(current_etl, ctrl, args.rows)
+
+        # Tempo para a thread de background esvaziar a fila (fora do caminho quente)
+        t_drain = _timed(logger_controller.shutdown)
+
+        for log in legacy:
+            log.close()
+
+    us = 1e6
+    print(f"Nível atual: {args.level.upper()} | arquivos no logger antigo: {len(COMPONENTS)}")
+    print(f"{'cenário':<22}{'antigo':>14}{'atual':>14}{'ganho':>10}")
+    print(f"{'por query (µs)':<22}{t_legacy_q / args.queries * us:>14.1f}{t_current_q / args.queries * us:>14.1f}"
+          f"{t_legacy_q / max(t_current_q, 1e-9):>9.1f}x")
+    print(f"{'por linha (µs)':<22}{t_legacy_r / args.rows * us:>14.3f}{t_current_r / args.rows * us:>14.3f}"
+          f"{t_legacy_r / max(t_current_r, 1e-9):>9.1f}x")
+    print(f"Drenagem da fila em background: {t_drain * 1000:.1f} ms (não bloqueia as queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# benchmarks/bench_logical_reads.py
+
+"""
+Leituras lógicas por página - consultas antigas x consolidadas (uma varredura por tabela)
+
+- Antes (réplica fiel do SQL anterior): a Operacional varria cada fato 2-3 vezes
+  (hoje, ontem, últimos 30 dias) e a Pós-Vendas varria BRZ_HIST_SERVICOS uma vez
+  por bloco (KPIs, departamento, categoria); o agregado diário era lido uma vez
+  por linha de negócio
+- Depois: agregação condicional sobre um agrupamento diário (Operacional),
+  GROUPING SETS (Pós-Vendas, uma consulta para os três blocos) e agregação por
+  LINHA numa leitura do AGG_DIARIO_FILIAL (KPIs, P&L, performance)
+- Medida: delta de "session logical reads" (v$mystat) na mesma sessão, com o
+  custo da própria leitura da estatística descontado; cada SQL roda uma vez
+  antes para tirar parse/carga do buffer cache da medição
+
+Pré-requisito: Oracle acessível (config/database.ini) e SELECT em v$mystat/v$statname
+(ex.: GRANT SELECT_CATALOG_ROLE).
+
+Uso:
+    python benchmarks/bench_logical_reads.py [--dt-ini 2025-01-01] [--dt-fim 2025-12-31]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+from connector.oracle_connector import OracleConnector
+from repositories.dashboard_analitico_repository import DashboardAnaliticoRepository
+from repositories.dashboard_operacional_repository import DashboardOperacionalRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, POS_VENDAS_TOP_N
+from repositories.kpi_repository import KpiRepository
+from repositories.performance_filial_repository import PerformanceFilialRepository
+from repositories.pos_vendas_repository import PosVendaRepository
+
+STAT_SQL = """
+SELECT ms.VALUE
+FROM v$mystat ms
+JOIN v$statname sn ON sn.STATISTIC# = ms.STATISTIC#
+WHERE sn.NAME = 'session logical reads'
+"""
+
+Query = Tuple[str, Dict[str, Any]]
+
+# -------------------------
+# SQL anterior (réplica fiel)
+# -------------------------
+LEGACY_SQL = {
+    "DashboardOperacionalRepository.kpis_vendas_veiculos_diario": """
+    WITH
+    hoje AS (
+      SELECT
+        SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
+        SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
+        SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+      FROM BRZ_HIST_VENDAS_VEICULOS
+      WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE)
+    ),
+    ontem AS (
+      SELECT
+        SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
+        SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
+        SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+      FROM BRZ_HIST_VENDAS_VEICULOS
+      WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE-1)
+    ),
+    m30 AS (
+      SELECT
+        AVG(QTD_DIA) AS QTD_MEDIA_30D,
+        AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D
+      FROM (
+        SELECT
+          TRUNC(DT_VENDA) AS DIA,
+          SUM(NVL(QTDE_VENDIDA,0)) AS QTD_DIA,
+          SUM(NVL(VALOR_VENDA,0)) AS RECEITA_DIA
+        FROM BRZ_HIST_VENDAS_VEICULOS
+        WHERE TRUNC(DT_VENDA) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
+        GROUP BY TRUNC(DT_VENDA)
+      )
+    )
+    SELECT
+      h.QTD AS QTD_HOJE,
+      o.QTD AS QTD_ONTEM,
+      m.QTD_MEDIA_30D,
+      h.RECEITA AS RECEITA_HOJE,
+      o.RECEITA AS RECEITA_ONTEM,
+      m.RECEITA_MEDIA_30D
+    FROM hoje h, ontem o, m30 m
+    """,
+    "DashboardOperacionalRepository.kpis_vendas_pecas_diario": """
+    WITH
+    hoje AS (
+      SELECT
+        SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
+        SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
+        SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+      FROM BRZ_HIST_VENDAS_PECAS
+      WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE)
+    ),
+    m30 AS (
+      SELECT
+        AVG(QTD_DIA) AS QTD_MEDIA_30D,
+        AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D,
+        AVG(MARGEM_DIA) AS MARGEM_MEDIA_30D
+      FROM (
+        SELECT
+          TRUNC(DT_VENDA) AS DIA,
+          SUM(NVL(QTDE_VENDIDA,0)) AS QTD_DIA,
+          SUM(NVL(VALOR_VENDA,0)) AS RECEITA_DIA,
+          CASE WHEN SUM(NVL(VALOR_VENDA,0))=0 THEN NULL
+               ELSE SUM(NVL(LUCRO_VENDA,0))/SUM(NVL(VALOR_VENDA,0))
+          END AS MARGEM_DIA
+        FROM BRZ_HIST_VENDAS_PECAS
+        WHERE TRUNC(DT_VENDA) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
+        GROUP BY TRUNC(DT_VENDA)
+      )
+    )
+    SELECT
+      h.QTD AS QTD_HOJE,
+      h.RECEITA AS RECEITA_HOJE,
+      CASE WHEN h.RECEITA=0 THEN NULL ELSE h.LUCRO/h.RECEITA END AS MARGEM_HOJE,
+      m.QTD_MEDIA_30D,
+      m.RECEITA_MEDIA_30D,
+      m.MARGEM_MEDIA_30D
+    FROM hoje h, m30 m
+    """,
+    "DashboardOperacionalRepository.kpis_servicos_diario": """
+    WITH
+    hoje AS (
+      SELECT
+        SUM(NVL(QTDE_SERVICOS,0)) AS QTD,
+        SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
+        SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO
+      FROM BRZ_HIST_SERVICOS
+      WHERE TRUNC(DT_REALIZACAO_SERVICO) = TRUNC(SYSDATE)
+    ),
+    m30 AS (
+      SELECT
+        AVG(QTD_DIA) AS QTD_MEDIA_30D,
+        AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D
+      FROM (
+        SELECT
+          TRUNC(DT_REALIZACAO_SERVICO) AS DIA,
+          SUM(NVL(QTDE_SERVICOS,0)) AS QTD_DIA,
+          SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA_DIA
+        FROM BRZ_HIST_SERVICOS
+        WHERE TRUNC(DT_REALIZACAO_SERVICO) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
+        GROUP BY TRUNC(DT_REALIZACAO_SERVICO)
+      )
+    )
+    SELECT
+      h.QTD AS QTD_HOJE,
+      m.QTD_MEDIA_30D,
+      h.RECEITA AS RECEITA_HOJE,
+      m.RECEITA_MEDIA_30D
+    FROM hoje h, m30 m
+    """,
+    "PosVendaRepository.kpis_servicos": """
+    SELECT
+      COUNT(*) AS REGISTROS,
+      SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
+      SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA_SERVICOS,
+      SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO_SERVICOS,
+      CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
+           ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
+      END AS MARGEM_SERVICOS,
+      AVG(NVL(VALOR_TOTAL_SERVICO,0)) AS TICKET_MEDIO_POR_REGISTRO,
+      AVG(NVL(QTDE_SERVICOS,0)) AS QTDE_MEDIA_SERVICOS_POR_REGISTRO
+    FROM BRZ_HIST_SERVICOS
+    WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
+      AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+      AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+    """,
+    "PosVendaRepository.por_departamento": """
+    SELECT
+      DEPARTAMENTO_SERVICO,
+      SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
+      SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
+      SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO,
+      CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
+           ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
+      END AS MARGEM
+    FROM BRZ_HIST_SERVICOS
+    WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
+      AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+      AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+    GROUP BY DEPARTAMENTO_SERVICO
+    ORDER BY RECEITA DESC NULLS LAST
+    FETCH FIRST {top_n} ROWS ONLY
+    """,
+    "PosVendaRepository.por_categoria_servico": """
+    SELECT
+      CATEGORIA_SERVICO,
+      SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
+      SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
+      SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO,
+      CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
+           ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
+      END AS MARGEM
+    FROM BRZ_HIST_SERVICOS
+    WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
+      AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+      AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+    GROUP BY CATEGORIA_SERVICO
+    ORDER BY LUCRO DESC NULLS LAST
+    FETCH FIRST {top_n} ROWS ONLY
+    """,
+}
+
+
+def recorded(cls: type, calls: List[Tuple[str, Dict[str, Any]]], use_rollup: Optional[bool] = None,
+             use_silver: Optional[bool] = None) -> List[Query]:
+    """SQL e binds que os métodos mandam ao banco (sem executar; repetidos contam 1x, como no cache)."""
+    queries: List[Query] = []
+
+    class Recorder(cls):
+        def query_dicts(self, sql: str, params: Optional[Dict[str, Any]] = None, *args: Any, **kwargs: Any):
+            if (sql, params or {}) not in queries:
+                queries.append((sql, params or {}))
+            return []
+
+        def from_slice(self, *args: Any, **kwargs: Any) -> None:
+            return None
+
+    repo = Recorder()
+    if use_rollup is not None:
+        repo.use_rollup = use_rollup
+    if use_silver is not None:
+        repo.use_silver = use_silver
+    for method, kwargs in calls:
+        getattr(repo, method)(**kwargs)
+    return queries
+
+
+def scenarios(dt_ini: date, dt_fim: date) -> List[Tuple[str, List[Query], List[Query]]]:
+    periodo = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+    pos = {**periodo, "cod_concessionaria": None, "cod_filial": None}
+    oper = ["kpis_vendas_veiculos_diario", "kpis_vendas_pecas_diario", "kpis_servicos_diario"]
+
+    return [
+        ("Operacional (KPIs do dia)",
+         [(LEGACY_SQL[f"DashboardOperacionalRepository.{m}"], {}) for m in oper],
+         recorded(DashboardOperacionalRepository, [(m, {}) for m in oper])),
+        ("Pós-Vendas (3 blocos)",
+         [(LEGACY_SQL["PosVendaRepository.kpis_servicos"], pos),
+          (LEGACY_SQL["PosVendaRepository.por_departamento"].format(top_n=POS_VENDAS_TOP_N), pos),
+          (LEGACY_SQL["PosVendaRepository.por_categoria_servico"].format(top_n=POS_VENDAS_TOP_N), pos)],
+         recorded(PosVendaRepository, [("kpis_servicos", periodo),
+                                       ("por_departamento", {**periodo, "top_n": POS_VENDAS_TOP_N}),
+                                       ("por_categoria_servico", {**periodo, "top_n": POS_VENDAS_TOP_N})])),
+        ("Home (KPIs, BRZ x agregado)",
+         recorded(KpiRepository, [("kpis_gerais_periodo", periodo)], use_rollup=False),
+         recorded(KpiRepository, [("kpis_gerais_periodo", periodo)], use_rollup=True)),
+        ("Analítico (P&L, BRZ x agregado)",
+         recorded(DashboardAnaliticoRepository, [("pnl_mensal", periodo)], use_rollup=False),
+         recorded(DashboardAnaliticoRepository, [("pnl_mensal", periodo)], use_rollup=True)),
+        ("Performance (BRZ x agregado)",
+         recorded(PerformanceFilialRepository, [("performance_por_filial", periodo)], use_rollup=False),
+         recorded(PerformanceFilialRepository, [("performance_por_filial", periodo)], use_rollup=True)),
+    ]
+
+
+def measure(cursor: Any, queries: List[Query], overhead: int) -> Tuple[int, float]:
+    """(leituras lógicas, ms) somadas das consultas, com o SQL já parseado e em cache."""
+    def stat() -> int:
+        cursor.execute(STAT_SQL)
+        return int(cursor.fetchone()[0])
+
+    reads = 0
+    elapsed = 0.0
+    for sql, params in queries:
+        cursor.execute(sql, params)
+        cursor.fetchall()
+
+        before = stat()
+        t0 = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        elapsed += time.perf_counter() - t0
+        reads += stat() - before - overhead
+    return reads, elapsed * 1000
+
+
+def report(cursor: Any, dt_ini: date, dt_fim: date) -> None:
+    # Custo da própria leitura de v$mystat (descontado de cada medida)
+    cursor.execute(STAT_SQL)
+    r0 = int(cursor.fetchone()[0])
+    cursor.execute(STAT_SQL)
+    overhead = int(cursor.fetchone()[0]) - r0
+
+    print(f"Período {dt_ini} a {dt_fim} | leituras lógicas por página (v$mystat)")
+    print(f"{'cenário':<34}{'SQL antes':>10}{'SQL depois':>11}{'antes':>12}{'depois':>12}{'redução':>10}{'ms antes':>10}{'ms depois':>11}")
+    for name, before, after in scenarios(dt_ini, dt_fim):
+        try:
+            reads_before, ms_before = measure(cursor, before, overhead)
+            reads_after, ms_after = measure(cursor, after, overhead)
+        except Exception as e:
+            print(f"{name:<34} erro: {str(e).splitlines()[0]}")
+            continue
+        print(f"{name:<34}{len(before):>10}{len(after):>11}{reads_before:>12}{reads_after:>12}"
+              f"{reads_before / max(reads_after, 1):>9.1f}x{ms_before:>10.1f}{ms_after:>11.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leituras lógicas: consultas antigas x consolidadas")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--dt-ini", type=date.fromisoformat, default=DEFAULT_DT_INI)
+    parser.add_argument("--dt-fim", type=date.fromisoformat, default=DEFAULT_DT_FIM)
+    args = parser.parse_args()
+
+    connector = OracleConnector(config_file=args.config, target="read")
+    try:
+        with connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                report(cursor, args.dt_ini, args.dt_fim)
+            finally:
+                cursor.close()
+    except Exception as e:
+        print(f"oracle: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+
+
+if __name__ == "__main__":
+    main()
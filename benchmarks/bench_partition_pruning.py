@@ -0,0 +1,154 @@
+# benchmarks/bench_partition_pruning.py
+
+"""
+Poda de partições - plano das consultas do dashboard nas BRZ_HIST_* particionadas
+
+- Consultas = SQL que os métodos públicos dos repositórios mandam ao banco com os
+  filtros padrão (mesmas chamadas do warm-up, repositories/warmup.py), no caminho
+  que lê as BRZ_* (agregado diário desligado)
+- EXPLAIN PLAN de cada SQL (sem executar); para cada acesso a tabela particionada
+  (ou índice local dela) mostra o operador PARTITION RANGE e o intervalo Pstart/Pstop:
+    SINGLE / ITERATOR com KEY ou números -> poda (só as partições do período)
+    ALL (1 - 1048575)                   -> SEM PODA (lê todas as partições)
+  KEY = partições decididas na execução pelos binds (:dt_ini/:dt_fim)
+- Tabelas não particionadas são ignoradas: sem a opção particionada
+  (sql/BRONZE PARTICIONADO - ...) o relatório sai vazio
+
+Pré-requisito: Oracle acessível (config/database.ini) com as BRZ_HIST_* particionadas
+e PLAN_TABLE disponível (padrão desde o 10g).
+
+Uso:
+    python benchmarks/bench_partition_pruning.py [--all]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import uuid
+from typing import Any, Dict, List, Set, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+from bench_logical_reads import recorded
+from connector.data_version import tables_in
+from connector.oracle_connector import OracleConnector
+from repositories.warmup import default_calls, repository_classes
+
+PARTITIONED_SQL = """
+SELECT t.TABLE_NAME AS OBJECT_NAME, t.TABLE_NAME
+FROM USER_PART_TABLES t
+UNION ALL
+SELECT i.INDEX_NAME, i.TABLE_NAME
+FROM USER_PART_INDEXES i
+"""
+
+PLAN_SQL = """
+SELECT ID, PARENT_ID, OPERATION, OPTIONS, OBJECT_NAME, PARTITION_START, PARTITION_STOP
+FROM PLAN_TABLE
+WHERE STATEMENT_ID = :sid
+ORDER BY ID
+"""
+
+# Operador de partição que lê todas as partições
+NO_PRUNING = {"ALL"}
+
+
+def queries() -> List[Tuple[str, str, Dict[str, Any]]]:
+    """(Classe.método, SQL, binds) das consultas do dashboard, sem repetir SQL."""
+    classes = {cls.__name__: cls for cls in repository_classes()}
+    seen: Set[str] = set()
+    out: List[Tuple[str, str, Dict[str, Any]]] = []
+    for call in default_calls():
+        cls_name, method = call.name.split(".", 1)
+        for sql, params in recorded(classes[cls_name], [(method, call.kwargs)], use_rollup=False):
+            if sql not in seen:
+                seen.add(sql)
+                out.append((call.name, sql, params))
+    return out
+
+
+def partition_ops(plan: List[Dict[str, Any]], partitioned: Dict[str, str]) -> List[Tuple[str, str, str]]:
+    """
+    (tabela, operador, Pstart-Pstop) de cada acesso a tabela/índice particionado.
+    O operador é o PARTITION RANGE mais próximo acima do acesso.
+    """
+    by_id = {row["ID"]: row for row in plan}
+    out = []
+    for row in plan:
+        table = partitioned.get(row["OBJECT_NAME"] or "")
+        if not table:
+            continue
+        parent = by_id.get(row["PARENT_ID"])
+        while parent is not None and parent["OPERATION"] != "PARTITION RANGE":
+            parent = by_id.get(parent["PARENT_ID"])
+        # Sem PARTITION RANGE acima (ex.: acesso pela PK global): o próprio acesso traz o intervalo
+        op = parent or row
+        out.append((table, op["OPTIONS"], f"{op['PARTITION_START']}-{op['PARTITION_STOP']}"))
+    return out
+
+
+def explain(cursor: Any, sql: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    sid = f"poda-{uuid.uuid4().hex[:12]}"
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{sid}' FOR {sql}", params)
+    try:
+        cursor.execute(PLAN_SQL, {"sid": sid})
+        columns = [d[0] for d in cursor.description]
+        return [dict(zip(columns, r)) for r in cursor.fetchall()]
+    finally:
+        cursor.execute("DELETE FROM PLAN_TABLE WHERE STATEMENT_ID = :sid", {"sid": sid})
+
+
+def report(cursor: Any, show_all: bool) -> int:
+    """Imprime o plano de partição por consulta; retorna quantas consultas leem todas as partições."""
+    cursor.execute(PARTITIONED_SQL)
+    partitioned = {r[0]: r[1] for r in cursor.fetchall()}
+    tables = set(partitioned.values())
+    if not tables:
+        print("Nenhuma tabela particionada (criar com sql/BRONZE PARTICIONADO - ... ou migrar)")
+        return 0
+
+    print(f"Tabelas particionadas: {', '.join(sorted(tables))}")
+    print(f"{'consulta':<62}{'tabela':<28}{'operador':<12}{'partições':<22}")
+    sem_poda = 0
+    for name, sql, params in queries():
+        if not tables.intersection(tables_in(sql)):
+            continue
+        try:
+            ops = partition_ops(explain(cursor, sql, params), partitioned)
+        except Exception as e:
+            print(f"{name:<62}erro: {str(e).splitlines()[0]}")
+            continue
+        bad = [op for op in ops if op[1] in NO_PRUNING]
+        sem_poda += bool(bad)
+        for table, options, span in (ops if show_all else bad or ops[:1]):
+            flag = "  <- SEM PODA" if options in NO_PRUNING else ""
+            print(f"{name:<62}{table:<28}{options:<12}{span:<22}{flag}")
+    print(f"\nConsultas que leem todas as partições: {sem_poda}")
+    return sem_poda
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poda de partições das consultas do dashboard (EXPLAIN PLAN)")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--all", action="store_true", help="Mostra todos os acessos (padrão: 1 por consulta)")
+    args = parser.parse_args()
+
+    connector = OracleConnector(config_file=args.config, target="read")
+    try:
+        with connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                report(cursor, args.all)
+            finally:
+                cursor.close()
+    except Exception as e:
+        print(f"oracle: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+
+
+if __name__ == "__main__":
+    main()
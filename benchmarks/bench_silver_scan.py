@@ -0,0 +1,219 @@
+# benchmarks/bench_silver_scan.py
+
+"""
+Volume varrido - fatos BRZ_HIST_* x camada SILVER (SLV_FATO_* + DIM_*)
+
+- Tabelas: bytes por linha do fato BRZ (nomes de filial, peça, vendedor, cidade...
+  repetidos em cada linha) x fato SILVER (data + chaves inteiras + medidas)
+    Oracle  : AVG_ROW_LEN / NUM_ROWS (USER_TABLES, estatísticas coletadas) e bytes do
+              segmento (USER_SEGMENTS); as dimensões entram somadas
+    Parquet : mesmo fato em memória (Arrow) e regravado em Parquet (compressão do
+              ParquetStore); o fato SILVER sai das views do DuckDB sobre os BRZ
+- Consultas: métodos com variante SILVER (use_silver) nos dois caminhos
+    Oracle  : leituras lógicas (v$mystat, benchmarks/bench_logical_reads.py)
+    DuckDB  : mediana de --runs sem cache, sobre as duas camadas regravadas em Parquet
+              numa pasta temporária (SILVER materializada, não a view derivada)
+- Oracle indisponível é reportado e só a parte Parquet/DuckDB roda
+
+Pré-requisitos: Parquet gravado pelos controllers ([PARQUET] enabled = true); para
+a parte Oracle, migração V006 aplicada + mains/main_silver_rebuild.py e
+DBMS_STATS.GATHER_SCHEMA_STATS recente.
+
+Uso:
+    python benchmarks/bench_silver_scan.py [--runs 5] [--parquet-root data/parquet] [--dt-ini 2025-01-01]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from bench_backends import direct_repository
+from bench_logical_reads import STAT_SQL, measure, recorded
+from connector.duckdb_connector import DuckDBConnector
+from connector.oracle_connector import OracleConnector
+from connector.silver import DIMENSIONS, FACTS
+from repositories.clientes_repository import ClientesRepository
+from repositories.dashboard_analitico_repository import DashboardAnaliticoRepository
+from repositories.dashboard_operacional_repository import DashboardOperacionalRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from repositories.pos_vendas_repository import PosVendaRepository
+
+TABLE_SQL = """
+SELECT t.TABLE_NAME, t.NUM_ROWS, t.AVG_ROW_LEN, NVL(s.BYTES, 0) AS BYTES
+FROM USER_TABLES t
+LEFT JOIN (SELECT SEGMENT_NAME, SUM(BYTES) AS BYTES FROM USER_SEGMENTS GROUP BY SEGMENT_NAME) s
+  ON s.SEGMENT_NAME = t.TABLE_NAME
+WHERE t.TABLE_NAME IN ({names})
+"""
+
+# Lidas pelos métodos do workload sem variante SILVER (rotatividade: estoque atual)
+EXTRA_TABLES = ("BRZ_ESTOQUE_PECAS",)
+
+
+def workload(dt_ini: date, dt_fim: date) -> List[Tuple[type, str, Dict[str, Any]]]:
+    periodo = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+    return [
+        (PosVendaRepository, "resumo_servicos", periodo),
+        (DashboardAnaliticoRepository, "lucro_por_vendedor", periodo),
+        (DashboardAnaliticoRepository, "rotatividade_pecas_categoria_proxy", periodo),
+        (DashboardOperacionalRepository, "top10_pecas_hoje", {}),
+        (ClientesRepository, "ltv_por_cliente", periodo),
+    ]
+
+
+# -------------------------
+# Oracle
+# -------------------------
+def oracle_report(cursor: Any, dt_ini: date, dt_fim: date) -> None:
+    names = [*FACTS, *(f.table for f in FACTS.values()), *DIMENSIONS]
+    cursor.execute(TABLE_SQL.format(names=", ".join(f"'{n}'" for n in names)))
+    stats = {r[0]: (int(r[1] or 0), int(r[2] or 0), int(r[3] or 0)) for r in cursor.fetchall()}
+
+    dims = sum(stats.get(d, (0, 0, 0))[2] for d in DIMENSIONS)
+    print(f"Oracle | dimensões SILVER: {dims / 1024 ** 2:,.1f} MB")
+    print(f"{'tabela BRZ':<28}{'linhas':>10}{'bytes/linha':>13}{'SILVER':>9}{'MB BRZ':>10}{'MB SILVER':>11}{'redução':>9}")
+    for source, fact in FACTS.items():
+        rows, brz_len, brz_bytes = stats.get(source, (0, 0, 0))
+        _, slv_len, slv_bytes = stats.get(fact.table, (0, 0, 0))
+        print(f"{source:<28}{rows:>10}{brz_len:>13}{slv_len:>9}{brz_bytes / 1024 ** 2:>10.1f}"
+              f"{slv_bytes / 1024 ** 2:>11.1f}{brz_bytes / max(slv_bytes, 1):>8.1f}x")
+
+    cursor.execute(STAT_SQL)
+    r0 = int(cursor.fetchone()[0])
+    cursor.execute(STAT_SQL)
+    overhead = int(cursor.fetchone()[0]) - r0
+
+    print(f"\n{'método':<66}{'leituras BRZ':>14}{'SILVER':>10}{'redução':>9}{'ms BRZ':>9}{'ms SILVER':>11}")
+    for cls, method, kwargs in workload(dt_ini, dt_fim):
+        name = f"{cls.__name__}.{method}"
+        try:
+            reads_brz, ms_brz = measure(cursor, recorded(cls, [(method, kwargs)], use_silver=False), overhead)
+            reads_slv, ms_slv = measure(cursor, recorded(cls, [(method, kwargs)], use_silver=True), overhead)
+        except Exception as e:
+            print(f"{name:<66} erro: {str(e).splitlines()[0]}")
+            continue
+        print(f"{name:<66}{reads_brz:>14}{reads_slv:>10}{reads_brz / max(reads_slv, 1):>8.1f}x"
+              f"{ms_brz:>9.1f}{ms_slv:>11.1f}")
+
+
+# -------------------------
+# Parquet / DuckDB
+# -------------------------
+def arrow_table(connector: DuckDBConnector, table_name: str) -> "pa.Table":
+    rows, _ = connector.run_select(f"SELECT * FROM {table_name}")
+    return pa.Table.from_pylist(rows)
+
+
+def parquet_bytes(table: Any, root: str, name: str) -> int:
+    """Grava a tabela como <root>/<name>/data.parquet (layout do ParquetStore) e devolve os bytes."""
+    directory = os.path.join(root, name)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "data.parquet")
+    pq.write_table(table, path, compression="zstd")
+    return os.path.getsize(path)
+
+
+def duckdb_report(connector: DuckDBConnector, dt_ini: date, dt_fim: date, runs: int) -> None:
+    print(f"Parquet ({connector.root}) | Arrow em memória e Parquet zstd regravado")
+    print(f"{'tabela BRZ':<28}{'linhas':>10}{'bytes/linha':>13}{'SILVER':>9}{'KB BRZ':>10}{'KB SILVER':>11}{'redução':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tables(connector, tmp)
+        timings_report(DuckDBConnector(tmp), dt_ini, dt_fim, runs)
+
+
+def tables(connector: DuckDBConnector, tmp: str) -> None:
+    """Tamanhos BRZ x SILVER; as duas camadas ficam gravadas em tmp para as consultas."""
+    dims = 0
+    for dimension in DIMENSIONS:
+        try:
+            dims += parquet_bytes(arrow_table(connector, dimension), tmp, dimension)
+        except Exception:
+            continue
+    for source, fact in FACTS.items():
+        try:
+            brz = arrow_table(connector, source)
+            slv = arrow_table(connector, fact.table)
+        except Exception as e:
+            print(f"{source:<28} sem Parquet ({str(e).splitlines()[0]})")
+            continue
+        rows = max(brz.num_rows, 1)
+        brz_kb = parquet_bytes(brz, tmp, source) / 1024
+        slv_kb = parquet_bytes(slv, tmp, fact.table) / 1024
+        print(f"{source:<28}{brz.num_rows:>10}{brz.nbytes // rows:>13}{slv.nbytes // rows:>9}"
+              f"{brz_kb:>10.1f}{slv_kb:>11.1f}{brz_kb / max(slv_kb, 0.001):>8.1f}x")
+    print(f"{'dimensões SILVER (total)':<28}{'':>32}{'':>10}{dims / 1024:>11.1f}")
+
+    # Outras tabelas lidas pelos métodos (iguais nos dois caminhos)
+    for table in EXTRA_TABLES:
+        try:
+            parquet_bytes(arrow_table(connector, table), tmp, table)
+        except Exception:
+            continue
+
+
+def timings_report(connector: DuckDBConnector, dt_ini: date, dt_fim: date, runs: int) -> None:
+    print(f"\n{'método':<66}{'ms BRZ':>10}{'ms SILVER':>11}{'ganho':>8}   (mediana de {runs})")
+    for cls, method, kwargs in workload(dt_ini, dt_fim):
+        medians = []
+        for silver in (False, True):
+            timings: List[float] = []
+            repo = direct_repository(cls, connector, timings)
+            repo.use_silver = silver
+            samples = []
+            for _ in range(runs):
+                timings.clear()
+                getattr(repo, method)(**kwargs)
+                samples.append(sum(timings) * 1000)
+            medians.append(statistics.median(samples))
+        print(f"{cls.__name__ + '.' + method:<66}{medians[0]:>10.1f}{medians[1]:>11.1f}"
+              f"{medians[0] / max(medians[1], 0.001):>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Volume varrido: fatos BRZ x camada SILVER")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--parquet-root", default=os.path.join(ROOT, "data", "parquet"))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--dt-ini", type=date.fromisoformat, default=DEFAULT_DT_INI)
+    parser.add_argument("--dt-fim", type=date.fromisoformat, default=DEFAULT_DT_FIM)
+    args = parser.parse_args()
+
+    connector = OracleConnector(config_file=args.config, target="read")
+    try:
+        with connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                oracle_report(cursor, args.dt_ini, args.dt_fim)
+            finally:
+                cursor.close()
+    except Exception as e:
+        print(f"oracle: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+    print()
+
+    if not os.path.isdir(args.parquet_root):
+        print(f"duckdb: sem Parquet em {args.parquet_root}")
+        return
+    t0 = time.perf_counter()
+    duck = DuckDBConnector(args.parquet_root)
+    duck.refresh_views()
+    duckdb_report(duck, args.dt_ini, args.dt_fim, args.runs)
+    print(f"\nConcluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
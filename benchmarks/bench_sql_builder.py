@@ -0,0 +1,157 @@
+# benchmarks/bench_sql_builder.py
+
+"""
+Predicados sargáveis e SQL especializado por filtro - antes x depois
+
+- Antes: a forma genérica que os repositórios usavam, reconstruída a partir do
+  SQL atual (mesma consulta, só os predicados mudam):
+  COL BETWEEN :dt_ini AND :dt_fim, "(:cod_x IS NULL OR COL = :cod_x)" para todo
+  filtro (todos os binds enviados, None quando sem filtro) e TRUNC(DT_VENDA) = TRUNC(SYSDATE)
+- Depois: SQL do repositório para a combinação de filtros (repositories/sql_builder.py),
+  com intervalo semiaberto e só os predicados/binds dos filtros informados
+- Cenários: sem filtro, uma concessionária, uma filial; cada SQL roda --runs vezes
+  depois de uma execução de aquecimento (mediana). A coluna "iguais" confere que
+  as duas formas devolvem as mesmas linhas
+
+Pré-requisitos: como em bench_backends.py (Oracle acessível e/ou Parquet local).
+
+Uso:
+    python benchmarks/bench_sql_builder.py [--runs 5] [--engines oracle,duckdb] [--cod-concessionaria X --cod-filial Y]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Garante import relativo do projeto (repositórios importam a partir de streamlit_app/)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, "streamlit_app"))
+
+from bench_backends import open_connector
+from bench_logical_reads import recorded
+from repositories.dashboard_operacional_repository import DashboardOperacionalRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from repositories.kpi_repository import KpiRepository
+from repositories.performance_filial_repository import PerformanceFilialRepository
+from repositories.pos_vendas_repository import PosVendaRepository
+from repositories.rentabilidade_integrada_repository import RentabilidadeIntegradaRepository
+from repositories.sql_builder import FILTER_COLUMNS
+
+# (classe, método, filtros aceitos)
+METHODS = [
+    (KpiRepository, "kpis_gerais_periodo", ("cod_concessionaria", "cod_filial")),
+    (RentabilidadeIntegradaRepository, "margem_integrada_por_venda_veiculo", ("cod_concessionaria", "cod_filial")),
+    (RentabilidadeIntegradaRepository, "ranking_modelos_rentabilidade_integrada", ("cod_concessionaria", "cod_filial")),
+    (RentabilidadeIntegradaRepository, "fluxo_caixa_proxy", ("cod_concessionaria", "cod_filial")),
+    (PosVendaRepository, "resumo_servicos", ("cod_concessionaria", "cod_filial")),
+    (PerformanceFilialRepository, "performance_por_filial", ("cod_concessionaria",)),
+    (DashboardOperacionalRepository, "top10_pecas_hoje", ()),
+]
+
+_RANGE_RE = re.compile(r"([\w.]+) >= :dt_ini AND \1 < :dt_fim \+ 1")
+_TODAY_RE = re.compile(r"([\w.]+) >= TRUNC\(SYSDATE\)\s+AND \1 < TRUNC\(SYSDATE\)\+1")
+_FILTER_RE = re.compile(r"(\w+\.)?(" + "|".join(FILTER_COLUMNS.values()) + r") = :(\w+)")
+
+
+def generic_sql(sql: str) -> str:
+    """Forma anterior dos predicados sobre o SQL gerado com todos os filtros ativos."""
+    sql = _RANGE_RE.sub(r"\1 BETWEEN :dt_ini AND :dt_fim", sql)
+    sql = _TODAY_RE.sub(r"TRUNC(\1) = TRUNC(SYSDATE)", sql)
+    sql = _FILTER_RE.sub(lambda m: f"(:{m.group(3)} IS NULL OR {m.group(1) or ''}{m.group(2)} = :{m.group(3)})", sql)
+    return sql.replace("WHERE 1 = 1 AND ", "WHERE ")
+
+
+def variants(cls: type, method: str, accepted: Tuple[str, ...], filtros: Dict[str, Any]) -> Tuple[Tuple[str, Dict[str, Any]], Tuple[str, Dict[str, Any]]]:
+    """((sql, params) antes, (sql, params) depois) de uma chamada."""
+    base = {"dt_ini": DEFAULT_DT_INI, "dt_fim": DEFAULT_DT_FIM} if accepted else {}
+    kwargs = {**base, **{k: v for k, v in filtros.items() if k in accepted}}
+    (after,) = recorded(cls, [(method, kwargs)])
+
+    # Antes: SQL com todos os filtros aceitos, binds ausentes como None
+    full = {**base, **{k: "x" for k in accepted}}
+    (template, _) = recorded(cls, [(method, full)])[0]
+    before_params = dict(after[1])
+    before_params.update({k: filtros.get(k) for k in accepted})
+    return (generic_sql(template), before_params), after
+
+
+def timed(connector: Any, sql: str, params: Dict[str, Any], runs: int) -> Tuple[float, list]:
+    rows, _ = connector.run_select(sql, params)
+    elapsed: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        connector.run_select(sql, params)
+        elapsed.append(time.perf_counter() - t0)
+    return statistics.median(elapsed) * 1000, rows
+
+
+def same_rows(a: list, b: list) -> bool:
+    key = lambda r: repr(sorted(r.items()))
+    return sorted(a, key=key) == sorted(b, key=key)
+
+
+def sample_filters(connector: Any, args: argparse.Namespace) -> Tuple[Any, Any]:
+    if args.cod_concessionaria is not None:
+        return args.cod_concessionaria, args.cod_filial
+    rows, _ = connector.run_select(
+        "SELECT COD_CONCESSIONARIA, COD_FILIAL FROM BRZ_HIST_VENDAS_VEICULOS "
+        "WHERE COD_FILIAL IS NOT NULL FETCH FIRST 1 ROWS ONLY", {})
+    return (rows[0]["COD_CONCESSIONARIA"], rows[0]["COD_FILIAL"]) if rows else (None, None)
+
+
+def bench_engine(connector: Any, conc: Any, filial: Any, runs: int) -> None:
+    scenarios = [
+        ("sem filtro", {}),
+        ("concessionária", {"cod_concessionaria": conc}),
+        ("filial", {"cod_concessionaria": conc, "cod_filial": filial}),
+    ]
+
+    print(f"{'método':<42}{'filtro':<16}{'ms antes':>10}{'ms depois':>11}{'razão':>8}{'iguais':>8}")
+    for cls, method, accepted in METHODS:
+        for label, filtros in scenarios:
+            if not accepted and filtros:
+                continue
+            if any(filtros.get(k) is not None for k in filtros if k not in accepted):
+                # Método sem filtro de filial: o cenário "filial" repetiria o de concessionária
+                continue
+            (sql_a, p_a), (sql_b, p_b) = variants(cls, method, accepted, filtros)
+            try:
+                ms_a, rows_a = timed(connector, sql_a, p_a, runs)
+                ms_b, rows_b = timed(connector, sql_b, p_b, runs)
+            except Exception as e:
+                print(f"{method:<42}{label:<16} erro: {str(e).splitlines()[0]}")
+                continue
+            print(f"{method:<42}{label:<16}{ms_a:>10.1f}{ms_b:>11.1f}{ms_a / max(ms_b, 1e-9):>7.1f}x"
+                  f"{'sim' if same_rows(rows_a, rows_b) else 'NÃO':>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predicados genéricos x SQL especializado por filtro")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--engines", default="oracle,duckdb")
+    parser.add_argument("--config", default=os.path.join(ROOT, "config", "database.ini"))
+    parser.add_argument("--parquet-root", default=os.path.join(ROOT, "data", "parquet"))
+    parser.add_argument("--cod-concessionaria", default=None)
+    parser.add_argument("--cod-filial", default=None)
+    args = parser.parse_args()
+
+    for engine in [e.strip() for e in args.engines.split(",") if e.strip()]:
+        try:
+            connector = open_connector(engine, args.config, args.parquet_root)
+            conc, filial = sample_filters(connector, args)
+        except Exception as e:
+            print(f"{engine}: indisponível ({str(e).splitlines()[0] if str(e) else type(e).__name__})")
+            continue
+        print(f"\n== {engine} | {DEFAULT_DT_INI} a {DEFAULT_DT_FIM} | mediana de {args.runs} execuções, sem cache")
+        bench_engine(connector, conc, filial, args.runs)
+
+
+if __name__ == "__main__":
+    main()
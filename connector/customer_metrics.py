@@ -0,0 +1,181 @@
+"""
+CustomerMetrics - Métricas por cliente, mês e origem (AGG_CLIENTE_METRICAS)
+- Grão: MES (1º dia) x CLIENTE_HASH x ORIGEM (VEICULO, PECA, SERVICO)
+- Medidas: PRIMEIRA_DATA / ULTIMA_DATA de compra no mês, TRANSACOES (linhas BRZ),
+  RECEITA e LUCRO; CLIENTE_KEY para exibição
+- Controllers: refresh(tabela, registros) depois do bulk_insert faz MERGE só dos
+  pares cliente x mês tocados pelo lote (o mês do cliente é recalculado inteiro a
+  partir da BRZ_*: recarregar o mesmo arquivo não soma duas vezes)
+  ([CLIENTE_METRICAS] enabled em config/database.ini, from_config)
+- Carga inicial / reconstrução: rebuild() (mains/main_cliente_metricas_rebuild.py);
+  troca de partição recalcula o mês trocado
+- Dashboard: LTV (top-N e tabela paginada), base do RFM e segmentos RFM somam os
+  meses do período em vez de unir as três BRZ_HIST_* ([CLIENTE_METRICAS] em
+  streamlit_app/config/config.ini). Só períodos de meses inteiros (dt_ini no dia 1,
+  dt_fim no último dia do mês, como o período padrão); os demais usam as BRZ_*
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from utils.ini_config import enabled_section
+
+METRICS_TABLE = "AGG_CLIENTE_METRICAS"
+
+METRICS_COLUMNS = (
+    "MES", "CLIENTE_HASH", "ORIGEM", "CLIENTE_KEY",
+    "PRIMEIRA_DATA", "ULTIMA_DATA", "TRANSACOES", "RECEITA", "LUCRO",
+)
+KEY_COLUMNS = ("MES", "CLIENTE_HASH", "ORIGEM")
+
+
+@dataclass(frozen=True)
+class MetricsSource:
+    """Como uma tabela BRZ_HIST_* alimenta as métricas (expressões já com NVL)."""
+    origem: str
+    date_column: str
+    receita: str
+    lucro: str
+
+
+METRICS_SOURCES: Dict[str, MetricsSource] = {
+    "BRZ_HIST_VENDAS_VEICULOS": MetricsSource("VEICULO", "DT_VENDA", "NVL(VALOR_VENDA,0)", "NVL(LUCRO_VENDA,0)"),
+    "BRZ_HIST_VENDAS_PECAS": MetricsSource("PECA", "DT_VENDA", "NVL(VALOR_VENDA,0)", "NVL(LUCRO_VENDA,0)"),
+    "BRZ_HIST_SERVICOS": MetricsSource(
+        "SERVICO", "DT_REALIZACAO_SERVICO", "NVL(VALOR_TOTAL_SERVICO,0)", "NVL(LUCRO_SERVICO,0)",
+    ),
+}
+
+
+def select_sql(table_name: str, where: str = "1 = 1") -> str:
+    """SELECT que agrega uma tabela BRZ_HIST_* no grão das métricas (colunas de METRICS_COLUMNS)."""
+    s = METRICS_SOURCES[table_name]
+    return f"""
+        SELECT
+            TRUNC({s.date_column}, 'MM') AS MES,
+            CLIENTE_HASH,
+            '{s.origem}' AS ORIGEM,
+            MAX(CLIENTE_KEY) AS CLIENTE_KEY,
+            MIN({s.date_column}) AS PRIMEIRA_DATA,
+            MAX({s.date_column}) AS ULTIMA_DATA,
+            COUNT(*) AS TRANSACOES,
+            SUM({s.receita}) AS RECEITA,
+            SUM({s.lucro}) AS LUCRO
+        FROM {table_name}
+        WHERE CLIENTE_HASH IS NOT NULL AND {where}
+        GROUP BY TRUNC({s.date_column}, 'MM'), CLIENTE_HASH
+    """
+
+
+def merge_sql(table_name: str) -> str:
+    """MERGE de um cliente (:hash) num mês (:mes) da origem da tabela."""
+    s = METRICS_SOURCES[table_name]
+    where = (f"CLIENTE_HASH = :hash AND {s.date_column} >= :mes "
+             f"AND {s.date_column} < ADD_MONTHS(:mes, 1)")
+    measures = [c for c in METRICS_COLUMNS if c not in KEY_COLUMNS]
+    return f"""
+    MERGE INTO {METRICS_TABLE} a
+    USING ({select_sql(table_name, where)}) x
+    ON ({" AND ".join(f"a.{c} = x.{c}" for c in KEY_COLUMNS)})
+    WHEN MATCHED THEN UPDATE SET
+        {", ".join(f"a.{c} = x.{c}" for c in measures)}, a.ATUALIZADO_EM = SYSTIMESTAMP
+    WHEN NOT MATCHED THEN INSERT ({", ".join(METRICS_COLUMNS)}, ATUALIZADO_EM)
+        VALUES ({", ".join(f"x.{c}" for c in METRICS_COLUMNS)}, SYSTIMESTAMP)
+    """
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def whole_months(dt_ini: date, dt_fim: date) -> bool:
+    """Período de meses inteiros (o único que as métricas mensais respondem exatamente)."""
+    return dt_ini.day == 1 and (dt_fim + timedelta(days=1)).day == 1 and dt_ini <= dt_fim
+
+
+def affected_customer_months(records: Iterable[Dict[str, Any]], date_column: str) -> List[Dict[str, Any]]:
+    """Pares cliente (CLIENTE_HASH) x mês tocados por um lote (mesmo formato do bulk_insert)."""
+    months: Dict[int, Set[date]] = defaultdict(set)
+    for r in records:
+        if r.get("CLIENTE_HASH") is not None and r.get(date_column) is not None:
+            months[r["CLIENTE_HASH"]].add(month_start(r[date_column]))
+    return [{"hash": h, "mes": m} for h, ms in sorted(months.items()) for m in sorted(ms)]
+
+
+class CustomerMetrics:
+    def __init__(self, connector: Any, batch_size: int = 200):
+        """
+        Args:
+            connector: OracleConnector de escrita
+            batch_size: Pares cliente x mês por executemany (uma ida ao banco por lote)
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, connector: Any, config_file: str = "config/database.ini") -> Optional["CustomerMetrics"]:
+        """Instância se [CLIENTE_METRICAS] enabled = true no .ini; None caso contrário."""
+        section = enabled_section(config_file, "CLIENTE_METRICAS")
+        return cls(connector, section.getint("batch_size", fallback=200)) if section is not None else None
+
+    def refresh(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        """MERGE dos pares cliente x mês do lote; retorna pares recalculados."""
+        table_name = table_name.upper()
+        if table_name not in METRICS_SOURCES:
+            return 0
+        binds = affected_customer_months(records, METRICS_SOURCES[table_name].date_column)
+        if not binds:
+            return 0
+
+        merge = merge_sql(table_name)
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for i in range(0, len(binds), self.batch_size):
+                    cursor.executemany(merge, binds[i:i + self.batch_size])
+            finally:
+                cursor.close()
+
+        self.connector.bump_data_version(METRICS_TABLE, len(binds))
+        return len(binds)
+
+    def rebuild(self, table_name: Optional[str] = None,
+                dt_ini: Optional[date] = None, dt_fim: Optional[date] = None) -> Dict[str, int]:
+        """
+        Reconstrói as métricas (todas as origens ou só a da tabela) dos meses que
+        tocam o período informado, ou de tudo. Retorna {tabela: linhas gravadas}.
+        """
+        tables = [table_name.upper()] if table_name else list(METRICS_SOURCES)
+        params: Dict[str, Any] = {
+            "mes_ini": month_start(dt_ini) if dt_ini else None,
+            "mes_fim": month_start(dt_fim) if dt_fim else None,
+        }
+        out: Dict[str, int] = {}
+        for name in tables:
+            s = METRICS_SOURCES[name]
+            agg_range = "(:mes_ini IS NULL OR MES >= :mes_ini) AND (:mes_fim IS NULL OR MES <= :mes_fim)"
+            src_range = (f"(:mes_ini IS NULL OR {s.date_column} >= :mes_ini) "
+                         f"AND (:mes_fim IS NULL OR {s.date_column} < ADD_MONTHS(:mes_fim, 1))")
+            block = f"""
+            BEGIN
+                DELETE FROM {METRICS_TABLE} WHERE ORIGEM = '{s.origem}' AND {agg_range};
+                INSERT INTO {METRICS_TABLE} ({", ".join(METRICS_COLUMNS)}, ATUALIZADO_EM)
+                SELECT x.*, SYSTIMESTAMP FROM ({select_sql(name, src_range)}) x;
+                :rows := SQL%ROWCOUNT;
+            END;
+            """
+            with self.connector.get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    rows = cursor.var(int)
+                    cursor.execute(block, {**params, "rows": rows})
+                    out[name] = int(rows.getvalue() or 0)
+                finally:
+                    cursor.close()
+
+        self.connector.bump_data_version(METRICS_TABLE, sum(out.values()))
+        return out
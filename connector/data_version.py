@@ -0,0 +1,126 @@
+"""
+DataVersionStore - Versão dos dados por tabela (CTL_DATA_VERSION)
+- Controllers: bump(tabela, linhas) após cada carga bem-sucedida (MERGE)
+- Dashboard: versions_for(sql) devolve as versões das tabelas lidas pelo SQL,
+  usadas na chave do cache de queries (o resultado vive até os dados mudarem)
+- A tabela de controle é lida inteira (poucas linhas) no máximo 1x a cada
+  check_interval_s segundos por processo
+- Sem a tabela de controle (ainda não criada / erro), cai no comportamento
+  antigo: a chave muda a cada fallback_ttl_s segundos
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+CONTROL_TABLE = "CTL_DATA_VERSION"
+
+# Tabelas versionadas (camada bronze, agregados e camada SILVER mantidos pelos controllers)
+_TABLE_RE = re.compile(r"\b(?:BRZ|AGG|SLV|DIM)_\w+\b", re.IGNORECASE)
+
+# SQL que depende do relógio: resultado muda mesmo sem carga nova
+_VOLATILE_RE = re.compile(r"\b(SYSDATE|SYSTIMESTAMP|CURRENT_DATE|CURRENT_TIMESTAMP)\b", re.IGNORECASE)
+
+BUMP_SQL = f"""
+MERGE INTO {CONTROL_TABLE} t
+USING (SELECT :table_name AS TABLE_NAME FROM dual) s
+ON (t.TABLE_NAME = s.TABLE_NAME)
+WHEN MATCHED THEN UPDATE SET
+    t.VERSION = t.VERSION + 1,
+    t.LOADED_AT = SYSTIMESTAMP,
+    t.ROWS_LOADED = :rows_loaded
+WHEN NOT MATCHED THEN INSERT (TABLE_NAME, VERSION, LOADED_AT, ROWS_LOADED)
+    VALUES (s.TABLE_NAME, 1, SYSTIMESTAMP, :rows_loaded)
+"""
+
+SNAPSHOT_SQL = f"SELECT TABLE_NAME, VERSION FROM {CONTROL_TABLE}"
+
+
+@lru_cache(maxsize=1024)
+def tables_in(sql: str) -> Tuple[str, ...]:
+    """Tabelas versionadas citadas no SQL (ordenadas, sem repetição)."""
+    return tuple(sorted({m.upper() for m in _TABLE_RE.findall(sql)}))
+
+
+@lru_cache(maxsize=1024)
+def is_volatile(sql: str) -> bool:
+    return bool(_VOLATILE_RE.search(sql))
+
+
+# Partes da chave que só dependem do relógio (janela de TTL / SYSDATE)
+TIME_KEYS = ("ttl", "clock")
+
+
+def data_versions(key: Tuple[Tuple[str, Any], ...]) -> Tuple[Tuple[str, Any], ...]:
+    """Só as versões das tabelas de uma chave de versions_for (sem as janelas de tempo)."""
+    return tuple(item for item in key if item[0] not in TIME_KEYS)
+
+
+class DataVersionStore:
+    def __init__(self, connector: Any, check_interval_s: float = 5.0,
+                 fallback_ttl_s: float = 120.0, volatile_ttl_s: float = 300.0):
+        """
+        Args:
+            connector: OracleConnector (leitura para o snapshot, escrita para o bump)
+            check_interval_s: Intervalo mínimo entre leituras da tabela de controle
+            fallback_ttl_s: Janela da chave quando a tabela de controle não está disponível
+            volatile_ttl_s: Janela extra da chave para SQL com SYSDATE/CURRENT_DATE
+        """
+        self.connector = connector
+        self.check_interval_s = check_interval_s
+        self.fallback_ttl_s = fallback_ttl_s
+        self.volatile_ttl_s = volatile_ttl_s
+
+        self._lock = threading.Lock()
+        self._snapshot: Optional[Dict[str, int]] = None
+        self._next_check = 0.0
+
+    # -------------------------
+    # Escrita (controllers)
+    # -------------------------
+    def bump(self, table_name: str, rows_loaded: int) -> None:
+        """Incrementa a versão da tabela (chamar só depois da carga confirmada)."""
+        self.connector.execute_dml(BUMP_SQL, {"table_name": table_name.upper(), "rows_loaded": int(rows_loaded)})
+        self.invalidate()
+
+    # -------------------------
+    # Leitura (dashboard)
+    # -------------------------
+    def snapshot(self) -> Optional[Dict[str, int]]:
+        """Versões atuais {tabela: versão}; None se a tabela de controle não puder ser lida."""
+        if time.monotonic() < self._next_check:
+            return self._snapshot
+
+        with self._lock:
+            if time.monotonic() < self._next_check:
+                return self._snapshot
+            try:
+                rows, _ = self.connector.run_select(SNAPSHOT_SQL)
+                self._snapshot = {r["TABLE_NAME"]: int(r["VERSION"]) for r in rows}
+                self._next_check = time.monotonic() + self.check_interval_s
+            except Exception:
+                # Tabela de controle ausente/inacessível: não insiste a cada query
+                self._snapshot = None
+                self._next_check = time.monotonic() + self.fallback_ttl_s
+            return self._snapshot
+
+    def versions_for(self, sql: str) -> Tuple[Tuple[str, Any], ...]:
+        """Parte da chave de cache que depende dos dados lidos pelo SQL."""
+        snapshot = self.snapshot()
+        if snapshot is None:
+            key: Tuple[Tuple[str, Any], ...] = (("ttl", int(time.time() // self.fallback_ttl_s)),)
+        else:
+            key = tuple((t, snapshot.get(t, 0)) for t in tables_in(sql))
+
+        if is_volatile(sql):
+            key += (("clock", int(time.time() // self.volatile_ttl_s)),)
+        return key
+
+    def invalidate(self) -> None:
+        """Força nova leitura da tabela de controle na próxima consulta."""
+        with self._lock:
+            self._next_check = 0.0
@@ -0,0 +1,239 @@
+"""
+Classe DuckDBConnector - Leitura local (DuckDB embarcado sobre os Parquet do ParquetStore)
+- Mesma interface de leitura do OracleConnector (run_select -> linhas + QueryStats),
+  então BaseRepository/DataVersionStore funcionam sem mudança
+- Cada pasta em <root> vira uma VIEW com o nome da tabela (read_parquet com partições)
+- AGG_DIARIO_FILIAL, AGG_JORNADA_CLIENTE e AGG_CLIENTE_METRICAS são views sobre as views dos fatos
+  (mesmo SELECT que os controllers usam para manter as tabelas no Oracle)
+- Camada SILVER (DIM_* / SLV_FATO_*): views derivadas dos fatos BRZ disponíveis,
+  chave substituta = posição do membro (connector/silver.py); pasta própria em
+  <root> (SILVER gravada em Parquet) tem precedência sobre a view derivada
+- Colunas IDENTITY do Oracle (IDENTITY_COLUMNS) não vão para o Parquet (o ID nasce
+  no INSERT); a view da tabela expõe no lugar uma chave substituta estável com o
+  mesmo nome (hash de arquivo + linha), usada como chave de venda/paginação
+- AGG_RFM_LIMIARES sem pasta em <root> (nenhum refresh gravou em Parquet) vira uma
+  view vazia com as colunas da tabela: o RFM cai nos limiares do período (connector/rfm.py)
+- View derivada que não compila (ex.: coluna ausente no Parquet) só é logada e
+  fica de fora; as demais tabelas continuam consultáveis
+- O SQL Oracle dos repositórios é traduzido por connector.sql_dialect
+- Uma conexão em memória por processo; cada consulta usa um cursor próprio
+  (cursores do DuckDB podem rodar em threads diferentes)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import duckdb
+except ImportError:  # backend opcional
+    duckdb = None
+
+# Importação da estrutura das pastas
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.customer_metrics import METRICS_SOURCES, METRICS_TABLE, select_sql as metrics_sql
+from connector.journey import JOURNEY_SOURCES, JOURNEY_TABLE, select_sql as journey_sql
+from connector.parquet_store import PARTITION_KEY
+from connector.rfm import THRESHOLD_COLUMNS, THRESHOLDS_TABLE
+from connector.rollups import ROLLUP_SOURCES, ROLLUP_TABLE, select_sql
+from connector.silver import DIMENSIONS, FACTS, dimension_select_sql, fact_select_sql
+from connector.sql_dialect import to_duckdb, duckdb_params
+from connector.query_stats import QueryStats, estimate_bytes
+from utils.logger_controller import LoggerController
+
+NOME = "DuckDBConnector"
+
+# Tabela -> coluna IDENTITY que os controllers não gravam no Parquet
+IDENTITY_COLUMNS: Dict[str, str] = {
+    "BRZ_HIST_VENDAS_VEICULOS": "ID_VENDA_VEICULO",
+    "BRZ_ESTOQUE_PECAS": "ID_ESTOQUE_PECA",
+}
+# Chave substituta: estável enquanto o arquivo existir (cada carga grava arquivos novos)
+SURROGATE_ID = "CAST(hash(filename, file_row_number) >> 1 AS BIGINT)"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "DuckDBConnector.txt")
+logger = LoggerController(logfile)
+
+
+class DuckDBConnector:
+    ENDPOINT = "duckdb"
+
+    def __init__(self, root: str = "data/parquet", threads: Optional[int] = None):
+        """
+        Args:
+            root: Raiz dos Parquet gravados pelo ParquetStore
+            threads: Threads do DuckDB por consulta (None = padrão do DuckDB)
+        """
+        if duckdb is None:
+            raise ImportError("❌ duckdb não instalado: necessário para o backend local")
+        self.root = Path(root)
+        self.target = "read"
+        self._db = duckdb.connect(":memory:")
+        if threads:
+            self._db.execute(f"SET threads = {int(threads)}")
+        self._views: Dict[str, int] = {}
+        self._rollup_sources: tuple = ()
+        self._journey = False
+        self._metrics_sources: tuple = ()
+        self._silver_sources: tuple = ()
+        self._thresholds = False
+        # View derivada que falhou -> views base daquela tentativa (só tenta de novo se mudarem)
+        self._failed: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+        logger.info("🦆 DuckDBConnector inicializado - root=%s", self.root)
+
+    # -------------------------
+    # Compatibilidade com OracleConnector
+    # -------------------------
+    def init_connection_pool(self, *args: Any, **kwargs: Any) -> None:
+        self.refresh_views()
+
+    def close_pool(self) -> None:
+        self._db.close()
+
+    # -------------------------
+    # Catálogo (pastas -> views)
+    # -------------------------
+    def refresh_views(self) -> None:
+        """Cria/atualiza uma view por tabela encontrada em root (barato: só lista as pastas)."""
+        if not self.root.is_dir():
+            return
+        with self._lock:
+            for entry in os.scandir(self.root):
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                partitioned = any(e.name.startswith(f"{PARTITION_KEY}=") for e in os.scandir(entry.path))
+                has_files = partitioned or any(e.name.endswith(".parquet") for e in os.scandir(entry.path))
+                layout = 2 if partitioned else 1
+                if not has_files or self._views.get(entry.name) == layout:
+                    continue
+
+                pattern = f"{Path(entry.path).as_posix()}/**/*.parquet"
+                select = self._table_select(entry.name, pattern, partitioned)
+                self._db.execute(f'CREATE OR REPLACE VIEW "{entry.name}" AS {select}')
+                self._views[entry.name] = layout
+                logger.info("📄 View %s -> %s", entry.name, pattern)
+            self._derived(ROLLUP_TABLE, self._refresh_rollup_view)
+            self._derived(JOURNEY_TABLE, self._refresh_journey_view)
+            self._derived(METRICS_TABLE, self._refresh_metrics_view)
+            self._derived("SILVER", self._refresh_silver_views)
+            self._derived(THRESHOLDS_TABLE, self._refresh_thresholds_view)
+
+    def _table_select(self, name: str, pattern: str, partitioned: bool) -> str:
+        """SELECT da view de uma pasta; sem a coluna IDENTITY no Parquet, acrescenta a chave substituta."""
+        options = "hive_partitioning = true, union_by_name = true" if partitioned else "union_by_name = true"
+        exclude = [PARTITION_KEY] if partitioned else []
+        extra = ""
+        identity = IDENTITY_COLUMNS.get(name)
+        if identity:
+            described = self._db.execute(f"DESCRIBE SELECT * FROM read_parquet('{pattern}', {options})").fetchall()
+            if identity not in {row[0].upper() for row in described}:
+                options += ", filename = true, file_row_number = true"
+                exclude += ["filename", "file_row_number"]
+                extra = f", {SURROGATE_ID} AS {identity}"
+        columns = f"* EXCLUDE ({', '.join(exclude)})" if exclude else "*"
+        return f"SELECT {columns}{extra} FROM read_parquet('{pattern}', {options})"
+
+    def _derived(self, name: str, refresh: Callable[[], None]) -> None:
+        """Atualiza um grupo de views derivadas sem derrubar o backend se ele falhar."""
+        state = tuple(sorted(self._views.items()))
+        if self._failed.get(name) == state:
+            return
+        try:
+            refresh()
+            self._failed.pop(name, None)
+        except Exception as e:
+            self._failed[name] = state
+            logger.error("❌ View derivada %s indisponível: %s", name, str(e).splitlines()[0])
+
+    def _refresh_rollup_view(self) -> None:
+        sources = tuple(t for t in ROLLUP_SOURCES if t in self._views)
+        if not sources or sources == self._rollup_sources:
+            return
+        union = " UNION ALL ".join(to_duckdb(select_sql(t)) for t in sources)
+        self._db.execute(f'CREATE OR REPLACE VIEW "{ROLLUP_TABLE}" AS {union}')
+        self._rollup_sources = sources
+        logger.info("📄 View %s -> %s", ROLLUP_TABLE, ", ".join(sources))
+
+    def _refresh_journey_view(self) -> None:
+        if self._journey or not all(t in self._views for t in JOURNEY_SOURCES):
+            return
+        self._db.execute(f'CREATE OR REPLACE VIEW "{JOURNEY_TABLE}" AS {to_duckdb(journey_sql())}')
+        self._journey = True
+        logger.info("📄 View %s -> %s", JOURNEY_TABLE, ", ".join(JOURNEY_SOURCES))
+
+    def _refresh_metrics_view(self) -> None:
+        sources = tuple(t for t in METRICS_SOURCES if t in self._views)
+        if not sources or sources == self._metrics_sources:
+            return
+        union = " UNION ALL ".join(to_duckdb(metrics_sql(t)) for t in sources)
+        self._db.execute(f'CREATE OR REPLACE VIEW "{METRICS_TABLE}" AS {union}')
+        self._metrics_sources = sources
+        logger.info("📄 View %s -> %s", METRICS_TABLE, ", ".join(sources))
+
+    def _refresh_silver_views(self) -> None:
+        sources = tuple(t for t in FACTS if t in self._views)
+        if not sources or sources == self._silver_sources:
+            return
+        for dimension in DIMENSIONS:
+            used = [t for t in sources if any(k.dimension == dimension for k in FACTS[t].keys)]
+            if used and dimension not in self._views:
+                self._db.execute(f'CREATE OR REPLACE VIEW "{dimension}" AS '
+                                 f'{to_duckdb(dimension_select_sql(dimension, used))}')
+        for source in sources:
+            if FACTS[source].table not in self._views:
+                self._db.execute(f'CREATE OR REPLACE VIEW "{FACTS[source].table}" AS '
+                                 f'{to_duckdb(fact_select_sql(source))}')
+        self._silver_sources = sources
+        logger.info("📄 Views SILVER -> %s", ", ".join(sources))
+
+    def _refresh_thresholds_view(self) -> None:
+        if self._thresholds or THRESHOLDS_TABLE in self._views:
+            return
+        columns = ", ".join(
+            ["CAST(NULL AS BIGINT) AS ID", "CAST(NULL AS DATE) AS DT_INI_REF",
+             "CAST(NULL AS DATE) AS DT_FIM_REF", "CAST(NULL AS BIGINT) AS CLIENTES"]
+            + [f"CAST(NULL AS DOUBLE) AS {c}" for c in THRESHOLD_COLUMNS]
+            + ["CAST(NULL AS TIMESTAMP) AS CALCULADO_EM"]
+        )
+        self._db.execute(f'CREATE OR REPLACE VIEW "{THRESHOLDS_TABLE}" AS SELECT {columns} WHERE FALSE')
+        self._thresholds = True
+        logger.info("📄 View %s vazia (sem limiares gravados em Parquet)", THRESHOLDS_TABLE)
+
+    # -------------------------
+    # Leitura
+    # -------------------------
+    def run_select(self, query: str, params: Optional[Dict[str, Any]] = None) -> Tuple[list, QueryStats]:
+        """SELECT em SQL Oracle (traduzido); retorna (linhas como dicionários, QueryStats)."""
+        self.refresh_views()
+        stats = QueryStats(endpoint=self.ENDPOINT)
+
+        t0 = time.perf_counter()
+        sql = to_duckdb(query)
+        cursor = self._db.cursor()
+        try:
+            cursor.execute(sql, duckdb_params(sql, params))
+            t2 = time.perf_counter()
+            stats.execute_ms = (t2 - t0) * 1000
+
+            columns = [desc[0] for desc in cursor.description] if cursor.description else []
+            rows = cursor.fetchall() if columns else []
+            results = [dict(zip(columns, row)) for row in rows]
+            stats.fetch_ms = (time.perf_counter() - t2) * 1000
+        finally:
+            cursor.close()
+
+        stats.rows = len(results)
+        stats.bytes = estimate_bytes(rows)
+        logger.debug("⏱️ run_select: execute=%.1fms fetch=%.1fms rows=%s",
+                     stats.execute_ms, stats.fetch_ms, stats.rows)
+        return results, stats
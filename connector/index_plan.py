@@ -0,0 +1,213 @@
+"""
+Plano de índices das tabelas BRZ_* / AGG_* derivado da carga real do dashboard
+- Carga de trabalho: SQL que os métodos públicos dos repositórios mandam ao banco
+  (chamadas do warm-up, repositories/warmup.py), ponderada pelo tempo registrado
+  em logs/query_telemetry.jsonl (benchmarks/bench_index_usage.py)
+- Padrão dominante: intervalo de data (sempre a 1ª coluna) + colunas agrupadas +
+  medidas somadas. Os índices "de cobertura" levam as medidas junto: a consulta é
+  respondida só pelo índice (INDEX RANGE SCAN / INDEX FAST FULL SCAN), sem ir à tabela
+- Índices antigos sem nenhum método que filtre pelas colunas deles saem (DROPPED_INDEXES):
+  só custam na carga (bulk_insert e troca de partição)
+- Aplicado por sql/migrations/V005__indices_carga_dashboard.sql (mains/main_migrate.py);
+  o relatório método -> índice esperado sai de benchmarks/bench_index_usage.py
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Índice do plano: colunas na ordem do índice e métodos que devem usá-lo."""
+    name: str
+    table: str
+    columns: Tuple[str, ...]
+    used_by: Tuple[str, ...]
+    motivo: str
+
+    @property
+    def leading(self) -> str:
+        return self.columns[0]
+
+
+INDEX_PLAN: Tuple[IndexSpec, ...] = (
+    # -------------------------
+    # BRZ_HIST_VENDAS_PECAS (maior volume)
+    # -------------------------
+    IndexSpec(
+        "IX_BRZ_VP_DT_PECA_COB", "BRZ_HIST_VENDAS_PECAS",
+        ("DT_VENDA", "DESCRICAO_PECA", "CATEGORIA_PECA", "QTDE_VENDIDA", "VALOR_VENDA", "LUCRO_VENDA"),
+        (
+            "DashboardOperacionalRepository.kpis_vendas_pecas_diario",
+            "DashboardOperacionalRepository.top10_pecas_hoje",
+            "DashboardPreditivoRepository.serie_diaria_pecas_receita",
+            "DashboardPreditivoRepository.risco_falta_pecas_30d",
+            "DashboardAnaliticoRepository.rotatividade_pecas_categoria_proxy",
+        ),
+        "período + peça/categoria com as medidas: KPIs do dia e séries sem acesso à tabela",
+    ),
+    IndexSpec(
+        "IX_BRZ_VP_DT_VENDEDOR_COB", "BRZ_HIST_VENDAS_PECAS",
+        ("DT_VENDA", "NOME_VENDEDOR", "VALOR_VENDA", "LUCRO_VENDA"),
+        ("DashboardAnaliticoRepository.lucro_por_vendedor",),
+        "período + vendedor (substitui IX_BRZ_VP_VENDEDOR, que não tinha a data)",
+    ),
+    IndexSpec(
+        "IX_BRZ_VP_DT_CLIENTE_COB", "BRZ_HIST_VENDAS_PECAS",
+        ("DT_VENDA", "CLIENTE_HASH", "CLIENTE_KEY", "VALOR_VENDA", "LUCRO_VENDA"),
+        (
+            "ClientesRepository.funil_clientes",
+            "ClientesRepository.ltv_por_cliente",
+            "ClientesRepository.rfm_base",
+            "ClientesRepository.rfm_segmentos",
+        ),
+        "período + cliente normalizado: funil, LTV e RFM filtram por data, não por cliente",
+    ),
+    # -------------------------
+    # BRZ_HIST_SERVICOS
+    # -------------------------
+    IndexSpec(
+        "IX_BRZ_SERV_DT_DEPTO_COB", "BRZ_HIST_SERVICOS",
+        ("DT_REALIZACAO_SERVICO", "DEPARTAMENTO_SERVICO", "CATEGORIA_SERVICO",
+         "QTDE_SERVICOS", "VALOR_TOTAL_SERVICO", "LUCRO_SERVICO"),
+        (
+            "PosVendaRepository.resumo_servicos",
+            "PosVendaRepository.kpis_servicos",
+            "PosVendaRepository.por_departamento",
+            "PosVendaRepository.por_categoria_servico",
+            "DashboardOperacionalRepository.kpis_servicos_diario",
+            "DashboardPreditivoRepository.serie_diaria_servicos_receita",
+        ),
+        "período + departamento/categoria com as medidas (substitui IX_BRZ_SERV_DEPARTAMENTO)",
+    ),
+    IndexSpec(
+        "IX_BRZ_SERV_DT_VENDEDOR_COB", "BRZ_HIST_SERVICOS",
+        ("DT_REALIZACAO_SERVICO", "NOME_VENDEDOR_SERVICO", "VALOR_TOTAL_SERVICO", "LUCRO_SERVICO"),
+        ("DashboardAnaliticoRepository.lucro_por_vendedor",),
+        "período + vendedor (substitui IX_BRZ_SERV_VENDEDOR)",
+    ),
+    IndexSpec(
+        "IX_BRZ_SERV_DT_CLIENTE_COB", "BRZ_HIST_SERVICOS",
+        ("DT_REALIZACAO_SERVICO", "CLIENTE_HASH", "CLIENTE_KEY", "VALOR_TOTAL_SERVICO", "LUCRO_SERVICO"),
+        (
+            "ClientesRepository.funil_clientes",
+            "ClientesRepository.ltv_por_cliente",
+            "ClientesRepository.rfm_base",
+            "ClientesRepository.rfm_segmentos",
+        ),
+        "período + cliente normalizado",
+    ),
+    # -------------------------
+    # BRZ_HIST_VENDAS_VEICULOS
+    # -------------------------
+    IndexSpec(
+        "IX_BRZ_VV_DT_KPI_COB", "BRZ_HIST_VENDAS_VEICULOS",
+        ("DT_VENDA", "QTDE_VENDIDA", "VALOR_VENDA", "LUCRO_VENDA", "DIAS_EM_ESTOQUE"),
+        (
+            "DashboardOperacionalRepository.kpis_vendas_veiculos_diario",
+            "DashboardPreditivoRepository.serie_diaria_veiculos_unidades",
+            "DashboardAnaliticoRepository.dias_estoque_historico_venda_mensal",
+        ),
+        "período com as medidas diárias/mensais de veículos",
+    ),
+    IndexSpec(
+        "IX_BRZ_VV_DT_VENDEDOR_COB", "BRZ_HIST_VENDAS_VEICULOS",
+        ("DT_VENDA", "NOME_VENDEDOR", "VALOR_VENDA", "LUCRO_VENDA"),
+        ("DashboardAnaliticoRepository.lucro_por_vendedor",),
+        "período + vendedor (substitui IX_BRZ_VV_VENDEDOR)",
+    ),
+    IndexSpec(
+        "IX_BRZ_VV_DT_CLIENTE_COB", "BRZ_HIST_VENDAS_VEICULOS",
+        ("DT_VENDA", "CLIENTE_HASH", "CLIENTE_KEY", "VALOR_VENDA", "LUCRO_VENDA"),
+        (
+            "ClientesRepository.funil_clientes",
+            "ClientesRepository.ltv_por_cliente",
+            "ClientesRepository.rfm_base",
+            "ClientesRepository.rfm_segmentos",
+        ),
+        "período + cliente normalizado",
+    ),
+    # -------------------------
+    # AGG_DIARIO_FILIAL (KPIs da Home, P&L, ROI, performance, fluxo de caixa)
+    # -------------------------
+    IndexSpec(
+        "IX_AGG_DIARIO_COB", "AGG_DIARIO_FILIAL",
+        ("DT", "LINHA", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "RECEITA", "LUCRO", "QTDE"),
+        (
+            "KpiRepository.kpis_gerais_periodo",
+            "KpiRepository.receita_mensal_total",
+            "DashboardAnaliticoRepository.pnl_mensal",
+            "DashboardAnaliticoRepository.roi_por_filial_periodo",
+            "PerformanceFilialRepository.performance_por_filial",
+            "RentabilidadeIntegradaRepository.fluxo_caixa_proxy",
+        ),
+        "consultas quentes da Home respondidas só pelo índice (substitui IX_AGG_DIARIO_DT_LINHA, prefixo dele)",
+    ),
+)
+
+# Índices já existentes que continuam no plano (criados pelos CREATE TABLE / ALTER)
+KEPT_INDEXES: Tuple[IndexSpec, ...] = (
+    IndexSpec(
+        "IX_BRZ_VP_FILIAL_DATA", "BRZ_HIST_VENDAS_PECAS",
+        ("COD_CONCESSIONARIA", "COD_FILIAL", "DT_VENDA"), (),
+        "filtro de concessionária/filial da sidebar (Filters)",
+    ),
+    IndexSpec(
+        "IX_BRZ_SERV_FILIAL_DATA", "BRZ_HIST_SERVICOS",
+        ("COD_CONCESSIONARIA", "COD_FILIAL", "DT_REALIZACAO_SERVICO"), (),
+        "filtro de concessionária/filial da sidebar (Filters)",
+    ),
+    IndexSpec(
+        "IX_BRZ_VV_FILIAL_DATA", "BRZ_HIST_VENDAS_VEICULOS",
+        ("COD_CONCESSIONARIA", "COD_FILIAL", "DT_VENDA"), (),
+        "filtro de concessionária/filial da sidebar (Filters)",
+    ),
+    IndexSpec(
+        "IX_BRZ_VP_CLIENTE", "BRZ_HIST_VENDAS_PECAS", ("CLIENTE_HASH", "DT_VENDA"), (),
+        "refresh da jornada por cliente (connector/journey.py)",
+    ),
+    IndexSpec(
+        "IX_BRZ_SERV_CLIENTE", "BRZ_HIST_SERVICOS", ("CLIENTE_HASH", "DT_REALIZACAO_SERVICO"), (),
+        "refresh da jornada por cliente (connector/journey.py)",
+    ),
+    IndexSpec(
+        "IX_BRZ_VV_CLIENTE", "BRZ_HIST_VENDAS_VEICULOS", ("CLIENTE_HASH", "DT_VENDA"), (),
+        "refresh da jornada por cliente (connector/journey.py)",
+    ),
+    IndexSpec(
+        "IX_AGG_DIARIO_FILIAL", "AGG_DIARIO_FILIAL", ("COD_CONCESSIONARIA", "COD_FILIAL", "DT"), (),
+        "KPIs com filtro de concessionária/filial",
+    ),
+    IndexSpec(
+        "IX_AGG_JORNADA_DT_FILIAL", "AGG_JORNADA_CLIENTE", ("DT_VENDA", "COD_CONCESSIONARIA", "COD_FILIAL"),
+        (
+            "RentabilidadeIntegradaRepository.margem_integrada_por_venda_veiculo",
+            "RentabilidadeIntegradaRepository.ranking_modelos_rentabilidade_integrada",
+        ),
+        "período da venda na jornada materializada",
+    ),
+)
+
+# Índices removidos: nenhum método do dashboard filtra pelas colunas líderes deles
+DROPPED_INDEXES: Dict[str, str] = {
+    "IX_BRZ_VP_PECA": "DESCRICAO_PECA/CATEGORIA_PECA só aparecem com período (IX_BRZ_VP_DT_PECA_COB)",
+    "IX_BRZ_VP_VENDEDOR": "sem data; substituído por IX_BRZ_VP_DT_VENDEDOR_COB",
+    "IX_BRZ_VP_CIDADE_ESTADO": "nenhuma consulta filtra ou agrupa por cidade/estado",
+    "IX_BRZ_SERV_DEPARTAMENTO": "sem data; substituído por IX_BRZ_SERV_DT_DEPTO_COB",
+    "IX_BRZ_SERV_VENDEDOR": "sem data; substituído por IX_BRZ_SERV_DT_VENDEDOR_COB",
+    "IX_BRZ_VV_VENDEDOR": "sem data; substituído por IX_BRZ_VV_DT_VENDEDOR_COB",
+    "IX_BRZ_VV_MARCA_MODELO": "marca/modelo só são agrupados, nunca filtrados",
+    "IX_BRZ_VV_CHASSI": "nenhuma consulta busca venda por chassi",
+    "IX_AGG_DIARIO_DT_LINHA": "prefixo de IX_AGG_DIARIO_COB",
+}
+
+
+def all_indexes() -> Tuple[IndexSpec, ...]:
+    return INDEX_PLAN + KEPT_INDEXES
+
+
+def indexes_for(method: str) -> List[IndexSpec]:
+    """Índices que o plano espera para o método (Classe.método)."""
+    return [spec for spec in all_indexes() if method in spec.used_by]
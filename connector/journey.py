@@ -0,0 +1,224 @@
+"""
+CustomerJourney - Jornada pós-venda por venda de veículo (AGG_JORNADA_CLIENTE)
+- Grão: uma linha por ID_VENDA_VEICULO, com a venda (filial, cliente, modelo, receita/lucro)
+- Medidas: receita e lucro de serviços (SRV) e peças (PEC) do mesmo cliente
+  (CLIENTE_HASH) na mesma concessionária em DT_VENDA .. DT_VENDA + n, para cada
+  janela padrão de JOURNEY_WINDOWS (colunas RECEITA_SRV_30, LUCRO_PEC_180, ...)
+- Controllers: refresh(tabela, registros) depois do bulk_insert recalcula só as
+  vendas tocadas pela carga (DELETE + INSERT num bloco PL/SQL, como o agregado diário):
+    - veículos: vendas dos dias do lote
+    - serviços/peças: vendas dos clientes do lote nos JOURNEY_DAYS dias anteriores
+  ([JORNADA] enabled em config/database.ini, from_config)
+- Carga inicial / reconstrução: rebuild() (mains/main_journey_rebuild.py)
+- Dashboard: rentabilidade integrada lê a tabela quando a janela é padrão
+  ([JORNADA] em streamlit_app/config/config.ini); outra janela usa a consulta ao vivo
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from connector.rollups import affected_dates
+from utils.ini_config import enabled_section
+
+JOURNEY_TABLE = "AGG_JORNADA_CLIENTE"
+JOURNEY_WINDOWS = (30, 60, 90, 180)
+JOURNEY_DAYS = max(JOURNEY_WINDOWS)
+
+SALES_TABLE = "BRZ_HIST_VENDAS_VEICULOS"
+
+# Linha pós-venda -> (tabela, coluna de data, receita, lucro)
+FOLLOW_UP_SOURCES: Dict[str, Tuple[str, str, str, str]] = {
+    "SRV": ("BRZ_HIST_SERVICOS", "DT_REALIZACAO_SERVICO", "VALOR_TOTAL_SERVICO", "LUCRO_SERVICO"),
+    "PEC": ("BRZ_HIST_VENDAS_PECAS", "DT_VENDA", "VALOR_VENDA", "LUCRO_VENDA"),
+}
+TABLE_LINES = {table: linha for linha, (table, *_) in FOLLOW_UP_SOURCES.items()}
+JOURNEY_SOURCES = (SALES_TABLE, *TABLE_LINES)
+
+SALE_COLUMNS = (
+    "ID_VENDA_VEICULO", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "DT_VENDA",
+    "NOME_COMPRADOR", "CLIENTE_HASH", "MARCA_VEICULO", "MODELO_VEICULO",
+    "RECEITA_VEICULO", "LUCRO_VEICULO",
+)
+WINDOW_COLUMNS = tuple(
+    f"{medida}_{linha}_{n}"
+    for linha in FOLLOW_UP_SOURCES for n in JOURNEY_WINDOWS for medida in ("RECEITA", "LUCRO")
+)
+JOURNEY_COLUMNS = SALE_COLUMNS + WINDOW_COLUMNS
+
+
+def window_columns(janela: int) -> Dict[str, str]:
+    """Colunas da tabela para uma janela padrão -> nomes usados pelo dashboard."""
+    return {
+        f"RECEITA_SRV_{janela}": "RECEITA_SERVICOS",
+        f"LUCRO_SRV_{janela}": "LUCRO_SERVICOS",
+        f"RECEITA_PEC_{janela}": "RECEITA_PECAS",
+        f"LUCRO_PEC_{janela}": "LUCRO_PECAS",
+    }
+
+
+def _follow_up_cte(linha: str) -> str:
+    table, dt, receita, lucro = FOLLOW_UP_SOURCES[linha]
+    sums = ",\n".join(
+        f"                SUM(CASE WHEN x.{dt} <= v.DT_VENDA + {n} THEN NVL(x.{col},0) END) AS {medida}_{linha}_{n}"
+        for n in JOURNEY_WINDOWS for medida, col in (("RECEITA", receita), ("LUCRO", lucro))
+    )
+    # Uma junção na maior janela; as menores são somas condicionais da mesma leitura
+    return f"""
+        {linha.lower()} AS (
+            SELECT
+                v.ID_VENDA_VEICULO,
+{sums}
+            FROM venda v
+            JOIN {table} x
+              ON x.CLIENTE_HASH = v.CLIENTE_HASH
+             AND x.COD_CONCESSIONARIA = v.COD_CONCESSIONARIA
+             AND x.{dt} BETWEEN v.DT_VENDA AND (v.DT_VENDA + {JOURNEY_DAYS})
+            GROUP BY v.ID_VENDA_VEICULO
+        )"""
+
+
+def select_sql(where: str = "1 = 1") -> str:
+    """SELECT da jornada (colunas de JOURNEY_COLUMNS) das vendas que atendem a where (alias v)."""
+    windows = ",\n".join(
+        f"            NVL({linha.lower()}.{medida}_{linha}_{n},0) AS {medida}_{linha}_{n}"
+        for linha in FOLLOW_UP_SOURCES for n in JOURNEY_WINDOWS for medida in ("RECEITA", "LUCRO")
+    )
+    return f"""
+        WITH venda AS (
+            SELECT
+                v.ID_VENDA_VEICULO,
+                v.COD_CONCESSIONARIA,
+                v.COD_FILIAL,
+                v.NOME_FILIAL,
+                v.DT_VENDA,
+                v.NOME_COMPRADOR,
+                v.CLIENTE_HASH,
+                v.MARCA_VEICULO,
+                v.MODELO_VEICULO,
+                SUM(NVL(v.VALOR_VENDA,0)) AS RECEITA_VEICULO,
+                SUM(NVL(v.LUCRO_VENDA,0)) AS LUCRO_VEICULO
+            FROM {SALES_TABLE} v
+            WHERE {where}
+            GROUP BY
+                v.ID_VENDA_VEICULO, v.COD_CONCESSIONARIA, v.COD_FILIAL, v.NOME_FILIAL,
+                v.DT_VENDA, v.NOME_COMPRADOR, v.CLIENTE_HASH, v.MARCA_VEICULO, v.MODELO_VEICULO
+        ),{",".join(_follow_up_cte(linha) for linha in FOLLOW_UP_SOURCES)}
+        SELECT
+            {", ".join(f"v.{c}" for c in SALE_COLUMNS)},
+{windows}
+        FROM venda v
+        LEFT JOIN srv ON srv.ID_VENDA_VEICULO = v.ID_VENDA_VEICULO
+        LEFT JOIN pec ON pec.ID_VENDA_VEICULO = v.ID_VENDA_VEICULO
+    """
+
+
+def _refresh_block(delete_where: str, where: str, count_rows: bool = False) -> str:
+    rows = "\n        :rows := SQL%ROWCOUNT;" if count_rows else ""
+    return f"""
+    BEGIN
+        DELETE FROM {JOURNEY_TABLE} WHERE {delete_where};
+        INSERT INTO {JOURNEY_TABLE} ({', '.join(JOURNEY_COLUMNS)}, ATUALIZADO_EM)
+        SELECT x.*, SYSTIMESTAMP FROM ({select_sql(where)}) x;{rows}
+    END;
+    """
+
+
+# Vendas de um dia (carga de veículos)
+REFRESH_DAY_BLOCK = _refresh_block(
+    "DT_VENDA >= :dt AND DT_VENDA < :dt + 1",
+    "v.DT_VENDA >= :dt AND v.DT_VENDA < :dt + 1",
+)
+
+# Vendas de um cliente cuja janela alcança [:dt_min, :dt_max] (carga de serviços/peças)
+REFRESH_CUSTOMER_BLOCK = _refresh_block(
+    f"CLIENTE_HASH = :hash AND DT_VENDA >= :dt_min - {JOURNEY_DAYS} AND DT_VENDA < :dt_max + 1",
+    f"v.CLIENTE_HASH = :hash AND v.DT_VENDA >= :dt_min - {JOURNEY_DAYS} AND v.DT_VENDA < :dt_max + 1",
+)
+
+
+def affected_customers(records: Iterable[Dict[str, Any]], date_column: str) -> List[Dict[str, Any]]:
+    """Clientes (CLIENTE_HASH) de um lote com o intervalo de datas tocado de cada um."""
+    spans: Dict[int, List[date]] = defaultdict(list)
+    for r in records:
+        if r.get("CLIENTE_HASH") is not None and r.get(date_column) is not None:
+            spans[r["CLIENTE_HASH"]].append(r[date_column])
+    return [{"hash": h, "dt_min": min(d), "dt_max": max(d)} for h, d in sorted(spans.items())]
+
+
+class CustomerJourney:
+    def __init__(self, connector: Any, batch_size: int = 200):
+        """
+        Args:
+            connector: OracleConnector de escrita
+            batch_size: Dias/clientes por executemany (uma ida ao banco por lote)
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, connector: Any, config_file: str = "config/database.ini") -> Optional["CustomerJourney"]:
+        """Instância se [JORNADA] enabled = true no .ini; None caso contrário."""
+        section = enabled_section(config_file, "JORNADA")
+        return cls(connector, section.getint("batch_size", fallback=200)) if section is not None else None
+
+    def refresh(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        """Recalcula as vendas tocadas pelo lote; retorna dias/clientes recalculados."""
+        table_name = table_name.upper()
+        if table_name == SALES_TABLE:
+            block = REFRESH_DAY_BLOCK
+            binds = [{"dt": d} for d in affected_dates(records, "DT_VENDA")]
+        elif table_name in TABLE_LINES:
+            _, date_column, _, _ = FOLLOW_UP_SOURCES[TABLE_LINES[table_name]]
+            block = REFRESH_CUSTOMER_BLOCK
+            binds = affected_customers(records, date_column)
+        else:
+            return 0
+        if not binds:
+            return 0
+
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for i in range(0, len(binds), self.batch_size):
+                    cursor.executemany(block, binds[i:i + self.batch_size])
+            finally:
+                cursor.close()
+
+        self.connector.bump_data_version(JOURNEY_TABLE, len(binds))
+        return len(binds)
+
+    def refresh_period(self, table_name: str, dt_ini: date, dt_fim: date) -> int:
+        """
+        Recalcula as vendas afetadas por um período recarregado da tabela (troca
+        de partição): as vendas do período, ou as até JOURNEY_DAYS dias antes dele
+        quando o período é de serviços/peças.
+        """
+        table_name = table_name.upper()
+        if table_name in TABLE_LINES:
+            return self.rebuild(dt_ini - timedelta(days=JOURNEY_DAYS), dt_fim)
+        if table_name == SALES_TABLE:
+            return self.rebuild(dt_ini, dt_fim)
+        return 0
+
+    def rebuild(self, dt_ini: Optional[date] = None, dt_fim: Optional[date] = None) -> int:
+        """Reconstrói a jornada das vendas do período informado (ou de todas); retorna linhas gravadas."""
+        params: Dict[str, Any] = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+        block = _refresh_block(
+            "(:dt_ini IS NULL OR DT_VENDA >= :dt_ini) AND (:dt_fim IS NULL OR DT_VENDA < :dt_fim + 1)",
+            "(:dt_ini IS NULL OR v.DT_VENDA >= :dt_ini) AND (:dt_fim IS NULL OR v.DT_VENDA < :dt_fim + 1)",
+            count_rows=True,
+        )
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                rows = cursor.var(int)
+                cursor.execute(block, {**params, "rows": rows})
+                out = int(rows.getvalue() or 0)
+            finally:
+                cursor.close()
+
+        self.connector.bump_data_version(JOURNEY_TABLE, out)
+        return out
@@ -0,0 +1,257 @@
+"""
+MigrationRunner - Versões do schema Oracle (sql/migrations/V<versão>__<descrição>.sql)
+- Cada arquivo é uma versão; aplicadas em ordem e registradas em CTL_SCHEMA_VERSION
+  (sql/CONTROLE - CREATE TABLE CTL_SCHEMA_VERSION.sql, criada pelo próprio runner)
+- Formato dos arquivos (o mesmo dos scripts de sql/):
+    comando terminado em ";" no fim da linha
+    bloco PL/SQL (DECLARE/BEGIN/CREATE PROCEDURE...) terminado por "/" sozinho na linha
+    "@@<arquivo>" inclui outro script, caminho relativo ao arquivo da migração
+- Idempotente: erros de "já existe" / "já removido" são ignorados (IGNORED_ERRORS),
+  então o baseline roda sem erro em bancos criados à mão e uma versão que falhou no
+  meio pode ser reaplicada inteira depois de corrigida
+- CHECKSUM (SHA-256 dos comandos, com includes expandidos): versão aplicada cujo arquivo
+  mudou depois aparece como "alterada" no status e não é reaplicada
+- Uso: mains/main_migrate.py
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Importação da estrutura das pastas
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.logger_controller import LoggerController
+
+NOME = "MigrationRunner"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "MigrationRunner.txt")
+logger = LoggerController(logfile)
+
+SQL_DIR = Path(__file__).resolve().parents[1] / "sql"
+MIGRATIONS_DIR = SQL_DIR / "migrations"
+CONTROL_TABLE = "CTL_SCHEMA_VERSION"
+CONTROL_DDL = SQL_DIR / "CONTROLE - CREATE TABLE CTL_SCHEMA_VERSION.sql"
+
+FILE_PATTERN = re.compile(r"^V(\d+)__(.+)\.sql$", re.IGNORECASE)
+PLSQL_START = re.compile(
+    r"^\s*(DECLARE|BEGIN|CREATE\s+(OR\s+REPLACE\s+)?(PROCEDURE|FUNCTION|PACKAGE|TRIGGER|TYPE))\b",
+    re.IGNORECASE,
+)
+
+# ORA-xxxxx que significam "já aplicado"
+IGNORED_ERRORS: Dict[int, str] = {
+    955: "objeto já existe",
+    1408: "colunas já indexadas",
+    1430: "coluna já existe",
+    2260: "tabela já tem chave primária",
+    2261: "chave única já existe",
+    2275: "restrição já existe",
+}
+# ... e em DROP, "já removido"
+IGNORED_ON_DROP: Dict[int, str] = {
+    942: "tabela não existe",
+    1418: "índice não existe",
+}
+
+APPLIED_SQL = f"""
+SELECT VERSION, DESCRICAO, CHECKSUM, APLICADO_EM, DURACAO_MS
+FROM {CONTROL_TABLE}
+ORDER BY VERSION
+"""
+
+RECORD_SQL = f"""
+INSERT INTO {CONTROL_TABLE} (VERSION, DESCRICAO, ARQUIVO, CHECKSUM, STATEMENTS, DURACAO_MS, APLICADO_EM)
+VALUES (:version, :descricao, :arquivo, :checksum, :statements, :duracao_ms, SYSTIMESTAMP)
+"""
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    path: Path
+    statements: Tuple[str, ...]
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256("\n;\n".join(self.statements).encode("utf-8")).hexdigest()
+
+
+def split_statements(path: Path, _seen: Tuple[Path, ...] = ()) -> List[str]:
+    """Comandos do script na ordem (com os @@ expandidos; sem ";" / "/" finais)."""
+    path = path.resolve()
+    if path in _seen:
+        raise ValueError(f"❌ Include circular: {path}")
+
+    statements: List[str] = []
+    buffer: List[str] = []
+    plsql = False
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = raw.rstrip()
+        stripped = line.strip()
+        if not buffer:
+            if not stripped or stripped.startswith("--") or stripped == "/":
+                continue
+            if stripped.startswith("@@"):
+                statements.extend(split_statements(path.parent / stripped[2:].strip(), _seen + (path,)))
+                continue
+            plsql = bool(PLSQL_START.match(line))
+
+        if plsql:
+            if stripped == "/":
+                statements.append("\n".join(buffer).strip())
+                buffer = []
+            else:
+                buffer.append(line)
+        elif line.endswith(";") and not stripped.startswith("--"):
+            buffer.append(line[:-1])
+            statements.append("\n".join(buffer).strip())
+            buffer = []
+        else:
+            buffer.append(line)
+
+    if buffer and "\n".join(buffer).strip():
+        statements.append("\n".join(buffer).strip())
+    return statements
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    """Migrações do diretório, em ordem de versão (versão repetida é erro)."""
+    out: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        m = FILE_PATTERN.match(path.name)
+        if not m:
+            continue
+        version = int(m.group(1))
+        if version in out:
+            raise ValueError(f"❌ Versão {version} repetida: {out[version].path.name} e {path.name}")
+        out[version] = Migration(version, m.group(2).replace("_", " "), path, tuple(split_statements(path)))
+    return [out[v] for v in sorted(out)]
+
+
+def ora_code(error: Exception) -> Optional[int]:
+    """Número ORA-xxxxx de um erro do oracledb (None se não for erro do banco)."""
+    detail = error.args[0] if error.args else None
+    return getattr(detail, "code", None)
+
+
+def is_ignorable(statement: str, error: Exception) -> Optional[str]:
+    """Motivo para ignorar o erro do comando (None = erro de verdade)."""
+    code = ora_code(error)
+    if code in IGNORED_ERRORS:
+        return IGNORED_ERRORS[code]
+    if code in IGNORED_ON_DROP and statement.lstrip().upper().startswith("DROP"):
+        return IGNORED_ON_DROP[code]
+    return None
+
+
+class MigrationRunner:
+    def __init__(self, connector: Any, directory: Path = MIGRATIONS_DIR):
+        """
+        Args:
+            connector: OracleConnector de escrita (DDL)
+            directory: Pasta com os arquivos V<versão>__<descrição>.sql
+        """
+        self.connector = connector
+        self.directory = Path(directory)
+
+    # -------------------------
+    # Estado
+    # -------------------------
+    def applied(self) -> Dict[int, Dict[str, Any]]:
+        """Versões registradas em CTL_SCHEMA_VERSION (cria a tabela na 1ª vez)."""
+        self.ensure_control_table()
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(APPLIED_SQL)
+                columns = [d[0] for d in cursor.description]
+                return {int(r[0]): dict(zip(columns, r)) for r in cursor.fetchall()}
+            finally:
+                cursor.close()
+
+    def status(self) -> List[Tuple[Migration, str, Optional[Dict[str, Any]]]]:
+        """(migração, aplicada|pendente|alterada, registro) de cada arquivo."""
+        applied = self.applied()
+        out = []
+        for migration in discover(self.directory):
+            row = applied.get(migration.version)
+            if row is None:
+                state = "pendente"
+            elif row["CHECKSUM"] != migration.checksum:
+                state = "alterada"
+            else:
+                state = "aplicada"
+            out.append((migration, state, row))
+        return out
+
+    def pending(self) -> List[Migration]:
+        return [m for m, state, _ in self.status() if state == "pendente"]
+
+    def ensure_control_table(self) -> None:
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for statement in split_statements(CONTROL_DDL):
+                    self._execute(cursor, statement)
+            finally:
+                cursor.close()
+
+    # -------------------------
+    # Aplicação
+    # -------------------------
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        """
+        Aplica as versões pendentes (até target, se informado) em ordem.
+        Para na primeira que falhar: ela não é registrada e é reaplicada inteira na
+        próxima execução.
+        """
+        done: List[Migration] = []
+        for migration in self.pending():
+            if target is not None and migration.version > target:
+                break
+            self.apply(migration)
+            done.append(migration)
+        return done
+
+    def apply(self, migration: Migration) -> None:
+        t0 = time.perf_counter()
+        logger.info("🚀 V%03d %s (%s comandos)", migration.version, migration.description, len(migration.statements))
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for statement in migration.statements:
+                    self._execute(cursor, statement)
+                # DDL faz commit implícito; o registro só entra depois de todos os comandos
+                cursor.execute(RECORD_SQL, {
+                    "version": migration.version,
+                    "descricao": migration.description[:200],
+                    "arquivo": migration.path.name,
+                    "checksum": migration.checksum,
+                    "statements": len(migration.statements),
+                    "duracao_ms": int((time.perf_counter() - t0) * 1000),
+                })
+            finally:
+                cursor.close()
+        logger.info("✅ V%03d aplicada em %.0f ms", migration.version, (time.perf_counter() - t0) * 1000)
+
+    @staticmethod
+    def _execute(cursor: Any, statement: str) -> None:
+        try:
+            cursor.execute(statement)
+        except Exception as e:
+            reason = is_ignorable(statement, e)
+            if reason is None:
+                logger.error("❌ Falha em: %s\n%s", statement.splitlines()[0], e)
+                raise
+            logger.info("⏭️ Ignorado (%s): %s", reason, statement.splitlines()[0])
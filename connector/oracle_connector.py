@@ -1,10 +1,10 @@
 """
 Classe OracleConnector - Conexão centralizada com Oracle DB
-Integrado com ETLAutosLogger singleton
+Integrado com LoggerController (fila em background, formatação preguiçosa)
 """
 
 import configparser
-import inspect
+import time
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 import oracledb
@@ -17,6 +17,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import do logger customizado
 from utils.logger_controller import LoggerController  # ou create_logger
+from connector.query_stats import QueryStats, estimate_round_trips, estimate_bytes
+from connector.data_version import DataVersionStore
+from utils.query_telemetry import telemetry, QueryRecord, sql_id
+from utils.tracing import tracer, traced
 
 # criação do logger (uma vez, no início do script/classe)
 logdirectory = r"logs"
@@ -26,20 +30,88 @@ logger = LoggerController(logfile)
 
 NOME = "OracleConnector"
 
+BASE_SECTION = "ORACLE_DB"
+
+# Alvo lógico -> seção do .ini (seções ausentes herdam de [ORACLE_DB])
+TARGET_SECTIONS = {
+    "default": BASE_SECTION,
+    "read": "ORACLE_DB_READ",
+    "write": "ORACLE_DB_WRITE",
+}
+
+# Colunas de uma tabela do schema corrente (nome sem owner, como nos INSERTs)
+COLUMNS_SQL = """
+    SELECT COLUMN_NAME FROM ALL_TAB_COLUMNS
+    WHERE OWNER = SYS_CONTEXT('USERENV', 'CURRENT_SCHEMA') AND TABLE_NAME = :table_name
+"""
+
+
+class _Endpoint:
+    """Um DSN nomeado (seção do .ini), com pool opcional e estado de saúde."""
+
+    def __init__(self, name: str, section: Dict[str, str]):
+        self.name = name
+        self.section = section
+        self.pool = None
+        self.down_until = 0.0
+
+    @property
+    def dsn(self) -> str:
+        return f"{self.section['host']}:{self.section['port']}/{self.section['service_name']}"
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, cooldown_s: float) -> None:
+        self.down_until = time.monotonic() + cooldown_s
+
+    def mark_up(self) -> None:
+        self.down_until = 0.0
+
+
 class OracleConnector:
-    def __init__(self, config_file: str = "config/database.ini"):
+    def __init__(self, config_file: str = "config/database.ini", target: str = "default"):
         """
         Inicializa conexão com Oracle usando arquivo .ini
+
+        Args:
+            config_file: Arquivo .ini com a seção [ORACLE_DB]
+            target: "read" (dashboard/agente), "write" (ETL) ou "default".
+                    Leituras caem para o primário quando o DSN de leitura está fora.
         """
+        if target not in TARGET_SECTIONS:
+            raise ValueError(f"❌ Target inválido: {target} (use {', '.join(TARGET_SECTIONS)})")
+
         self.config_file = Path(config_file)
         self.config = configparser.ConfigParser()
+        self.target = target
         self._load_config()
-        self.pool = None
+
+        # Statement cache por sessão (driver): SELECTs repetidos não são reanalisados
+        section = self.config[BASE_SECTION]
+        self.stmtcachesize = section.getint('stmtcachesize', fallback=20)
+
+        # Tamanho dos lotes de fetch (define os round trips de um SELECT)
+        self.arraysize = section.getint('arraysize', fallback=oracledb.defaults.arraysize)
+        self.prefetchrows = section.getint('prefetchrows', fallback=oracledb.defaults.prefetchrows)
+
+        # Roteamento: endpoint do alvo + primário como fallback das leituras
+        self.health_cooldown_s = section.getfloat('health_cooldown_s', fallback=30.0)
+        name = self._section_name(target)
+        self.endpoint = _Endpoint(name, self._section(name))
+        self.fallback = None
+        if target == "read":
+            primary = self._section_name("write")
+            primary_section = self._section(primary)
+            if primary_section != self.endpoint.section:
+                self.fallback = _Endpoint(primary, primary_section)
+
+        # Tabela -> colunas (só mudam com migração: lidas uma vez por processo)
+        self._columns: Dict[str, frozenset] = {}
       
         #logger.info(f"🔌 OracleConnector inicializado - Config: {self.config_file}")
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:     ", "🔌 OracleConnector inicializado - Config: {self.config_file}")
+        logger.info("🔌 OracleConnector inicializado - Config: %s", self.config_file)
     
     def _load_config(self) -> None:
         """Carrega configurações do arquivo .ini"""
@@ -47,96 +119,131 @@ class OracleConnector:
             raise FileNotFoundError(f"❌ Arquivo de config não encontrado: {self.config_file}")
         
         self.config.read(self.config_file)
-        if not self.config.has_section('ORACLE_DB'):
+        if not self.config.has_section(BASE_SECTION):
             raise ValueError("❌ Seção [ORACLE_DB] não encontrada no arquivo .ini")
         
-        section = self.config['ORACLE_DB']
-
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", "📋 Configuração carregada:")
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"Host: {section.get('host', 'N/A')}")
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"Port: {section.get('port', 'N/A')}")
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"Service: {section.get('service_name', 'N/A')}")
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"User: {section.get('username', 'N/A')}")
-    
+        section = self._section(self._section_name(self.target))
+
+        logger.info("📋 Configuração carregada (target=%s -> [%s]):", self.target, self._section_name(self.target))
+        logger.info("Host: %s", section.get('host', 'N/A'))
+        logger.info("Port: %s", section.get('port', 'N/A'))
+        logger.info("Service: %s", section.get('service_name', 'N/A'))
+        logger.info("User: %s", section.get('username', 'N/A'))
+
+    def _section_name(self, target: str) -> str:
+        """Seção efetiva do alvo: a nomeada se existir no .ini, senão [ORACLE_DB]."""
+        name = TARGET_SECTIONS[target]
+        return name if self.config.has_section(name) else BASE_SECTION
+
+    def _section(self, name: str) -> Dict[str, str]:
+        """Seção nomeada com herança de [ORACLE_DB] (seção inexistente = a própria base)."""
+        merged = dict(self.config[BASE_SECTION])
+        if name != BASE_SECTION and self.config.has_section(name):
+            merged.update(self.config[name])
+        return merged
+
+    @property
+    def pool(self):
+        """Pool do endpoint do alvo (compatível com o uso anterior de self.pool)."""
+        return self.endpoint.pool
+
     @property
     def dsn(self) -> str:
         """DSN string para conexão Oracle"""
-        section = self.config['ORACLE_DB']
-        dsn = f"{section['host']}:{section['port']}/{section['service_name']}"
+        dsn = self.endpoint.dsn
         #logger.debug(f"🔗 DSN gerado: {dsn}")
 
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"🔗 DSN gerado: {dsn}")
+        logger.debug("🔗 DSN gerado: %s", dsn)
 
         return dsn
+
+    def _route(self) -> list:
+        """Ordem de tentativa: alvo saudável primeiro; leitura fora -> primário primeiro."""
+        if self.fallback is None:
+            return [self.endpoint]
+        if self.endpoint.healthy:
+            return [self.endpoint, self.fallback]
+        return [self.fallback, self.endpoint]
+
+    def _open(self, endpoint: _Endpoint) -> 'oracledb.Connection': # type: ignore
+        if endpoint.pool:
+            logger.debug("Usando pool de conexões (%s)", endpoint.name)
+            return endpoint.pool.acquire()
+
+        logger.info("Conectando: %s@%s", endpoint.section['username'], endpoint.dsn)
+        conn = oracledb.connect(
+            user=endpoint.section['username'],
+            password=endpoint.section['password'],
+            dsn=endpoint.dsn,
+            stmtcachesize=self.stmtcachesize
+        )
+        conn.autocommit = True
+        return conn
+
+    def _acquire(self) -> Tuple['oracledb.Connection', _Endpoint]: # type: ignore
+        """Abre conexão seguindo a rota; falha de conexão no DSN de leitura o marca como fora."""
+        route = self._route()
+        for i, endpoint in enumerate(route):
+            try:
+                conn = self._open(endpoint)
+            except oracledb.Error as e:
+                if i == len(route) - 1:
+                    raise
+                if endpoint is self.endpoint:
+                    endpoint.mark_down(self.health_cooldown_s)
+                    logger.warning("⚠️ [%s] indisponível (%s); leituras vão para [%s] por %.0fs",
+                                   endpoint.name, e, route[i + 1].name, self.health_cooldown_s)
+                else:
+                    logger.warning("⚠️ [%s] indisponível (%s); tentando [%s]", endpoint.name, e, route[i + 1].name)
+                continue
+
+            if endpoint is self.endpoint and not endpoint.healthy:
+                endpoint.mark_up()
+                logger.info("✅ [%s] voltou a responder", endpoint.name)
+            return conn, endpoint
+        raise RuntimeError("Nenhum endpoint configurado")
     
     @contextmanager
     def get_connection(self) -> 'oracledb.Connection': # type: ignore
         """
         Context manager para conexão segura (auto-commit, auto-close)
         """
-        section = self.config['ORACLE_DB']
+        with self._connection() as (conn, _endpoint):
+            yield conn
+
+    @contextmanager
+    def _connection(self):
+        """Como get_connection, mas devolve também o endpoint que atendeu (conn, endpoint)."""
         conn = None
+        endpoint = None
         
         try:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", "🔄 Estabelecendo conexão Oracle...")
+            logger.debug("🔄 Estabelecendo conexão Oracle...")
             
-            if self.pool:
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "DEBUG: ", "Usando pool de conexões")
-                conn = self.pool.acquire()
-            else:
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", f"Conectando: {section['username']}@{self.dsn}")
-
-                conn = oracledb.connect(
-                    user=section['username'],
-                    password=section['password'],
-                    dsn=self.dsn
-                )
-                conn.autocommit = True
+            conn, endpoint = self._acquire()
 
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", "✅ Conexão Oracle estabelecida com sucesso")
-            yield conn
+            logger.debug("✅ Conexão Oracle estabelecida com sucesso (%s)", endpoint.name)
+            yield conn, endpoint
             
         except oracledb.Error as e:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "ERRO!!!", f"❌ Erro na conexão Oracle: {e}")
+            logger.error("❌ Erro na conexão Oracle: %s", e)
             
             raise
         finally:
             if conn:
                 try:
-                    if self.pool:
-                        self.pool.release(conn)
-                        context = inspect.currentframe()
-                        linenumber = context.f_lineno
-                        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "DEBUG:  ", "Conexão devolvida ao pool")
+                    if endpoint.pool:
+                        endpoint.pool.release(conn)
+                        logger.debug("Conexão devolvida ao pool")
                     else:
                         conn.close()
-                        context = inspect.currentframe()
-                        linenumber = context.f_lineno
-                        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", "Conexão fechada\n\n")
+                        logger.debug("Conexão fechada")
                 except Exception as close_err:
-                    context = inspect.currentframe()
-                    linenumber = context.f_lineno
-                    logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "AVISO: ", f"⚠️ Erro ao fechar conexão: {close_err}")
+                    logger.warning("⚠️ Erro ao fechar conexão: %s", close_err)
     
     def test_connection(self) -> bool:
         """Teste completo de conexão com query básica"""
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", "🧪 Iniciando teste de conexão...")
+        logger.info("🧪 Iniciando teste de conexão...")
         try:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
@@ -146,23 +253,15 @@ class OracleConnector:
                 
                 user, sysdate = result
 
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", f"✅ Teste SUCEDIDO!")
+                logger.info("✅ Teste SUCEDIDO!")
 
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"Usuário: {user}")
+                logger.info("Usuário: %s", user)
 
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"Data/Hora: {sysdate}")
+                logger.info("Data/Hora: %s", sysdate)
                 return True
                 
         except Exception as e:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "ERRO!!!", f"❌ Erro na conexão Oracle: {e}")
+            logger.error("❌ Erro na conexão Oracle: %s", e)
             return False
     
     def execute_query(self, query: str, params: Optional[Tuple] = None, 
@@ -171,49 +270,86 @@ class OracleConnector:
         Executa SELECT e retorna resultados como lista de dicionários
         """
 
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"📊 Executando query: {query[:100]}...")
+        logger.info("📊 Executando query: %s...", query[:100])
 
         if params:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber,"INFO:    ", f"Parâmetros: {params}")
+            logger.info("Parâmetros: %s", params)
         
+        if fetchall:
+            t0 = time.perf_counter()
+            results, stats = self.run_select(query, params)
+            telemetry.record(QueryRecord(
+                caller="OracleConnector.execute_query",
+                sql_id=sql_id(query),
+                sql_preview=" ".join(query.split())[:200],
+                wall_ms=(time.perf_counter() - t0) * 1000,
+                execute_ms=stats.execute_ms,
+                fetch_ms=stats.fetch_ms,
+                rows=stats.rows,
+                round_trips=stats.round_trips,
+                bytes=stats.bytes,
+                endpoint=stats.endpoint,
+            ))
+
+            logger.info("✅ Query OK: %s registros retornados", len(results))
+            return results
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
                 cursor.execute(query, params)
-                
-                if fetchall:
-                    columns = [desc[0] for desc in cursor.description]
-                    results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-                    context = inspect.currentframe()
-                    linenumber = context.f_lineno
-                    logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", f"✅ Query OK: {len(results)} registros retornados")
-                    return results
-                else:
-                    context = inspect.currentframe()
-                    linenumber = context.f_lineno
-                    logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", "✅ Query OK (sem fetch)")
-                    return []
-                    
+
+                logger.info("✅ Query OK (sem fetch)")
+                return []
+
             finally:
                 cursor.close()
     
+    def run_select(self, query: str, params: Optional[Any] = None) -> Tuple[list[Dict[str, Any]], QueryStats]:
+        """
+        Executa SELECT e retorna (linhas como dicionários, QueryStats com execute/fetch).
+
+        Um cursor por consulta, fechado no fim: o reuso do statement preparado é
+        do statement cache da sessão (stmtcachesize), que sobrevive à volta da
+        conexão para o pool.
+        """
+        stats = QueryStats()
+
+        with self._connection() as (conn, endpoint):
+            stats.endpoint = endpoint.name
+            t0 = time.perf_counter()
+            cursor = conn.cursor()
+            try:
+                cursor.prepare(query)
+                cursor.arraysize = self.arraysize
+                cursor.prefetchrows = self.prefetchrows
+                cursor.execute(None, params or {})
+                t2 = time.perf_counter()
+                stats.execute_ms = (t2 - t0) * 1000
+
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                rows = cursor.fetchall() if columns else []
+                results = [dict(zip(columns, row)) for row in rows]
+                stats.fetch_ms = (time.perf_counter() - t2) * 1000
+                stats.rows = len(results)
+                stats.round_trips = estimate_round_trips(stats.rows, self.prefetchrows, self.arraysize)
+                stats.bytes = estimate_bytes(rows)
+            finally:
+                cursor.close()
+
+        logger.debug("⏱️ run_select: execute=%.1fms fetch=%.1fms rows=%s round_trips~%s bytes~%s",
+                     stats.execute_ms, stats.fetch_ms, stats.rows,
+                     stats.round_trips, stats.bytes)
+        return results, stats
+
     def execute_dml(self, dml: str, params: Optional[Tuple] = None) -> int:
         """
         Executa INSERT/UPDATE/DELETE e retorna linhas afetadas
         """
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"⚡ Executando DML: {dml[:100]}...")
+        logger.info("⚡ Executando DML: %s...", dml[:100])
 
         if params:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "DEBUG: ", f"Parâmetros DML: {params}")
+            logger.debug("Parâmetros DML: %s", params)
         
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -221,27 +357,31 @@ class OracleConnector:
                 cursor.execute(dml, params)
                 rows_affected = cursor.rowcount
 
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"✅ DML executada: {rows_affected} linhas afetadas")
+                logger.info("✅ DML executada: %s linhas afetadas", rows_affected)
 
                 return rows_affected
             finally:
                 cursor.close()
     
+    def table_columns(self, table_name: str) -> frozenset:
+        """Colunas da tabela no schema corrente (vazio se a tabela não existe)."""
+        table_name = table_name.upper()
+        if table_name not in self._columns:
+            rows, _ = self.run_select(COLUMNS_SQL, {"table_name": table_name})
+            self._columns[table_name] = frozenset(r["COLUMN_NAME"] for r in rows)
+        return self._columns[table_name]
+
+    @traced("oracle.bulk_insert")
     def bulk_insert(self, table_name: str, data: list[Dict[str, Any]]) -> int:
         """
         Bulk insert otimizado (batch de 1000 registros)
         """
         if not data:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "AVISO: ", "⚠️ Nenhum dado para bulk insert")
+            logger.warning("⚠️ Nenhum dado para bulk insert")
             return 0
         
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"📦 Bulk insert em {table_name}: {len(data)} registros")
+        logger.info("📦 Bulk insert em %s: %s registros", table_name, len(data))
+        tracer.current().set(table=table_name, rows=len(data))
 
         #logger.progress_bar(0, len(data), f"Bulk {table_name}")
         
@@ -259,50 +399,70 @@ class OracleConnector:
                 batch_size = 1000
                 for i in range(0, len(params), batch_size):
                     batch = params[i:i+batch_size]
-                    cursor.executemany(query, batch)
+                    with tracer.span("oracle.executemany", batch=i // batch_size, rows=len(batch)):
+                        cursor.executemany(query, batch)
                     batch_inserted = cursor.rowcount
                     total_inserted += batch_inserted
                     #logger.progress_bar(i + len(batch), len(params), f"Bulk {table_name}")
                 
-                context = inspect.currentframe()
-                linenumber = context.f_lineno
-                logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ", f"✅ Bulk insert concluído: {total_inserted} linhas inseridas")
+                logger.info("✅ Bulk insert concluído: %s linhas inseridas", total_inserted)
                 return total_inserted
                 
             finally:
                 cursor.close()
     
-    def init_connection_pool(self, min_size: int = 2, max_size: int = 10) -> None:
-        """Pool de conexões para produção"""
-        section = self.config['ORACLE_DB']
+    def bump_data_version(self, table_name: str, rows_loaded: int) -> bool:
+        """
+        Registra uma carga concluída em CTL_DATA_VERSION (invalida o cache do dashboard
+        para as queries que leem a tabela). Falha aqui não desfaz a carga: só loga.
+        """
         try:
-            self.pool = oracledb.create_pool(
-                user=section['username'],
-                password=section['password'],
-                dsn=self.dsn,
-                min=min_size,
-                max=max_size,
-                increment=1
-            )
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", f"🏊‍♂️ Pool inicializado: min={min_size}, max={max_size}")
-        except oracledb.Error as e:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "ERRO!!!", f"❌ Erro pool: {e}")
-            raise
+            DataVersionStore(self).bump(table_name, rows_loaded)
+            logger.info("🔖 Versão dos dados atualizada: %s (+%s linhas)", table_name, rows_loaded)
+            return True
+        except Exception as e:
+            logger.error("❌ Falha ao atualizar versão dos dados de %s: %s", table_name, e)
+            return False
+
+    def init_connection_pool(self, min_size: int = 2, max_size: int = 10) -> None:
+        """
+        Pool de conexões para produção (um por endpoint).
+        O pool do fallback é criado com o mínimo de 1 sessão; se o DSN de leitura
+        estiver fora na subida, ele já nasce marcado como indisponível.
+        """
+        endpoints = [(self.endpoint, min_size)]
+        if self.fallback is not None:
+            endpoints.append((self.fallback, 1))
+
+        for endpoint, min_sessions in endpoints:
+            section = endpoint.section
+            try:
+                endpoint.pool = oracledb.create_pool(
+                    user=section['username'],
+                    password=section['password'],
+                    dsn=endpoint.dsn,
+                    min=min_sessions,
+                    max=max_size,
+                    increment=1,
+                    stmtcachesize=self.stmtcachesize
+                )
+                logger.info("🏊‍♂️ Pool inicializado [%s]: min=%s, max=%s", endpoint.name, min_sessions, max_size)
+            except oracledb.Error as e:
+                logger.error("❌ Erro pool [%s]: %s", endpoint.name, e)
+                if endpoint is self.endpoint and self.fallback is not None:
+                    endpoint.mark_down(self.health_cooldown_s)
+                    continue
+                raise
     
     def close_pool(self) -> None:
         """Fecha pool"""
-        if self.pool:
-            self.pool.close()
+        for endpoint in (self.endpoint, self.fallback):
+            if endpoint is not None and endpoint.pool:
+                endpoint.pool.close()
 
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ", "🏊‍♂️ Pool fechado")
+                logger.info("🏊‍♂️ Pool fechado [%s]", endpoint.name)
 
-            self.pool = None
+                endpoint.pool = None
 
 
 # Teste standalone
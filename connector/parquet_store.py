@@ -0,0 +1,240 @@
+"""
+Classe ParquetStore - Cópia local das tabelas BRZ em Parquet (particionado por mês)
+- Controllers gravam o mesmo lote inserido no Oracle (quando [PARQUET] enabled = true)
+- Layout: <root>/<TABELA>/ANO_MES=AAAA-MM/part-<instante>-<id>.parquet
+  (tabelas sem coluna de data, como os estoques, ficam direto em <root>/<TABELA>/)
+- Escrita atômica (arquivo temporário + os.replace): o DuckDB nunca lê arquivo pela metade
+- Mantém <root>/CTL_DATA_VERSION/ com a versão de cada tabela, como a
+  CTL_DATA_VERSION do Oracle (chave do cache do dashboard no backend DuckDB)
+- O agregado diário, a jornada pós-venda e a camada SILVER não são gravados: no DuckDB são
+  views sobre os fatos (DuckDBConnector), só a versão deles é incrementada junto
+  com a do fato
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # só quem grava Parquet precisa do pyarrow
+    pa = None
+    pq = None
+
+# Importação da estrutura das pastas
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.customer_metrics import METRICS_SOURCES, METRICS_TABLE
+from connector.data_version import CONTROL_TABLE
+from connector.journey import JOURNEY_SOURCES, JOURNEY_TABLE
+from connector.rollups import ROLLUP_SOURCES, ROLLUP_TABLE
+from connector.silver import derived_tables as silver_tables
+from utils.ini_config import enabled_section
+from utils.logger_controller import LoggerController
+
+NOME = "ParquetStore"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "ParquetStore.txt")
+logger = LoggerController(logfile)
+
+PARTITION_KEY = "ANO_MES"
+NO_DATE_PARTITION = "sem_data"
+
+
+class ParquetStore:
+    def __init__(self, root: str = "data/parquet", compression: str = "zstd"):
+        """
+        Args:
+            root: Diretório raiz (uma pasta por tabela)
+            compression: Codec do Parquet (zstd, snappy, none)
+        """
+        if pa is None:
+            raise ImportError("❌ pyarrow não instalado: necessário para gravar Parquet")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+
+        logger.info("🗂️ ParquetStore inicializado - root=%s", self.root)
+
+    @classmethod
+    def from_config(cls, config_file: str = "config/database.ini") -> Optional["ParquetStore"]:
+        """Instância a partir de [PARQUET] no .ini; None se desabilitado."""
+        section = enabled_section(config_file, "PARQUET")
+        if section is None:
+            return None
+        root = Path(section.get("root", "data/parquet"))
+        if not root.is_absolute():
+            root = Path(__file__).resolve().parents[1] / root
+        return cls(str(root), section.get("compression", "zstd"))
+
+    # -------------------------
+    # Escrita
+    # -------------------------
+    def write_table(self, table_name: str, records: List[Dict[str, Any]],
+                    partition_column: Optional[str] = None) -> int:
+        """
+        Grava os registros (mesmo formato do bulk_insert) e incrementa a versão da tabela.
+
+        Args:
+            table_name: Tabela BRZ (nome da pasta)
+            records: Lista de dicts com as colunas da tabela
+            partition_column: Coluna de data que define o mês da partição (None = sem partição)
+        """
+        if not records:
+            return 0
+
+        t0 = time.perf_counter()
+        table = pa.Table.from_pylist(records)
+        table_dir = self.root / table_name.upper()
+
+        if partition_column is None:
+            self._write_file(table, table_dir)
+            partitions = 1
+        else:
+            groups = self._months(table, partition_column)
+            for month, idx in groups.items():
+                self._write_file(table.take(idx), table_dir / f"{PARTITION_KEY}={month}")
+            partitions = len(groups)
+
+        self.bump_version(table_name, len(records))
+        self._bump_derived(table_name, len(records))
+        logger.info("✅ Parquet %s: %s linhas em %s partições (%.0f ms)",
+                    table_name, len(records), partitions, (time.perf_counter() - t0) * 1000)
+        return len(records)
+
+    def replace_months(self, table_name: str, records: List[Dict[str, Any]], partition_column: str) -> int:
+        """
+        Substitui as partições mensais presentes no lote pelos registros dele
+        (espelho da troca de partição no Oracle, connector/partition_exchange.py):
+        grava o arquivo novo do mês e só então remove os anteriores.
+        """
+        if not records:
+            return 0
+
+        t0 = time.perf_counter()
+        table = pa.Table.from_pylist(records)
+        table_dir = self.root / table_name.upper()
+        groups = self._months(table, partition_column)
+        for month, idx in groups.items():
+            directory = table_dir / f"{PARTITION_KEY}={month}"
+            old = list(directory.glob("*.parquet")) if directory.is_dir() else []
+            self._write_file(table.take(idx), directory)
+            for path in old:
+                path.unlink(missing_ok=True)
+
+        self.bump_version(table_name, len(records))
+        self._bump_derived(table_name, len(records))
+        logger.info("✅ Parquet %s: %s meses substituídos, %s linhas (%.0f ms)",
+                    table_name, len(groups), len(records), (time.perf_counter() - t0) * 1000)
+        return len(records)
+
+    def rewrite_table(self, table_name: str,
+                      transform: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]) -> int:
+        """
+        Reescreve cada arquivo da tabela com transform(registros) (ex.: colunas
+        novas no histórico já gravado). Cada arquivo é trocado de forma atômica
+        no mesmo caminho; retorna as linhas reescritas.
+        """
+        table_dir = self.root / table_name.upper()
+        if not table_dir.is_dir():
+            return 0
+
+        t0 = time.perf_counter()
+        rows = 0
+        files = sorted(p for p in table_dir.rglob("*.parquet") if not p.name.startswith("."))
+        for path in files:
+            records = transform(pq.read_table(path).to_pylist())
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".tmp")
+            os.close(fd)
+            try:
+                pq.write_table(pa.Table.from_pylist(records), tmp, compression=self.compression)
+                os.replace(tmp, path)
+            except Exception:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+            rows += len(records)
+
+        self.bump_version(table_name, rows)
+        self._bump_derived(table_name, rows)
+        logger.info("✅ Parquet %s reescrito: %s linhas em %s arquivos (%.0f ms)",
+                    table_name, rows, len(files), (time.perf_counter() - t0) * 1000)
+        return rows
+
+    def _write_file(self, table: "pa.Table", directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        final = directory / f"part-{datetime.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp, compression=self.compression)
+            os.replace(tmp, final)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return final
+
+    def _months(self, table: "pa.Table", partition_column: str) -> Dict[str, List[int]]:
+        """Índices das linhas por partição mensal (AAAA-MM)."""
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for i, value in enumerate(table.column(partition_column).to_pylist()):
+            groups[self._month(value)].append(i)
+        return groups
+
+    @staticmethod
+    def _month(value: Any) -> str:
+        if isinstance(value, (date, datetime)):
+            return f"{value:%Y-%m}"
+        return NO_DATE_PARTITION
+
+    # -------------------------
+    # Versão dos dados (espelho da CTL_DATA_VERSION)
+    # -------------------------
+    def _bump_derived(self, table_name: str, rows_loaded: int) -> None:
+        """Versões das views derivadas da tabela no DuckDB (agregados e camada SILVER)."""
+        name = table_name.upper()
+        derived = list(silver_tables(name))
+        if name in ROLLUP_SOURCES:
+            derived.append(ROLLUP_TABLE)
+        if name in JOURNEY_SOURCES:
+            derived.append(JOURNEY_TABLE)
+        if name in METRICS_SOURCES:
+            derived.append(METRICS_TABLE)
+        for table in derived:
+            self.bump_version(table, rows_loaded)
+
+    def bump_version(self, table_name: str, rows_loaded: int) -> None:
+        path = self.root / CONTROL_TABLE / "versions.parquet"
+        versions: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            for row in pq.read_table(path).to_pylist():
+                versions[row["TABLE_NAME"]] = row
+
+        name = table_name.upper()
+        current = versions.get(name, {"VERSION": 0})
+        versions[name] = {
+            "TABLE_NAME": name,
+            "VERSION": int(current["VERSION"]) + 1,
+            "LOADED_AT": datetime.now(),
+            "ROWS_LOADED": int(rows_loaded),
+        }
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".tmp")
+        os.close(fd)
+        try:
+            pq.write_table(pa.Table.from_pylist(list(versions.values())), tmp)
+            os.replace(tmp, path)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
@@ -0,0 +1,171 @@
+"""
+PartitionExchange - Carga de meses inteiros por troca de partição (BRZ_HIST_* particionadas)
+- Só para a opção particionada das tabelas de histórico (sql/BRONZE PARTICIONADO - ...)
+- Para cada mês do lote:
+    1. staging vazia com a mesma estrutura (CREATE TABLE ... FOR EXCHANGE WITH TABLE)
+    2. insert em modo direto dos registros do mês (ID pela sequência da identity da tabela)
+    3. ALTER TABLE ... EXCHANGE PARTITION FOR (1º dia do mês): o mês inteiro é
+       substituído numa operação de dicionário, sem DELETE nem índice mantido linha a linha
+    4. reconstrução dos índices locais da partição; a PK global é mantida na troca
+       (UPDATE GLOBAL INDEXES); a staging (agora com as linhas antigas do mês) é descartada
+- Uso: recarga/backfill de meses fechados (run_backfill dos controllers,
+  mains/main_backfill_mes.py); as cargas do dia a dia continuam no bulk_insert
+- Requer Oracle 12.2+ (FOR EXCHANGE WITH TABLE) e meses dentro do intervalo
+  mensal (a partir de 2000-01, ver P_ANTERIOR no DDL particionado)
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Importação da estrutura das pastas
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.logger_controller import LoggerController
+
+NOME = "PartitionExchange"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "PartitionExchange.txt")
+logger = LoggerController(logfile)
+
+PARTITIONING_SQL = """
+SELECT PARTITIONING_TYPE, INTERVAL
+FROM USER_PART_TABLES
+WHERE TABLE_NAME = :table_name
+"""
+
+IDENTITY_SQL = """
+SELECT COLUMN_NAME, SEQUENCE_NAME
+FROM USER_TAB_IDENTITY_COLUMNS
+WHERE TABLE_NAME = :table_name
+"""
+
+
+def month_start(value: Any) -> Optional[date]:
+    """1º dia do mês da data (None se não for data)."""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.replace(day=1)
+    return None
+
+
+def month_end(month: date) -> date:
+    """Último dia do mês (month = 1º dia)."""
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def group_by_month(records: List[Dict[str, Any]], date_column: str) -> Dict[date, List[Dict[str, Any]]]:
+    """Registros por mês da coluna de data (linhas sem data ficam de fora)."""
+    groups: Dict[date, List[Dict[str, Any]]] = defaultdict(list)
+    for r in records:
+        month = month_start(r.get(date_column))
+        if month is not None:
+            groups[month].append(r)
+    return dict(sorted(groups.items()))
+
+
+class PartitionExchange:
+    def __init__(self, connector: Any, batch_size: int = 5000):
+        """
+        Args:
+            connector: OracleConnector de escrita
+            batch_size: Linhas por executemany na staging
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+
+    def is_partitioned(self, table_name: str) -> bool:
+        """True se a tabela usa a opção particionada (RANGE com INTERVAL)."""
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(PARTITIONING_SQL, {"table_name": table_name.upper()})
+                row = cursor.fetchone()
+            finally:
+                cursor.close()
+        return bool(row and row[0] == "RANGE" and row[1])
+
+    def load_months(self, table_name: str, records: List[Dict[str, Any]],
+                    date_column: str) -> Dict[date, int]:
+        """
+        Substitui cada mês presente no lote pelos registros dele (o mês inteiro:
+        linhas antigas do mês que não estão no lote deixam de existir).
+        Retorna {1º dia do mês: linhas carregadas}.
+        """
+        table_name = table_name.upper()
+        if not self.is_partitioned(table_name):
+            raise ValueError(f"❌ {table_name} não é particionada: criar com sql/BRONZE PARTICIONADO - ...")
+
+        out: Dict[date, int] = {}
+        for month, rows in group_by_month(records, date_column).items():
+            t0 = time.perf_counter()
+            out[month] = self._exchange_month(table_name, month, rows)
+            logger.info("🔁 %s %s: %s linhas trocadas (%.0f ms)",
+                        table_name, f"{month:%Y-%m}", out[month], (time.perf_counter() - t0) * 1000)
+        return out
+
+    def _exchange_month(self, table_name: str, month: date, rows: List[Dict[str, Any]]) -> int:
+        staging = f"{table_name}_X{month:%Y%m}"
+        # Literal montado a partir de date (nunca de texto do usuário)
+        partition = f"PARTITION FOR (DATE '{month:%Y-%m-%d}')"
+
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                identity = self._identity(cursor, table_name)
+                self._drop(cursor, staging)
+                cursor.execute(f"CREATE TABLE {staging} FOR EXCHANGE WITH TABLE {table_name}")
+                try:
+                    self._fill(cursor, staging, rows, identity)
+                    # Cria a partição do mês (INTERVAL) caso ainda não exista
+                    cursor.execute(f"LOCK TABLE {table_name} {partition} IN SHARE MODE")
+                    # Registros agrupados por mês aqui: a validação linha a linha é dispensável
+                    cursor.execute(
+                        f"ALTER TABLE {table_name} EXCHANGE {partition} WITH TABLE {staging} "
+                        f"EXCLUDING INDEXES WITHOUT VALIDATION UPDATE GLOBAL INDEXES"
+                    )
+                    cursor.execute(f"ALTER TABLE {table_name} MODIFY {partition} REBUILD UNUSABLE LOCAL INDEXES")
+                finally:
+                    self._drop(cursor, staging)
+            finally:
+                cursor.close()
+        return len(rows)
+
+    @staticmethod
+    def _identity(cursor: Any, table_name: str) -> Optional[Tuple[str, str]]:
+        """(coluna, sequência) da identity da tabela; a staging não herda a identity."""
+        cursor.execute(IDENTITY_SQL, {"table_name": table_name})
+        row = cursor.fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _fill(self, cursor: Any, staging: str, rows: List[Dict[str, Any]],
+              identity: Optional[Tuple[str, str]]) -> None:
+        columns = list(rows[0].keys())
+        placeholders = [f":{i}" for i in range(len(columns))]
+        if identity and identity[0] not in columns:
+            columns.insert(0, identity[0])
+            placeholders.insert(0, f"{identity[1]}.NEXTVAL")
+        query = (f"INSERT /*+ APPEND_VALUES */ INTO {staging} ({','.join(columns)}) "
+                 f"VALUES ({','.join(placeholders)})")
+
+        params = [tuple(row.values()) for row in rows]
+        for i in range(0, len(params), self.batch_size):
+            cursor.executemany(query, params[i:i + self.batch_size])
+
+    @staticmethod
+    def _drop(cursor: Any, staging: str) -> None:
+        cursor.execute(f"""
+        BEGIN
+            EXECUTE IMMEDIATE 'DROP TABLE {staging} PURGE';
+        EXCEPTION WHEN OTHERS THEN
+            IF SQLCODE != -942 THEN RAISE; END IF;
+        END;
+        """)
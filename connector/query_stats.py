@@ -0,0 +1,68 @@
+"""
+Tempos e estimativas de uma execução de SELECT (QueryStats)
+O reuso de statements preparados é do statement cache do driver: cada sessão
+do pool guarda os stmtcachesize SQLs mais recentes (config/database.ini), então
+o SELECT repetido de um repositório não é reanalisado no servidor mesmo com um
+cursor novo por consulta. Esse cache pertence à sessão, não ao objeto Connection
+devolvido por pool.acquire() (um wrapper novo a cada chamada).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, asdict
+from typing import Any, Dict
+
+
+@dataclass
+class QueryStats:
+    """
+    Tempos de uma execução de SELECT (em milissegundos).
+
+    execute_ms: prepare + execute (inclui o parse no servidor quando o
+                statement não está no statement cache da sessão; o prepare
+                do cliente não vai ao servidor e por isso não é medido à parte)
+    fetch_ms:   fetchall + montagem das linhas
+
+    round_trips e bytes são estimativas do lado cliente: o driver thin não
+    expõe os contadores do SQL*Net, então derivamos de prefetchrows/arraysize
+    e do tamanho dos valores recebidos.
+
+    endpoint:   seção do .ini que atendeu (ORACLE_DB_READ, ORACLE_DB_WRITE...)
+    """
+    execute_ms: float = 0.0
+    fetch_ms: float = 0.0
+    rows: int = 0
+    round_trips: int = 0
+    bytes: int = 0
+    endpoint: str = ""
+
+    @property
+    def total_ms(self) -> float:
+        return self.execute_ms + self.fetch_ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        d["total_ms"] = self.total_ms
+        return d
+
+
+def estimate_round_trips(rows: int, prefetchrows: int, arraysize: int) -> int:
+    """1 ida/volta do execute (já traz prefetchrows linhas) + 1 por lote de arraysize."""
+    remaining = max(rows - max(prefetchrows, 0), 0)
+    return 1 + (-(-remaining // max(arraysize, 1)) if remaining else 0)
+
+
+def estimate_bytes(rows: Any) -> int:
+    """Tamanho aproximado do payload recebido (texto em UTF-8, números/datas ~8 bytes)."""
+    total = 0
+    for row in rows:
+        for v in row:
+            if v is None:
+                total += 1
+            elif isinstance(v, str):
+                total += len(v.encode("utf-8"))
+            elif isinstance(v, (bytes, bytearray)):
+                total += len(v)
+            else:
+                total += 8
+    return total
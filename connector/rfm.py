@@ -0,0 +1,243 @@
+"""
+RfmThresholds - Scores RFM (Recency/Frequency/Monetary) e segmentos calculados no banco
+- Cliente = CLIENTE_HASH; transações de veículos, peças e serviços do período
+  (RECENCY_DIAS = dt_fim - última compra, FREQUENCY = transações, MONETARY = receita)
+- Score 1..5 por medida contra os limiares de quintil (P20/P40/P60/P80, PERCENTILE_DISC):
+    R: até P20 -> 5 ... acima de P80 -> 1 (menos dias desde a compra é melhor)
+    F/M: acima de P80 -> 5 ... até P20 -> 1
+  empates ficam sempre na mesma faixa (o qcut por rank dividia empates ao acaso)
+- Segmentos (SEGMENTS): VIP (R, F e M >= 4), Crescimento (R e F >= 4), Risco
+  (R < 4 com F ou M >= 4) e Dorminte (o resto)
+- Limiares persistidos em AGG_RFM_LIMIARES (uma linha por cálculo; vale a de maior ID):
+  o mesmo cliente não troca de segmento só porque a base mudou entre duas consultas.
+  Tabela vazia (ou, no DuckDB, ainda sem a pasta Parquet): valem os limiares do período
+  Recalcular com refresh() (mains/main_rfm_limiares.py); o dashboard usa os persistidos
+  com [RFM] persisted = true em streamlit_app/config/config.ini, senão calcula os do período
+- Dashboard: só o resumo por segmento e a página de clientes pedida saem do banco;
+  as medidas por cliente vêm de AGG_CLIENTE_METRICAS em períodos de meses inteiros
+  (connector/customer_metrics.py, snapshot=True)
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from connector.customer_metrics import METRICS_TABLE
+
+THRESHOLDS_TABLE = "AGG_RFM_LIMIARES"
+QUANTILES = (20, 40, 60, 80)
+SEGMENTS = ("VIP", "Crescimento", "Risco", "Dorminte")
+
+# Medida -> coluna do cliente
+MEASURES = {"R": "RECENCY_DIAS", "F": "FREQUENCY", "M": "MONETARY"}
+THRESHOLD_COLUMNS = tuple(f"{m}_P{q}" for m in MEASURES for q in QUANTILES)
+
+
+def _period(column: str) -> str:
+    # Mesmo predicado semiaberto de repositories.sql_builder.date_range (os mains
+    # importam este módulo sem o streamlit_app no path)
+    return f"{column} >= :dt_ini AND {column} < :dt_fim + 1"
+
+
+# Transações (veículo + peça + serviço) e medidas por cliente no período (:dt_ini, :dt_fim)
+CUSTOMERS_CTES = f"""
+        rfm_tx AS (
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
+                 DT_VENDA AS DT,
+                 NVL(VALOR_VENDA,0) AS RECEITA
+          FROM BRZ_HIST_VENDAS_VEICULOS
+          WHERE {_period("DT_VENDA")}
+            AND CLIENTE_HASH IS NOT NULL
+
+          UNION ALL
+
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
+                 DT_VENDA AS DT,
+                 NVL(VALOR_VENDA,0) AS RECEITA
+          FROM BRZ_HIST_VENDAS_PECAS
+          WHERE {_period("DT_VENDA")}
+            AND CLIENTE_HASH IS NOT NULL
+
+          UNION ALL
+
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
+                 DT_REALIZACAO_SERVICO AS DT,
+                 NVL(VALOR_TOTAL_SERVICO,0) AS RECEITA
+          FROM BRZ_HIST_SERVICOS
+          WHERE {_period("DT_REALIZACAO_SERVICO")}
+            AND CLIENTE_HASH IS NOT NULL
+        ),
+        rfm AS (
+          SELECT
+            CLIENTE_HASH,
+            MAX(CLIENTE) AS CLIENTE,
+            MAX(DT) AS ULTIMA_DATA,
+            TRUNC(:dt_fim) - TRUNC(MAX(DT)) AS RECENCY_DIAS,
+            COUNT(*) AS FREQUENCY,
+            SUM(RECEITA) AS MONETARY
+          FROM rfm_tx
+          GROUP BY CLIENTE_HASH
+        )"""
+
+# Mesmas medidas somando os meses do período em AGG_CLIENTE_METRICAS (período de meses inteiros)
+METRICS_CTES = f"""
+        rfm AS (
+          SELECT
+            CLIENTE_HASH,
+            MAX(CLIENTE_KEY) AS CLIENTE,
+            MAX(ULTIMA_DATA) AS ULTIMA_DATA,
+            TRUNC(:dt_fim) - TRUNC(MAX(ULTIMA_DATA)) AS RECENCY_DIAS,
+            SUM(TRANSACOES) AS FREQUENCY,
+            SUM(RECEITA) AS MONETARY
+          FROM {METRICS_TABLE}
+          WHERE MES BETWEEN :dt_ini AND :dt_fim
+          GROUP BY CLIENTE_HASH
+        )"""
+
+
+def thresholds_select() -> str:
+    """SELECT dos limiares (colunas de THRESHOLD_COLUMNS + CLIENTES) sobre o CTE rfm."""
+    percentiles = ",\n".join(
+        f"            PERCENTILE_DISC({q / 100}) WITHIN GROUP (ORDER BY {col}) AS {m}_P{q}"
+        for m, col in MEASURES.items() for q in QUANTILES
+    )
+    return f"""
+          SELECT
+            COUNT(*) AS CLIENTES,
+{percentiles}
+          FROM rfm"""
+
+
+def _score(measure: str) -> str:
+    col = MEASURES[measure]
+    if measure == "R":
+        # Menos dias é melhor: até P20 -> 5
+        cases = " ".join(f"WHEN r.{col} <= l.R_P{q} THEN {5 - i}" for i, q in enumerate(QUANTILES))
+    else:
+        # Mais é melhor: acima de P80 -> 5
+        cases = " ".join(f"WHEN r.{col} > l.{measure}_P{q} THEN {5 - i}" for i, q in enumerate(reversed(QUANTILES)))
+    return f"CASE {cases} ELSE 1 END AS {measure}_SCORE"
+
+
+@lru_cache(maxsize=None)
+def scored_sql(persisted: bool, snapshot: bool = False) -> str:
+    """
+    Clientes do período com R/F/M_SCORE e SEGMENTO.
+
+    Args:
+        persisted: True = limiares da última linha de AGG_RFM_LIMIARES (os do período
+                   enquanto a tabela estiver vazia); False = limiares calculados sobre
+                   os próprios clientes do período
+        snapshot: True = medidas de AGG_CLIENTE_METRICAS (só períodos de meses inteiros)
+    """
+    if persisted:
+        cols = ", ".join(THRESHOLD_COLUMNS)
+        # Sem linha gravada o CROSS JOIN zeraria o resultado: cai nos limiares do período
+        lim = f"""
+          SELECT {cols}
+          FROM {THRESHOLDS_TABLE}
+          WHERE ID = (SELECT MAX(ID) FROM {THRESHOLDS_TABLE})
+          UNION ALL
+          SELECT {cols}
+          FROM ({thresholds_select()}
+          ) p
+          WHERE NOT EXISTS (SELECT 1 FROM {THRESHOLDS_TABLE})"""
+    else:
+        lim = thresholds_select()
+    scores = ",\n".join(f"            {_score(m)}" for m in MEASURES)
+    return f"""
+        WITH{METRICS_CTES if snapshot else CUSTOMERS_CTES},
+        lim AS ({lim}
+        ),
+        scored AS (
+          SELECT
+            r.CLIENTE_HASH, r.CLIENTE, r.ULTIMA_DATA, r.RECENCY_DIAS, r.FREQUENCY, r.MONETARY,
+{scores}
+          FROM rfm r
+          CROSS JOIN lim l
+        )
+        SELECT
+          s.*,
+          CASE
+            WHEN s.R_SCORE >= 4 AND s.F_SCORE >= 4 AND s.M_SCORE >= 4 THEN '{SEGMENTS[0]}'
+            WHEN s.R_SCORE >= 4 AND s.F_SCORE >= 4 THEN '{SEGMENTS[1]}'
+            WHEN s.R_SCORE < 4 AND (s.F_SCORE >= 4 OR s.M_SCORE >= 4) THEN '{SEGMENTS[2]}'
+            ELSE '{SEGMENTS[3]}'
+          END AS SEGMENTO
+        FROM scored s
+    """
+
+
+@lru_cache(maxsize=None)
+def compute_sql(snapshot: bool = False) -> str:
+    """Limiares dos clientes do período (:dt_ini, :dt_fim), sem gravar."""
+    return f"WITH{METRICS_CTES if snapshot else CUSTOMERS_CTES}{thresholds_select()}"
+
+INSERT_SQL = f"""
+    INSERT INTO {THRESHOLDS_TABLE} (DT_INI_REF, DT_FIM_REF, CLIENTES, {", ".join(THRESHOLD_COLUMNS)})
+    WITH{CUSTOMERS_CTES}
+    SELECT :dt_ini, :dt_fim, x.* FROM ({thresholds_select()}
+    ) x
+"""
+
+LATEST_SQL = f"""
+    SELECT * FROM {THRESHOLDS_TABLE}
+    WHERE ID = (SELECT MAX(ID) FROM {THRESHOLDS_TABLE})
+"""
+
+
+class RfmThresholds:
+    def __init__(self, connector: Any, parquet_store: Optional[Any] = None):
+        """
+        Args:
+            connector: OracleConnector de escrita, ou DuckDBConnector (só Parquet)
+            parquet_store: ParquetStore que recebe a linha (espelho para o DuckDB);
+                           obrigatório com DuckDBConnector
+        """
+        self.connector = connector
+        self.parquet_store = parquet_store
+
+    @property
+    def _oracle(self) -> bool:
+        return getattr(self.connector, "ENDPOINT", "") != "duckdb"
+
+    def compute(self, dt_ini: date, dt_fim: date) -> Dict[str, Any]:
+        """Limiares dos clientes de dt_ini..dt_fim, sem gravar."""
+        rows, _ = self.connector.run_select(compute_sql(), {"dt_ini": dt_ini, "dt_fim": dt_fim})
+        return dict(rows[0]) if rows else {}
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Linha em uso pelo dashboard (maior ID), ou None se nada foi gravado."""
+        try:
+            rows, _ = self.connector.run_select(LATEST_SQL)
+        except Exception:
+            if self._oracle:
+                raise
+            return None  # Parquet ainda sem a pasta da tabela
+        return dict(rows[0]) if rows else None
+
+    def refresh(self, dt_ini: date, dt_fim: date) -> Dict[str, Any]:
+        """Calcula e grava uma nova linha de limiares (passa a valer no dashboard); retorna a linha."""
+        params = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+        if self._oracle:
+            # Cálculo e gravação no banco, sem trazer clientes
+            self.connector.execute_dml(INSERT_SQL, params)
+            self.connector.bump_data_version(THRESHOLDS_TABLE, 1)
+            row = self.latest() or {}
+        else:
+            if self.parquet_store is None:
+                raise ValueError("DuckDB: informe o ParquetStore que recebe os limiares")
+            previous = self.latest()
+            row = {
+                "ID": int(previous["ID"]) + 1 if previous else 1,
+                "DT_INI_REF": dt_ini,
+                "DT_FIM_REF": dt_fim,
+                **self.compute(dt_ini, dt_fim),
+                "CALCULADO_EM": datetime.now(),
+            }
+
+        if self.parquet_store is not None and row:
+            self.parquet_store.write_table(THRESHOLDS_TABLE, [row])
+        return row
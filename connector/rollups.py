@@ -0,0 +1,170 @@
+"""
+DailyRollup - Agregado diário por filial e linha de negócio (AGG_DIARIO_FILIAL)
+- Grão: dia x LINHA (VEIC, PEC, SRV) x COD_CONCESSIONARIA x COD_FILIAL x NOME_FILIAL
+- Medidas: RECEITA, LUCRO, CUSTO, QTDE e QTDE_REGISTROS (linhas BRZ de origem)
+- Controllers: refresh(tabela, datas) depois do bulk_insert recalcula só os dias
+  tocados pela carga (DELETE + INSERT do dia num bloco PL/SQL: atômico e idempotente,
+  recarregar o mesmo arquivo não duplica o agregado)
+  ([ROLLUP] enabled em config/database.ini, from_config)
+- Carga inicial / reconstrução: rebuild() (mains/main_rollup_rebuild.py)
+- Dashboard: KPIs, P&L, ROI, performance por filial e fluxo de caixa leem o agregado
+  ([ROLLUP] em streamlit_app/config/config.ini)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.ini_config import enabled_section
+
+ROLLUP_TABLE = "AGG_DIARIO_FILIAL"
+
+ROLLUP_COLUMNS = (
+    "DT", "LINHA", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL",
+    "RECEITA", "LUCRO", "CUSTO", "QTDE", "QTDE_REGISTROS",
+)
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    """Como uma tabela BRZ_* alimenta o agregado (expressões já com NVL)."""
+    linha: str
+    date_column: str
+    receita: str
+    lucro: str
+    custo: str
+    qtde: str
+
+
+ROLLUP_SOURCES: Dict[str, RollupSource] = {
+    "BRZ_HIST_VENDAS_VEICULOS": RollupSource(
+        "VEIC", "DT_VENDA", "NVL(VALOR_VENDA,0)", "NVL(LUCRO_VENDA,0)",
+        "NVL(CUSTO_VEICULO,0)", "NVL(QTDE_VENDIDA,0)",
+    ),
+    "BRZ_HIST_VENDAS_PECAS": RollupSource(
+        "PEC", "DT_VENDA", "NVL(VALOR_VENDA,0)", "NVL(LUCRO_VENDA,0)",
+        "NVL(CUSTO_PECA,0)", "NVL(QTDE_VENDIDA,0)",
+    ),
+    # Serviço não tem coluna de custo: custo = receita - lucro
+    "BRZ_HIST_SERVICOS": RollupSource(
+        "SRV", "DT_REALIZACAO_SERVICO", "NVL(VALOR_TOTAL_SERVICO,0)", "NVL(LUCRO_SERVICO,0)",
+        "NVL(VALOR_TOTAL_SERVICO,0) - NVL(LUCRO_SERVICO,0)", "NVL(QTDE_SERVICOS,0)",
+    ),
+}
+
+
+def select_sql(table_name: str, where: str = "1 = 1") -> str:
+    """SELECT que agrega uma tabela BRZ_* no grão do agregado (colunas de ROLLUP_COLUMNS)."""
+    s = ROLLUP_SOURCES[table_name]
+    return f"""
+        SELECT
+            TRUNC({s.date_column}) AS DT,
+            '{s.linha}' AS LINHA,
+            COD_CONCESSIONARIA,
+            COD_FILIAL,
+            NOME_FILIAL,
+            SUM({s.receita}) AS RECEITA,
+            SUM({s.lucro}) AS LUCRO,
+            SUM({s.custo}) AS CUSTO,
+            SUM({s.qtde}) AS QTDE,
+            COUNT(*) AS QTDE_REGISTROS
+        FROM {table_name}
+        WHERE {where}
+        GROUP BY TRUNC({s.date_column}), COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
+    """
+
+
+def _insert_sql(table_name: str, where: str) -> str:
+    return (f"INSERT INTO {ROLLUP_TABLE} ({', '.join(ROLLUP_COLUMNS)}, ATUALIZADO_EM) "
+            f"SELECT x.*, SYSTIMESTAMP FROM ({select_sql(table_name, where)}) x")
+
+
+def refresh_day_block(table_name: str) -> str:
+    """Bloco PL/SQL que recalcula um dia (:dt) de uma linha de negócio."""
+    s = ROLLUP_SOURCES[table_name]
+    # Intervalo semiaberto no dia: usa o índice (..., data) das BRZ_*
+    where = f"{s.date_column} >= :dt AND {s.date_column} < :dt + 1"
+    return f"""
+    BEGIN
+        DELETE FROM {ROLLUP_TABLE} WHERE LINHA = '{s.linha}' AND DT = :dt;
+        {_insert_sql(table_name, where)};
+    END;
+    """
+
+
+def affected_dates(records: Iterable[Dict[str, Any]], date_column: str) -> List[date]:
+    """Dias distintos tocados por um lote (mesmo formato do bulk_insert)."""
+    return sorted({r[date_column] for r in records if r.get(date_column) is not None})
+
+
+class DailyRollup:
+    def __init__(self, connector: Any, batch_size: int = 200):
+        """
+        Args:
+            connector: OracleConnector de escrita
+            batch_size: Dias por executemany (uma ida ao banco por lote)
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, connector: Any, config_file: str = "config/database.ini") -> Optional["DailyRollup"]:
+        """Instância se [ROLLUP] enabled = true no .ini; None caso contrário."""
+        section = enabled_section(config_file, "ROLLUP")
+        return cls(connector, section.getint("batch_size", fallback=200)) if section is not None else None
+
+    def refresh(self, table_name: str, dates: Iterable[date]) -> int:
+        """Recalcula os dias informados da linha de negócio da tabela; retorna dias recalculados."""
+        table_name = table_name.upper()
+        if table_name not in ROLLUP_SOURCES:
+            return 0
+        days = [{"dt": d} for d in sorted(set(dates))]
+        if not days:
+            return 0
+
+        block = refresh_day_block(table_name)
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                for i in range(0, len(days), self.batch_size):
+                    cursor.executemany(block, days[i:i + self.batch_size])
+            finally:
+                cursor.close()
+
+        self.connector.bump_data_version(ROLLUP_TABLE, len(days))
+        return len(days)
+
+    def rebuild(self, table_name: Optional[str] = None,
+                dt_ini: Optional[date] = None, dt_fim: Optional[date] = None) -> Dict[str, int]:
+        """
+        Reconstrói o agregado (todas as linhas ou só a da tabela), no período
+        informado ou inteiro. Retorna {tabela: linhas gravadas no agregado}.
+        """
+        tables = [table_name.upper()] if table_name else list(ROLLUP_SOURCES)
+        out: Dict[str, int] = {}
+        for name in tables:
+            s = ROLLUP_SOURCES[name]
+            params: Dict[str, Any] = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+            agg_range = ("(:dt_ini IS NULL OR DT >= :dt_ini) AND (:dt_fim IS NULL OR DT < :dt_fim + 1)")
+            src_range = (f"(:dt_ini IS NULL OR {s.date_column} >= :dt_ini) "
+                         f"AND (:dt_fim IS NULL OR {s.date_column} < :dt_fim + 1)")
+            block = f"""
+            BEGIN
+                DELETE FROM {ROLLUP_TABLE} WHERE LINHA = '{s.linha}' AND {agg_range};
+                {_insert_sql(name, src_range)};
+                :rows := SQL%ROWCOUNT;
+            END;
+            """
+            with self.connector.get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    rows = cursor.var(int)
+                    cursor.execute(block, {**params, "rows": rows})
+                    out[name] = int(rows.getvalue() or 0)
+                finally:
+                    cursor.close()
+
+        self.connector.bump_data_version(ROLLUP_TABLE, sum(out.values()))
+        return out
@@ -0,0 +1,350 @@
+"""
+SilverLayer - Camada SILVER: dimensões conformadas + fatos só com chaves e medidas
+- Dimensões (DIM_*): filial, peça, serviço, veículo, vendedor, cliente e geografia,
+  chave substituta inteira (SK_*) por membro natural (ex.: DESCRICAO_PECA + CATEGORIA_PECA)
+  e os atributos descritivos; DIM_VENDEDOR é compartilhada por vendedores e mecânicos
+- Fatos (SLV_FATO_*): data + SK_* + medidas (dezenas de bytes por linha contra as
+  centenas das BRZ_HIST_*, que repetem nomes de filial, peça, vendedor, cidade...)
+- Valor natural ausente vira MISSING_TEXT / MISSING_NUMBER: as junções são por
+  igualdade (usam o índice único da dimensão) e o membro "tudo ausente" é o SK 0,
+  criado junto com a tabela
+- Controllers ([SILVER] em config/database.ini): load(tabela, registros) depois do
+  bulk_insert; as chaves saem de um cache em memória por dimensão (KeyCache: 1 SELECT
+  por dimensão por processo, membros novos numa ida ao banco) e o fato é gravado direto
+- Carga inicial / backfill: rebuild() (mains/main_silver_rebuild.py), em SQL:
+  MERGE dos membros do período nas dimensões + DELETE/INSERT do fato
+- Dashboard: variantes SILVER das consultas que agrupam por nome
+  ([SILVER] em streamlit_app/config/config.ini); no DuckDB as DIM_*/SLV_FATO_* são
+  views sobre os fatos BRZ (DuckDBConnector)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from utils.ini_config import enabled_section
+
+MISSING_TEXT = "-"
+MISSING_NUMBER = -1
+UNKNOWN_KEY = 0
+KEY_SEQUENCE = "SEQ_SILVER_SK"
+
+
+@dataclass(frozen=True)
+class Dimension:
+    """Dimensão conformada: chave substituta, colunas do membro natural e atributos."""
+    table: str
+    key: str
+    natural: Tuple[str, ...]
+    attributes: Tuple[str, ...] = ()
+    numeric: Tuple[str, ...] = ()
+
+    def missing(self, column: str) -> Any:
+        return MISSING_NUMBER if column in self.numeric else MISSING_TEXT
+
+
+DIMENSIONS: Dict[str, Dimension] = {d.table: d for d in (
+    Dimension("DIM_FILIAL", "SK_FILIAL", ("COD_CONCESSIONARIA", "COD_FILIAL"),
+              ("NOME_CONCESSIONARIA", "NOME_FILIAL", "MARCA_FILIAL")),
+    Dimension("DIM_PECA", "SK_PECA", ("DESCRICAO_PECA", "CATEGORIA_PECA")),
+    Dimension("DIM_SERVICO", "SK_SERVICO",
+              ("DESCRICAO_SERVICO", "SECAO_SERVICO", "DEPARTAMENTO_SERVICO", "CATEGORIA_SERVICO")),
+    Dimension("DIM_VEICULO", "SK_VEICULO",
+              ("MARCA_VEICULO", "MODELO_VEICULO", "FAMILIA_VEICULO", "CATEGORIA_VEICULO",
+               "VEICULO_NOVO_SEMINOVO", "TIPO_COMBUSTIVEL", "ANO_MODELO"), numeric=("ANO_MODELO",)),
+    Dimension("DIM_VENDEDOR", "SK_VENDEDOR", ("NOME_VENDEDOR",)),
+    Dimension("DIM_CLIENTE", "SK_CLIENTE", ("CLIENTE_HASH",), ("CLIENTE_KEY",), numeric=("CLIENTE_HASH",)),
+    Dimension("DIM_GEOGRAFIA", "SK_GEOGRAFIA", ("ESTADO", "CIDADE"), ("MACROREGIAO",)),
+)}
+
+
+@dataclass(frozen=True)
+class FactKey:
+    """Chave do fato: coluna SK_*, dimensão e colunas BRZ na ordem de natural/attributes."""
+    key: str
+    dimension: str
+    natural: Tuple[str, ...]
+    attributes: Tuple[Optional[str], ...] = ()
+
+    @property
+    def dim(self) -> Dimension:
+        return DIMENSIONS[self.dimension]
+
+
+@dataclass(frozen=True)
+class Fact:
+    table: str
+    date_column: str
+    keys: Tuple[FactKey, ...]
+    measures: Tuple[str, ...]
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.date_column, *(k.key for k in self.keys), *self.measures)
+
+
+_FILIAL = FactKey("SK_FILIAL", "DIM_FILIAL", ("COD_CONCESSIONARIA", "COD_FILIAL"),
+                  ("NOME_CONCESSIONARIA", "NOME_FILIAL", "MARCA_FILIAL"))
+_CLIENTE = FactKey("SK_CLIENTE", "DIM_CLIENTE", ("CLIENTE_HASH",), ("CLIENTE_KEY",))
+_GEOGRAFIA = FactKey("SK_GEOGRAFIA", "DIM_GEOGRAFIA", ("ESTADO_VENDA", "CIDADE_VENDA"), ("MACROREGIAO_VENDA",))
+
+# Tabela BRZ -> fato SILVER
+FACTS: Dict[str, Fact] = {
+    "BRZ_HIST_VENDAS_VEICULOS": Fact(
+        "SLV_FATO_VENDAS_VEICULOS", "DT_VENDA",
+        (
+            _FILIAL,
+            FactKey("SK_VEICULO", "DIM_VEICULO", DIMENSIONS["DIM_VEICULO"].natural),
+            FactKey("SK_VENDEDOR", "DIM_VENDEDOR", ("NOME_VENDEDOR",)),
+            _CLIENTE,
+            _GEOGRAFIA,
+        ),
+        ("QTDE_VENDIDA", "VALOR_VENDA", "CUSTO_VEICULO", "LUCRO_VENDA", "DIAS_EM_ESTOQUE"),
+    ),
+    "BRZ_HIST_VENDAS_PECAS": Fact(
+        "SLV_FATO_VENDAS_PECAS", "DT_VENDA",
+        (
+            _FILIAL,
+            FactKey("SK_PECA", "DIM_PECA", ("DESCRICAO_PECA", "CATEGORIA_PECA")),
+            FactKey("SK_VENDEDOR", "DIM_VENDEDOR", ("NOME_VENDEDOR",)),
+            _CLIENTE,
+            _GEOGRAFIA,
+        ),
+        ("QTDE_VENDIDA", "VALOR_VENDA", "CUSTO_PECA", "LUCRO_VENDA"),
+    ),
+    "BRZ_HIST_SERVICOS": Fact(
+        "SLV_FATO_SERVICOS", "DT_REALIZACAO_SERVICO",
+        (
+            # Serviço não tem MARCA_FILIAL
+            FactKey("SK_FILIAL", "DIM_FILIAL", ("COD_CONCESSIONARIA", "COD_FILIAL"),
+                    ("NOME_CONCESSIONARIA", "NOME_FILIAL", None)),
+            FactKey("SK_SERVICO", "DIM_SERVICO", DIMENSIONS["DIM_SERVICO"].natural),
+            FactKey("SK_VENDEDOR", "DIM_VENDEDOR", ("NOME_VENDEDOR_SERVICO",)),
+            FactKey("SK_MECANICO", "DIM_VENDEDOR", ("NOME_MECANICO",)),
+            _CLIENTE,
+        ),
+        ("QTDE_SERVICOS", "VALOR_TOTAL_SERVICO", "LUCRO_SERVICO"),
+    ),
+}
+SILVER_TABLES = tuple(f.table for f in FACTS.values()) + tuple(DIMENSIONS)
+
+
+def derived_tables(table_name: str) -> Tuple[str, ...]:
+    """Fato e dimensões SILVER alimentados por uma tabela BRZ (versões a incrementar na carga)."""
+    fact = FACTS.get(table_name.upper())
+    if fact is None:
+        return ()
+    return (fact.table, *dict.fromkeys(k.dimension for k in fact.keys))
+
+
+# -------------------------
+# SQL (Oracle; o DuckDBConnector traduz para as views)
+# -------------------------
+def _nvl(dim: Dimension, column: str, expr: str) -> str:
+    missing = dim.missing(column)
+    return f"NVL({expr}, {missing})" if column in dim.numeric else f"NVL({expr}, '{missing}')"
+
+
+def members_sql(fk: FactKey, source: str, where: str = "1 = 1") -> str:
+    """Membros distintos da dimensão citados pela tabela BRZ (colunas com os nomes da dimensão)."""
+    dim = fk.dim
+    natural = [f"{_nvl(dim, col, f'b.{src}')} AS {col}" for col, src in zip(dim.natural, fk.natural)]
+    attrs = [f"MAX(b.{src}) AS {col}" if src else f"CAST(NULL AS VARCHAR(100)) AS {col}"
+             for col, src in zip(dim.attributes, fk.attributes or (None,) * len(dim.attributes))]
+    group = ", ".join(_nvl(dim, col, f"b.{src}") for col, src in zip(dim.natural, fk.natural))
+    return (f"SELECT {', '.join(natural + attrs)} FROM {source} b "
+            f"WHERE {where} GROUP BY {group}")
+
+
+def merge_members_sql(fk: FactKey, source: str, where: str) -> str:
+    """MERGE dos membros novos do período (chave pela sequência)."""
+    dim = fk.dim
+    on = " AND ".join(f"d.{c} = s.{c}" for c in dim.natural)
+    cols = (*dim.natural, *dim.attributes)
+    return (f"MERGE INTO {dim.table} d USING ({members_sql(fk, source, where)}) s ON ({on}) "
+            f"WHEN NOT MATCHED THEN INSERT ({dim.key}, {', '.join(cols)}) "
+            f"VALUES ({KEY_SEQUENCE}.NEXTVAL, {', '.join(f's.{c}' for c in cols)})")
+
+
+def fact_select_sql(source: str, where: str = "1 = 1") -> str:
+    """Linhas do fato a partir da tabela BRZ (dimensões já com os membros do período)."""
+    fact = FACTS[source]
+    select = [f"b.{fact.date_column}"]
+    joins = []
+    for i, fk in enumerate(fact.keys):
+        dim = fk.dim
+        on = " AND ".join(f"d{i}.{col} = {_nvl(dim, col, f'b.{src}')}" for col, src in zip(dim.natural, fk.natural))
+        joins.append(f"JOIN {dim.table} d{i} ON {on}")
+        select.append(f"d{i}.{dim.key} AS {fk.key}")
+    select += [f"b.{m}" for m in fact.measures]
+    return f"SELECT {', '.join(select)} FROM {source} b {' '.join(joins)} WHERE {where}"
+
+
+def dimension_select_sql(dimension: str, sources: Iterable[str]) -> str:
+    """
+    Dimensão inteira derivada das tabelas BRZ (views do DuckDB): chave = posição do
+    membro em ordem natural, SK 0 para o membro "tudo ausente", como no Oracle.
+    """
+    dim = DIMENSIONS[dimension]
+    parts = [members_sql(fk, source) for source in sources for fk in FACTS[source].keys if fk.dimension == dimension]
+    natural = ", ".join(dim.natural)
+    unknown = " AND ".join(f"{c} = {_nvl(dim, c, 'NULL')}" for c in dim.natural)
+    attrs = "".join(f", MAX({c}) AS {c}" for c in dim.attributes)
+    return (f"SELECT CASE WHEN {unknown} THEN {UNKNOWN_KEY} "
+            f"ELSE ROW_NUMBER() OVER (ORDER BY {natural}) END AS {dim.key}, {natural}{attrs} "
+            f"FROM ({' UNION ALL '.join(parts)}) m GROUP BY {natural}")
+
+
+# -------------------------
+# Carga (Oracle)
+# -------------------------
+def natural_key(fk: FactKey, record: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Membro natural do registro, com o mesmo tratamento de ausente do SQL (NVL)."""
+    dim = fk.dim
+    out = []
+    for col, src in zip(dim.natural, fk.natural):
+        value = record.get(src)
+        out.append(dim.missing(col) if value is None or value == "" else value)
+    return tuple(out)
+
+
+class KeyCache:
+    """SK_* por membro natural de uma dimensão, em memória durante o processo de ETL."""
+
+    def __init__(self, dimension: Dimension):
+        self.dimension = dimension
+        self._keys: Optional[Dict[Tuple[Any, ...], int]] = None
+        d = dimension
+        cols = (*d.natural, *d.attributes)
+        binds = ", ".join(f":{i} AS {c}" for i, c in enumerate((d.key, *cols)))
+        self._load_sql = f"SELECT {d.key}, {', '.join(d.natural)} FROM {d.table}"
+        self._merge_sql = (
+            f"MERGE INTO {d.table} d USING (SELECT {binds} FROM DUAL) s "
+            f"ON ({' AND '.join(f'd.{c} = s.{c}' for c in d.natural)}) "
+            f"WHEN NOT MATCHED THEN INSERT ({d.key}, {', '.join(cols)}) "
+            f"VALUES (s.{d.key}, {', '.join(f's.{c}' for c in cols)})"
+        )
+        self._lookup_sql = (f"SELECT {d.key} FROM {d.table} WHERE "
+                            + " AND ".join(f"{c} = :{i}" for i, c in enumerate(d.natural)))
+
+    def __len__(self) -> int:
+        return len(self._keys or {})
+
+    def keys(self, cursor: Any, members: Dict[Tuple[Any, ...], Tuple[Any, ...]]) -> Dict[Tuple[Any, ...], int]:
+        """
+        Garante os membros na dimensão e devolve o mapa membro -> SK.
+        members: {membro natural: atributos} (atributos só usados para membro novo)
+        """
+        if self._keys is None:
+            cursor.execute(self._load_sql)
+            self._keys = {tuple(r[1:]): int(r[0]) for r in cursor.fetchall()}
+
+        missing = [m for m in members if m not in self._keys]
+        if missing:
+            cursor.execute(f"SELECT {KEY_SEQUENCE}.NEXTVAL FROM DUAL CONNECT BY LEVEL <= :n", {"n": len(missing)})
+            new_keys = [int(r[0]) for r in cursor.fetchall()]
+            cursor.executemany(self._merge_sql, [(sk, *m, *members[m]) for sk, m in zip(new_keys, missing)],
+                               arraydmlrowcounts=True)
+            for sk, m, count in zip(new_keys, missing, cursor.getarraydmlrowcounts()):
+                if count:
+                    self._keys[m] = sk
+                else:
+                    # Outra carga criou o membro entre a leitura do cache e o MERGE
+                    cursor.execute(self._lookup_sql, list(m))
+                    self._keys[m] = int(cursor.fetchone()[0])
+        return self._keys
+
+
+class SilverLoader:
+    def __init__(self, connector: Any, batch_size: int = 5000):
+        """
+        Args:
+            connector: OracleConnector de escrita
+            batch_size: Linhas do fato por executemany
+        """
+        self.connector = connector
+        self.batch_size = batch_size
+        self._caches: Dict[str, KeyCache] = {}
+
+    @classmethod
+    def from_config(cls, connector: Any, config_file: str = "config/database.ini") -> Optional["SilverLoader"]:
+        """Instância se [SILVER] enabled = true no .ini; None caso contrário."""
+        section = enabled_section(config_file, "SILVER")
+        return cls(connector, section.getint("batch_size", fallback=5000)) if section is not None else None
+
+    def _cache(self, dimension: str) -> KeyCache:
+        if dimension not in self._caches:
+            self._caches[dimension] = KeyCache(DIMENSIONS[dimension])
+        return self._caches[dimension]
+
+    def load(self, table_name: str, records: List[Dict[str, Any]]) -> int:
+        """Grava no fato SILVER o mesmo lote inserido na BRZ (mesmo formato do bulk_insert)."""
+        fact = FACTS.get(table_name.upper())
+        if fact is None or not records:
+            return 0
+
+        with self.connector.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                keys: List[Tuple[FactKey, Dict[Tuple[Any, ...], int]]] = []
+                for fk in fact.keys:
+                    members: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+                    for r in records:
+                        members.setdefault(natural_key(fk, r), tuple(r.get(a) if a else None for a in fk.attributes))
+                    keys.append((fk, self._cache(fk.dimension).keys(cursor, members)))
+
+                rows = [
+                    (r[fact.date_column],
+                     *(cache[natural_key(fk, r)] for fk, cache in keys),
+                     *(r.get(m) for m in fact.measures))
+                    for r in records
+                ]
+                query = (f"INSERT INTO {fact.table} ({', '.join(fact.columns)}) "
+                         f"VALUES ({', '.join(f':{i}' for i in range(len(fact.columns)))})")
+                for i in range(0, len(rows), self.batch_size):
+                    cursor.executemany(query, rows[i:i + self.batch_size])
+            finally:
+                cursor.close()
+
+        for table in derived_tables(table_name):
+            self.connector.bump_data_version(table, len(rows))
+        return len(rows)
+
+    def rebuild(self, table_name: Optional[str] = None,
+                dt_ini: Optional[date] = None, dt_fim: Optional[date] = None) -> Dict[str, int]:
+        """
+        Reconstrói os fatos SILVER (todos ou o da tabela BRZ), no período informado ou
+        inteiro, a partir das BRZ_*. Retorna {fato: linhas gravadas}.
+        """
+        sources = [table_name.upper()] if table_name else list(FACTS)
+        out: Dict[str, int] = {}
+        for source in sources:
+            fact = FACTS[source]
+            col = fact.date_column
+            src_range = f"(:dt_ini IS NULL OR b.{col} >= :dt_ini) AND (:dt_fim IS NULL OR b.{col} < :dt_fim + 1)"
+            fact_range = f"(:dt_ini IS NULL OR {col} >= :dt_ini) AND (:dt_fim IS NULL OR {col} < :dt_fim + 1)"
+            merges = ";\n".join(merge_members_sql(fk, source, src_range) for fk in fact.keys)
+            block = f"""
+            BEGIN
+                {merges};
+                DELETE FROM {fact.table} WHERE {fact_range};
+                INSERT INTO {fact.table} ({', '.join(fact.columns)}) {fact_select_sql(source, src_range)};
+                :rows := SQL%ROWCOUNT;
+            END;
+            """
+            with self.connector.get_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    rows = cursor.var(int)
+                    cursor.execute(block, {"dt_ini": dt_ini, "dt_fim": dt_fim, "rows": rows})
+                    out[fact.table] = int(rows.getvalue() or 0)
+                finally:
+                    cursor.close()
+
+            for table in derived_tables(source):
+                self.connector.bump_data_version(table, out[fact.table])
+        # Membros novos criados pelo MERGE: o próximo load relê as dimensões
+        self._caches.clear()
+        return out
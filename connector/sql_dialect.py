@@ -0,0 +1,140 @@
+"""
+Tradução do SQL Oracle dos repositórios para DuckDB
+
+Cobre o que os repositórios usam:
+- NVL(a, b)                    -> COALESCE(a, b)
+- TRUNC(x) / TRUNC(x, 'MM')    -> CAST(x AS DATE) / CAST(date_trunc('month', x) AS DATE)
+- SYSDATE / SYSTIMESTAMP       -> CURRENT_DATE / CURRENT_TIMESTAMP (SYSDATE sempre aparece truncado)
+- FETCH FIRST n ROWS ONLY      -> LIMIT n
+- FROM dual                    -> (removido; DuckDB aceita SELECT sem FROM)
+- :bind                        -> $bind
+Literais entre aspas simples nunca são alterados.
+
+Datas no Parquet são DATE (as colunas BRZ são DATE sem hora), então
+"data + n" e "data - data" têm o mesmo significado (dias) nos dois bancos.
+SQL que não traduz bem pode ter uma variante própria (query_dicts(..., variants=...)).
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+_LITERAL_RE = re.compile(r"('(?:[^']|'')*')")
+_BIND_RE = re.compile(r"(?<![:\w$]):([A-Za-z_]\w*)")
+
+_TRUNC_UNITS = {
+    "MM": "month", "MON": "month", "MONTH": "month",
+    "YYYY": "year", "YEAR": "year", "Y": "year",
+    "Q": "quarter",
+    "IW": "week",
+}
+
+# Substituições simples (fora de literais)
+_SIMPLE = [
+    (re.compile(r"\bNVL\s*\(", re.IGNORECASE), "COALESCE("),
+    (re.compile(r"\bSYSTIMESTAMP\b", re.IGNORECASE), "CURRENT_TIMESTAMP"),
+    (re.compile(r"\bSYSDATE\b", re.IGNORECASE), "CURRENT_DATE"),
+    (re.compile(r"\bFETCH\s+(?:FIRST|NEXT)\s+(\d+|:\w+)\s+ROWS?\s+ONLY\b", re.IGNORECASE), r"LIMIT \1"),
+    (re.compile(r"\bFROM\s+dual\b", re.IGNORECASE), ""),
+]
+
+
+def _map_code(sql: str, fn: Callable[[str], str]) -> str:
+    """Aplica fn só nos trechos fora de literais."""
+    parts = _LITERAL_RE.split(sql)
+    return "".join(p if i % 2 else fn(p) for i, p in enumerate(parts))
+
+
+def _find_close(sql: str, start: int) -> int:
+    """Índice do ')' que fecha o '(' em start (ignorando literais)."""
+    depth = 0
+    i = start
+    while i < len(sql):
+        ch = sql[i]
+        if ch == "'":
+            i = sql.index("'", i + 1)
+            while i + 1 < len(sql) and sql[i + 1] == "'":
+                i = sql.index("'", i + 2)
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("Parênteses desbalanceados no SQL")
+
+
+def _split_args(args: str) -> List[str]:
+    out, depth, quote, cur = [], 0, False, []
+    for ch in args:
+        if ch == "'":
+            quote = not quote
+        elif not quote and ch == "(":
+            depth += 1
+        elif not quote and ch == ")":
+            depth -= 1
+        elif not quote and depth == 0 and ch == ",":
+            out.append("".join(cur))
+            cur = []
+            continue
+        cur.append(ch)
+    out.append("".join(cur))
+    return out
+
+
+def _translate_trunc(sql: str) -> str:
+    pattern = re.compile(r"\bTRUNC\s*\(", re.IGNORECASE)
+    pos = 0
+    out = []
+    while True:
+        m = pattern.search(sql, pos)
+        # Ignora ocorrências dentro de literais (número ímpar de aspas antes)
+        while m and sql.count("'", 0, m.start()) % 2:
+            m = pattern.search(sql, m.end())
+        if not m:
+            out.append(sql[pos:])
+            return "".join(out)
+        open_idx = m.end() - 1
+        close_idx = _find_close(sql, open_idx)
+        args = _split_args(sql[open_idx + 1:close_idx])
+        expr = _translate_trunc(args[0].strip())
+        unit = args[1].strip().strip("'").upper() if len(args) > 1 else "DD"
+
+        if unit in ("DD", "DDD", "J"):
+            repl = f"CAST({expr} AS DATE)"
+        elif unit in _TRUNC_UNITS:
+            repl = f"CAST(date_trunc('{_TRUNC_UNITS[unit]}', {expr}) AS DATE)"
+        else:
+            raise ValueError(f"TRUNC com formato não suportado no DuckDB: {unit}")
+
+        out.append(sql[pos:m.start()])
+        out.append(repl)
+        pos = close_idx + 1
+
+
+@lru_cache(maxsize=512)
+def to_duckdb(sql: str) -> str:
+    """SQL Oracle dos repositórios -> SQL DuckDB (resultado em cache por texto)."""
+    def code(part: str) -> str:
+        for rx, repl in _SIMPLE:
+            part = rx.sub(repl, part)
+        return _BIND_RE.sub(r"$\1", part)
+
+    return _map_code(_translate_trunc(sql), code)
+
+
+@lru_cache(maxsize=512)
+def bind_names(sql: str) -> frozenset:
+    """Binds ($nome) usados no SQL já traduzido."""
+    names: set = set()
+    _map_code(sql, lambda part: names.update(re.findall(r"\$([A-Za-z_]\w*)", part)) or part)
+    return frozenset(names)
+
+
+def duckdb_params(sql: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """DuckDB exige exatamente os binds do SQL (o Oracle ignora os que sobram)."""
+    names = bind_names(sql)
+    return {k: v for k, v in (params or {}).items() if k in names}
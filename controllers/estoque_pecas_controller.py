@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 import sys
-import inspect
 from pathlib import Path
 from datetime import datetime, date
 from typing import Any, Dict, List, Optional
@@ -15,8 +14,10 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from connector.oracle_connector import OracleConnector
+from connector.parquet_store import ParquetStore
 from utils.csv_handler import CSVHandler
 from utils.logger_controller import LoggerController
+from utils.tracing import tracer, traced
 from models.models import BRZEstoquePecas
 
 
@@ -30,27 +31,32 @@ logger = LoggerController(logfile)
 
 class EstoquePecasController:
     TABLE_NAME = "BRZ_ESTOQUE_PECAS"
+    PARTITION_COLUMN = None  # partição mensal no Parquet
 
     def __init__(
         self,
         connector: Optional[OracleConnector] = None,
         csv_handler: Optional[CSVHandler] = None,
         log_directory: str = "logs",
+        parquet_store: Optional[ParquetStore] = None,
     ):
         self.logger = logger
-        self.connector = connector or OracleConnector()
+        self.connector = connector or OracleConnector(target="write")
         self.csv_handler = csv_handler or CSVHandler(log_directory=log_directory)
+        # Cópia em Parquet para o backend local (DuckDB); None se [PARQUET] desabilitado
+        self.parquet_store = parquet_store or ParquetStore.from_config()
 
     # -------------------------
     # Pipeline principal
     # -------------------------
+    # ETL roda poucas vezes e gera poucos spans (etapas/lotes): trace sempre amostrado
+    @traced(f"etl.{NOME}", sample=1.0)
     def run(self, csv_path: str) -> int:
         """
         Lê CSV -> padroniza -> valida (Pydantic) -> bulk insert no Oracle.
         Retorna quantidade inserida.
         """
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"Iniciando ETL: {csv_path}")
+        self.logger.info("Iniciando ETL: %s", csv_path)
 
         read_result = self.csv_handler.read_csv(
             csv_path,
@@ -60,32 +66,45 @@ class EstoquePecasController:
 
         df = read_result.df
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"[{NOME}] Linhas lidas do CSV: {len(df)} | Delimitador detectado: '{read_result.delimiter}'")
+        self.logger.info("[%s] Linhas lidas do CSV: %s | Delimitador detectado: '%s'", NOME, len(df), read_result.delimiter)
 
         print("\nDataFrame: ")
         print(df)
 
         records = self._transform_to_brz_records(df)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"[{NOME}] Registros prontos para insert: {len(records)}")
+        self.logger.info("[%s] Registros prontos para insert: %s", NOME, len(records))
 
         if not records:
-            context = inspect.currentframe()
-            self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"[{NOME}] Nada para inserir.")
+            self.logger.info("[%s] Nada para inserir.", NOME)
             return 0
 
         inserted = self.connector.bulk_insert(self.TABLE_NAME, records)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", "INFO:", f"[{NOME}] Inseridos no Oracle: {inserted}")
+        self.logger.info("[%s] Inseridos no Oracle: %s", NOME, inserted)
+        tracer.current().set(csv=os.path.basename(csv_path), rows=len(df), inserted=inserted)
+
+        # Nova versão dos dados: o cache do dashboard das queries sobre a tabela é invalidado
+        if inserted:
+            self.connector.bump_data_version(self.TABLE_NAME, inserted)
+
+        if inserted and self.parquet_store:
+            try:
+                self.parquet_store.write_table(self.TABLE_NAME, records, self.PARTITION_COLUMN)
+            except Exception as e:
+                # O Oracle já está carregado: falha no Parquet não derruba o ETL
+                self.logger.error("[%s] ❌ Falha ao gravar Parquet: %s", NOME, e)
         return inserted
 
     # -------------------------
     # Transformações
     # -------------------------
     def _transform_to_brz_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Mapeia as colunas do CSV para BRZ_* e valida cada linha (Pydantic)."""
+        return self._validate_records(self._map_to_brz_rows(df))
+
+    @traced("etl.transform")
+    def _map_to_brz_rows(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
         Converte DataFrame (colunas do CSV) em lista de dicts com colunas BRZ_*.
         Aqui mantemos o mínimo (base limpa). Tratamentos por base virão depois.
@@ -142,6 +161,14 @@ class EstoquePecasController:
                 "CODIGO_PECA_ESTOQUE": self._safe_str(row.get("Codigo_da_Peca_no_Estoque")),
             }
 
+            out.append(brz)
+
+        return out
+
+    @traced("etl.validate")
+    def _validate_records(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for brz in rows:
             # Validação Pydantic usando o model como contrato [file:35]
             try:
                 model = BRZEstoquePecas(**brz)
@@ -149,9 +176,9 @@ class EstoquePecasController:
                 out.append(model.model_dump(by_alias=True, exclude={"ID_ESTOQUE_PECA"}, exclude_none=False))
             except Exception as e:
                 # Por ora: loga e ignora a linha (tratamento fino depois)
-                context = inspect.currentframe()
-                self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "ERRO!!!", f"[{NOME}] Linha ignorada por erro de validação: {e}")
+                self.logger.error("[%s] Linha ignorada por erro de validação: %s", NOME, e)
 
+        tracer.current().set(rows=len(rows), rejected=len(rows) - len(out))
         return out
 
     # -------------------------
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 import sys
-import inspect
 from datetime import datetime, date
 from typing import Any, Dict, List, Optional
 
@@ -14,8 +13,10 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from connector.oracle_connector import OracleConnector  # [file:39]
+from connector.parquet_store import ParquetStore
 from utils.csv_handler import CSVHandler
 from utils.logger_controller import LoggerController
+from utils.tracing import tracer, traced
 from models.models import BRZEstoqueVeiculos
 
 NOME = "EstoqueVeiculosController"
@@ -29,24 +30,28 @@ logger = LoggerController(logfile)
 
 class EstoqueVeiculosController:
     TABLE_NAME = "BRZ_ESTOQUE_VEICULOS"  # [file:34]
+    PARTITION_COLUMN = None  # partição mensal no Parquet
 
     def __init__(
         self,
         connector: Optional[OracleConnector] = None,
         csv_handler: Optional[CSVHandler] = None,
         log_directory: str = "logs",
+        parquet_store: Optional[ParquetStore] = None,
     ):
         self.logger = logger
-        self.connector = connector or OracleConnector()
+        self.connector = connector or OracleConnector(target="write")
         self.csv_handler = csv_handler or CSVHandler(log_directory=log_directory)
+        # Cópia em Parquet para o backend local (DuckDB); None se [PARQUET] desabilitado
+        self.parquet_store = parquet_store or ParquetStore.from_config()
 
     # -------------------------
     # Pipeline principal
     # -------------------------
+    # ETL roda poucas vezes e gera poucos spans (etapas/lotes): trace sempre amostrado
+    @traced(f"etl.{NOME}", sample=1.0)
     def run(self, csv_path: str) -> int:
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",
-                        f"Iniciando ETL: {csv_path}")
+        self.logger.info("Iniciando ETL: %s", csv_path)
 
         read_result = self.csv_handler.read_csv(
             csv_path,
@@ -55,24 +60,32 @@ class EstoqueVeiculosController:
         )
 
         df = read_result.df
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"[{NOME}] Linhas lidas do CSV: {len(df)} | Delimitador detectado: '{read_result.delimiter}'")
+        self.logger.info("[%s] Linhas lidas do CSV: %s | Delimitador detectado: '%s'", NOME, len(df), read_result.delimiter)
 
         df = self._fix_duplicate_dt_entrada_columns(df)
         df = self._dedupe_rows(df)
 
         records = self._transform_to_brz_records(df)
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",f"[{NOME}] Registros prontos para insert: {len(records)}")
+        self.logger.info("[%s] Registros prontos para insert: %s", NOME, len(records))
 
         if not records:
-            context = inspect.currentframe()
-            self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",f"[{NOME}] Nada para inserir.")
+            self.logger.info("[%s] Nada para inserir.", NOME)
             return 0
 
         inserted = self.connector.bulk_insert(self.TABLE_NAME, records)
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",f"[{NOME}] Inseridos no Oracle: {inserted}")
+        self.logger.info("[%s] Inseridos no Oracle: %s", NOME, inserted)
+        tracer.current().set(csv=os.path.basename(csv_path), rows=len(df), inserted=inserted)
+
+        # Nova versão dos dados: o cache do dashboard das queries sobre a tabela é invalidado
+        if inserted:
+            self.connector.bump_data_version(self.TABLE_NAME, inserted)
+
+        if inserted and self.parquet_store:
+            try:
+                self.parquet_store.write_table(self.TABLE_NAME, records, self.PARTITION_COLUMN)
+            except Exception as e:
+                # O Oracle já está carregado: falha no Parquet não derruba o ETL
+                self.logger.error("[%s] ❌ Falha ao gravar Parquet: %s", NOME, e)
         return inserted
 
     # -------------------------
@@ -86,8 +99,7 @@ class EstoqueVeiculosController:
             return "0"
         # fallback: mantém o próprio valor (ajuste se tiver outros mapeamentos)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"Coluna 'COD_CONCESSIONARIA' tratada.")
+        self.logger.info("Coluna 'COD_CONCESSIONARIA' tratada.")
         return nome_concessionaria.strip()
 
     def _map_cod_filial(self, nome_filial: Optional[str], cod_concessionaria: Optional[str]) -> Optional[str]:
@@ -111,13 +123,13 @@ class EstoqueVeiculosController:
         if cod_concessionaria:
             return f"{cod_concessionaria}-1-0"
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"Coluna 'COD_FILIAL' tratada.")
+        self.logger.info("Coluna 'COD_FILIAL' tratada.")
         return nome_filial.strip()
 
     # -------------------------
     # Correção de colunas repetidas
     # -------------------------
+    @traced("etl.fix_dt_entrada")
     def _fix_duplicate_dt_entrada_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         No CSV a coluna 'Data_de_Entrada_do_Veiculo_no_Estoque' aparece 3 vezes. [file:42]
@@ -153,14 +165,13 @@ class EstoqueVeiculosController:
         to_drop = [c for c in cols if c != canonical and c in df.columns]
         df = df.drop(columns=to_drop)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",
-                        f"DT_ENTRADA: mantida='{canonical}', removidas={to_drop}")
+        self.logger.info("DT_ENTRADA: mantida='%s', removidas=%s", canonical, to_drop)
         return df
 
     # -------------------------
     # Deduplicação de linhas
     # -------------------------
+    @traced("etl.dedupe")
     def _dedupe_rows(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Como o CSV não traz chassi/placa, dedupe por conjunto estável.
@@ -182,15 +193,19 @@ class EstoqueVeiculosController:
         df = df.drop_duplicates(subset=subset, keep="first") if subset else df.drop_duplicates(keep="first")
         after = len(df)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:",
-                        f"Dedup linhas: antes={before} depois={after} subset={subset if subset else 'FULL'}")
+        self.logger.info("Dedup linhas: antes=%s depois=%s subset=%s", before, after, subset if subset else 'FULL')
+        tracer.current().set(before=before, after=after)
         return df
 
     # -------------------------
     # Transformação para BRZ_*
     # -------------------------
     def _transform_to_brz_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Mapeia as colunas do CSV para BRZ_* e valida cada linha (Pydantic)."""
+        return self._validate_records(self._map_to_brz_rows(df))
+
+    @traced("etl.transform")
+    def _map_to_brz_rows(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
 
         def parse_date_dd_mm_yyyy(val: Any) -> Optional[date]:
@@ -239,15 +254,23 @@ class EstoqueVeiculosController:
                 "DT_ENTRADA_ESTOQUE": parse_date_dd_mm_yyyy(row.get("Data_de_Entrada_do_Veiculo_no_Estoque")),
             }
 
+            out.append(brz)
+
+        return out
+
+    @traced("etl.validate")
+    def _validate_records(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for brz in rows:
+            # Validação Pydantic usando o model como contrato
             try:
                 model = BRZEstoqueVeiculos(**brz)
                 # Identity existe no model, então excluir explicitamente do insert
                 out.append(model.model_dump(by_alias=True, exclude={"ID_ESTOQUE_VEICULO"}, exclude_none=False))
             except Exception as e:
-                context = inspect.currentframe()
-                self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno,
-                                "ERRO!!!", f"[{NOME}] Linha ignorada por erro de validação: {e}")
+                self.logger.error("[%s] Linha ignorada por erro de validação: %s", NOME, e)
 
+        tracer.current().set(rows=len(rows), rejected=len(rows) - len(out))
         return out
 
     # -------------------------
@@ -280,8 +303,7 @@ class EstoqueVeiculosController:
 
         # fallback: tenta extrair número (se vier algo diferente)
 
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"Coluna 'TEMPO_TOTAL_ESTOQUE_DIAS' tratada.")
+        self.logger.info("Coluna 'TEMPO_TOTAL_ESTOQUE_DIAS' tratada.")
         return self._safe_int(s)
 
     def _safe_str(self, v: Any) -> Optional[str]:
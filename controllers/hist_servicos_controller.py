@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 import sys
-import inspect
 from pathlib import Path
 from datetime import datetime, date
 from typing import Any, Dict, List, Optional
@@ -15,8 +14,16 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from connector.oracle_connector import OracleConnector
+from connector.parquet_store import ParquetStore
+from connector.customer_metrics import CustomerMetrics
+from connector.journey import CustomerJourney
+from connector.partition_exchange import PartitionExchange, month_end
+from connector.rollups import DailyRollup, affected_dates
+from connector.silver import SilverLoader
 from utils.csv_handler import CSVHandler
+from utils.customer_key import customer_columns, oracle_records
 from utils.logger_controller import LoggerController
+from utils.tracing import tracer, traced
 from models.models import BRZHistServicos
 
 
@@ -30,27 +37,38 @@ logger = LoggerController(logfile)
 
 class HistServicosController:
     TABLE_NAME = "BRZ_HIST_SERVICOS"
+    PARTITION_COLUMN = "DT_REALIZACAO_SERVICO"  # partição mensal no Parquet
 
     def __init__(
         self,
         connector: Optional[OracleConnector] = None,
         csv_handler: Optional[CSVHandler] = None,
         log_directory: str = "logs",
+        parquet_store: Optional[ParquetStore] = None,
     ):
         self.logger = logger
-        self.connector = connector or OracleConnector()
+        self.connector = connector or OracleConnector(target="write")
         self.csv_handler = csv_handler or CSVHandler(log_directory=log_directory)
+        # Cópia em Parquet para o backend local (DuckDB); None se [PARQUET] desabilitado
+        self.parquet_store = parquet_store or ParquetStore.from_config()
+        # Agregado diário, jornada pós-venda e métricas de clientes; None se desabilitados no .ini
+        self.rollup = DailyRollup.from_config(self.connector)
+        self.journey = CustomerJourney.from_config(self.connector)
+        self.customer_metrics = CustomerMetrics.from_config(self.connector)
+        # Camada SILVER (chaves substitutas); None se [SILVER] desabilitado
+        self.silver = SilverLoader.from_config(self.connector)
 
     # -------------------------
     # Pipeline principal
     # -------------------------
+    # ETL roda poucas vezes e gera poucos spans (etapas/lotes): trace sempre amostrado
+    @traced(f"etl.{NOME}", sample=1.0)
     def run(self, csv_path: str) -> int:
         """
         Lê CSV -> padroniza -> valida (Pydantic) -> bulk insert no Oracle.
         Retorna quantidade inserida.
         """
-        context = inspect.currentframe()
-        self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "INFO:", f"Iniciando ETL: {csv_path}")
+        self.logger.info("Iniciando ETL: %s", csv_path)
 
         read_result = self.csv_handler.read_csv(
             csv_path,
@@ -59,26 +77,127 @@ class HistServicosController:
         )
 
         df = read_result.df
-        self.logger.info(f"[{NOME}] Linhas lidas do CSV: {len(df)} | Delimitador detectado: '{read_result.delimiter}'")
+        self.logger.info("[%s] Linhas lidas do CSV: %s | Delimitador detectado: '%s'", NOME, len(df), read_result.delimiter)
 
         print("\nDataFrame: ")
         print(df)
 
         records = self._transform_to_brz_records(df)
-        self.logger.info(f"[{NOME}] Registros prontos para insert: {len(records)}")
+        self.logger.info("[%s] Registros prontos para insert: %s", NOME, len(records))
 
         if not records:
-            self.logger.info(f"[{NOME}] Nada para inserir.")
+            self.logger.info("[%s] Nada para inserir.", NOME)
             return 0
 
-        inserted = self.connector.bulk_insert(self.TABLE_NAME, records)
-        self.logger.info(f"[{NOME}] Inseridos no Oracle: {inserted}")
+        inserted = self.connector.bulk_insert(self.TABLE_NAME, self._oracle_records(records))
+        self.logger.info("[%s] Inseridos no Oracle: %s", NOME, inserted)
+        tracer.current().set(csv=os.path.basename(csv_path), rows=len(df), inserted=inserted)
+
+        # Agregado diário (AGG_DIARIO_FILIAL): recalcula só os dias presentes no lote
+        if inserted and self.rollup:
+            try:
+                days = self.rollup.refresh(self.TABLE_NAME, affected_dates(records, self.PARTITION_COLUMN))
+                self.logger.info("[%s] Agregado diário atualizado: %s dias", NOME, days)
+            except Exception as e:
+                # Carga já confirmada: o agregado pode ser refeito com mains/main_rollup_rebuild.py
+                self.logger.error("[%s] ❌ Falha ao atualizar o agregado diário: %s", NOME, e)
+
+        # Jornada pós-venda (AGG_JORNADA_CLIENTE): recalcula só as vendas tocadas pelo lote
+        if inserted and self.journey:
+            try:
+                touched = self.journey.refresh(self.TABLE_NAME, records)
+                self.logger.info("[%s] Jornada pós-venda atualizada: %s dias/clientes", NOME, touched)
+            except Exception as e:
+                # Carga já confirmada: a jornada pode ser refeita com mains/main_journey_rebuild.py
+                self.logger.error("[%s] ❌ Falha ao atualizar a jornada pós-venda: %s", NOME, e)
+
+        # Métricas por cliente (AGG_CLIENTE_METRICAS): MERGE só dos clientes x meses do lote
+        if inserted and self.customer_metrics:
+            try:
+                pairs = self.customer_metrics.refresh(self.TABLE_NAME, records)
+                self.logger.info("[%s] Métricas de clientes atualizadas: %s clientes/meses", NOME, pairs)
+            except Exception as e:
+                # Carga já confirmada: as métricas podem ser refeitas com mains/main_cliente_metricas_rebuild.py
+                self.logger.error("[%s] ❌ Falha ao atualizar as métricas de clientes: %s", NOME, e)
+
+        # Camada SILVER (SLV_FATO_* / DIM_*): mesmo lote, só chaves e medidas
+        if inserted and self.silver:
+            try:
+                rows = self.silver.load(self.TABLE_NAME, records)
+                self.logger.info("[%s] Fato SILVER atualizado: %s linhas", NOME, rows)
+            except Exception as e:
+                # Carga já confirmada: o fato pode ser refeito com mains/main_silver_rebuild.py
+                self.logger.error("[%s] ❌ Falha ao atualizar a camada SILVER: %s", NOME, e)
+
+        # Nova versão dos dados: o cache do dashboard das queries sobre a tabela é invalidado
+        if inserted:
+            self.connector.bump_data_version(self.TABLE_NAME, inserted)
+
+        if inserted and self.parquet_store:
+            try:
+                self.parquet_store.write_table(self.TABLE_NAME, records, self.PARTITION_COLUMN)
+            except Exception as e:
+                # O Oracle já está carregado: falha no Parquet não derruba o ETL
+                self.logger.error("[%s] ❌ Falha ao gravar Parquet: %s", NOME, e)
         return inserted
+
+    @traced(f"etl.{NOME}.backfill", sample=1.0)
+    def run_backfill(self, csv_path: str) -> int:
+        """
+        Recarga de meses inteiros por troca de partição (opção particionada da tabela):
+        cada mês presente no CSV substitui o mês inteiro no Oracle e no Parquet.
+        Retorna quantidade carregada.
+        """
+        self.logger.info("Iniciando backfill por troca de partição: %s", csv_path)
+
+        df = self.csv_handler.read_csv(csv_path, normalize_columns=True, save_rejected_rows=True).df
+        records = self._transform_to_brz_records(df)
+        if not records:
+            self.logger.info("[%s] Nada para carregar.", NOME)
+            return 0
+
+        months = PartitionExchange(self.connector).load_months(
+            self.TABLE_NAME, self._oracle_records(records), self.PARTITION_COLUMN
+        )
+        loaded = sum(months.values())
+        self.logger.info("[%s] Meses trocados: %s (%s linhas)", NOME, len(months), loaded)
+        tracer.current().set(csv=os.path.basename(csv_path), months=len(months), loaded=loaded)
+
+        # Agregado diário, jornada pós-venda e métricas de clientes: recalcula os meses trocados
+        for month in months:
+            try:
+                if self.rollup:
+                    self.rollup.rebuild(self.TABLE_NAME, month, month_end(month))
+                if self.journey:
+                    self.journey.refresh_period(self.TABLE_NAME, month, month_end(month))
+                if self.customer_metrics:
+                    self.customer_metrics.rebuild(self.TABLE_NAME, month, month_end(month))
+                if self.silver:
+                    self.silver.rebuild(self.TABLE_NAME, month, month_end(month))
+            except Exception as e:
+                # Carga já confirmada: refazer com mains/main_rollup_rebuild.py / main_journey_rebuild.py /
+                # main_cliente_metricas_rebuild.py / main_silver_rebuild.py
+                self.logger.error("[%s] ❌ Falha ao recalcular agregados de %s: %s", NOME, f"{month:%Y-%m}", e)
+
+        if loaded:
+            self.connector.bump_data_version(self.TABLE_NAME, loaded)
+
+        if loaded and self.parquet_store:
+            try:
+                self.parquet_store.replace_months(self.TABLE_NAME, records, self.PARTITION_COLUMN)
+            except Exception as e:
+                self.logger.error("[%s] ❌ Falha ao gravar Parquet: %s", NOME, e)
+        return loaded
     
     # -------------------------
     # Transformações
     # -------------------------
     def _transform_to_brz_records(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Mapeia as colunas do CSV para BRZ_* e valida cada linha (Pydantic)."""
+        return self._validate_records(self._map_to_brz_rows(df))
+
+    @traced("etl.transform")
+    def _map_to_brz_rows(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
         """
         Converte DataFrame (colunas do CSV) em lista de dicts com colunas BRZ_*.
         Aqui mantemos o mínimo (base limpa). Tratamentos por base virão depois.
@@ -117,7 +236,17 @@ class HistServicosController:
                 "NOME_MECANICO": self._safe_str(row.get("Nome_Do_Mecanico_Que_Fez_O_Servico", "")).strip() or None,
                 "NOME_CLIENTE": self._safe_str(row.get("Nome_Do_Cliente_Que_Fez_O_Servico", "")).strip() or None,
             }
+            # Chave normalizada do cliente (mesma regra de veículos/peças, inclusive o reparo de mojibake)
+            brz.update(customer_columns(brz["NOME_CLIENTE"]))
+
+            out.append(brz)
 
+        return out
+
+    @traced("etl.validate")
+    def _validate_records(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for brz in rows:
             # Validação Pydantic usando o model como contrato [file:35]
             try:
                 model = BRZHistServicos(**brz)
@@ -125,14 +254,22 @@ class HistServicosController:
                 out.append(model.model_dump(by_alias=True, exclude={"ID_SERVICO"}, exclude_none=False))
             except Exception as e:
                 # Por ora: loga e ignora a linha (tratamento fino depois)
-                context = inspect.currentframe()
-                self.logger.log(NOME, os.path.dirname(__file__), __name__, context.f_lineno, "ERRO!!!", f"[{NOME}] Linha ignorada por erro de validação: {e}")
+                self.logger.error("[%s] Linha ignorada por erro de validação: %s", NOME, e)
 
+        tracer.current().set(rows=len(rows), rejected=len(rows) - len(out))
         return out
     
     # -------------------------
     # Helpers
     # -------------------------
+    def _oracle_records(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Lote do INSERT: sem CLIENTE_KEY/CLIENTE_HASH enquanto a migração V003 não criou as colunas."""
+        rows = oracle_records(self.connector, self.TABLE_NAME, records)
+        if rows is not records:
+            self.logger.warning("[%s] ⚠️ %s sem CLIENTE_KEY/CLIENTE_HASH: carga sem a chave do cliente "
+                                "(aplicar V003 e rodar mains/main_backfill_cliente_key.py)", NOME, self.TABLE_NAME)
+        return rows
+
     def _safe_str(self, v: Any) -> Optional[str]:
         if v is None:
             return None
@@ -0,0 +1,105 @@
+# mains/main_backfill_cliente_key.py
+
+"""
+Preenche CLIENTE_KEY / CLIENTE_HASH no histórico já carregado.
+
+Cargas novas já gravam as colunas (controllers); rodar isto uma vez depois do
+script "sql/BRONZE - ALTER TABLE BRZ_HIST ADD CLIENTE_KEY.sql":
+    python mains/main_backfill_cliente_key.py
+    python mains/main_backfill_cliente_key.py --table BRZ_HIST_SERVICOS --all
+    python mains/main_backfill_cliente_key.py --parquet-only
+
+A chave sai de utils/customer_key.py (mojibake + acentos + espaços + maiúsculas),
+a mesma regra do ETL: por isso o cálculo é em Python (uma vez por nome distinto).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.oracle_connector import OracleConnector
+from connector.parquet_store import ParquetStore
+from utils.customer_key import HASH_COLUMN, KEY_COLUMN, NAME_COLUMNS, customer_columns
+
+
+def backfill_oracle(connector: OracleConnector, table: str, recompute: bool, batch_size: int) -> int:
+    """
+    Atualiza as linhas da tabela por ROWID (uma leitura da tabela, UPDATE em lotes;
+    NOME_* não tem índice, então um UPDATE por nome varreria a tabela a cada nome).
+    Retorna linhas atualizadas.
+    """
+    name_col = NAME_COLUMNS[table]
+    pending = "" if recompute else f" AND {HASH_COLUMN} IS NULL"
+    select = f"SELECT ROWIDTOCHAR(ROWID), {name_col} FROM {table} WHERE {name_col} IS NOT NULL{pending}"
+    update = f"UPDATE {table} SET {KEY_COLUMN} = :k, {HASH_COLUMN} = :h WHERE ROWID = CHARTOROWID(:rid)"
+
+    keys: Dict[str, Dict[str, Any]] = {}
+    total = 0
+    with connector.get_connection() as conn:
+        reader, writer = conn.cursor(), conn.cursor()
+        try:
+            reader.arraysize = batch_size
+            reader.execute(select)
+            while True:
+                rows = reader.fetchmany(batch_size)
+                if not rows:
+                    break
+                batch = []
+                for rid, nome in rows:
+                    cols = keys.get(nome)
+                    if cols is None:
+                        cols = keys[nome] = customer_columns(nome)
+                    batch.append({"k": cols[KEY_COLUMN], "h": cols[HASH_COLUMN], "rid": rid})
+                writer.executemany(update, batch)
+                total += len(batch)
+        finally:
+            reader.close()
+            writer.close()
+
+    if total:
+        connector.bump_data_version(table, total)
+    return total
+
+
+def backfill_parquet(store: ParquetStore, table: str) -> int:
+    name_col = NAME_COLUMNS[table]
+
+    def add_keys(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [{**r, **customer_columns(r.get(name_col))} for r in records]
+
+    return store.rewrite_table(table, add_keys)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preenche CLIENTE_KEY / CLIENTE_HASH no histórico")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--table", choices=sorted(NAME_COLUMNS), help="Só esta tabela")
+    parser.add_argument("--all", action="store_true", help="Recalcula também as linhas já preenchidas")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--parquet-only", action="store_true", help="Só a cópia Parquet ([PARQUET] no .ini)")
+    args = parser.parse_args()
+
+    tables = [args.table] if args.table else list(NAME_COLUMNS)
+    store = ParquetStore.from_config(args.config)
+    connector = None if args.parquet_only else OracleConnector(config_file=args.config, target="write")
+
+    for table in tables:
+        t0 = time.perf_counter()
+        if connector:
+            rows = backfill_oracle(connector, table, args.all, args.batch_size)
+            print(f"[main_backfill_cliente_key] {table}: {rows} linhas atualizadas no Oracle")
+        if store:
+            rows = backfill_parquet(store, table)
+            print(f"[main_backfill_cliente_key] {table}: {rows} linhas reescritas no Parquet")
+        print(f"[main_backfill_cliente_key] {table} concluída em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# mains/main_backfill_mes.py
+
+"""
+Recarga de meses inteiros por troca de partição (opção particionada das BRZ_HIST_*).
+
+Cada mês presente no CSV substitui o mês inteiro na tabela (connector/partition_exchange.py),
+no agregado diário, na jornada pós-venda e no Parquet. Para cargas do dia a dia,
+usar os mains normais (main_hist_*). Exige as tabelas criadas com
+"sql/BRONZE PARTICIONADO - ..." (ou migradas com "sql/BRONZE PARTICIONADO - MIGRAR BRZ_HIST.sql").
+
+    python mains/main_backfill_mes.py --table servicos
+    python mains/main_backfill_mes.py --table veiculos --csv bases/vendas-2024-03.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from views.hist_servicos_view import HistServicosView
+from views.hist_vendas_pecas_view import HistVendasPecasView
+from views.hist_vendas_veiculos_view import HistVendasVeiculosView
+
+# tabela -> (view, CSV padrão em bases/)
+TABLES = {
+    "veiculos": (HistVendasVeiculosView, "historico-de-vendas-de-veiculos.csv"),
+    "pecas": (HistVendasPecasView, "historico-de-vendas-de-pecas.csv"),
+    "servicos": (HistServicosView, "historico-de-servicos-realizados.csv"),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recarga de meses inteiros por troca de partição")
+    parser.add_argument("--table", required=True, choices=sorted(TABLES))
+    parser.add_argument("--csv", help="CSV com os meses a substituir (padrão: o CSV da tabela em bases/)")
+    args = parser.parse_args()
+
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    view_cls, default_csv = TABLES[args.table]
+    csv_path = args.csv or os.path.join(base_dir, "bases", default_csv)
+
+    t0 = time.perf_counter()
+    loaded = view_cls().run_backfill(csv_path)
+
+    print(f"[main_backfill_mes] Linhas carregadas: {loaded}")
+    print(f"[main_backfill_mes] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# mains/main_cache_warmup.py
+
+"""
+Pré-aquece o cache de resultados do dashboard com os filtros padrão.
+
+Rodar depois das cargas (as versões em CTL_DATA_VERSION mudaram, então as chaves
+antigas não servem mais) ou antes de liberar um deploy:
+    python mains/main_cache_warmup.py
+    python mains/main_cache_warmup.py --workers 6 --only KpiRepository
+
+O resultado vai para o cache persistente ([CACHE] backend = disk em
+streamlit_app/config/config.ini), compartilhado com os processos do Streamlit.
+Com backend = none o warm-up só mede os tempos.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Garante import relativo do projeto (e do pacote repositories do dashboard)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'streamlit_app')))
+
+from repositories.base_repo import CACHE
+from repositories.warmup import default_calls, format_report, run_warmup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pré-aquece o cache de resultados do dashboard")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--workers", type=int, default=int(CACHE.get("warmup_workers", 4)),
+                        help="Chamadas simultâneas (padrão: [CACHE] warmup_workers)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="Filtra por prefixo de Classe.metodo (pode repetir)")
+    parser.add_argument("--list", action="store_true", help="Só lista as chamadas, sem executar")
+    args = parser.parse_args()
+
+    calls = default_calls(args.config)
+    if args.only:
+        calls = [c for c in calls if any(c.name.startswith(p) for p in args.only)]
+
+    if args.list:
+        for c in calls:
+            print(f"{c.name} {c.kwargs}")
+        return
+
+    results = run_warmup(calls, max_workers=args.workers, config_file=args.config)
+    print(format_report(results))
+
+    failed = [r for r in results if r.error]
+    print(f"[main_cache_warmup] {len(results) - len(failed)}/{len(results)} chamadas aquecidas")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
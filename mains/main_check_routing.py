@@ -0,0 +1,69 @@
+# mains/main_check_routing.py
+
+"""
+Confere o roteamento leitura/escrita do OracleConnector.
+
+- Mostra a seção/DSN efetiva de cada alvo (read/write) e o fallback das leituras
+- Executa um SELECT de identificação da sessão em cada alvo (serviço, host, papel do banco)
+- --simulate-read-down: marca o DSN de leitura como fora e mostra a leitura indo para o primário
+
+Teste local com dois endpoints: suba um segundo Oracle (ex.: porta 1522),
+descomente [ORACLE_DB_READ] / [ORACLE_DB_WRITE] em config/database.ini e rode:
+    python mains/main_check_routing.py
+    python mains/main_check_routing.py --simulate-read-down
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.oracle_connector import OracleConnector
+
+WHOAMI_SQL = """
+SELECT SYS_CONTEXT('USERENV', 'SERVICE_NAME')  AS SERVICE_NAME,
+       SYS_CONTEXT('USERENV', 'SERVER_HOST')   AS SERVER_HOST,
+       SYS_CONTEXT('USERENV', 'DATABASE_ROLE') AS DATABASE_ROLE
+FROM dual
+"""
+
+
+def check(connector: OracleConnector) -> None:
+    fallback = f"[{connector.fallback.name}] {connector.fallback.dsn}" if connector.fallback else "-"
+    print(f"[main_check_routing] target={connector.target:<5} -> [{connector.endpoint.name}] {connector.endpoint.dsn}"
+          f" | fallback: {fallback} | saudável: {connector.endpoint.healthy}")
+    try:
+        rows, stats = connector.run_select(WHOAMI_SQL)
+        row = rows[0] if rows else {}
+        print(f"    atendido por [{stats.endpoint}] service={row.get('SERVICE_NAME')} "
+              f"host={row.get('SERVER_HOST')} role={row.get('DATABASE_ROLE')} ({stats.total_ms:.1f} ms)")
+    except Exception as e:
+        print(f"    ❌ falhou: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confere o roteamento leitura/escrita do OracleConnector")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--simulate-read-down", action="store_true",
+                        help="Marca o DSN de leitura como indisponível antes de consultar")
+    args = parser.parse_args()
+
+    writer = OracleConnector(config_file=args.config, target="write")
+    reader = OracleConnector(config_file=args.config, target="read")
+
+    if args.simulate_read_down:
+        if reader.fallback is None:
+            print("[main_check_routing] Leitura e primário usam o mesmo DSN: não há fallback para simular.")
+        else:
+            reader.endpoint.mark_down(reader.health_cooldown_s)
+
+    check(writer)
+    check(reader)
+
+
+if __name__ == "__main__":
+    main()
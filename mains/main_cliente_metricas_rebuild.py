@@ -0,0 +1,46 @@
+# mains/main_cliente_metricas_rebuild.py
+
+"""
+Reconstrói as métricas por cliente AGG_CLIENTE_METRICAS a partir das tabelas BRZ_HIST_*.
+
+As cargas normais mantêm a tabela sozinhas (MERGE só dos clientes x meses tocados);
+rodar isto na carga inicial, depois de criar a tabela, ou para corrigir um período
+(meses inteiros que tocam dt-ini..dt-fim):
+    python mains/main_cliente_metricas_rebuild.py
+    python mains/main_cliente_metricas_rebuild.py --table BRZ_HIST_SERVICOS --dt-ini 2025-01-01 --dt-fim 2025-03-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.customer_metrics import CustomerMetrics, METRICS_SOURCES, METRICS_TABLE
+from connector.oracle_connector import OracleConnector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Reconstrói {METRICS_TABLE}")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--table", choices=sorted(METRICS_SOURCES), help="Só a origem desta tabela")
+    parser.add_argument("--dt-ini", type=date.fromisoformat, help="AAAA-MM-DD (padrão: desde o início)")
+    parser.add_argument("--dt-fim", type=date.fromisoformat, help="AAAA-MM-DD (padrão: até o fim)")
+    args = parser.parse_args()
+
+    metrics = CustomerMetrics(OracleConnector(config_file=args.config, target="write"))
+    t0 = time.perf_counter()
+    result = metrics.rebuild(args.table, args.dt_ini, args.dt_fim)
+
+    for table, rows in result.items():
+        print(f"[main_cliente_metricas_rebuild] {table}: {rows} linhas cliente x mês")
+    print(f"[main_cliente_metricas_rebuild] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# mains/main_journey_rebuild.py
+
+"""
+Reconstrói a jornada pós-venda AGG_JORNADA_CLIENTE a partir das tabelas BRZ_*.
+
+As cargas normais mantêm a tabela sozinhas (só as vendas tocadas); rodar isto
+na carga inicial, depois de criar a tabela, ou para corrigir um período de vendas:
+    python mains/main_journey_rebuild.py
+    python mains/main_journey_rebuild.py --dt-ini 2025-01-01 --dt-fim 2025-03-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.journey import CustomerJourney, JOURNEY_TABLE
+from connector.oracle_connector import OracleConnector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Reconstrói {JOURNEY_TABLE}")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--dt-ini", type=date.fromisoformat, help="Data da venda AAAA-MM-DD (padrão: desde o início)")
+    parser.add_argument("--dt-fim", type=date.fromisoformat, help="Data da venda AAAA-MM-DD (padrão: até o fim)")
+    args = parser.parse_args()
+
+    journey = CustomerJourney(OracleConnector(config_file=args.config, target="write"))
+    t0 = time.perf_counter()
+    rows = journey.rebuild(args.dt_ini, args.dt_fim)
+
+    print(f"[main_journey_rebuild] {rows} vendas na jornada")
+    print(f"[main_journey_rebuild] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# mains/main_migrate.py
+
+"""
+Aplica as migrações de schema pendentes (sql/migrations/V<versão>__<descrição>.sql).
+
+Versões aplicadas ficam em CTL_SCHEMA_VERSION; rodar de novo só aplica as novas:
+    python mains/main_migrate.py
+    python mains/main_migrate.py --status
+    python mains/main_migrate.py --dry-run          # lista os comandos sem executar
+    python mains/main_migrate.py --target 3         # aplica só até a V003
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.migrations import MigrationRunner, discover
+from connector.oracle_connector import OracleConnector
+
+
+def print_status(runner: MigrationRunner) -> None:
+    for migration, state, row in runner.status():
+        when = f"{row['APLICADO_EM']:%Y-%m-%d %H:%M}" if row and row.get("APLICADO_EM") else ""
+        print(f"[main_migrate] V{migration.version:03d} {migration.description:<32}{state:<10}{when}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrações de schema (CTL_SCHEMA_VERSION)")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--status", action="store_true", help="Só mostra aplicada/pendente/alterada por versão")
+    parser.add_argument("--dry-run", action="store_true", help="Lista os comandos das versões sem executar")
+    parser.add_argument("--target", type=int, help="Última versão a aplicar (padrão: todas)")
+    args = parser.parse_args()
+
+    if args.dry_run:
+        # Sem banco: mostra todas as versões do diretório (o filtro de pendentes precisa do Oracle)
+        for migration in discover():
+            if args.target is not None and migration.version > args.target:
+                break
+            print(f"[main_migrate] V{migration.version:03d} {migration.description} "
+                  f"({len(migration.statements)} comandos, checksum {migration.checksum[:12]})")
+            for statement in migration.statements:
+                print(f"    {statement.splitlines()[0]}")
+        return
+
+    runner = MigrationRunner(OracleConnector(config_file=args.config, target="write"))
+    if args.status:
+        print_status(runner)
+        return
+
+    t0 = time.perf_counter()
+    done = runner.migrate(target=args.target)
+    for migration in done:
+        print(f"[main_migrate] V{migration.version:03d} {migration.description} aplicada")
+    if not done:
+        print("[main_migrate] Nada pendente")
+    print(f"[main_migrate] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# mains/main_rfm_limiares.py
+
+"""
+Recalcula os limiares de quintil do RFM e grava uma nova linha em AGG_RFM_LIMIARES.
+
+A linha nova passa a valer no dashboard ([RFM] persisted = true); rodar quando a
+base de clientes mudou o bastante (ex.: mensal), não a cada carga:
+    python mains/main_rfm_limiares.py                      # últimos 365 dias
+    python mains/main_rfm_limiares.py --dt-ini 2025-01-01 --dt-fim 2025-12-31
+    python mains/main_rfm_limiares.py --parquet-only       # só a cópia Parquet (DuckDB)
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.duckdb_connector import DuckDBConnector
+from connector.oracle_connector import OracleConnector
+from connector.parquet_store import ParquetStore
+from connector.rfm import MEASURES, QUANTILES, RfmThresholds, THRESHOLDS_TABLE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Recalcula {THRESHOLDS_TABLE}")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--dt-ini", type=date.fromisoformat, help="Início do período de referência (padrão: dt-fim - 365 dias)")
+    parser.add_argument("--dt-fim", type=date.fromisoformat, default=date.today(), help="Fim do período (padrão: hoje)")
+    parser.add_argument("--parquet-only", action="store_true",
+                        help="Calcula sobre o Parquet ([PARQUET] no .ini) e grava só lá")
+    args = parser.parse_args()
+    dt_ini = args.dt_ini or args.dt_fim - timedelta(days=365)
+
+    store = ParquetStore.from_config(args.config)
+    if args.parquet_only:
+        if store is None:
+            parser.error("--parquet-only precisa de [PARQUET] enabled = true no .ini")
+        connector = DuckDBConnector(str(store.root))
+        connector.refresh_views()
+    else:
+        connector = OracleConnector(config_file=args.config, target="write")
+
+    t0 = time.perf_counter()
+    row = RfmThresholds(connector, store).refresh(dt_ini, args.dt_fim)
+
+    print(f"[main_rfm_limiares] ID {row.get('ID')}: {row.get('CLIENTES')} clientes de {dt_ini} a {args.dt_fim}")
+    for m, col in MEASURES.items():
+        limiares = " / ".join(f"{row.get(f'{m}_P{q}')}" for q in QUANTILES)
+        print(f"[main_rfm_limiares] {col:<13} P{'/P'.join(map(str, QUANTILES))}: {limiares}")
+    print(f"[main_rfm_limiares] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# mains/main_rollup_rebuild.py
+
+"""
+Reconstrói o agregado diário AGG_DIARIO_FILIAL a partir das tabelas BRZ_*.
+
+As cargas normais mantêm o agregado sozinhas (só os dias tocados); rodar isto
+na carga inicial, depois de criar a tabela, ou para corrigir um período:
+    python mains/main_rollup_rebuild.py
+    python mains/main_rollup_rebuild.py --table BRZ_HIST_SERVICOS --dt-ini 2025-01-01 --dt-fim 2025-03-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.oracle_connector import OracleConnector
+from connector.rollups import DailyRollup, ROLLUP_SOURCES, ROLLUP_TABLE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Reconstrói {ROLLUP_TABLE}")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--table", choices=sorted(ROLLUP_SOURCES), help="Só a linha de negócio desta tabela")
+    parser.add_argument("--dt-ini", type=date.fromisoformat, help="AAAA-MM-DD (padrão: desde o início)")
+    parser.add_argument("--dt-fim", type=date.fromisoformat, help="AAAA-MM-DD (padrão: até o fim)")
+    args = parser.parse_args()
+
+    rollup = DailyRollup(OracleConnector(config_file=args.config, target="write"))
+    t0 = time.perf_counter()
+    result = rollup.rebuild(args.table, args.dt_ini, args.dt_fim)
+
+    for table, rows in result.items():
+        print(f"[main_rollup_rebuild] {table}: {rows} linhas no agregado")
+    print(f"[main_rollup_rebuild] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+# mains/main_silver_rebuild.py
+
+"""
+Reconstrói a camada SILVER (fatos SLV_FATO_* e membros das dimensões DIM_*) a partir das tabelas BRZ_*.
+
+As cargas normais mantêm os fatos sozinhas quando [SILVER] enabled = true no
+config/database.ini; rodar isto na carga inicial, depois da migração V006, ou
+para corrigir um período:
+    python mains/main_silver_rebuild.py
+    python mains/main_silver_rebuild.py --table BRZ_HIST_SERVICOS --dt-ini 2025-01-01 --dt-fim 2025-03-31
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+# Garante import relativo do projeto
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from connector.oracle_connector import OracleConnector
+from connector.silver import FACTS, SilverLoader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reconstrói a camada SILVER")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(__file__), "..", "config", "database.ini"))
+    parser.add_argument("--table", choices=sorted(FACTS), help="Tabela BRZ de origem (padrão: todas)")
+    parser.add_argument("--dt-ini", type=date.fromisoformat, help="Data AAAA-MM-DD (padrão: desde o início)")
+    parser.add_argument("--dt-fim", type=date.fromisoformat, help="Data AAAA-MM-DD (padrão: até o fim)")
+    args = parser.parse_args()
+
+    silver = SilverLoader(OracleConnector(config_file=args.config, target="write"))
+    t0 = time.perf_counter()
+    for table, rows in silver.rebuild(args.table, args.dt_ini, args.dt_fim).items():
+        print(f"[main_silver_rebuild] {table}: {rows} linhas")
+    print(f"[main_silver_rebuild] Concluído em {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -112,6 +112,8 @@ class BRZHistServicos(BaseBronzeModel):
     nome_vendedor_servico: Optional[str] = Field(default=None, alias="NOME_VENDEDOR_SERVICO")
     nome_mecanico: Optional[str] = Field(default=None, alias="NOME_MECANICO")
     nome_cliente: Optional[str] = Field(default=None, alias="NOME_CLIENTE")
+    cliente_key: Optional[str] = Field(default=None, alias="CLIENTE_KEY")
+    cliente_hash: Optional[int] = Field(default=None, alias="CLIENTE_HASH")
 
 
 # ============================================================
@@ -146,6 +148,8 @@ class BRZHistVendasPecas(BaseBronzeModel):
 
     nome_vendedor: Optional[str] = Field(default=None, alias="NOME_VENDEDOR")
     nome_comprador: Optional[str] = Field(default=None, alias="NOME_COMPRADOR")
+    cliente_key: Optional[str] = Field(default=None, alias="CLIENTE_KEY")
+    cliente_hash: Optional[int] = Field(default=None, alias="CLIENTE_HASH")
 
     cidade_venda: Optional[str] = Field(default=None, alias="CIDADE_VENDA")
     estado_venda: Optional[str] = Field(default=None, alias="ESTADO_VENDA")
@@ -194,6 +198,8 @@ class BRZHistVendasVeiculos(BaseBronzeModel):
     tipo_venda_veiculo: Optional[str] = Field(default=None, alias="TIPO_VENDA_VEICULO")
     nome_vendedor: Optional[str] = Field(default=None, alias="NOME_VENDEDOR")
     nome_comprador: Optional[str] = Field(default=None, alias="NOME_COMPRADOR")
+    cliente_key: Optional[str] = Field(default=None, alias="CLIENTE_KEY")
+    cliente_hash: Optional[int] = Field(default=None, alias="CLIENTE_HASH")
 
     cidade_venda: Optional[str] = Field(default=None, alias="CIDADE_VENDA")
     estado_venda: Optional[str] = Field(default=None, alias="ESTADO_VENDA")
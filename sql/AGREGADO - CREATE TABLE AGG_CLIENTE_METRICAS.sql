@@ -0,0 +1,19 @@
+-- Métricas por cliente (CLIENTE_HASH), mês e origem (VEICULO, PECA, SERVICO): primeira/última
+-- compra, transações, receita e lucro. Mantida pelos controllers (connector/customer_metrics.py:
+-- MERGE só dos clientes x meses tocados por cada carga).
+-- LTV e RFM do dashboard somam os meses do período daqui em vez de unir as três BRZ_HIST_*.
+-- Carga inicial depois de criar a tabela: python mains/main_cliente_metricas_rebuild.py
+CREATE TABLE AGG_CLIENTE_METRICAS (
+    MES                        DATE           NOT NULL,
+    CLIENTE_HASH               NUMBER(19)     NOT NULL,
+    ORIGEM                     VARCHAR2(10)   NOT NULL,
+    CLIENTE_KEY                VARCHAR2(150),
+    PRIMEIRA_DATA              DATE,
+    ULTIMA_DATA                DATE,
+    TRANSACOES                 NUMBER,
+    RECEITA                    NUMBER(18,2),
+    LUCRO                      NUMBER(18,2),
+    ATUALIZADO_EM              TIMESTAMP,
+    CONSTRAINT PK_AGG_CLIENTE_METRICAS
+        PRIMARY KEY (MES, CLIENTE_HASH, ORIGEM)
+);
@@ -0,0 +1,27 @@
+-- Agregado diário por filial e linha de negócio (VEIC, PEC, SRV), mantido pelos controllers
+-- (connector/rollups.py: recalcula só os dias tocados por cada carga).
+-- KPIs, P&L, ROI, performance por filial e fluxo de caixa do dashboard leem daqui.
+-- Carga inicial depois de criar a tabela: python mains/main_rollup_rebuild.py
+CREATE TABLE AGG_DIARIO_FILIAL (
+    DT                         DATE           NOT NULL,
+    LINHA                      VARCHAR2(4)    NOT NULL,
+    COD_CONCESSIONARIA         VARCHAR2(10),
+    COD_FILIAL                 VARCHAR2(10),
+    NOME_FILIAL                VARCHAR2(100),
+    RECEITA                    NUMBER(18,2),
+    LUCRO                      NUMBER(18,2),
+    CUSTO                      NUMBER(18,2),
+    QTDE                       NUMBER(18,2),
+    QTDE_REGISTROS             NUMBER(18),
+    ATUALIZADO_EM              TIMESTAMP,
+    CONSTRAINT CK_AGG_DIARIO_LINHA
+        CHECK (LINHA IN ('VEIC', 'PEC', 'SRV'))
+);
+
+-- Filtro por período (todas as consultas) e recálculo por dia/linha
+CREATE INDEX IX_AGG_DIARIO_DT_LINHA
+    ON AGG_DIARIO_FILIAL (DT, LINHA);
+
+-- Filtro por concessionária/filial (KPIs da Home e fluxo de caixa)
+CREATE INDEX IX_AGG_DIARIO_FILIAL
+    ON AGG_DIARIO_FILIAL (COD_CONCESSIONARIA, COD_FILIAL, DT);
@@ -0,0 +1,45 @@
+-- Jornada pós-venda por venda de veículo: receita/lucro de serviços (SRV) e peças (PEC)
+-- do mesmo cliente (CLIENTE_HASH) na mesma concessionária em 30/60/90/180 dias após a venda.
+-- Mantida pelos controllers (connector/journey.py: recalcula só as vendas tocadas por cada carga).
+-- Rentabilidade integrada do dashboard lê daqui quando a janela é uma das padrão.
+-- Carga inicial depois de criar a tabela: python mains/main_journey_rebuild.py
+CREATE TABLE AGG_JORNADA_CLIENTE (
+    ID_VENDA_VEICULO           NUMBER         NOT NULL,
+    COD_CONCESSIONARIA         VARCHAR2(10),
+    COD_FILIAL                 VARCHAR2(10),
+    NOME_FILIAL                VARCHAR2(100),
+    DT_VENDA                   DATE           NOT NULL,
+    NOME_COMPRADOR             VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
+    MARCA_VEICULO              VARCHAR2(50),
+    MODELO_VEICULO             VARCHAR2(100),
+    RECEITA_VEICULO            NUMBER(18,2),
+    LUCRO_VEICULO              NUMBER(18,2),
+    RECEITA_SRV_30             NUMBER(18,2),
+    LUCRO_SRV_30               NUMBER(18,2),
+    RECEITA_SRV_60             NUMBER(18,2),
+    LUCRO_SRV_60               NUMBER(18,2),
+    RECEITA_SRV_90             NUMBER(18,2),
+    LUCRO_SRV_90               NUMBER(18,2),
+    RECEITA_SRV_180            NUMBER(18,2),
+    LUCRO_SRV_180              NUMBER(18,2),
+    RECEITA_PEC_30             NUMBER(18,2),
+    LUCRO_PEC_30               NUMBER(18,2),
+    RECEITA_PEC_60             NUMBER(18,2),
+    LUCRO_PEC_60               NUMBER(18,2),
+    RECEITA_PEC_90             NUMBER(18,2),
+    LUCRO_PEC_90               NUMBER(18,2),
+    RECEITA_PEC_180            NUMBER(18,2),
+    LUCRO_PEC_180              NUMBER(18,2),
+    ATUALIZADO_EM              TIMESTAMP,
+    CONSTRAINT PK_AGG_JORNADA_CLIENTE
+        PRIMARY KEY (ID_VENDA_VEICULO)
+);
+
+-- Filtro por período e concessionária/filial (margem integrada e ranking de modelos)
+CREATE INDEX IX_AGG_JORNADA_DT_FILIAL
+    ON AGG_JORNADA_CLIENTE (DT_VENDA, COD_CONCESSIONARIA, COD_FILIAL);
+
+-- Recálculo por cliente (cargas de serviços e peças)
+CREATE INDEX IX_AGG_JORNADA_CLIENTE
+    ON AGG_JORNADA_CLIENTE (CLIENTE_HASH, DT_VENDA);
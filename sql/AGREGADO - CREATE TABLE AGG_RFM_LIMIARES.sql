@@ -0,0 +1,25 @@
+-- Limiares de quintil do RFM (P20/P40/P60/P80 de recência, frequência e valor por cliente),
+-- uma linha por cálculo (connector/rfm.py). O dashboard pontua os clientes contra a linha de
+-- maior ID com [RFM] persisted = true: os segmentos não mudam só porque a base mudou.
+-- Cálculo depois de criar a tabela: python mains/main_rfm_limiares.py
+CREATE TABLE AGG_RFM_LIMIARES (
+    ID                         NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    DT_INI_REF                 DATE           NOT NULL,
+    DT_FIM_REF                 DATE           NOT NULL,
+    CLIENTES                   NUMBER,
+    R_P20                      NUMBER,
+    R_P40                      NUMBER,
+    R_P60                      NUMBER,
+    R_P80                      NUMBER,
+    F_P20                      NUMBER,
+    F_P40                      NUMBER,
+    F_P60                      NUMBER,
+    F_P80                      NUMBER,
+    M_P20                      NUMBER(18,2),
+    M_P40                      NUMBER(18,2),
+    M_P60                      NUMBER(18,2),
+    M_P80                      NUMBER(18,2),
+    CALCULADO_EM               TIMESTAMP      DEFAULT SYSTIMESTAMP,
+    CONSTRAINT PK_AGG_RFM_LIMIARES
+        PRIMARY KEY (ID)
+);
@@ -0,0 +1,29 @@
+-- Chave normalizada de cliente nas tabelas de histórico já existentes
+-- (tabelas novas já nascem com as colunas: ver os CREATE TABLE BRZ_HIST_*).
+-- CLIENTE_KEY / CLIENTE_HASH são calculadas no ETL (utils/customer_key.py);
+-- depois deste script, preencher o histórico com:
+--     python mains/main_backfill_cliente_key.py
+ALTER TABLE BRZ_HIST_VENDAS_VEICULOS ADD (
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19)
+);
+
+ALTER TABLE BRZ_HIST_VENDAS_PECAS ADD (
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19)
+);
+
+ALTER TABLE BRZ_HIST_SERVICOS ADD (
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19)
+);
+
+-- Joins e agrupamentos por cliente (funil, LTV, RFM, rentabilidade integrada)
+CREATE INDEX IX_BRZ_VV_CLIENTE
+    ON BRZ_HIST_VENDAS_VEICULOS (CLIENTE_HASH, DT_VENDA);
+
+CREATE INDEX IX_BRZ_VP_CLIENTE
+    ON BRZ_HIST_VENDAS_PECAS (CLIENTE_HASH, DT_VENDA);
+
+CREATE INDEX IX_BRZ_SERV_CLIENTE
+    ON BRZ_HIST_SERVICOS (CLIENTE_HASH, DT_REALIZACAO_SERVICO);
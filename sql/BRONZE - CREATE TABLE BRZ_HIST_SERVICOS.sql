@@ -15,6 +15,8 @@ CREATE TABLE BRZ_HIST_SERVICOS (
     NOME_VENDEDOR_SERVICO      VARCHAR2(100),
     NOME_MECANICO              VARCHAR2(100),
     NOME_CLIENTE               VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
     CONSTRAINT PK_BRZ_HIST_SERVICOS
         PRIMARY KEY (ID_SERVICO)
 );
@@ -28,3 +30,7 @@ CREATE INDEX IX_BRZ_SERV_DEPARTAMENTO
 
 CREATE INDEX IX_BRZ_SERV_VENDEDOR
     ON BRZ_HIST_SERVICOS (NOME_VENDEDOR_SERVICO);
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_SERV_CLIENTE
+    ON BRZ_HIST_SERVICOS (CLIENTE_HASH, DT_REALIZACAO_SERVICO);
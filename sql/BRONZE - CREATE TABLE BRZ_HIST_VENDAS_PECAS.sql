@@ -18,6 +18,8 @@ CREATE TABLE BRZ_HIST_VENDAS_PECAS (
     TIPO_VENDA_PECA            VARCHAR2(100),
     NOME_VENDEDOR              VARCHAR2(100),
     NOME_COMPRADOR             VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
     CIDADE_VENDA               VARCHAR2(100),
     ESTADO_VENDA               VARCHAR2(50),
     MACROREGIAO_VENDA          VARCHAR2(50),
@@ -41,3 +43,7 @@ CREATE INDEX IX_BRZ_VP_VENDEDOR
 
 CREATE INDEX IX_BRZ_VP_CIDADE_ESTADO
     ON BRZ_HIST_VENDAS_PECAS (ESTADO_VENDA, CIDADE_VENDA);
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_VP_CLIENTE
+    ON BRZ_HIST_VENDAS_PECAS (CLIENTE_HASH, DT_VENDA);
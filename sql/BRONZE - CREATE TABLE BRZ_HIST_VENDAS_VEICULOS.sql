@@ -26,6 +26,8 @@ CREATE TABLE BRZ_HIST_VENDAS_VEICULOS (
     TIPO_VENDA_VEICULO         VARCHAR2(100),
     NOME_VENDEDOR              VARCHAR2(100),
     NOME_COMPRADOR             VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
     CIDADE_VENDA               VARCHAR2(100),
     ESTADO_VENDA               VARCHAR2(50),
     MACROREGIAO_VENDA          VARCHAR2(50),
@@ -45,3 +47,7 @@ CREATE INDEX IX_BRZ_VV_CHASSI
 
 CREATE INDEX IX_BRZ_VV_VENDEDOR
     ON BRZ_HIST_VENDAS_VEICULOS (NOME_VENDEDOR);
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_VV_CLIENTE
+    ON BRZ_HIST_VENDAS_VEICULOS (CLIENTE_HASH, DT_VENDA);
@@ -0,0 +1,47 @@
+-- Opção particionada de BRZ_HIST_SERVICOS: uma partição por mês de DT_REALIZACAO_SERVICO (INTERVAL),
+-- criada automaticamente no primeiro insert do mês. Consultas com filtro de período
+-- leem só as partições do intervalo (poda: python benchmarks/bench_partition_pruning.py).
+-- Índices LOCAL (um segmento por partição); a PK fica global (não contém a data).
+-- Meses inteiros podem ser recarregados por troca de partição (connector/partition_exchange.py).
+-- Tabela já existente sem partição: sql/BRONZE PARTICIONADO - MIGRAR BRZ_HIST.sql
+CREATE TABLE BRZ_HIST_SERVICOS (
+    ID_SERVICO                 NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    COD_CONCESSIONARIA         VARCHAR2(10)   NOT NULL,
+    COD_FILIAL                 VARCHAR2(10)   NOT NULL,
+    NOME_CONCESSIONARIA        VARCHAR2(100),
+    NOME_FILIAL                VARCHAR2(100),
+    DT_REALIZACAO_SERVICO      DATE           NOT NULL,
+    QTDE_SERVICOS              NUMBER(10),
+    VALOR_TOTAL_SERVICO        NUMBER(18,2),
+    LUCRO_SERVICO              NUMBER(18,2),
+    DESCRICAO_SERVICO          VARCHAR2(200),
+    SECAO_SERVICO              VARCHAR2(100),
+    DEPARTAMENTO_SERVICO       VARCHAR2(100),
+    CATEGORIA_SERVICO          VARCHAR2(100),
+    NOME_VENDEDOR_SERVICO      VARCHAR2(100),
+    NOME_MECANICO              VARCHAR2(100),
+    NOME_CLIENTE               VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
+    CONSTRAINT PK_BRZ_HIST_SERVICOS
+        PRIMARY KEY (ID_SERVICO)
+)
+PARTITION BY RANGE (DT_REALIZACAO_SERVICO)
+INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+(
+    PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+);
+
+-- Índices (alto volume de linhas)
+CREATE INDEX IX_BRZ_SERV_FILIAL_DATA
+    ON BRZ_HIST_SERVICOS (COD_CONCESSIONARIA, COD_FILIAL, DT_REALIZACAO_SERVICO) LOCAL;
+
+CREATE INDEX IX_BRZ_SERV_DEPARTAMENTO
+    ON BRZ_HIST_SERVICOS (DEPARTAMENTO_SERVICO) LOCAL;
+
+CREATE INDEX IX_BRZ_SERV_VENDEDOR
+    ON BRZ_HIST_SERVICOS (NOME_VENDEDOR_SERVICO) LOCAL;
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_SERV_CLIENTE
+    ON BRZ_HIST_SERVICOS (CLIENTE_HASH, DT_REALIZACAO_SERVICO) LOCAL;
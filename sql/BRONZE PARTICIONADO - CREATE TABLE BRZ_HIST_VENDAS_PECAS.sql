@@ -0,0 +1,60 @@
+-- Opção particionada de BRZ_HIST_VENDAS_PECAS: uma partição por mês de DT_VENDA (INTERVAL),
+-- criada automaticamente no primeiro insert do mês. Consultas com filtro de período
+-- leem só as partições do intervalo (poda: python benchmarks/bench_partition_pruning.py).
+-- Índices LOCAL (um segmento por partição); a PK fica global (não contém a data).
+-- Meses inteiros podem ser recarregados por troca de partição (connector/partition_exchange.py).
+-- Tabela já existente sem partição: sql/BRONZE PARTICIONADO - MIGRAR BRZ_HIST.sql
+CREATE TABLE BRZ_HIST_VENDAS_PECAS (
+    ID_VENDA_PECA              NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    COD_CONCESSIONARIA         VARCHAR2(10)   NOT NULL,
+    COD_FILIAL                 VARCHAR2(10)   NOT NULL,
+    NOME_CONCESSIONARIA        VARCHAR2(100),
+    NOME_FILIAL                VARCHAR2(100),
+    MARCA_FILIAL               VARCHAR2(50),
+    DT_VENDA                   DATE           NOT NULL,
+    QTDE_VENDIDA               NUMBER(18,2),
+    TIPO_TRANSACAO             VARCHAR2(50),
+    VALOR_VENDA                NUMBER(18,2),
+    CUSTO_PECA                 NUMBER(18,2),
+    LUCRO_VENDA                NUMBER(18,2),
+    MARGEM_VENDA               NUMBER(9,4),
+    DESCRICAO_PECA             VARCHAR2(200),
+    CATEGORIA_PECA             VARCHAR2(100),
+    DEPARTAMENTO_VENDA         VARCHAR2(100),
+    TIPO_VENDA_PECA            VARCHAR2(100),
+    NOME_VENDEDOR              VARCHAR2(100),
+    NOME_COMPRADOR             VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
+    CIDADE_VENDA               VARCHAR2(100),
+    ESTADO_VENDA               VARCHAR2(50),
+    MACROREGIAO_VENDA          VARCHAR2(50),
+    CONSTRAINT PK_BRZ_HIST_VENDAS_PECAS
+        PRIMARY KEY (ID_VENDA_PECA)
+)
+PARTITION BY RANGE (DT_VENDA)
+INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+(
+    PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+);
+
+-- FKs lógicas (mesmo que Bronze não valide fisicamente, já deixa pronto)
+-- Ex.: para futura Dim_Peca (SILVER/GOLD), o join será por DESCRICAO/CATEGORIA
+-- e para filial por COD_CONCESSIONARIA/COD_FILIAL. [file:2]
+
+-- Índices (tabela de maior volume)
+CREATE INDEX IX_BRZ_VP_FILIAL_DATA
+    ON BRZ_HIST_VENDAS_PECAS (COD_CONCESSIONARIA, COD_FILIAL, DT_VENDA) LOCAL;
+
+CREATE INDEX IX_BRZ_VP_PECA
+    ON BRZ_HIST_VENDAS_PECAS (DESCRICAO_PECA, CATEGORIA_PECA) LOCAL;
+
+CREATE INDEX IX_BRZ_VP_VENDEDOR
+    ON BRZ_HIST_VENDAS_PECAS (NOME_VENDEDOR) LOCAL;
+
+CREATE INDEX IX_BRZ_VP_CIDADE_ESTADO
+    ON BRZ_HIST_VENDAS_PECAS (ESTADO_VENDA, CIDADE_VENDA) LOCAL;
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_VP_CLIENTE
+    ON BRZ_HIST_VENDAS_PECAS (CLIENTE_HASH, DT_VENDA) LOCAL;
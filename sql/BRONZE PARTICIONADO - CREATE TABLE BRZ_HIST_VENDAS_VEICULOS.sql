@@ -0,0 +1,64 @@
+-- Opção particionada de BRZ_HIST_VENDAS_VEICULOS: uma partição por mês de DT_VENDA (INTERVAL),
+-- criada automaticamente no primeiro insert do mês. Consultas com filtro de período
+-- leem só as partições do intervalo (poda: python benchmarks/bench_partition_pruning.py).
+-- Índices LOCAL (um segmento por partição); a PK fica global (não contém a data).
+-- Meses inteiros podem ser recarregados por troca de partição (connector/partition_exchange.py).
+-- Tabela já existente sem partição: sql/BRONZE PARTICIONADO - MIGRAR BRZ_HIST.sql
+CREATE TABLE BRZ_HIST_VENDAS_VEICULOS (
+    ID_VENDA_VEICULO           NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    COD_CONCESSIONARIA         VARCHAR2(10)   NOT NULL,
+    COD_FILIAL                 VARCHAR2(10)   NOT NULL,
+    NOME_CONCESSIONARIA        VARCHAR2(100),
+    NOME_FILIAL                VARCHAR2(100),
+    MARCA_FILIAL               VARCHAR2(50),
+    DT_VENDA                   DATE           NOT NULL,
+    QTDE_VENDIDA               NUMBER(10),
+    TIPO_TRANSACAO             VARCHAR2(50),
+    VALOR_VENDA                NUMBER(18,2),
+    CUSTO_VEICULO              NUMBER(18,2),
+    LUCRO_VENDA                NUMBER(18,2),
+    MARGEM_VENDA               NUMBER(9,4),
+    MARCA_VEICULO              VARCHAR2(50),
+    MODELO_VEICULO             VARCHAR2(100),
+    FAMILIA_VEICULO            VARCHAR2(100),
+    CATEGORIA_VEICULO          VARCHAR2(100),
+    COR_VEICULO                VARCHAR2(50),
+    VEICULO_NOVO_SEMINOVO      VARCHAR2(20),
+    TIPO_COMBUSTIVEL           VARCHAR2(30),
+    ANO_MODELO                 NUMBER(4),
+    ANO_FABRICACAO             NUMBER(4),
+    CHASSI_VEICULO             VARCHAR2(50),
+    DIAS_EM_ESTOQUE            NUMBER(10),
+    TIPO_VENDA_VEICULO         VARCHAR2(100),
+    NOME_VENDEDOR              VARCHAR2(100),
+    NOME_COMPRADOR             VARCHAR2(150),
+    CLIENTE_KEY                VARCHAR2(150),
+    CLIENTE_HASH               NUMBER(19),
+    CIDADE_VENDA               VARCHAR2(100),
+    ESTADO_VENDA               VARCHAR2(50),
+    MACROREGIAO_VENDA          VARCHAR2(50),
+    CONSTRAINT PK_BRZ_HIST_VENDAS_VEIC
+        PRIMARY KEY (ID_VENDA_VEICULO)
+)
+PARTITION BY RANGE (DT_VENDA)
+INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+(
+    PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+);
+
+-- Índices
+CREATE INDEX IX_BRZ_VV_FILIAL_DATA
+    ON BRZ_HIST_VENDAS_VEICULOS (COD_CONCESSIONARIA, COD_FILIAL, DT_VENDA) LOCAL;
+
+CREATE INDEX IX_BRZ_VV_MARCA_MODELO
+    ON BRZ_HIST_VENDAS_VEICULOS (MARCA_VEICULO, MODELO_VEICULO) LOCAL;
+
+CREATE INDEX IX_BRZ_VV_CHASSI
+    ON BRZ_HIST_VENDAS_VEICULOS (CHASSI_VEICULO) LOCAL;
+
+CREATE INDEX IX_BRZ_VV_VENDEDOR
+    ON BRZ_HIST_VENDAS_VEICULOS (NOME_VENDEDOR) LOCAL;
+
+-- Cliente normalizado (utils/customer_key.py): joins e agrupamentos por cliente
+CREATE INDEX IX_BRZ_VV_CLIENTE
+    ON BRZ_HIST_VENDAS_VEICULOS (CLIENTE_HASH, DT_VENDA) LOCAL;
@@ -0,0 +1,60 @@
+-- Migração das tabelas de histórico já existentes para a opção particionada
+-- (uma partição por mês da data do fato, índices LOCAL, PK global).
+-- ALTER TABLE ... MODIFY PARTITION BY ... ONLINE (Oracle 12.2+): a tabela continua
+-- aceitando leitura e DML durante a conversão; os dados existentes são redistribuídos
+-- nas partições mensais e os índices listados passam a ser locais.
+-- Rodar fora do horário de carga (a conversão reescreve a tabela inteira) e, depois,
+-- coletar estatísticas e conferir a poda: python benchmarks/bench_partition_pruning.py
+-- Rollback: não há conversão de volta; recriar a tabela com os CREATE TABLE "BRONZE - ..."
+-- e copiar os dados (INSERT /*+ APPEND */ ... SELECT).
+
+ALTER TABLE BRZ_HIST_VENDAS_VEICULOS
+    MODIFY PARTITION BY RANGE (DT_VENDA)
+    INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+    (
+        PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+    )
+    ONLINE
+    UPDATE INDEXES (
+        IX_BRZ_VV_FILIAL_DATA LOCAL,
+        IX_BRZ_VV_MARCA_MODELO LOCAL,
+        IX_BRZ_VV_CHASSI LOCAL,
+        IX_BRZ_VV_VENDEDOR LOCAL,
+        IX_BRZ_VV_CLIENTE LOCAL
+    );
+
+ALTER TABLE BRZ_HIST_VENDAS_PECAS
+    MODIFY PARTITION BY RANGE (DT_VENDA)
+    INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+    (
+        PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+    )
+    ONLINE
+    UPDATE INDEXES (
+        IX_BRZ_VP_FILIAL_DATA LOCAL,
+        IX_BRZ_VP_PECA LOCAL,
+        IX_BRZ_VP_VENDEDOR LOCAL,
+        IX_BRZ_VP_CIDADE_ESTADO LOCAL,
+        IX_BRZ_VP_CLIENTE LOCAL
+    );
+
+ALTER TABLE BRZ_HIST_SERVICOS
+    MODIFY PARTITION BY RANGE (DT_REALIZACAO_SERVICO)
+    INTERVAL (NUMTOYMINTERVAL(1, 'MONTH'))
+    (
+        PARTITION P_ANTERIOR VALUES LESS THAN (DATE '2000-01-01')
+    )
+    ONLINE
+    UPDATE INDEXES (
+        IX_BRZ_SERV_FILIAL_DATA LOCAL,
+        IX_BRZ_SERV_DEPARTAMENTO LOCAL,
+        IX_BRZ_SERV_VENDEDOR LOCAL,
+        IX_BRZ_SERV_CLIENTE LOCAL
+    );
+
+BEGIN
+    DBMS_STATS.GATHER_TABLE_STATS(USER, 'BRZ_HIST_VENDAS_VEICULOS', granularity => 'AUTO', cascade => TRUE);
+    DBMS_STATS.GATHER_TABLE_STATS(USER, 'BRZ_HIST_VENDAS_PECAS', granularity => 'AUTO', cascade => TRUE);
+    DBMS_STATS.GATHER_TABLE_STATS(USER, 'BRZ_HIST_SERVICOS', granularity => 'AUTO', cascade => TRUE);
+END;
+/
@@ -0,0 +1,10 @@
+-- Versão dos dados por tabela: incrementada a cada carga bem-sucedida dos controllers.
+-- O cache de queries do dashboard usa essas versões na chave (invalida só quando os dados mudam).
+CREATE TABLE CTL_DATA_VERSION (
+    TABLE_NAME               VARCHAR2(128)  NOT NULL,
+    VERSION                  NUMBER(18)     DEFAULT 0 NOT NULL,
+    LOADED_AT                TIMESTAMP,
+    ROWS_LOADED              NUMBER(18),
+    CONSTRAINT PK_CTL_DATA_VERSION
+        PRIMARY KEY (TABLE_NAME)
+);
@@ -0,0 +1,15 @@
+-- Versões de schema aplicadas pelo runner de migrações (connector/migrations.py).
+-- Uma linha por arquivo sql/migrations/V<versão>__<descrição>.sql aplicado;
+-- CHECKSUM = SHA-256 dos comandos (com os @@ já expandidos): alerta se o arquivo mudou depois.
+-- Criada pelo próprio runner na 1ª execução: python mains/main_migrate.py
+CREATE TABLE CTL_SCHEMA_VERSION (
+    VERSION                  NUMBER(6)      NOT NULL,
+    DESCRICAO                VARCHAR2(200),
+    ARQUIVO                  VARCHAR2(260),
+    CHECKSUM                 VARCHAR2(64),
+    STATEMENTS               NUMBER(6),
+    DURACAO_MS               NUMBER(12),
+    APLICADO_EM              TIMESTAMP,
+    CONSTRAINT PK_CTL_SCHEMA_VERSION
+        PRIMARY KEY (VERSION)
+);
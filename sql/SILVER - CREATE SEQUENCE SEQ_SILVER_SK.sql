@@ -0,0 +1,2 @@
+-- Chaves substitutas das dimensões SILVER (DIM_*). Começa em 1: 0 é o membro "não informado".
+CREATE SEQUENCE SEQ_SILVER_SK START WITH 1 INCREMENT BY 1 CACHE 1000 NOCYCLE;
@@ -0,0 +1,19 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Cliente normalizado (utils/customer_key.py): CLIENTE_HASH é o membro, CLIENTE_KEY o atributo.
+-- Chave substituta SK_CLIENTE pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_CLIENTE = 0 = "não informado".
+CREATE TABLE DIM_CLIENTE (
+    SK_CLIENTE                 NUMBER(10)     NOT NULL,
+    CLIENTE_HASH               NUMBER(19)     NOT NULL,
+    CLIENTE_KEY                VARCHAR2(150),
+    CONSTRAINT PK_DIM_CLIENTE
+        PRIMARY KEY (SK_CLIENTE),
+    CONSTRAINT UK_DIM_CLIENTE
+        UNIQUE (CLIENTE_HASH)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_CLIENTE (SK_CLIENTE, CLIENTE_HASH)
+SELECT 0, -1 FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_CLIENTE WHERE SK_CLIENTE = 0);
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Filial (concessionária + filial). Atributos descritivos pelo último valor carregado.
+-- Chave substituta SK_FILIAL pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_FILIAL = 0 = "não informado".
+CREATE TABLE DIM_FILIAL (
+    SK_FILIAL                  NUMBER(10)     NOT NULL,
+    COD_CONCESSIONARIA         VARCHAR2(10)   NOT NULL,
+    COD_FILIAL                 VARCHAR2(10)   NOT NULL,
+    NOME_CONCESSIONARIA        VARCHAR2(100),
+    NOME_FILIAL                VARCHAR2(100),
+    MARCA_FILIAL               VARCHAR2(50),
+    CONSTRAINT PK_DIM_FILIAL
+        PRIMARY KEY (SK_FILIAL),
+    CONSTRAINT UK_DIM_FILIAL
+        UNIQUE (COD_CONCESSIONARIA, COD_FILIAL)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_FILIAL (SK_FILIAL, COD_CONCESSIONARIA, COD_FILIAL)
+SELECT 0, '-', '-' FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_FILIAL WHERE SK_FILIAL = 0);
+
+COMMIT;
@@ -0,0 +1,20 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Local da venda (estado + cidade; macrorregião como atributo).
+-- Chave substituta SK_GEOGRAFIA pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_GEOGRAFIA = 0 = "não informado".
+CREATE TABLE DIM_GEOGRAFIA (
+    SK_GEOGRAFIA               NUMBER(10)     NOT NULL,
+    ESTADO                     VARCHAR2(50)   NOT NULL,
+    CIDADE                     VARCHAR2(100)  NOT NULL,
+    MACROREGIAO                VARCHAR2(50),
+    CONSTRAINT PK_DIM_GEOGRAFIA
+        PRIMARY KEY (SK_GEOGRAFIA),
+    CONSTRAINT UK_DIM_GEOGRAFIA
+        UNIQUE (ESTADO, CIDADE)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_GEOGRAFIA (SK_GEOGRAFIA, ESTADO, CIDADE)
+SELECT 0, '-', '-' FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_GEOGRAFIA WHERE SK_GEOGRAFIA = 0);
+
+COMMIT;
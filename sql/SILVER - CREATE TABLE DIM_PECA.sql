@@ -0,0 +1,19 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Peça vendida (descrição + categoria).
+-- Chave substituta SK_PECA pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_PECA = 0 = "não informado".
+CREATE TABLE DIM_PECA (
+    SK_PECA                    NUMBER(10)     NOT NULL,
+    DESCRICAO_PECA             VARCHAR2(200)  NOT NULL,
+    CATEGORIA_PECA             VARCHAR2(100)  NOT NULL,
+    CONSTRAINT PK_DIM_PECA
+        PRIMARY KEY (SK_PECA),
+    CONSTRAINT UK_DIM_PECA
+        UNIQUE (DESCRICAO_PECA, CATEGORIA_PECA)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_PECA (SK_PECA, DESCRICAO_PECA, CATEGORIA_PECA)
+SELECT 0, '-', '-' FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_PECA WHERE SK_PECA = 0);
+
+COMMIT;
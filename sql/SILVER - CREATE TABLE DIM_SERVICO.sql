@@ -0,0 +1,21 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Serviço de oficina (descrição, seção, departamento e categoria).
+-- Chave substituta SK_SERVICO pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_SERVICO = 0 = "não informado".
+CREATE TABLE DIM_SERVICO (
+    SK_SERVICO                 NUMBER(10)     NOT NULL,
+    DESCRICAO_SERVICO          VARCHAR2(200)  NOT NULL,
+    SECAO_SERVICO              VARCHAR2(100)  NOT NULL,
+    DEPARTAMENTO_SERVICO       VARCHAR2(100)  NOT NULL,
+    CATEGORIA_SERVICO          VARCHAR2(100)  NOT NULL,
+    CONSTRAINT PK_DIM_SERVICO
+        PRIMARY KEY (SK_SERVICO),
+    CONSTRAINT UK_DIM_SERVICO
+        UNIQUE (DESCRICAO_SERVICO, SECAO_SERVICO, DEPARTAMENTO_SERVICO, CATEGORIA_SERVICO)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_SERVICO (SK_SERVICO, DESCRICAO_SERVICO, SECAO_SERVICO, DEPARTAMENTO_SERVICO, CATEGORIA_SERVICO)
+SELECT 0, '-', '-', '-', '-' FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_SERVICO WHERE SK_SERVICO = 0);
+
+COMMIT;
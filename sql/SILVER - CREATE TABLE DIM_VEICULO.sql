@@ -0,0 +1,24 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Versão de veículo vendida (marca, modelo, família, categoria, novo/seminovo, combustível, ano).
+-- Chave substituta SK_VEICULO pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_VEICULO = 0 = "não informado".
+CREATE TABLE DIM_VEICULO (
+    SK_VEICULO                 NUMBER(10)     NOT NULL,
+    MARCA_VEICULO              VARCHAR2(50)   NOT NULL,
+    MODELO_VEICULO             VARCHAR2(100)  NOT NULL,
+    FAMILIA_VEICULO            VARCHAR2(100)  NOT NULL,
+    CATEGORIA_VEICULO          VARCHAR2(100)  NOT NULL,
+    VEICULO_NOVO_SEMINOVO      VARCHAR2(20)   NOT NULL,
+    TIPO_COMBUSTIVEL           VARCHAR2(30)   NOT NULL,
+    ANO_MODELO                 NUMBER(4)      NOT NULL,
+    CONSTRAINT PK_DIM_VEICULO
+        PRIMARY KEY (SK_VEICULO),
+    CONSTRAINT UK_DIM_VEICULO
+        UNIQUE (MARCA_VEICULO, MODELO_VEICULO, FAMILIA_VEICULO, CATEGORIA_VEICULO, VEICULO_NOVO_SEMINOVO, TIPO_COMBUSTIVEL, ANO_MODELO)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_VEICULO (SK_VEICULO, MARCA_VEICULO, MODELO_VEICULO, FAMILIA_VEICULO, CATEGORIA_VEICULO, VEICULO_NOVO_SEMINOVO, TIPO_COMBUSTIVEL, ANO_MODELO)
+SELECT 0, '-', '-', '-', '-', '-', '-', -1 FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_VEICULO WHERE SK_VEICULO = 0);
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- Dimensão conformada da camada SILVER (connector/silver.py): Vendedor (peças, veículos, serviços) e mecânico (SLV_FATO_SERVICOS.SK_MECANICO): mesma dimensão.
+-- Chave substituta SK_VENDEDOR pela sequência SEQ_SILVER_SK; valor natural ausente gravado como '-' / -1,
+-- então os fatos juntam por igualdade. Membro SK_VENDEDOR = 0 = "não informado".
+CREATE TABLE DIM_VENDEDOR (
+    SK_VENDEDOR                NUMBER(10)     NOT NULL,
+    NOME_VENDEDOR              VARCHAR2(100)  NOT NULL,
+    CONSTRAINT PK_DIM_VENDEDOR
+        PRIMARY KEY (SK_VENDEDOR),
+    CONSTRAINT UK_DIM_VENDEDOR
+        UNIQUE (NOME_VENDEDOR)
+);
+
+-- Membro "não informado"
+INSERT INTO DIM_VENDEDOR (SK_VENDEDOR, NOME_VENDEDOR)
+SELECT 0, '-' FROM DUAL
+WHERE NOT EXISTS (SELECT 1 FROM DIM_VENDEDOR WHERE SK_VENDEDOR = 0);
+
+COMMIT;
@@ -0,0 +1,19 @@
+-- Fato da camada SILVER equivalente a BRZ_HIST_SERVICOS: só data, chaves substitutas (DIM_*) e medidas.
+-- Mantido pelos controllers (connector/silver.py: SilverLoader.load a cada carga).
+-- SK_MECANICO aponta para DIM_VENDEDOR (dimensão compartilhada).
+-- Carga inicial / backfill: python mains/main_silver_rebuild.py
+CREATE TABLE SLV_FATO_SERVICOS (
+    DT_REALIZACAO_SERVICO      DATE           NOT NULL,
+    SK_FILIAL                  NUMBER(10)     NOT NULL,
+    SK_SERVICO                 NUMBER(10)     NOT NULL,
+    SK_VENDEDOR                NUMBER(10)     NOT NULL,
+    SK_MECANICO                NUMBER(10)     NOT NULL,
+    SK_CLIENTE                 NUMBER(10)     NOT NULL,
+    QTDE_SERVICOS              NUMBER(10),
+    VALOR_TOTAL_SERVICO        NUMBER(18,2),
+    LUCRO_SERVICO              NUMBER(18,2)
+) PCTFREE 0;
+
+-- Período + filial (filtros do dashboard); o resto é agrupado por chave
+CREATE INDEX IX_SLV_SERV_DT_FILIAL
+    ON SLV_FATO_SERVICOS (DT_REALIZACAO_SERVICO, SK_FILIAL);
@@ -0,0 +1,20 @@
+-- Fato da camada SILVER equivalente a BRZ_HIST_VENDAS_VEICULOS: só data, chaves substitutas (DIM_*) e medidas.
+-- Mantido pelos controllers (connector/silver.py: SilverLoader.load a cada carga).
+-- Carga inicial / backfill: python mains/main_silver_rebuild.py
+CREATE TABLE SLV_FATO_VENDAS_VEICULOS (
+    DT_VENDA                   DATE           NOT NULL,
+    SK_FILIAL                  NUMBER(10)     NOT NULL,
+    SK_VEICULO                 NUMBER(10)     NOT NULL,
+    SK_VENDEDOR                NUMBER(10)     NOT NULL,
+    SK_CLIENTE                 NUMBER(10)     NOT NULL,
+    SK_GEOGRAFIA               NUMBER(10)     NOT NULL,
+    QTDE_VENDIDA               NUMBER(10),
+    VALOR_VENDA                NUMBER(18,2),
+    CUSTO_VEICULO              NUMBER(18,2),
+    LUCRO_VENDA                NUMBER(18,2),
+    DIAS_EM_ESTOQUE            NUMBER(10)
+) PCTFREE 0;
+
+-- Período + filial (filtros do dashboard); o resto é agrupado por chave
+CREATE INDEX IX_SLV_VV_DT_FILIAL
+    ON SLV_FATO_VENDAS_VEICULOS (DT_VENDA, SK_FILIAL);
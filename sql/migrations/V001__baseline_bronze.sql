@@ -0,0 +1,10 @@
+-- Baseline: camada BRONZE e versão dos dados (estado dos scripts aplicados à mão).
+-- Em bancos já criados os CREATE existentes são ignorados pelo runner (ORA-00955),
+-- então a versão é só registrada.
+-- A opção particionada das BRZ_HIST_* (sql/BRONZE PARTICIONADO - ...) continua manual.
+@@../BRONZE - CREATE TABLE BRZ_ESTOQUE_PECAS.sql
+@@../BRONZE - CREATE TABLE BRZ_ESTOQUE_VEICULOS.sql
+@@../BRONZE - CREATE TABLE BRZ_HIST_VENDAS_VEICULOS.sql
+@@../BRONZE - CREATE TABLE BRZ_HIST_VENDAS_PECAS.sql
+@@../BRONZE - CREATE TABLE BRZ_HIST_SERVICOS.sql
+@@../CONTROLE - CREATE TABLE CTL_DATA_VERSION.sql
@@ -0,0 +1,3 @@
+-- Agregado diário por filial e linha de negócio (connector/rollups.py).
+-- Carga inicial depois da migração: python mains/main_rollup_rebuild.py
+@@../AGREGADO - CREATE TABLE AGG_DIARIO_FILIAL.sql
@@ -0,0 +1,8 @@
+-- Chave normalizada de cliente no histórico (utils/customer_key.py).
+-- Tabelas criadas pelo baseline já têm as colunas: ADD e CREATE INDEX são ignorados
+-- (ORA-01430 / ORA-00955). Preencher o histórico: python mains/main_backfill_cliente_key.py
+-- A chave não é o UPPER(TRIM(nome)) de antes: também corrige mojibake, tira acentos e
+-- espaços repetidos (utils/customer_key.py), então agrupamentos por cliente mudam em
+-- relação aos relatórios antigos. Sem equivalente exato em SQL: o backfill é em Python.
+-- Antes desta versão os controllers carregam sem as duas colunas (utils/customer_key.oracle_records)
+@@../BRONZE - ALTER TABLE BRZ_HIST ADD CLIENTE_KEY.sql
@@ -0,0 +1,3 @@
+-- Jornada pós-venda materializada por venda de veículo (connector/journey.py).
+-- Carga inicial depois da migração: python mains/main_journey_rebuild.py
+@@../AGREGADO - CREATE TABLE AGG_JORNADA_CLIENTE.sql
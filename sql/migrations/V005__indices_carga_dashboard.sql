@@ -0,0 +1,64 @@
+-- Índices derivados da carga de trabalho do dashboard (connector/index_plan.py).
+-- Intervalo de data sempre na 1ª coluna; os *_COB levam as medidas somadas para a
+-- consulta ser respondida só pelo índice. Relatório método -> índice esperado:
+--     python benchmarks/bench_index_usage.py
+-- Tabelas particionadas (sql/BRONZE PARTICIONADO - ...) recebem os índices como LOCAL.
+-- Idempotente: índice já existente (ORA-00955 / ORA-01408) ou já removido (ORA-01418) é ignorado.
+DECLARE
+    PROCEDURE criar(p_nome VARCHAR2, p_tabela VARCHAR2, p_colunas VARCHAR2) IS
+        v_particionada NUMBER;
+    BEGIN
+        SELECT COUNT(*) INTO v_particionada FROM USER_PART_TABLES WHERE TABLE_NAME = p_tabela;
+        EXECUTE IMMEDIATE 'CREATE INDEX ' || p_nome || ' ON ' || p_tabela || ' (' || p_colunas || ')'
+            || CASE WHEN v_particionada > 0 THEN ' LOCAL' END;
+    EXCEPTION WHEN OTHERS THEN
+        IF SQLCODE NOT IN (-955, -1408) THEN RAISE; END IF;
+    END;
+
+    PROCEDURE remover(p_nome VARCHAR2) IS
+    BEGIN
+        EXECUTE IMMEDIATE 'DROP INDEX ' || p_nome;
+    EXCEPTION WHEN OTHERS THEN
+        IF SQLCODE != -1418 THEN RAISE; END IF;
+    END;
+BEGIN
+    -- BRZ_HIST_VENDAS_PECAS
+    criar('IX_BRZ_VP_DT_PECA_COB', 'BRZ_HIST_VENDAS_PECAS',
+          'DT_VENDA, DESCRICAO_PECA, CATEGORIA_PECA, QTDE_VENDIDA, VALOR_VENDA, LUCRO_VENDA');
+    criar('IX_BRZ_VP_DT_VENDEDOR_COB', 'BRZ_HIST_VENDAS_PECAS',
+          'DT_VENDA, NOME_VENDEDOR, VALOR_VENDA, LUCRO_VENDA');
+    criar('IX_BRZ_VP_DT_CLIENTE_COB', 'BRZ_HIST_VENDAS_PECAS',
+          'DT_VENDA, CLIENTE_HASH, CLIENTE_KEY, VALOR_VENDA, LUCRO_VENDA');
+
+    -- BRZ_HIST_SERVICOS
+    criar('IX_BRZ_SERV_DT_DEPTO_COB', 'BRZ_HIST_SERVICOS',
+          'DT_REALIZACAO_SERVICO, DEPARTAMENTO_SERVICO, CATEGORIA_SERVICO, QTDE_SERVICOS, VALOR_TOTAL_SERVICO, LUCRO_SERVICO');
+    criar('IX_BRZ_SERV_DT_VENDEDOR_COB', 'BRZ_HIST_SERVICOS',
+          'DT_REALIZACAO_SERVICO, NOME_VENDEDOR_SERVICO, VALOR_TOTAL_SERVICO, LUCRO_SERVICO');
+    criar('IX_BRZ_SERV_DT_CLIENTE_COB', 'BRZ_HIST_SERVICOS',
+          'DT_REALIZACAO_SERVICO, CLIENTE_HASH, CLIENTE_KEY, VALOR_TOTAL_SERVICO, LUCRO_SERVICO');
+
+    -- BRZ_HIST_VENDAS_VEICULOS
+    criar('IX_BRZ_VV_DT_KPI_COB', 'BRZ_HIST_VENDAS_VEICULOS',
+          'DT_VENDA, QTDE_VENDIDA, VALOR_VENDA, LUCRO_VENDA, DIAS_EM_ESTOQUE');
+    criar('IX_BRZ_VV_DT_VENDEDOR_COB', 'BRZ_HIST_VENDAS_VEICULOS',
+          'DT_VENDA, NOME_VENDEDOR, VALOR_VENDA, LUCRO_VENDA');
+    criar('IX_BRZ_VV_DT_CLIENTE_COB', 'BRZ_HIST_VENDAS_VEICULOS',
+          'DT_VENDA, CLIENTE_HASH, CLIENTE_KEY, VALOR_VENDA, LUCRO_VENDA');
+
+    -- AGG_DIARIO_FILIAL
+    criar('IX_AGG_DIARIO_COB', 'AGG_DIARIO_FILIAL',
+          'DT, LINHA, COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL, RECEITA, LUCRO, QTDE');
+
+    -- Sem método do dashboard que filtre pelas colunas líderes (só custam na carga)
+    remover('IX_BRZ_VP_PECA');
+    remover('IX_BRZ_VP_VENDEDOR');
+    remover('IX_BRZ_VP_CIDADE_ESTADO');
+    remover('IX_BRZ_SERV_DEPARTAMENTO');
+    remover('IX_BRZ_SERV_VENDEDOR');
+    remover('IX_BRZ_VV_VENDEDOR');
+    remover('IX_BRZ_VV_MARCA_MODELO');
+    remover('IX_BRZ_VV_CHASSI');
+    remover('IX_AGG_DIARIO_DT_LINHA');
+END;
+/
@@ -0,0 +1,13 @@
+-- Camada SILVER: dimensões conformadas (DIM_*) e fatos só com chaves e medidas (SLV_FATO_*)
+-- (connector/silver.py). Carga inicial depois da migração: python mains/main_silver_rebuild.py
+@@../SILVER - CREATE SEQUENCE SEQ_SILVER_SK.sql
+@@../SILVER - CREATE TABLE DIM_FILIAL.sql
+@@../SILVER - CREATE TABLE DIM_PECA.sql
+@@../SILVER - CREATE TABLE DIM_SERVICO.sql
+@@../SILVER - CREATE TABLE DIM_VEICULO.sql
+@@../SILVER - CREATE TABLE DIM_VENDEDOR.sql
+@@../SILVER - CREATE TABLE DIM_CLIENTE.sql
+@@../SILVER - CREATE TABLE DIM_GEOGRAFIA.sql
+@@../SILVER - CREATE TABLE SLV_FATO_VENDAS_VEICULOS.sql
+@@../SILVER - CREATE TABLE SLV_FATO_VENDAS_PECAS.sql
+@@../SILVER - CREATE TABLE SLV_FATO_SERVICOS.sql
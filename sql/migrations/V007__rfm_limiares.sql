@@ -0,0 +1,3 @@
+-- Limiares persistidos do RFM (connector/rfm.py).
+-- Primeiro cálculo depois da migração: python mains/main_rfm_limiares.py
+@@../AGREGADO - CREATE TABLE AGG_RFM_LIMIARES.sql
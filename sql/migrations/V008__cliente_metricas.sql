@@ -0,0 +1,3 @@
+-- Métricas por cliente, mês e origem mantidas por MERGE nas cargas (connector/customer_metrics.py).
+-- Carga inicial depois da migração: python mains/main_cliente_metricas_rebuild.py
+@@../AGREGADO - CREATE TABLE AGG_CLIENTE_METRICAS.sql
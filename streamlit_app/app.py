@@ -1,4 +1,5 @@
 import sys
+import threading
 from pathlib import Path
 
 # Adiciona a raiz do projeto (pai de streamlit_app) no PYTHONPATH
@@ -8,6 +9,10 @@ if str(PROJECT_ROOT) not in sys.path:
 
 import streamlit as st
 
+from utils.ini_config import flag
+from utils.query_telemetry import telemetry
+from utils.tracing import tracer
+
 # ----------------------------
 # (AUTH) Mantido, porém desativado para o case
 # ----------------------------
@@ -20,6 +25,23 @@ APP_TITLE = "Autos Code - Dashboard"
 st.set_page_config(page_title=APP_TITLE, layout="wide")
 
 
+@st.cache_resource(show_spinner=False)
+def start_cache_warmup() -> bool:
+    """Aquece o cache com os filtros padrão em background (1x por processo)."""
+    from repositories.base_repo import CACHE
+    if not flag(CACHE, "warmup_on_start"):
+        return False
+
+    from repositories.warmup import run_warmup
+    threading.Thread(
+        target=run_warmup,
+        kwargs={"max_workers": int(CACHE.get("warmup_workers", 4))},
+        name="cache-warmup",
+        daemon=True,
+    ).start()
+    return True
+
+
 def init_session_state() -> None:
     if "authenticated" not in st.session_state:
         st.session_state["authenticated"] = False
@@ -80,38 +102,54 @@ def render_app_shell() -> None:
             index=0,
         )
 
+        # Idade dos dados exibidos (stale-while-revalidate): preenchido depois do render
+        freshness_container = st.container()
+
+        # Telemetria de queries (opcional): preenchido depois que a página renderiza
+        show_profiler = st.checkbox("Query profiler", value=False)
+        profiler_container = st.container()
+
     # Conteúdo
     st.title(APP_TITLE)
+    render_id = telemetry.begin_render(page)
 
     
-    if page == "Home":
-        from views.home_view import render as render_home
-        render_home()
-    elif page == "DASHBOARD - Operacional":
-        from views.dashboard_operacional_view import render as render_ops
-        render_ops()
-    elif page == "DASHBOARD - Analítico":
-        from views.dashboard_analitico_view import render as render_ops
-        render_ops()
-    elif page == "DASHBOARD - Preditivo":
-        from views.dashboard_preditivo_view import render as render_ops
-        render_ops()
-    elif page == "Rentabilidade Integrada":
-        from views.rentabilidade_integrada_view import render as render_ri
-        render_ri()
-    elif page == "Pós-Vendas":
-        from views.pos_vendas_view import render as render_pos
-        render_pos()
-    elif page == "Performance Filial":
-        from views.performance_filial_view import render as render_perf
-        render_perf()
-    elif page == "Clientes":
-        from views.clientes_view import render as render_clientes
-        render_clientes()
+    # Span raiz do render (amostrado; sempre amostrado com o profiler aberto)
+    with tracer.span("render.page", sample=1.0 if show_profiler else None, page=page, render_id=render_id):
+        if page == "Home":
+            from views.home_view import render as render_home
+            render_home()
+        elif page == "DASHBOARD - Operacional":
+            from views.dashboard_operacional_view import render as render_ops
+            render_ops()
+        elif page == "DASHBOARD - Analítico":
+            from views.dashboard_analitico_view import render as render_ops
+            render_ops()
+        elif page == "DASHBOARD - Preditivo":
+            from views.dashboard_preditivo_view import render as render_ops
+            render_ops()
+        elif page == "Rentabilidade Integrada":
+            from views.rentabilidade_integrada_view import render as render_ri
+            render_ri()
+        elif page == "Pós-Vendas":
+            from views.pos_vendas_view import render as render_pos
+            render_pos()
+        elif page == "Performance Filial":
+            from views.performance_filial_view import render as render_perf
+            render_perf()
+        elif page == "Clientes":
+            from views.clientes_view import render as render_clientes
+            render_clientes()
+
+    from views.query_profiler_view import render_freshness, render_panel
+    render_freshness(freshness_container, render_id)
+    if show_profiler:
+        render_panel(profiler_container, render_id)
 
 
 def main() -> None:
     init_session_state()
+    start_cache_warmup()
 
     # ----------------------------
     # (AUTH) DESATIVADO
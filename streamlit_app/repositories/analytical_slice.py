@@ -0,0 +1,219 @@
+"""
+AnalyticalSlice - Recorte local (pandas, colunar e tipado) das tabelas BRZ
+
+- Carregado 1x por (período do recorte, versão dos dados): fatos de vendas de
+  veículos, peças e serviços no período + estoques já agregados por filial
+- Textos repetidos (filial, vendedor, departamento, códigos) como category;
+  valores como float64 (mesma soma do Oracle); fatos ordenados pela data,
+  então o filtro de período é uma busca binária (sem varrer a tabela)
+- Os métodos reproduzem o SQL dos repositórios (mesmos nomes e colunas de
+  saída); BaseRepository.from_slice decide quando usar o recorte e cai no
+  Oracle se o período pedido estiver fora dele
+"""
+
+from __future__ import annotations
+
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Colunas já com NVL aplicado no Oracle (o recorte nunca tem valor nulo)
+SLICE_QUERIES: Dict[str, str] = {
+    "veic": """
+        SELECT DT_VENDA AS DT, COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+               NOME_VENDEDOR AS VENDEDOR,
+               NVL(VALOR_VENDA,0) AS RECEITA, NVL(LUCRO_VENDA,0) AS LUCRO
+        FROM BRZ_HIST_VENDAS_VEICULOS
+        WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
+        """,
+    "pec": """
+        SELECT DT_VENDA AS DT, COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+               NOME_VENDEDOR AS VENDEDOR,
+               NVL(VALOR_VENDA,0) AS RECEITA, NVL(LUCRO_VENDA,0) AS LUCRO
+        FROM BRZ_HIST_VENDAS_PECAS
+        WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
+        """,
+    "srv": """
+        SELECT DT_REALIZACAO_SERVICO AS DT, COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+               NOME_VENDEDOR_SERVICO AS VENDEDOR, DEPARTAMENTO_SERVICO,
+               NVL(QTDE_SERVICOS,0) AS QTDE_SERVICOS,
+               NVL(VALOR_TOTAL_SERVICO,0) AS RECEITA, NVL(LUCRO_SERVICO,0) AS LUCRO
+        FROM BRZ_HIST_SERVICOS
+        WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
+        """,
+    "estoque_veic": """
+        SELECT COD_FILIAL, NOME_FILIAL, SUM(NVL(CUSTO_VEICULO,0)) AS ESTOQUE_VEIC
+        FROM BRZ_ESTOQUE_VEICULOS
+        GROUP BY COD_FILIAL, NOME_FILIAL
+        """,
+    "estoque_pec": """
+        SELECT COD_FILIAL, NOME_FILIAL, SUM(NVL(VALOR_PECA_ESTOQUE,0)) AS ESTOQUE_PEC
+        FROM BRZ_ESTOQUE_PECAS
+        GROUP BY COD_FILIAL, NOME_FILIAL
+        """,
+}
+
+# Colunas de cada consulta (recorte vazio ainda precisa do esquema)
+SLICE_COLUMNS: Dict[str, List[str]] = {
+    "veic": ["DT", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "VENDEDOR", "RECEITA", "LUCRO"],
+    "pec": ["DT", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "VENDEDOR", "RECEITA", "LUCRO"],
+    "srv": ["DT", "COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "VENDEDOR", "DEPARTAMENTO_SERVICO",
+            "QTDE_SERVICOS", "RECEITA", "LUCRO"],
+    "estoque_veic": ["COD_FILIAL", "NOME_FILIAL", "ESTOQUE_VEIC"],
+    "estoque_pec": ["COD_FILIAL", "NOME_FILIAL", "ESTOQUE_PEC"],
+}
+
+_FACTS = ("veic", "pec", "srv")
+_CATEGORIES = ("COD_CONCESSIONARIA", "COD_FILIAL", "NOME_FILIAL", "VENDEDOR", "DEPARTAMENTO_SERVICO")
+_FLOATS = ("RECEITA", "LUCRO", "QTDE_SERVICOS", "ESTOQUE_VEIC", "ESTOQUE_PEC")
+
+
+def _typed(rows: List[Dict[str, Any]], columns: List[str]) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=columns)
+    for col in df.columns:
+        if col in _CATEGORIES:
+            df[col] = df[col].astype("category")
+        elif col in _FLOATS:
+            df[col] = df[col].astype("float64")
+    if "DT" in df.columns:
+        df["DT"] = pd.to_datetime(df["DT"])
+        df["MES"] = df["DT"].dt.to_period("M").dt.to_timestamp()
+        df = df.sort_values("DT", kind="stable").reset_index(drop=True)
+    return df
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Lista de dicts como o query_dicts devolve (NaN -> None, datas como datetime)."""
+    out = df.astype(object).where(df.notna(), None)
+    rows = out.to_dict("records")
+    for row in rows:
+        for k, v in row.items():
+            if isinstance(v, pd.Timestamp):
+                row[k] = v.to_pydatetime()
+            elif isinstance(v, np.generic):
+                row[k] = v.item()
+    return rows
+
+
+def _margem(lucro: pd.Series, receita: pd.Series) -> pd.Series:
+    # CASE WHEN receita = 0 THEN NULL ELSE lucro/receita END
+    return (lucro / receita.where(receita != 0)).astype("float64")
+
+
+class AnalyticalSlice:
+    def __init__(self, dt_ini: date, dt_fim: date, frames: Dict[str, pd.DataFrame], load_ms: float = 0.0):
+        self.dt_ini = dt_ini
+        self.dt_fim = dt_fim
+        self.frames = frames
+        self.load_ms = load_ms
+
+    # -------------------------
+    # Carga
+    # -------------------------
+    @classmethod
+    def load(cls, connector: Any, dt_ini: date, dt_fim: date) -> "AnalyticalSlice":
+        """Busca o recorte no Oracle (uma query por tabela) e tipa as colunas."""
+        t0 = time.perf_counter()
+        params = {"dt_ini": dt_ini, "dt_fim": dt_fim}
+        frames: Dict[str, pd.DataFrame] = {}
+        for name, sql in SLICE_QUERIES.items():
+            rows, _ = connector.run_select(sql, params if name in _FACTS else None)
+            frames[name] = _typed(rows, SLICE_COLUMNS[name])
+        return cls(dt_ini, dt_fim, frames, (time.perf_counter() - t0) * 1000)
+
+    @property
+    def rows(self) -> int:
+        return sum(len(df) for df in self.frames.values())
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(df.memory_usage(deep=True).sum() for df in self.frames.values()))
+
+    def covers(self, dt_ini: date, dt_fim: date) -> bool:
+        return self.dt_ini <= dt_ini and dt_fim <= self.dt_fim
+
+    # -------------------------
+    # Filtros
+    # -------------------------
+    def _period(self, name: str, dt_ini: date, dt_fim: date) -> pd.DataFrame:
+        """DT BETWEEN :dt_ini AND :dt_fim (datas à meia-noite, como o bind do Oracle)."""
+        df = self.frames[name]
+        if df.empty:
+            return df
+        dts = df["DT"].to_numpy()
+        lo = np.searchsorted(dts, np.datetime64(datetime.combine(dt_ini, datetime.min.time())), side="left")
+        hi = np.searchsorted(dts, np.datetime64(datetime.combine(dt_fim, datetime.min.time())), side="right")
+        return df.iloc[lo:hi]
+
+    @staticmethod
+    def _by_codes(df: pd.DataFrame, cod_concessionaria: Optional[Any], cod_filial: Optional[Any]) -> pd.DataFrame:
+        if cod_concessionaria is not None:
+            df = df[df["COD_CONCESSIONARIA"] == str(cod_concessionaria)]
+        if cod_filial is not None:
+            df = df[df["COD_FILIAL"] == str(cod_filial)]
+        return df
+
+    # -------------------------
+    # DashboardAnaliticoRepository
+    # -------------------------
+    def pnl_mensal(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
+        parts = []
+        for name, prefix in (("veic", "VEIC"), ("pec", "PEC"), ("srv", "SRV")):
+            g = self._period(name, dt_ini, dt_fim).groupby("MES")[["RECEITA", "LUCRO"]].sum()
+            parts.append(g.rename(columns={"RECEITA": f"{prefix}_RECEITA", "LUCRO": f"{prefix}_LUCRO"}))
+
+        df = pd.concat(parts, axis=1).fillna(0.0).sort_index()
+        df["LUCRO_TOTAL"] = df["VEIC_LUCRO"] + df["PEC_LUCRO"] + df["SRV_LUCRO"]
+        df["RECEITA_TOTAL"] = df["VEIC_RECEITA"] + df["PEC_RECEITA"] + df["SRV_RECEITA"]
+        df = df.rename_axis("MES").reset_index()
+        return _records(df[["MES", "VEIC_RECEITA", "VEIC_LUCRO", "PEC_RECEITA", "PEC_LUCRO",
+                            "SRV_RECEITA", "SRV_LUCRO", "LUCRO_TOTAL", "RECEITA_TOTAL"]])
+
+    def roi_por_filial_periodo(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
+        keys = ["COD_FILIAL", "NOME_FILIAL"]
+        lucro = pd.concat(
+            [self._period(n, dt_ini, dt_fim)[keys + ["LUCRO"]] for n in _FACTS], ignore_index=True
+        )
+        lucro = lucro.astype({k: "object" for k in keys})
+        lucro = lucro.groupby(keys, dropna=False, observed=True)["LUCRO"].sum().rename("LUCRO_TOTAL").reset_index()
+
+        # Estoques agregados por (filial, nome) e ligados só pelo código (como no SQL)
+        est_v = self.frames["estoque_veic"].astype({k: "object" for k in keys}).drop(columns="NOME_FILIAL")
+        est_p = self.frames["estoque_pec"].astype({k: "object" for k in keys}).drop(columns="NOME_FILIAL")
+        # NULL nunca casa no JOIN do Oracle; no merge do pandas NaN casaria com NaN
+        est_v = est_v[est_v["COD_FILIAL"].notna()]
+        est_p = est_p[est_p["COD_FILIAL"].notna()]
+        df = lucro.merge(est_v, on="COD_FILIAL", how="left").merge(est_p, on="COD_FILIAL", how="left")
+
+        df["CAPITAL_ESTOQUE"] = df["ESTOQUE_VEIC"].fillna(0.0) + df["ESTOQUE_PEC"].fillna(0.0)
+        df["ROI_ESTOQUE"] = _margem(df["LUCRO_TOTAL"], df["CAPITAL_ESTOQUE"])
+        df = df.sort_values("ROI_ESTOQUE", ascending=False, na_position="last", kind="stable")
+        return _records(df[["COD_FILIAL", "NOME_FILIAL", "LUCRO_TOTAL", "CAPITAL_ESTOQUE", "ROI_ESTOQUE"]])
+
+    def lucro_por_vendedor(self, dt_ini: date, dt_fim: date, top_n: int = 20) -> List[Dict[str, Any]]:
+        allv = pd.concat(
+            [self._period(n, dt_ini, dt_fim)[["VENDEDOR", "LUCRO", "RECEITA"]] for n in _FACTS], ignore_index=True
+        )
+        allv = allv[allv["VENDEDOR"].notna()].astype({"VENDEDOR": "object"})
+        df = allv.groupby("VENDEDOR")[["LUCRO", "RECEITA"]].sum()
+        df = df.rename(columns={"LUCRO": "LUCRO_TOTAL", "RECEITA": "RECEITA_TOTAL"}).reset_index()
+        df["MARGEM"] = _margem(df["LUCRO_TOTAL"], df["RECEITA_TOTAL"])
+        df = df.sort_values("LUCRO_TOTAL", ascending=False, kind="stable").head(int(top_n))
+        return _records(df[["VENDEDOR", "LUCRO_TOTAL", "RECEITA_TOTAL", "MARGEM"]])
+
+    # -------------------------
+    # PosVendaRepository
+    # -------------------------
+    def por_departamento(self, dt_ini: date, dt_fim: date,
+                         cod_concessionaria: Optional[Any] = None,
+                         cod_filial: Optional[Any] = None,
+                         top_n: int = 20) -> List[Dict[str, Any]]:
+        srv = self._by_codes(self._period("srv", dt_ini, dt_fim), cod_concessionaria, cod_filial)
+        df = srv.groupby("DEPARTAMENTO_SERVICO", dropna=False, observed=True)[["QTDE_SERVICOS", "RECEITA", "LUCRO"]].sum()
+        df = df.reset_index().astype({"DEPARTAMENTO_SERVICO": "object"})
+        df["MARGEM"] = _margem(df["LUCRO"], df["RECEITA"])
+        df = df.sort_values("RECEITA", ascending=False, na_position="last", kind="stable").head(int(top_n))
+        return _records(df[["DEPARTAMENTO_SERVICO", "QTDE_SERVICOS", "RECEITA", "LUCRO", "MARGEM"]])
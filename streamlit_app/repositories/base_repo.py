@@ -1,13 +1,31 @@
 from __future__ import annotations
 
-import inspect
+import contextvars
 import os
-from typing import Any, Optional, Dict, List
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, Optional, Dict, List, Tuple, Union
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 from connector.oracle_connector import OracleConnector
+from connector.duckdb_connector import DuckDBConnector
+from connector.data_version import DataVersionStore, data_versions
+from connector.rollups import ROLLUP_TABLE
+from utils.ini_config import flag, read, section
 from utils.logger_controller import LoggerController
+from utils.query_telemetry import telemetry, QueryRecord, sql_id
+from utils.tracing import tracer
+from utils.result_cache import ResultCache, create_result_cache, result_key
+from utils.background_refresh import StaleWhileRevalidate
+from repositories.analytical_slice import AnalyticalSlice, SLICE_QUERIES
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, PAGE_SIZE
+from repositories.pagination import Page, PageSpec, keyset_sql, page_params, to_page
 
 import pandas as pd
 
@@ -17,75 +35,485 @@ os.makedirs(logdirectory, exist_ok=True)
 logfile = os.path.join(logdirectory, "BaseRepository.txt")
 logger = LoggerController(logfile)
 
+# Cache de queries: sem TTL fixo, a chave inclui a versão dos dados (CTL_DATA_VERSION)
+_cache_cfg = read(Path(__file__).resolve().parents[1] / "config" / "config.ini")
+CACHE = section(_cache_cfg, "CACHE")
+CACHE_MAX_ENTRIES = int(CACHE.get("max_entries", 1000))
+SWR_ENABLED = flag(CACHE, "stale_while_revalidate", True)
+# Agregados ligados no .ini são checados (existem e têm linhas) a cada table_check_s
+TABLE_CHECK_S = float(CACHE.get("table_check_s", 300))
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# Fan-out: consultas independentes de uma página em paralelo
+FANOUT_WORKERS = int(section(_cache_cfg, "FANOUT").get("workers", 4))
+
+# Recorte analítico local (pandas) para filtros sem ida ao Oracle
+_slice_cfg = section(_cache_cfg, "SLICE")
+SLICE_ENABLED = flag(_slice_cfg, "enabled")
+SLICE_DT_INI = date.fromisoformat(_slice_cfg["dt_ini"]) if _slice_cfg.get("dt_ini") else DEFAULT_DT_INI
+SLICE_DT_FIM = date.fromisoformat(_slice_cfg["dt_fim"]) if _slice_cfg.get("dt_fim") else DEFAULT_DT_FIM
+SLICE_RETRY_S = float(_slice_cfg.get("retry_s", 120))
+_SLICE_SQL = " ".join(SLICE_QUERIES.values())
+
+# Agregado diário por filial e linha de negócio (AGG_DIARIO_FILIAL, connector/rollups.py)
+ROLLUP_ENABLED = flag(section(_cache_cfg, "ROLLUP"), "enabled")
+
+# Jornada pós-venda por venda de veículo (AGG_JORNADA_CLIENTE, connector/journey.py)
+JOURNEY_ENABLED = flag(section(_cache_cfg, "JORNADA"), "enabled")
+
+# Camada SILVER: fatos só com chaves substitutas + dimensões conformadas (connector/silver.py)
+SILVER_ENABLED = flag(section(_cache_cfg, "SILVER"), "enabled")
+
+# Métricas por cliente x mês x origem (AGG_CLIENTE_METRICAS, connector/customer_metrics.py)
+CLIENT_METRICS_ENABLED = flag(section(_cache_cfg, "CLIENTE_METRICAS"), "enabled")
+
+# RFM: pontua contra os limiares persistidos em AGG_RFM_LIMIARES (connector/rfm.py)
+RFM_PERSISTED = flag(section(_cache_cfg, "RFM"), "persisted")
+
+# Backend de leitura: oracle (padrão) ou duckdb (Parquet local gravado pelos controllers)
+# A variável de ambiente AUTOS_DASHBOARD_ENGINE sobrepõe o .ini
+_backend_cfg = section(_cache_cfg, "BACKEND")
+ENGINES = ("oracle", "duckdb")
+ENGINE = (os.environ.get("AUTOS_DASHBOARD_ENGINE") or _backend_cfg.get("engine", "oracle")).strip().lower()
+PARQUET_ROOT = Path(_backend_cfg.get("parquet_root", "data/parquet"))
+if not PARQUET_ROOT.is_absolute():
+    PARQUET_ROOT = PROJECT_ROOT / PARQUET_ROOT
+
+Connector = Union[OracleConnector, DuckDBConnector]
+
+# Marca as threads do fan-out (fan_out aninhado roda em série, sem esperar o próprio pool)
+_in_fanout: contextvars.ContextVar[bool] = contextvars.ContextVar("repo_fanout", default=False)
+
 
 class BaseRepository:
-    def __init__(self, config_file: str = "config/database.ini"):
+    # Falha ao carregar o recorte: volta para o Oracle e só tenta de novo depois disso
+    _slice_retry_at = 0.0
+    # Recorte analítico do processo: (config, engine) -> (versões, recorte); cargas em andamento
+    _slices: Dict[Tuple[str, str], Tuple[tuple, AnalyticalSlice]] = {}
+    _slices_loading: set = set()
+    _slices_lock = threading.Lock()
+    # (engine, tabela) -> (existe e tem linhas, instante da checagem); compartilhado pelo processo
+    _tables_ready: Dict[Tuple[str, str], Tuple[bool, float]] = {}
+    # KPIs/P&L/ROI/performance leem AGG_DIARIO_FILIAL em vez de somar as BRZ_*
+    use_rollup = ROLLUP_ENABLED
+    # Rentabilidade integrada lê AGG_JORNADA_CLIENTE nas janelas padrão (30/60/90/180 dias)
+    use_journey = JOURNEY_ENABLED
+    # Agrupamentos por peça/vendedor/serviço/cliente leem SLV_FATO_* e juntam a DIM_* no resultado
+    use_silver = SILVER_ENABLED
+    # LTV e RFM somam AGG_CLIENTE_METRICAS em períodos de meses inteiros
+    use_cliente_metricas = CLIENT_METRICS_ENABLED
+    # Segmentos RFM com os limiares gravados (estáveis) em vez dos quintis do período
+    use_rfm_limiares = RFM_PERSISTED
+
+    def __init__(self, config_file: str = "config/database.ini", engine: Optional[str] = None):
+        """
+        Args:
+            config_file: database.ini (usado pelo backend oracle)
+            engine: oracle | duckdb (None = [BACKEND] engine do config.ini)
+        """
         self._config_file = config_file
+        self._engine = (engine or ENGINE).lower()
+        if self._engine not in ENGINES:
+            raise ValueError(f"❌ Backend desconhecido: {self._engine} (use {', '.join(ENGINES)})")
 
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ",
-                   f"Inicializando BaseRepository - config_file={config_file}")
+        logger.info("Inicializando BaseRepository - config_file=%s engine=%s", config_file, self._engine)
 
     @staticmethod
     @st.cache_resource
-    def _get_connector_cached(config_file: str) -> OracleConnector:
-        return OracleConnector(config_file=config_file)
+    def _get_connector_cached(config_file: str, engine: str = "oracle") -> Connector:
+        if engine == "duckdb":
+            # Uma conexão DuckDB em memória por processo, views sobre os Parquet locais
+            connector = DuckDBConnector(str(PARQUET_ROOT))
+            connector.init_connection_pool()
+            return connector
+        # Pool mantém as sessões vivas entre reruns: é o que permite o reuso
+        # do statement cache e dos cursores preparados para o mesmo SQL.
+        # Leituras do dashboard vão para o DSN de leitura (fallback: primário).
+        connector = OracleConnector(config_file=config_file, target="read")
+        connector.init_connection_pool()
+        return connector
 
-    def _get_connector(self) -> OracleConnector:
-        return self._get_connector_cached(self._config_file)
+    def _get_connector(self) -> Connector:
+        return self._get_connector_cached(self._config_file, self._engine)
+
+    def table_ready(self, table: str) -> bool:
+        """
+        True se a tabela existe e tem linhas. Agregado ligado no config.ini antes da
+        migração/rebuild não derruba (ORA-00942) nem zera a tela: a consulta volta às BRZ_*.
+        """
+        key = (self._engine, table)
+        now = time.monotonic()
+        cached = self._tables_ready.get(key)
+        if cached and now - cached[1] < TABLE_CHECK_S:
+            return cached[0]
+        try:
+            rows, _ = self._get_connector().run_select(f"SELECT 1 AS OK FROM {table} FETCH FIRST 1 ROWS ONLY")
+            ready = bool(rows)
+        except Exception as e:
+            logger.debug("Checagem de %s falhou: %s", table, e)
+            ready = False
+        if not ready and (cached is None or cached[0]):
+            logger.warning("⚠️ %s ausente ou vazia: consultas voltam às tabelas BRZ_*", table)
+        self._tables_ready[key] = (ready, now)
+        return ready
+
+    @property
+    def rollup_ready(self) -> bool:
+        """[ROLLUP] ligado e AGG_DIARIO_FILIAL carregado."""
+        return self.use_rollup and self.table_ready(ROLLUP_TABLE)
+
+    @staticmethod
+    @st.cache_resource
+    def _get_versions_cached(config_file: str, engine: str = "oracle") -> DataVersionStore:
+        return DataVersionStore(
+            BaseRepository._get_connector_cached(config_file, engine),
+            check_interval_s=float(CACHE.get("version_check_s", 5)),
+            fallback_ttl_s=float(CACHE.get("fallback_ttl_s", 120)),
+            volatile_ttl_s=float(CACHE.get("volatile_ttl_s", 300)),
+        )
+
+    @staticmethod
+    @st.cache_resource
+    def _get_result_cache_cached(engine: str = "oracle") -> ResultCache:
+        # Segundo nível (persistente, compartilhado entre réplicas no mesmo host)
+        directory = Path(CACHE.get("disk_dir", "cache/results"))
+        if not directory.is_absolute():
+            directory = PROJECT_ROOT / directory
+        if engine != "oracle":
+            # Versões dos dados são contadores independentes por backend: diretórios separados
+            directory = directory / engine
+        return create_result_cache(
+            CACHE.get("backend", "none"),
+            directory=str(directory),
+            max_mb=CACHE.get("disk_max_mb", 512),
+        )
 
     @staticmethod
     def _normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         return params or {}
 
-    @st.cache_data(ttl=120, show_spinner=False)
-    def query_dicts(_self, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _caller_name(depth: int = 2) -> str:
+        """Método de repositório que originou a query (ex.: KpiRepository.kpis_gerais_periodo)."""
+        frame = sys._getframe(depth)
+        owner = frame.f_locals.get("self")
+        owner_name = type(owner).__name__ if owner is not None else frame.f_globals.get("__name__", "?")
+        return f"{owner_name}.{frame.f_code.co_name}"
 
+    @staticmethod
+    @st.cache_resource
+    def _get_swr_cached() -> StaleWhileRevalidate:
+        return StaleWhileRevalidate(
+            max_workers=int(CACHE.get("swr_workers", 2)),
+            max_entries=int(CACHE.get("swr_max_entries", 500)),
+            on_error=lambda key, e: logger.error("❌ Refresh em background falhou: %s", e),
+        )
 
+    @staticmethod
+    @st.cache_resource
+    def _get_fanout_pool_cached() -> ThreadPoolExecutor:
+        # Compartilhado por todas as sessões; manter workers abaixo do max do pool do Oracle
+        return ThreadPoolExecutor(max_workers=max(FANOUT_WORKERS, 1), thread_name_prefix="fanout")
+
+    def fan_out(self, calls: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+        """
+        Executa as consultas independentes de uma página em paralelo e devolve
+        {nome: resultado} na mesma ordem de calls.
+
+        Cada chamada usa uma conexão própria do pool, então a latência da página
+        passa a ser a da consulta mais lenta, não a soma. Telemetria (render),
+        span corrente e o contexto do Streamlit seguem para as threads.
+        A primeira exceção é repassada depois que todas terminarem.
+
+        Ex.: res = repo.fan_out({"kpis": lambda: repo.kpis(dt_ini, dt_fim), ...})
+        """
+        if len(calls) <= 1 or FANOUT_WORKERS <= 1 or _in_fanout.get():
+            return {name: fn() for name, fn in calls.items()}
+
+        pool = self._get_fanout_pool_cached()
+        script_ctx = get_script_run_ctx(suppress_warning=True)
+        with tracer.span("repo.fan_out", calls=len(calls)):
+            futures = {
+                name: pool.submit(contextvars.copy_context().run, self._fanout_task, script_ctx, fn)
+                for name, fn in calls.items()
+            }
+            errors = [f.exception() for f in futures.values()]
+        for e in errors:
+            if e is not None:
+                raise e
+        return {name: f.result() for name, f in futures.items()}
+
+    def prefetch(self, fn: Callable[[], Any]) -> Future:
+        """
+        Dispara fn no pool do fan-out sem esperar (ex.: próxima página de uma
+        tabela enquanto o usuário lê a atual) e devolve o Future.
+
+        O resultado também fica no cache de query_dicts, então mesmo um Future
+        descartado deixa a próxima chamada igual respondida pelo cache.
+        """
+        pool = self._get_fanout_pool_cached()
+        script_ctx = get_script_run_ctx(suppress_warning=True)
+        return pool.submit(contextvars.copy_context().run, self._fanout_task, script_ctx, fn)
+
+    @staticmethod
+    def _fanout_task(script_ctx: Any, fn: Callable[[], Any]) -> Any:
+        # Roda numa cópia do contexto de quem chamou (render_id, span)
+        if script_ctx is not None:
+            add_script_run_ctx(threading.current_thread(), script_ctx)
+        _in_fanout.set(True)
+        return fn()
+
+    def _slice_for(self, versions: tuple) -> Optional[AnalyticalSlice]:
+        """Recorte da versão atual; se ainda não existe, agenda a carga em background e devolve None."""
+        key = (self._config_file, self._engine)
+        with BaseRepository._slices_lock:
+            current = BaseRepository._slices.get(key)
+            if current is not None and current[0] == versions:
+                return current[1]
+            if (key, versions) in BaseRepository._slices_loading:
+                return None
+            BaseRepository._slices_loading.add((key, versions))
+        threading.Thread(target=self._load_slice, args=(key, versions), name="slice-load", daemon=True).start()
+        logger.info("🧊 Recorte analítico em carga em background; até lá as consultas vão ao banco")
+        return None
+
+    @staticmethod
+    def _load_slice(key: Tuple[str, str], versions: tuple) -> None:
+        # Carga nova => recorte novo; o anterior (outra versão) é substituído
+        config_file, engine = key
+        try:
+            analytical_slice = AnalyticalSlice.load(BaseRepository._get_connector_cached(config_file, engine),
+                                                    SLICE_DT_INI, SLICE_DT_FIM)
+            with BaseRepository._slices_lock:
+                BaseRepository._slices[key] = (versions, analytical_slice)
+            logger.info("🧊 Recorte analítico %s a %s carregado: %s linhas, %.1f MB em %.0f ms",
+                        SLICE_DT_INI, SLICE_DT_FIM, analytical_slice.rows, analytical_slice.nbytes / 1024 / 1024,
+                        analytical_slice.load_ms)
+        except Exception as e:
+            BaseRepository._slice_retry_at = time.monotonic() + SLICE_RETRY_S
+            logger.warning("⚠️ Recorte analítico indisponível, consultando o banco: %s", e)
+        finally:
+            with BaseRepository._slices_lock:
+                BaseRepository._slices_loading.discard((key, versions))
+
+    def from_slice(self, method: str, dt_ini: date, dt_fim: date, **kwargs: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Responde o método pelo recorte analítico local (group-bys em pandas) quando
+        o período pedido está dentro do recorte ([SLICE] em config.ini).
+        Retorna None para o repositório seguir com o SQL no Oracle.
+
+        O recorte é carregado 1x por processo e versão dos dados, em background:
+        enquanto carrega (e logo depois de uma carga nova) a consulta vai ao banco.
+        A chamada respondida pelo recorte entra na telemetria com cache_tier "slice".
+        """
+        if not SLICE_ENABLED or not (SLICE_DT_INI <= dt_ini and dt_fim <= SLICE_DT_FIM):
+            return None
+        if time.monotonic() < BaseRepository._slice_retry_at:
+            return None
+
+        caller = self._caller_name()
+        with tracer.span("repo.slice", caller=caller, method=method) as span:
+            t0 = time.perf_counter()
+            try:
+                versions = self._get_versions_cached(self._config_file, self._engine).versions_for(_SLICE_SQL)
+            except Exception as e:
+                BaseRepository._slice_retry_at = time.monotonic() + SLICE_RETRY_S
+                logger.warning("⚠️ Recorte analítico indisponível, consultando o banco: %s", e)
+                return None
+            analytical_slice = self._slice_for(versions)
+            if analytical_slice is None:
+                return None
+            results = getattr(analytical_slice, method)(dt_ini, dt_fim, **kwargs)
+            wall_ms = (time.perf_counter() - t0) * 1000
+            span.set(rows=len(results), cache_tier="slice")
+
+        telemetry.record(QueryRecord(
+            caller=caller,
+            sql_id=f"slice:{method}",
+            sql_preview=f"AnalyticalSlice.{method} {dt_ini}..{dt_fim} {kwargs or ''}".strip(),
+            wall_ms=wall_ms,
+            rows=len(results),
+            cache_hit=True,
+            cache_tier="slice",
+        ))
+        return results
+
+    def query_dicts(self, sql: str, params: Optional[Dict[str, Any]] = None,
+                    _caller: Optional[str] = None,
+                    variants: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """
         Executa SELECT e retorna resultados como lista de dicionários, com suporte
         a bind variables nomeadas (:dt_ini, :cod_filial, etc.).
+
+        Cada chamada gera um registro de telemetria (tempos, linhas, round trips,
+        bytes, cache hit/miss, idade do dado e método chamador).
+
+        O resultado fica em cache até uma carga nova mudar a versão de alguma
+        tabela BRZ_* lida pelo SQL (SQL com SYSDATE ainda expira por janela de tempo).
+        Com stale-while-revalidate, a chave vencida só por tempo (volatile_ttl_s /
+        fallback_ttl_s) devolve o último resultado na hora e o novo é buscado em
+        segundo plano; versão de dados nova (carga) sempre busca o resultado novo.
+
+        O SQL é Oracle; no backend duckdb ele é traduzido (connector.sql_dialect).
+        variants={"duckdb": "..."} substitui o SQL inteiro naquele backend quando a
+        tradução automática não basta.
+        """
+        p = self._normalize_params(params)
+        caller = _caller or self._caller_name()
+        sql = (variants or {}).get(self._engine, sql)
+        versions = self._get_versions_cached(self._config_file, self._engine).versions_for(sql)
+        swr = self._get_swr_cached() if SWR_ENABLED else None
+        base_key = result_key(sql, p, (self._engine,))
+
+        # Preenchido pelo corpo cacheado apenas em miss do st.cache_data
+        # (tier "disk" = veio do cache persistente, "oracle"/"duckdb" = foi ao banco)
+        probe: Dict[str, Any] = {}
+
+        sid = sql_id(sql)
+        with tracer.span("repo.query", caller=caller, sql_id=sid) as span:
+            t0 = time.perf_counter()
+            latest = swr.latest(base_key) if swr else None
+
+            if (latest is not None and latest.versions != versions
+                    and data_versions(latest.versions) == data_versions(versions)):
+                results = latest.rows
+                probe["tier"] = "stale"
+                probe["fetched_at"] = latest.fetched_at
+                connector, result_cache = self._get_connector(), self._get_result_cache_cached(self._engine)
+                if swr.refresh(base_key, versions,
+                               lambda: self._fetch(connector, result_cache, sql, p, versions)):
+                    logger.info("🔄 Servindo resultado anterior de %s; refresh em background agendado", caller)
+            else:
+                results = self._query_dicts_cached(sql, p, versions, self._engine, probe)
+                if swr and "fetched_at" in probe:
+                    swr.remember(base_key, versions, results, probe["fetched_at"])
+                elif latest is not None:
+                    probe["fetched_at"] = latest.fetched_at
+            wall_ms = (time.perf_counter() - t0) * 1000
+
+            stats = probe.get("stats")
+            tier = probe.get("tier", "memory")
+            fetched_at = probe.get("fetched_at")
+            age_s = max(time.time() - fetched_at, 0.0) if fetched_at else None
+            span.set(rows=len(results), cache_hit=tier not in ENGINES, cache_tier=tier)
+            if stats:
+                span.set(execute_ms=round(stats.execute_ms, 2),
+                         fetch_ms=round(stats.fetch_ms, 2))
+
+        telemetry.record(QueryRecord(
+            caller=caller,
+            sql_id=sid,
+            sql_preview=" ".join(sql.split())[:200],
+            wall_ms=wall_ms,
+            execute_ms=stats.execute_ms if stats else 0.0,
+            fetch_ms=stats.fetch_ms if stats else 0.0,
+            rows=len(results),
+            round_trips=stats.round_trips if stats else 0,
+            bytes=stats.bytes if stats else 0,
+            cache_hit=tier not in ENGINES,
+            cache_tier=tier,
+            endpoint=stats.endpoint if stats else "",
+            age_s=age_s,
+        ))
+        return results
+
+    @st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner=False)
+    def _query_dicts_cached(_self, sql: str, params: Dict[str, Any], versions: tuple, engine: str,
+                            _probe: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        # versions e engine entram na chave (carga nova => chave nova); _probe não entra
+        # (prefixo "_"), só transporta as métricas do miss
+        rows, _ = _self._fetch(_self._get_connector_cached(_self._config_file, engine),
+                               _self._get_result_cache_cached(engine), sql, params, versions, _probe)
+        return rows
+
+    @staticmethod
+    def _fetch(connector: Connector, result_cache: ResultCache, sql: str, p: Dict[str, Any],
+               versions: tuple, probe: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], float]:
         """
-        p = _self._normalize_params(params)
+        Busca fora do st.cache_data: cache persistente, senão o banco (gravando no cache).
+        Roda tanto no rerun do Streamlit quanto nos workers de refresh em background.
+        Retorna (linhas, instante da busca no banco).
+        """
+        probe = probe if probe is not None else {}
 
-        context = inspect.currentframe()
-        linenumber = context.f_lineno
-        logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ",
-                   f"📊 query_dicts: {sql[:120]}...")
+        logger.info("📊 query_dicts: %s...", sql[:120])
         if p:
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "INFO:    ",
-                       f"Params: {p}")
+            logger.debug("Params: %s", p)
 
-        connector = _self._get_connector()
+        key = result_key(sql, p, versions)
+        try:
+            cached = result_cache.get(key)
+        except Exception as e:
+            logger.warning("⚠️ Cache persistente indisponível (%s): %s", result_cache.name, e)
+            cached = None
+        if cached is not None:
+            probe["tier"] = "disk"
+            probe["fetched_at"] = cached.fetched_at
+            logger.info("💾 query_dicts via cache %s: %s registros", result_cache.name, len(cached.rows))
+            return cached.rows, cached.fetched_at
 
         try:
-            with connector.get_connection() as conn:
-                cursor = conn.cursor()
-                try:
-                    cursor.execute(sql, p)
-                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
-                    rows = cursor.fetchall() if columns else []
-                finally:
-                    cursor.close()
-
-            results = [dict(zip(columns, row)) for row in rows]
-
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "SUCESSO! ",
-                       f"✅ query_dicts OK: {len(results)} registros retornados")
-            return results
+            results, stats = connector.run_select(sql, p)
+            fetched_at = time.time()
+            probe["stats"] = stats
+            probe["tier"] = "duckdb" if isinstance(connector, DuckDBConnector) else "oracle"
+            probe["fetched_at"] = fetched_at
 
+            logger.info("✅ query_dicts OK: %s registros retornados | execute=%.1fms fetch=%.1fms",
+                        len(results), stats.execute_ms, stats.fetch_ms)
         except Exception as e:
-            context = inspect.currentframe()
-            linenumber = context.f_lineno
-            logger.log(NOME, os.path.dirname(__file__), __name__, linenumber, "ERRO!!!",
-                       f"❌ query_dicts falhou: {e}")
+            logger.error("❌ query_dicts falhou: %s", e)
             raise
 
+        try:
+            result_cache.put(key, results, fetched_at)
+        except Exception as e:
+            logger.warning("⚠️ Falha ao gravar no cache %s: %s", result_cache.name, e)
+        return results, fetched_at
+
     def query_one(self, sql: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        rows = self.query_dicts(sql, params)
+        rows = self.query_dicts(sql, params, _caller=self._caller_name())
         return rows[0] if rows else {}
 
+    def query_page(self, sql: str, params: Optional[Dict[str, Any]], spec: PageSpec,
+                   sort: Optional[str] = None, descending: Optional[bool] = None,
+                   after: Optional[Tuple[Any, ...]] = None, busca: Optional[str] = None,
+                   page_size: int = PAGE_SIZE) -> Page:
+        """
+        Uma página de sql (SELECT sem ORDER BY / FETCH) com ordenação, busca e
+        cursor keyset no banco (repositories.pagination).
+
+        after é o next_cursor da página anterior (None = 1ª página); trocar sort,
+        descending ou busca exige recomeçar do início.
+        """
+        sort = spec.column(sort).name
+        descending = spec.descending if descending is None else bool(descending)
+        page_size = max(int(page_size), 1)
+        busca = (busca or "").strip() or None
+
+        page_sql = keyset_sql(sql, spec, sort, descending, after is not None, busca is not None, page_size)
+        p = {**self._normalize_params(params), **page_params(spec, after, busca)}
+        rows = self.query_dicts(page_sql, p, _caller=self._caller_name())
+        return to_page(rows, spec, sort, descending, page_size)
+
+    @staticmethod
+    def split_grouping_sets(rows: List[Dict[str, Any]], column: str = "GRUPO") -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Separa o resultado de um GROUP BY GROUPING SETS pelo rótulo do conjunto.
+
+        O SQL marca cada linha com o conjunto de origem (ex.: CASE GROUPING_ID(...)
+        WHEN ... THEN 'DEPARTAMENTO' END AS GRUPO); a coluna sai das linhas devolvidas.
+        Assim uma varredura da tabela atende vários retornos do repositório.
+        """
+        out: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            row = dict(row)
+            out.setdefault(row.pop(column), []).append(row)
+        return out
+
+    @staticmethod
+    def top(rows: List[Dict[str, Any]], key: str, n: int) -> List[Dict[str, Any]]:
+        """ORDER BY key DESC NULLS LAST FETCH FIRST n ROWS ONLY, sobre linhas já agregadas."""
+        return sorted(rows, key=lambda r: (r[key] is None, -(r[key] or 0)))[:int(n)]
+
 
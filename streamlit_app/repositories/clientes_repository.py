@@ -1,123 +1,264 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
+from connector.customer_metrics import METRICS_TABLE, whole_months
+from connector.rfm import LATEST_SQL, SEGMENTS, compute_sql, scored_sql
 from repositories.base_repo import BaseRepository
+from repositories.defaults import PAGE_SIZE
+from repositories.pagination import NULL_DATE, Page, PageSpec, SortColumn
+
+# Tabela de LTV: ordenável pelas medidas, desempate pelo cliente normalizado
+LTV_PAGE = PageSpec(
+    sorts=(
+        SortColumn("RECEITA_TOTAL", "Receita"),
+        SortColumn("LUCRO_TOTAL", "Lucro"),
+        SortColumn("TRANSACOES", "Transações"),
+        SortColumn("ULTIMA_DATA", "Última compra", NULL_DATE),
+    ),
+    key=("CLIENTE_HASH",),
+    search=("CLIENTE",),
+)
+
+# Clientes de um segmento RFM: ordenável pelas medidas, desempate pelo cliente normalizado
+RFM_PAGE = PageSpec(
+    sorts=(
+        SortColumn("MONETARY", "Receita"),
+        SortColumn("FREQUENCY", "Transações"),
+        SortColumn("RECENCY_DIAS", "Dias desde a última compra"),
+        SortColumn("ULTIMA_DATA", "Última compra", NULL_DATE),
+    ),
+    key=("CLIENTE_HASH",),
+    search=("CLIENTE",),
+)
 
 
 class ClientesRepository(BaseRepository):
 
+    def _metricas(self, dt_ini: date, dt_fim: date) -> bool:
+        """Período servido por AGG_CLIENTE_METRICAS (ligado e de meses inteiros)."""
+        return self.use_cliente_metricas and whole_months(dt_ini, dt_fim)
+
     def funil_clientes(self) -> Dict[str, Any]:
+        # Clientes cruzados por CLIENTE_HASH (chave normalizada gravada pelo ETL, indexada)
         sql = """
         WITH
         veic AS (
-          SELECT DISTINCT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE
+          SELECT DISTINCT CLIENTE_HASH
           FROM BRZ_HIST_VENDAS_VEICULOS
           WHERE DT_VENDA >= DATE '2023-01-01' AND DT_VENDA < DATE '2024-01-01'
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
         ),
         srv AS (
-          SELECT DISTINCT UPPER(TRIM(NOME_CLIENTE)) AS CLIENTE
+          SELECT DISTINCT CLIENTE_HASH
           FROM BRZ_HIST_SERVICOS
           WHERE DT_REALIZACAO_SERVICO >= DATE '2023-01-01' AND DT_REALIZACAO_SERVICO < DATE '2024-01-01'
-            AND NOME_CLIENTE IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
         ),
         pec AS (
-          SELECT DISTINCT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE
+          SELECT DISTINCT CLIENTE_HASH
           FROM BRZ_HIST_VENDAS_PECAS
           WHERE DT_VENDA >= DATE '2023-01-01' AND DT_VENDA < DATE '2024-01-01'
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
         )
         SELECT
           (SELECT COUNT(*) FROM veic) AS CLIENTES_VEIC_2023,
-          (SELECT COUNT(*) FROM veic v JOIN srv s ON s.CLIENTE = v.CLIENTE) AS COM_SERVICO_POSTERIOR,
-          (SELECT COUNT(*) FROM veic v JOIN pec p ON p.CLIENTE = v.CLIENTE) AS COM_COMPRA_PECAS
+          (SELECT COUNT(*) FROM veic v JOIN srv s ON s.CLIENTE_HASH = v.CLIENTE_HASH) AS COM_SERVICO_POSTERIOR,
+          (SELECT COUNT(*) FROM veic v JOIN pec p ON p.CLIENTE_HASH = v.CLIENTE_HASH) AS COM_COMPRA_PECAS
         FROM dual
         """
         return self.query_one(sql, {})
 
     def ltv_por_cliente(self, dt_ini: date, dt_fim: date, top_n: int = 50) -> List[Dict[str, Any]]:
-        sql = f"""
+        if self._metricas(dt_ini, dt_fim):
+            sql = self._ltv_metricas_sql(int(top_n))
+        else:
+            sql = self._ltv_sql(self.use_silver, int(top_n))
+        return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
+    def ltv_por_cliente_pagina(self, dt_ini: date, dt_fim: date, sort: Optional[str] = None,
+                               descending: Optional[bool] = None, after: Optional[Tuple[Any, ...]] = None,
+                               busca: Optional[str] = None, page_size: int = PAGE_SIZE) -> Page:
+        """Todos os clientes do período, uma página por vez (tabela da view; o gráfico segue com o top-N)."""
+        if self._metricas(dt_ini, dt_fim):
+            sql = self._ltv_metricas_sql(None)
+        else:
+            sql = self._ltv_sql(self.use_silver, None)
+        return self.query_page(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim}, LTV_PAGE,
+                               sort, descending, after, busca, page_size)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _ltv_sql(use_silver: bool, top_n: Optional[int]) -> str:
+        """top_n=None: todos os clientes, sem ordem, com CLIENTE_HASH (base da paginação)."""
+        top = "" if top_n is None else f"ORDER BY RECEITA_TOTAL DESC FETCH FIRST {top_n} ROWS ONLY"
+        if use_silver:
+            # Fatos SILVER: resumo por SK_CLIENTE em cada linha (0 = sem cliente), soma dos
+            # resumos e DIM_CLIENTE só para os clientes do topo
+            chave = "" if top_n is not None else "\n          d.CLIENTE_HASH,"
+            return f"""
         WITH
         tx AS (
-          SELECT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE,
+          SELECT SK_CLIENTE, COUNT(*) AS TRANSACOES, MIN(DT_VENDA) AS PRIMEIRA_DATA, MAX(DT_VENDA) AS ULTIMA_DATA,
+                 SUM(NVL(VALOR_VENDA,0)) AS RECEITA, SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+          FROM SLV_FATO_VENDAS_VEICULOS
+          WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim AND SK_CLIENTE <> 0
+          GROUP BY SK_CLIENTE
+
+          UNION ALL
+
+          SELECT SK_CLIENTE, COUNT(*), MIN(DT_VENDA), MAX(DT_VENDA),
+                 SUM(NVL(VALOR_VENDA,0)), SUM(NVL(LUCRO_VENDA,0))
+          FROM SLV_FATO_VENDAS_PECAS
+          WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim AND SK_CLIENTE <> 0
+          GROUP BY SK_CLIENTE
+
+          UNION ALL
+
+          SELECT SK_CLIENTE, COUNT(*), MIN(DT_REALIZACAO_SERVICO), MAX(DT_REALIZACAO_SERVICO),
+                 SUM(NVL(VALOR_TOTAL_SERVICO,0)), SUM(NVL(LUCRO_SERVICO,0))
+          FROM SLV_FATO_SERVICOS
+          WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim AND SK_CLIENTE <> 0
+          GROUP BY SK_CLIENTE
+        ),
+        ltv AS (
+          SELECT SK_CLIENTE,
+                 SUM(TRANSACOES) AS TRANSACOES,
+                 MIN(PRIMEIRA_DATA) AS PRIMEIRA_DATA,
+                 MAX(ULTIMA_DATA) AS ULTIMA_DATA,
+                 SUM(RECEITA) AS RECEITA_TOTAL,
+                 SUM(LUCRO) AS LUCRO_TOTAL
+          FROM tx
+          GROUP BY SK_CLIENTE
+          {top}
+        )
+        SELECT
+          d.CLIENTE_KEY AS CLIENTE,{chave}
+          l.TRANSACOES,
+          l.PRIMEIRA_DATA,
+          l.ULTIMA_DATA,
+          l.RECEITA_TOTAL,
+          l.LUCRO_TOTAL
+        FROM ltv l
+        JOIN DIM_CLIENTE d ON d.SK_CLIENTE = l.SK_CLIENTE
+        {"" if top_n is None else "ORDER BY l.RECEITA_TOTAL DESC"}
+        """
+
+        chave = "" if top_n is not None else "\n          CLIENTE_HASH,"
+        return f"""
+        WITH
+        tx AS (
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_VENDA AS DT,
                  NVL(VALOR_VENDA,0) AS RECEITA,
                  NVL(LUCRO_VENDA,0) AS LUCRO,
                  'VEICULO' AS ORIGEM
           FROM BRZ_HIST_VENDAS_VEICULOS
           WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
 
           UNION ALL
 
-          SELECT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE,
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_VENDA AS DT,
                  NVL(VALOR_VENDA,0) AS RECEITA,
                  NVL(LUCRO_VENDA,0) AS LUCRO,
                  'PECA' AS ORIGEM
           FROM BRZ_HIST_VENDAS_PECAS
           WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
 
           UNION ALL
 
-          SELECT UPPER(TRIM(NOME_CLIENTE)) AS CLIENTE,
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_REALIZACAO_SERVICO AS DT,
                  NVL(VALOR_TOTAL_SERVICO,0) AS RECEITA,
                  NVL(LUCRO_SERVICO,0) AS LUCRO,
                  'SERVICO' AS ORIGEM
           FROM BRZ_HIST_SERVICOS
           WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-            AND NOME_CLIENTE IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
         )
         SELECT
-          CLIENTE,
+          CLIENTE,{chave}
           COUNT(*) AS TRANSACOES,
           MIN(DT) AS PRIMEIRA_DATA,
           MAX(DT) AS ULTIMA_DATA,
           SUM(RECEITA) AS RECEITA_TOTAL,
           SUM(LUCRO) AS LUCRO_TOTAL
         FROM tx
-        GROUP BY CLIENTE
-        ORDER BY RECEITA_TOTAL DESC
-        FETCH FIRST {int(top_n)} ROWS ONLY
+        GROUP BY CLIENTE_HASH, CLIENTE
+        {top}
+        """
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _ltv_metricas_sql(top_n: Optional[int]) -> str:
+        """LTV somando os meses do período em AGG_CLIENTE_METRICAS (top_n=None: base da paginação)."""
+        top = "" if top_n is None else f"ORDER BY RECEITA_TOTAL DESC FETCH FIRST {top_n} ROWS ONLY"
+        chave = "" if top_n is not None else "\n          CLIENTE_HASH,"
+        return f"""
+        SELECT
+          MAX(CLIENTE_KEY) AS CLIENTE,{chave}
+          SUM(TRANSACOES) AS TRANSACOES,
+          MIN(PRIMEIRA_DATA) AS PRIMEIRA_DATA,
+          MAX(ULTIMA_DATA) AS ULTIMA_DATA,
+          SUM(RECEITA) AS RECEITA_TOTAL,
+          SUM(LUCRO) AS LUCRO_TOTAL
+        FROM {METRICS_TABLE}
+        WHERE MES BETWEEN :dt_ini AND :dt_fim
+        GROUP BY CLIENTE_HASH
+        {top}
         """
-        return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
 
     def rfm_base(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
         """
         Retorna Recency (dias), Frequency (transações) e Monetary (receita) por cliente no período.
         Recency = (dt_fim - última_data_no_período) em dias.
         """
+        if self._metricas(dt_ini, dt_fim):
+            sql = f"""
+        SELECT
+          MAX(CLIENTE_KEY) AS CLIENTE,
+          MAX(ULTIMA_DATA) AS ULTIMA_DATA,
+          TRUNC(:dt_fim) - TRUNC(MAX(ULTIMA_DATA)) AS RECENCY_DIAS,
+          SUM(TRANSACOES) AS FREQUENCY,
+          SUM(RECEITA) AS MONETARY
+        FROM {METRICS_TABLE}
+        WHERE MES BETWEEN :dt_ini AND :dt_fim
+        GROUP BY CLIENTE_HASH
+        """
+            return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
         sql = """
         WITH
         tx AS (
-          SELECT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE,
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_VENDA AS DT,
                  NVL(VALOR_VENDA,0) AS RECEITA
           FROM BRZ_HIST_VENDAS_VEICULOS
           WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
 
           UNION ALL
 
-          SELECT UPPER(TRIM(NOME_COMPRADOR)) AS CLIENTE,
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_VENDA AS DT,
                  NVL(VALOR_VENDA,0) AS RECEITA
           FROM BRZ_HIST_VENDAS_PECAS
           WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-            AND NOME_COMPRADOR IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
 
           UNION ALL
 
-          SELECT UPPER(TRIM(NOME_CLIENTE)) AS CLIENTE,
+          SELECT CLIENTE_KEY AS CLIENTE, CLIENTE_HASH,
                  DT_REALIZACAO_SERVICO AS DT,
                  NVL(VALOR_TOTAL_SERVICO,0) AS RECEITA
           FROM BRZ_HIST_SERVICOS
           WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-            AND NOME_CLIENTE IS NOT NULL
+            AND CLIENTE_HASH IS NOT NULL
         )
         SELECT
           CLIENTE,
@@ -126,6 +267,44 @@ class ClientesRepository(BaseRepository):
           COUNT(*) AS FREQUENCY,
           SUM(RECEITA) AS MONETARY
         FROM tx
-        GROUP BY CLIENTE
+        GROUP BY CLIENTE_HASH, CLIENTE
         """
         return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
+    def rfm_segmentos(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
+        """Resumo por segmento RFM (scores e segmentos calculados no banco, connector/rfm.py)."""
+        sql = f"""
+        SELECT
+          SEGMENTO,
+          COUNT(*) AS CLIENTES,
+          SUM(MONETARY) AS RECEITA,
+          AVG(FREQUENCY) AS FREQ_MEDIA,
+          AVG(RECENCY_DIAS) AS RECENCY_MEDIA
+        FROM ({scored_sql(self.use_rfm_limiares, self._metricas(dt_ini, dt_fim))}) s
+        GROUP BY SEGMENTO
+        """
+        return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
+    def rfm_limiares(self, dt_ini: date, dt_fim: date) -> Dict[str, Any]:
+        """Limiares P20..P80 usados nos scores: os persistidos ou os do próprio período."""
+        if self.use_rfm_limiares:
+            lim = self.query_one(LATEST_SQL, {})
+            if lim:
+                return lim
+            # Nada gravado ainda: scored_sql também usa os do período
+        return self.query_one(compute_sql(self._metricas(dt_ini, dt_fim)), {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
+    def rfm_clientes_segmento_pagina(self, dt_ini: date, dt_fim: date, segmento: str = SEGMENTS[0],
+                                     sort: Optional[str] = None, descending: Optional[bool] = None,
+                                     after: Optional[Tuple[Any, ...]] = None, busca: Optional[str] = None,
+                                     page_size: int = PAGE_SIZE) -> Page:
+        """Clientes de um segmento com os scores, uma página por vez (lista sob demanda da view)."""
+        sql = f"""
+        SELECT
+          CLIENTE, CLIENTE_HASH, ULTIMA_DATA, RECENCY_DIAS, FREQUENCY, MONETARY,
+          R_SCORE, F_SCORE, M_SCORE
+        FROM ({scored_sql(self.use_rfm_limiares, self._metricas(dt_ini, dt_fim))}) s
+        WHERE SEGMENTO = :segmento
+        """
+        return self.query_page(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim, "segmento": segmento},
+                               RFM_PAGE, sort, descending, after, busca, page_size)
@@ -1,16 +1,47 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 from repositories.base_repo import BaseRepository
+from repositories.defaults import PAGE_SIZE
+from repositories.pagination import Page, PageSpec, SortColumn
+from repositories.sql_builder import date_range
+
+# Tabela de vendedores: um vendedor por linha, o próprio nome desempata
+VENDEDOR_PAGE = PageSpec(
+    sorts=(
+        SortColumn("LUCRO_TOTAL", "Lucro"),
+        SortColumn("RECEITA_TOTAL", "Receita"),
+        SortColumn("MARGEM", "Margem"),
+    ),
+    key=("VENDEDOR",),
+    search=("VENDEDOR",),
+)
 
 
 class DashboardAnaliticoRepository(BaseRepository):
 
     def pnl_mensal(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
-        sql = """
-        WITH
+        local = self.from_slice("pnl_mensal", dt_ini, dt_fim)
+        if local is not None:
+            return local
+
+        if self.rollup_ready:
+            # Agregado diário (AGG_DIARIO_FILIAL): uma varredura agrupada por mês e linha
+            fatos = f"""
+        agg AS (
+          SELECT /*+ MATERIALIZE */ TRUNC(DT,'MM') AS MES, LINHA, SUM(RECEITA) AS RECEITA, SUM(LUCRO) AS LUCRO
+          FROM AGG_DIARIO_FILIAL
+          WHERE {date_range("DT")}
+          GROUP BY TRUNC(DT,'MM'), LINHA
+        ),
+        veic AS (SELECT MES, RECEITA, LUCRO FROM agg WHERE LINHA = 'VEIC'),
+        pec AS (SELECT MES, RECEITA, LUCRO FROM agg WHERE LINHA = 'PEC'),
+        srv AS (SELECT MES, RECEITA, LUCRO FROM agg WHERE LINHA = 'SRV'),"""
+        else:
+            fatos = """
         veic AS (
           SELECT TRUNC(DT_VENDA,'MM') AS MES,
                  SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
@@ -34,7 +65,11 @@ class DashboardAnaliticoRepository(BaseRepository):
           FROM BRZ_HIST_SERVICOS
           WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
           GROUP BY TRUNC(DT_REALIZACAO_SERVICO,'MM')
-        ),
+        ),"""
+
+        sql = f"""
+        WITH
+        {fatos}
         base AS (
           SELECT MES FROM veic
           UNION SELECT MES FROM pec
@@ -56,8 +91,21 @@ class DashboardAnaliticoRepository(BaseRepository):
         return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
 
     def roi_por_filial_periodo(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
-        sql = """
-        WITH
+        local = self.from_slice("roi_por_filial_periodo", dt_ini, dt_fim)
+        if local is not None:
+            return local
+
+        if self.rollup_ready:
+            # Agregado diário já soma as três linhas de negócio por filial
+            lucro = f"""
+        lucro AS (
+          SELECT COD_FILIAL, NOME_FILIAL, SUM(LUCRO) AS LUCRO_VEIC
+          FROM AGG_DIARIO_FILIAL
+          WHERE {date_range("DT")}
+          GROUP BY COD_FILIAL, NOME_FILIAL
+        ),"""
+        else:
+            lucro = """
         lucro AS (
           SELECT COD_FILIAL, NOME_FILIAL,
                  SUM(NVL(LUCRO_VENDA,0)) AS LUCRO_VEIC
@@ -78,7 +126,11 @@ class DashboardAnaliticoRepository(BaseRepository):
           FROM BRZ_HIST_SERVICOS
           WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
           GROUP BY COD_FILIAL, NOME_FILIAL
-        ),
+        ),"""
+
+        sql = f"""
+        WITH
+        {lucro}
         lucro_filial AS (
           SELECT COD_FILIAL, NOME_FILIAL, SUM(LUCRO_VEIC) AS LUCRO_TOTAL
           FROM lucro
@@ -110,7 +162,63 @@ class DashboardAnaliticoRepository(BaseRepository):
         return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
 
     def lucro_por_vendedor(self, dt_ini: date, dt_fim: date, top_n: int = 20) -> List[Dict[str, Any]]:
-        sql = f"""
+        local = self.from_slice("lucro_por_vendedor", dt_ini, dt_fim, top_n=top_n)
+        if local is not None:
+            return local
+
+        sql = self._lucro_por_vendedor_sql(self.use_silver, int(top_n))
+        return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
+    def lucro_por_vendedor_pagina(self, dt_ini: date, dt_fim: date, sort: Optional[str] = None,
+                                  descending: Optional[bool] = None, after: Optional[Tuple[Any, ...]] = None,
+                                  busca: Optional[str] = None, page_size: int = PAGE_SIZE) -> Page:
+        """Todos os vendedores do período, uma página por vez (o gráfico segue com o top-N)."""
+        sql = self._lucro_por_vendedor_sql(self.use_silver, None)
+        return self.query_page(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim}, VENDEDOR_PAGE,
+                               sort, descending, after, busca, page_size)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _lucro_por_vendedor_sql(use_silver: bool, top_n: Optional[int]) -> str:
+        """top_n=None: todos os vendedores, sem ordem (base da paginação)."""
+        top = "" if top_n is None else f"ORDER BY LUCRO_TOTAL DESC FETCH FIRST {top_n} ROWS ONLY"
+        if use_silver:
+            # Fatos SILVER: soma por SK_VENDEDOR (chave inteira, 0 = sem vendedor) nas três
+            # linhas e junta DIM_VENDEDOR só no resultado, uma linha por vendedor
+            return f"""
+        WITH
+        allv AS (
+          SELECT SK_VENDEDOR, SUM(NVL(LUCRO_VENDA,0)) AS LUCRO, SUM(NVL(VALOR_VENDA,0)) AS RECEITA
+          FROM SLV_FATO_VENDAS_VEICULOS
+          WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim AND SK_VENDEDOR <> 0
+          GROUP BY SK_VENDEDOR
+          UNION ALL
+          SELECT SK_VENDEDOR, SUM(NVL(LUCRO_VENDA,0)), SUM(NVL(VALOR_VENDA,0))
+          FROM SLV_FATO_VENDAS_PECAS
+          WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim AND SK_VENDEDOR <> 0
+          GROUP BY SK_VENDEDOR
+          UNION ALL
+          SELECT SK_VENDEDOR, SUM(NVL(LUCRO_SERVICO,0)), SUM(NVL(VALOR_TOTAL_SERVICO,0))
+          FROM SLV_FATO_SERVICOS
+          WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim AND SK_VENDEDOR <> 0
+          GROUP BY SK_VENDEDOR
+        ),
+        tot AS (
+          SELECT SK_VENDEDOR, SUM(LUCRO) AS LUCRO, SUM(RECEITA) AS RECEITA
+          FROM allv
+          GROUP BY SK_VENDEDOR
+        )
+        SELECT
+          d.NOME_VENDEDOR AS VENDEDOR,
+          t.LUCRO AS LUCRO_TOTAL,
+          t.RECEITA AS RECEITA_TOTAL,
+          CASE WHEN t.RECEITA=0 THEN NULL ELSE t.LUCRO/t.RECEITA END AS MARGEM
+        FROM tot t
+        JOIN DIM_VENDEDOR d ON d.SK_VENDEDOR = t.SK_VENDEDOR
+        {top}
+        """
+
+        return f"""
         WITH
         vv AS (
           SELECT NOME_VENDEDOR AS VENDEDOR,
@@ -151,10 +259,8 @@ class DashboardAnaliticoRepository(BaseRepository):
           CASE WHEN SUM(RECEITA)=0 THEN NULL ELSE SUM(LUCRO)/SUM(RECEITA) END AS MARGEM
         FROM allv
         GROUP BY VENDEDOR
-        ORDER BY LUCRO_TOTAL DESC
-        FETCH FIRST {int(top_n)} ROWS ONLY
+        {top}
         """
-        return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
 
     def estoque_kpis(self) -> Dict[str, Any]:
         sql = """
@@ -184,15 +290,33 @@ class DashboardAnaliticoRepository(BaseRepository):
         """
         Proxy de giro por categoria = receita no período / valor em estoque atual da categoria.
         """
-        sql = """
-        WITH
+        if self.use_silver:
+            # Fato SILVER: soma por SK_PECA e junta DIM_PECA no resultado ('-' = sem categoria)
+            vendas = """
+        vendas AS (
+          SELECT NULLIF(d.CATEGORIA_PECA, '-') AS CATEGORIA_PECA,
+                 SUM(f.RECEITA) AS RECEITA_PERIODO
+          FROM (
+            SELECT SK_PECA, SUM(NVL(VALOR_VENDA,0)) AS RECEITA
+            FROM SLV_FATO_VENDAS_PECAS
+            WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
+            GROUP BY SK_PECA
+          ) f
+          JOIN DIM_PECA d ON d.SK_PECA = f.SK_PECA
+          GROUP BY NULLIF(d.CATEGORIA_PECA, '-')
+        ),"""
+        else:
+            vendas = """
         vendas AS (
           SELECT CATEGORIA_PECA,
                  SUM(NVL(VALOR_VENDA,0)) AS RECEITA_PERIODO
           FROM BRZ_HIST_VENDAS_PECAS
           WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
           GROUP BY CATEGORIA_PECA
-        ),
+        ),"""
+
+        sql = f"""
+        WITH{vendas}
         estoque AS (
           SELECT CATEGORIA_PECA,
                  SUM(NVL(VALOR_PECA_ESTOQUE,0)) AS VALOR_ESTOQUE
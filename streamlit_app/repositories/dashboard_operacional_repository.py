@@ -8,97 +8,90 @@ from repositories.base_repo import BaseRepository
 class DashboardOperacionalRepository(BaseRepository):
 
     def kpis_vendas_veiculos_diario(self) -> Dict[str, Any]:
+        # Uma varredura dos últimos 31 dias (agregado por dia) atende hoje, ontem e a média de 30 dias
         sql = """
         WITH
-        hoje AS (
+        dia AS (
           SELECT
+            TRUNC(DT_VENDA) AS DIA,
             SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
-            SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
-            SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+            SUM(NVL(VALOR_VENDA,0)) AS RECEITA
           FROM BRZ_HIST_VENDAS_VEICULOS
-          WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE)
-        ),
-        ontem AS (
-          SELECT
-            SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
-            SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
-            SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
-          FROM BRZ_HIST_VENDAS_VEICULOS
-          WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE-1)
-        ),
-        m30 AS (
-          SELECT
-            AVG(QTD_DIA) AS QTD_MEDIA_30D,
-            AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D
-          FROM (
-            SELECT
-              TRUNC(DT_VENDA) AS DIA,
-              SUM(NVL(QTDE_VENDIDA,0)) AS QTD_DIA,
-              SUM(NVL(VALOR_VENDA,0)) AS RECEITA_DIA
-            FROM BRZ_HIST_VENDAS_VEICULOS
-            WHERE TRUNC(DT_VENDA) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
-            GROUP BY TRUNC(DT_VENDA)
-          )
+          WHERE DT_VENDA >= TRUNC(SYSDATE)-30
+            AND DT_VENDA < TRUNC(SYSDATE)+1
+          GROUP BY TRUNC(DT_VENDA)
         )
         SELECT
-          h.QTD AS QTD_HOJE,
-          o.QTD AS QTD_ONTEM,
-          m.QTD_MEDIA_30D,
-          h.RECEITA AS RECEITA_HOJE,
-          o.RECEITA AS RECEITA_ONTEM,
-          m.RECEITA_MEDIA_30D
-        FROM hoje h, ontem o, m30 m
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN QTD END) AS QTD_HOJE,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE)-1 THEN QTD END) AS QTD_ONTEM,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN QTD END) AS QTD_MEDIA_30D,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_HOJE,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE)-1 THEN RECEITA END) AS RECEITA_ONTEM,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_MEDIA_30D
+        FROM dia
         """
         return self.query_one(sql, {})
 
     def kpis_vendas_pecas_diario(self) -> Dict[str, Any]:
+        # Uma varredura dos últimos 31 dias: hoje e médias de 30 dias por agregação condicional
         sql = """
         WITH
-        hoje AS (
+        dia AS (
           SELECT
+            TRUNC(DT_VENDA) AS DIA,
             SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
             SUM(NVL(VALOR_VENDA,0)) AS RECEITA,
-            SUM(NVL(LUCRO_VENDA,0)) AS LUCRO
+            CASE WHEN SUM(NVL(VALOR_VENDA,0))=0 THEN NULL
+                 ELSE SUM(NVL(LUCRO_VENDA,0))/SUM(NVL(VALOR_VENDA,0))
+            END AS MARGEM
           FROM BRZ_HIST_VENDAS_PECAS
-          WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE)
-        ),
-        m30 AS (
-          SELECT
-            AVG(QTD_DIA) AS QTD_MEDIA_30D,
-            AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D,
-            AVG(MARGEM_DIA) AS MARGEM_MEDIA_30D
-          FROM (
-            SELECT
-              TRUNC(DT_VENDA) AS DIA,
-              SUM(NVL(QTDE_VENDIDA,0)) AS QTD_DIA,
-              SUM(NVL(VALOR_VENDA,0)) AS RECEITA_DIA,
-              CASE WHEN SUM(NVL(VALOR_VENDA,0))=0 THEN NULL
-                   ELSE SUM(NVL(LUCRO_VENDA,0))/SUM(NVL(VALOR_VENDA,0))
-              END AS MARGEM_DIA
-            FROM BRZ_HIST_VENDAS_PECAS
-            WHERE TRUNC(DT_VENDA) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
-            GROUP BY TRUNC(DT_VENDA)
-          )
+          WHERE DT_VENDA >= TRUNC(SYSDATE)-30
+            AND DT_VENDA < TRUNC(SYSDATE)+1
+          GROUP BY TRUNC(DT_VENDA)
         )
         SELECT
-          h.QTD AS QTD_HOJE,
-          h.RECEITA AS RECEITA_HOJE,
-          CASE WHEN h.RECEITA=0 THEN NULL ELSE h.LUCRO/h.RECEITA END AS MARGEM_HOJE,
-          m.QTD_MEDIA_30D,
-          m.RECEITA_MEDIA_30D,
-          m.MARGEM_MEDIA_30D
-        FROM hoje h, m30 m
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN QTD END) AS QTD_HOJE,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_HOJE,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN MARGEM END) AS MARGEM_HOJE,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN QTD END) AS QTD_MEDIA_30D,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_MEDIA_30D,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN MARGEM END) AS MARGEM_MEDIA_30D
+        FROM dia
         """
         return self.query_one(sql, {})
 
     def top10_pecas_hoje(self) -> List[Dict[str, Any]]:
+        if self.use_silver:
+            # Fato SILVER: soma por SK_PECA e junta DIM_PECA só nas peças vendidas no dia
+            sql = """
+        SELECT
+          NULLIF(d.DESCRICAO_PECA, '-') AS DESCRICAO_PECA,
+          SUM(f.QTD) AS QTD,
+          SUM(f.RECEITA) AS RECEITA
+        FROM (
+          SELECT SK_PECA,
+                 SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
+                 SUM(NVL(VALOR_VENDA,0)) AS RECEITA
+          FROM SLV_FATO_VENDAS_PECAS
+          WHERE DT_VENDA >= TRUNC(SYSDATE)
+            AND DT_VENDA < TRUNC(SYSDATE)+1
+          GROUP BY SK_PECA
+        ) f
+        JOIN DIM_PECA d ON d.SK_PECA = f.SK_PECA
+        GROUP BY NULLIF(d.DESCRICAO_PECA, '-')
+        ORDER BY QTD DESC, RECEITA DESC
+        FETCH FIRST 10 ROWS ONLY
+        """
+            return self.query_dicts(sql, {})
+
         sql = """
         SELECT
           DESCRICAO_PECA,
           SUM(NVL(QTDE_VENDIDA,0)) AS QTD,
           SUM(NVL(VALOR_VENDA,0)) AS RECEITA
         FROM BRZ_HIST_VENDAS_PECAS
-        WHERE TRUNC(DT_VENDA) = TRUNC(SYSDATE)
+        WHERE DT_VENDA >= TRUNC(SYSDATE)
+          AND DT_VENDA < TRUNC(SYSDATE)+1
         GROUP BY DESCRICAO_PECA
         ORDER BY QTD DESC, RECEITA DESC
         FETCH FIRST 10 ROWS ONLY
@@ -106,35 +99,24 @@ class DashboardOperacionalRepository(BaseRepository):
         return self.query_dicts(sql, {})
 
     def kpis_servicos_diario(self) -> Dict[str, Any]:
+        # Uma varredura dos últimos 31 dias: hoje e médias de 30 dias por agregação condicional
         sql = """
         WITH
-        hoje AS (
+        dia AS (
           SELECT
+            TRUNC(DT_REALIZACAO_SERVICO) AS DIA,
             SUM(NVL(QTDE_SERVICOS,0)) AS QTD,
-            SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
-            SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO
+            SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA
           FROM BRZ_HIST_SERVICOS
-          WHERE TRUNC(DT_REALIZACAO_SERVICO) = TRUNC(SYSDATE)
-        ),
-        m30 AS (
-          SELECT
-            AVG(QTD_DIA) AS QTD_MEDIA_30D,
-            AVG(RECEITA_DIA) AS RECEITA_MEDIA_30D
-          FROM (
-            SELECT
-              TRUNC(DT_REALIZACAO_SERVICO) AS DIA,
-              SUM(NVL(QTDE_SERVICOS,0)) AS QTD_DIA,
-              SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA_DIA
-            FROM BRZ_HIST_SERVICOS
-            WHERE TRUNC(DT_REALIZACAO_SERVICO) BETWEEN TRUNC(SYSDATE)-30 AND TRUNC(SYSDATE)-1
-            GROUP BY TRUNC(DT_REALIZACAO_SERVICO)
-          )
+          WHERE DT_REALIZACAO_SERVICO >= TRUNC(SYSDATE)-30
+            AND DT_REALIZACAO_SERVICO < TRUNC(SYSDATE)+1
+          GROUP BY TRUNC(DT_REALIZACAO_SERVICO)
         )
         SELECT
-          h.QTD AS QTD_HOJE,
-          m.QTD_MEDIA_30D,
-          h.RECEITA AS RECEITA_HOJE,
-          m.RECEITA_MEDIA_30D
-        FROM hoje h, m30 m
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN QTD END) AS QTD_HOJE,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN QTD END) AS QTD_MEDIA_30D,
+          SUM(CASE WHEN DIA = TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_HOJE,
+          AVG(CASE WHEN DIA < TRUNC(SYSDATE) THEN RECEITA END) AS RECEITA_MEDIA_30D
+        FROM dia
         """
         return self.query_one(sql, {})
@@ -1,9 +1,45 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 
 from repositories.base_repo import BaseRepository
+from repositories.defaults import PAGE_SIZE
+from repositories.pagination import NULL_DATE, Page, PageSpec, SortColumn
+
+
+def _pecas_obsoletas_sql(com_id: bool) -> str:
+    """Peças marcadas como obsoletas ou paradas há 60+ dias; com_id traz a chave da paginação."""
+    chave = "\n        ID_ESTOQUE_PECA," if com_id else ""
+    return f"""
+        SELECT{chave}
+        CATEGORIA_PECA,
+        DESCRICAO_PECA,
+        CODIGO_PECA_ESTOQUE,
+        QTDE_PECA_ESTOQUE,
+        VALOR_PECA_ESTOQUE,
+        PECA_OBSOLETA_FLAG,
+        TEMPO_OBSOLETA_DIAS,
+        DT_ULTIMA_VENDA_PECA
+        FROM BRZ_ESTOQUE_PECAS
+        WHERE
+        (
+            UPPER(TRIM(PECA_OBSOLETA_FLAG)) IN ('SIM','S','Y','YES','1','TRUE')
+            OR NVL(TEMPO_OBSOLETA_DIAS,0) >= 60
+        )"""
+
+
+# Tabela de peças obsoletas: mesma ordem padrão do top-N (tempo parado)
+OBSOLETAS_PAGE = PageSpec(
+    sorts=(
+        SortColumn("TEMPO_OBSOLETA_DIAS", "Dias obsoleta"),
+        SortColumn("VALOR_PECA_ESTOQUE", "Valor em estoque"),
+        SortColumn("QTDE_PECA_ESTOQUE", "Quantidade"),
+        SortColumn("DT_ULTIMA_VENDA_PECA", "Última venda", NULL_DATE),
+    ),
+    key=("ID_ESTOQUE_PECA",),
+    search=("DESCRICAO_PECA", "CATEGORIA_PECA", "CODIGO_PECA_ESTOQUE"),
+)
 
 
 class DashboardPreditivoRepository(BaseRepository):
@@ -97,23 +133,16 @@ class DashboardPreditivoRepository(BaseRepository):
 
     def pecas_obsoletas(self, top_n: int = 50) -> List[Dict[str, Any]]:
         sql = f"""
-        SELECT
-        CATEGORIA_PECA,
-        DESCRICAO_PECA,
-        CODIGO_PECA_ESTOQUE,
-        QTDE_PECA_ESTOQUE,
-        VALOR_PECA_ESTOQUE,
-        PECA_OBSOLETA_FLAG,
-        TEMPO_OBSOLETA_DIAS,
-        DT_ULTIMA_VENDA_PECA
-        FROM BRZ_ESTOQUE_PECAS
-        WHERE
-        (
-            UPPER(TRIM(PECA_OBSOLETA_FLAG)) IN ('SIM','S','Y','YES','1','TRUE')
-            OR NVL(TEMPO_OBSOLETA_DIAS,0) >= 60
-        )
+        {_pecas_obsoletas_sql(False)}
         ORDER BY NVL(TEMPO_OBSOLETA_DIAS,0) DESC, NVL(VALOR_PECA_ESTOQUE,0) DESC
         FETCH FIRST {int(top_n)} ROWS ONLY
         """
         return self.query_dicts(sql, {})
 
+    def pecas_obsoletas_pagina(self, sort: Optional[str] = None, descending: Optional[bool] = None,
+                               after: Optional[Tuple[Any, ...]] = None, busca: Optional[str] = None,
+                               page_size: int = PAGE_SIZE) -> Page:
+        """Todo o estoque obsoleto, uma página por vez (ID_ESTOQUE_PECA desempata)."""
+        return self.query_page(_pecas_obsoletas_sql(True), {}, OBSOLETAS_PAGE,
+                               sort, descending, after, busca, page_size)
+
@@ -0,0 +1,37 @@
+"""
+Filtros padrão do dashboard (valores iniciais da sidebar de cada view).
+
+Fonte única para as views e para o warm-up do cache (repositories/warmup.py):
+o warm-up só adianta o primeiro render se chamar os repositórios exatamente
+com os mesmos argumentos que as views usam ao abrir.
+
+Parâmetros cujo valor inicial na view é igual ao default do método do
+repositório (ex.: top_n=50 em ltv_por_cliente) não precisam estar aqui.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List
+
+# Período padrão de todas as páginas
+DEFAULT_DT_INI = date(2025, 1, 1)
+DEFAULT_DT_FIM = date(2025, 12, 31)
+
+# Sliders cujo valor inicial difere do default do método
+PERFORMANCE_TOP_N = 30            # performance_filial_view
+ANALITICO_PERFORMANCE_TOP_N = 200  # dashboard_analitico_view (aba performance)
+POS_VENDAS_TOP_N = 15             # pos_vendas_view
+
+# Linhas por página das tabelas paginadas (views/paged_table.py, métodos *_pagina)
+PAGE_SIZE = 50
+
+# Argumentos extras do warm-up por "Classe.metodo" (uma chamada por dicionário)
+WARMUP_OVERRIDES: Dict[str, List[Dict[str, Any]]] = {
+    "PerformanceFilialRepository.performance_por_filial": [
+        {"top_n": PERFORMANCE_TOP_N},
+        {"top_n": ANALITICO_PERFORMANCE_TOP_N},
+    ],
+    "PosVendaRepository.por_departamento": [{"top_n": POS_VENDAS_TOP_N}],
+    "PosVendaRepository.por_categoria_servico": [{"top_n": POS_VENDAS_TOP_N}],
+}
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, List
 from datetime import date
 
 from repositories.base_repo import BaseRepository
+from repositories.sql_builder import Filters, and_filters, date_range
 
 
 class KpiRepository(BaseRepository):
@@ -15,42 +17,72 @@ class KpiRepository(BaseRepository):
         cod_concessionaria: Optional[int] = None,
         cod_filial: Optional[int] = None,
     ) -> Dict[str, Any]:
+        filtros = Filters(cod_concessionaria, cod_filial)
+        sql = self._kpis_gerais_sql(self.rollup_ready, filtros.active)
 
-        sql = """
-        WITH
+        params: Dict[str, Any] = {
+            "dt_ini": dt_ini,
+            "dt_fim": dt_fim,
+            **filtros.params,
+        }
+
+        return self.query_one(sql, params)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _kpis_gerais_sql(use_rollup: bool, filtros: FrozenSet[str]) -> str:
+        """SQL de kpis_gerais_periodo para a combinação de filtros (uma variante por combinação)."""
+        f = and_filters(filtros)
+
+        if use_rollup:
+            # Agregado diário (AGG_DIARIO_FILIAL): uma varredura, as três linhas por agregação condicional
+            fatos = f"""
+        v_fatos AS (
+            SELECT /*+ MATERIALIZE */
+                SUM(CASE WHEN LINHA = 'VEIC' THEN RECEITA END) AS RECEITA_VEIC,
+                SUM(CASE WHEN LINHA = 'VEIC' THEN LUCRO END) AS LUCRO_VEIC,
+                SUM(CASE WHEN LINHA = 'PEC' THEN RECEITA END) AS RECEITA_PEC,
+                SUM(CASE WHEN LINHA = 'PEC' THEN LUCRO END) AS LUCRO_PEC,
+                SUM(CASE WHEN LINHA = 'SRV' THEN RECEITA END) AS RECEITA_SRV,
+                SUM(CASE WHEN LINHA = 'SRV' THEN LUCRO END) AS LUCRO_SRV
+            FROM AGG_DIARIO_FILIAL
+            WHERE {date_range("DT")}{f}
+        ),
+        v_veic AS (SELECT RECEITA_VEIC, LUCRO_VEIC FROM v_fatos),
+        v_pec AS (SELECT RECEITA_PEC, LUCRO_PEC FROM v_fatos),
+        v_srv AS (SELECT RECEITA_SRV, LUCRO_SRV FROM v_fatos),"""
+        else:
+            fatos = f"""
         v_veic AS (
             SELECT
                 SUM(NVL(VALOR_VENDA,0)) AS RECEITA_VEIC,
                 SUM(NVL(LUCRO_VENDA,0)) AS LUCRO_VEIC
             FROM BRZ_HIST_VENDAS_VEICULOS
-            WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+            WHERE {date_range("DT_VENDA")}{f}
         ),
         v_pec AS (
             SELECT
                 SUM(NVL(VALOR_VENDA,0)) AS RECEITA_PEC,
                 SUM(NVL(LUCRO_VENDA,0)) AS LUCRO_PEC
             FROM BRZ_HIST_VENDAS_PECAS
-            WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+            WHERE {date_range("DT_VENDA")}{f}
         ),
         v_srv AS (
             SELECT
                 SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA_SRV,
                 SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO_SRV
             FROM BRZ_HIST_SERVICOS
-            WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
-        ),
+            WHERE {date_range("DT_REALIZACAO_SERVICO")}{f}
+        ),"""
+
+        return f"""
+        WITH
+        {fatos}
         v_est AS (
             SELECT
                 SUM(NVL(VALOR_PECA_ESTOQUE,0)) AS VALOR_ESTOQUE_PEC
             FROM BRZ_ESTOQUE_PECAS
-            WHERE (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+            WHERE 1 = 1{f}
         )
         SELECT
             (v_veic.RECEITA_VEIC + v_pec.RECEITA_PEC + v_srv.RECEITA_SRV) AS RECEITA_TOTAL,
@@ -62,16 +94,17 @@ class KpiRepository(BaseRepository):
         FROM v_veic, v_pec, v_srv, v_est
         """
 
-        params: Dict[str, Any] = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
-        }
-
-        return self.query_one(sql, params)
-
     def receita_mensal_total(self, dt_ini: date, dt_fim: date) -> List[Dict[str, Any]]:
+        if self.rollup_ready:
+            sql = f"""
+            SELECT TRUNC(DT, 'MM') AS MES, SUM(RECEITA) AS RECEITA_TOTAL
+            FROM AGG_DIARIO_FILIAL
+            WHERE {date_range("DT")}
+            GROUP BY TRUNC(DT, 'MM')
+            ORDER BY MES
+            """
+            return self.query_dicts(sql, {"dt_ini": dt_ini, "dt_fim": dt_fim})
+
         sql = """
         WITH
         veic AS (
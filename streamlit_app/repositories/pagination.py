@@ -0,0 +1,138 @@
+"""
+Paginação por chave (keyset) das tabelas grandes das views
+
+- O método do repositório fornece o SELECT completo (sem ORDER BY / FETCH) e um
+  PageSpec: colunas ordenáveis, chave única de desempate e colunas de busca
+- Cada página é "as próximas N linhas depois da última vista" na ordem pedida:
+    WHERE (ORD < :pg_sort) OR (ORD = :pg_sort AND KEY < :pg_k0) ...
+    ORDER BY ORD DESC, KEY DESC FETCH FIRST N+1 ROWS ONLY
+  sem OFFSET: a página 40 custa o mesmo que a 1ª (o banco não conta as linhas
+  puladas) e linhas novas carregadas no meio da navegação não duplicam/pulam linhas
+- Ordenação e busca (UPPER(coluna) LIKE) rodam no banco; nulos da coluna de
+  ordenação viram o menor valor (NVL com a sentinela da coluna), então ficam no
+  fim em ordem decrescente
+- A busca é literal: %, _ e a barra invertida digitados são escapados
+- O texto do SQL depende só de (base, coluna, direção, tem cursor, tem busca,
+  tamanho): poucas variantes por tabela, todas em cache de statement e de resultado
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+# Coluna auxiliar com o valor de ordenação (já com NVL), removida das linhas devolvidas
+SORT_COLUMN = "PG_SORT"
+
+# Menor valor por tipo de coluna (nulos na ordenação)
+NULL_NUMBER = "-1E30"
+NULL_DATE = "DATE '0001-01-01'"
+NULL_TEXT = "' '"
+
+# Escape dos curingas do LIKE no texto digitado (ESCAPE '\' no SQL)
+LIKE_ESCAPE = "\\"
+
+
+@dataclass(frozen=True)
+class SortColumn:
+    name: str
+    label: str
+    null: str = NULL_NUMBER
+
+
+@dataclass(frozen=True)
+class PageSpec:
+    """Como paginar o resultado de um método: ordenações, chave única e busca."""
+    sorts: Tuple[SortColumn, ...]
+    key: Tuple[str, ...]
+    search: Tuple[str, ...] = ()
+    descending: bool = True
+
+    @property
+    def default_sort(self) -> str:
+        return self.sorts[0].name
+
+    def column(self, name: Optional[str]) -> SortColumn:
+        for col in self.sorts:
+            if col.name == name:
+                return col
+        return self.sorts[0]
+
+
+@dataclass(frozen=True)
+class Page:
+    rows: List[Dict[str, Any]]
+    # Cursor da próxima página (valores da última linha); None = última página
+    next_cursor: Optional[Tuple[Any, ...]]
+    sort: str
+    descending: bool
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def _after(columns: Tuple[str, ...], op: str, i: int = 0) -> str:
+    """(c0, c1, ...) depois de (:pg_c0, :pg_c1, ...) na ordem op, sem comparação de tuplas (Oracle)."""
+    head = f"{columns[i]} {op} :pg_c{i}"
+    if i == len(columns) - 1:
+        return head
+    return f"({head} OR ({columns[i]} = :pg_c{i} AND {_after(columns, op, i + 1)}))"
+
+
+@lru_cache(maxsize=256)
+def keyset_sql(base: str, spec: PageSpec, sort: str, descending: bool,
+               with_cursor: bool, with_search: bool, page_size: int) -> str:
+    """SELECT de uma página (page_size + 1 linhas: a sobra indica que há próxima página)."""
+    col = spec.column(sort)
+    direction = "DESC" if descending else "ASC"
+    columns = (SORT_COLUMN, *spec.key)
+
+    where = []
+    if with_search and spec.search:
+        where.append("(" + " OR ".join(
+            f"UPPER({c}) LIKE :pg_busca ESCAPE '{LIKE_ESCAPE}'" for c in spec.search
+        ) + ")")
+    if with_cursor:
+        where.append(_after(columns, "<" if descending else ">"))
+
+    return f"""
+        SELECT * FROM (
+          SELECT q.*, NVL(q.{col.name}, {col.null}) AS {SORT_COLUMN}
+          FROM ({base}) q
+        ) p
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY {", ".join(f"{c} {direction}" for c in columns)}
+        FETCH FIRST {int(page_size) + 1} ROWS ONLY
+        """
+
+
+def escape_like(text: str) -> str:
+    """Texto literal para LIKE: %, _ e o próprio escape deixam de ser curingas."""
+    for ch in (LIKE_ESCAPE, "%", "_"):
+        text = text.replace(ch, LIKE_ESCAPE + ch)
+    return text
+
+
+def page_params(spec: PageSpec, after: Optional[Tuple[Any, ...]], busca: Optional[str]) -> Dict[str, Any]:
+    """Binds do cursor (:pg_c0..) e da busca (:pg_busca) para keyset_sql."""
+    params: Dict[str, Any] = {}
+    if after is not None:
+        params.update({f"pg_c{i}": v for i, v in enumerate(after)})
+    if busca and spec.search:
+        params["pg_busca"] = f"%{escape_like(busca.strip().upper())}%"
+    return params
+
+
+def to_page(rows: List[Dict[str, Any]], spec: PageSpec, sort: str, descending: bool, page_size: int) -> Page:
+    """Corta a linha de sobra e monta o cursor da próxima página."""
+    more = len(rows) > page_size
+    rows = [dict(r) for r in rows[:page_size]]
+    cursor = None
+    if more and rows:
+        last = rows[-1]
+        cursor = (last[SORT_COLUMN], *(last[k] for k in spec.key))
+    for r in rows:
+        r.pop(SORT_COLUMN, None)
+    return Page(rows, cursor, spec.column(sort).name, descending)
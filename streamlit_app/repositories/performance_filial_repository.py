@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, List
 
 from repositories.base_repo import BaseRepository
+from repositories.sql_builder import Filters, and_filters, date_range
 
 
 class PerformanceFilialRepository(BaseRepository):
@@ -15,9 +17,48 @@ class PerformanceFilialRepository(BaseRepository):
         cod_concessionaria: Optional[int] = None,
         top_n: int = 50,
     ) -> List[Dict[str, Any]]:
+        filtros = Filters(cod_concessionaria)
+        sql = self._performance_sql(self.rollup_ready, filtros.active, int(top_n))
 
-        sql = f"""
-        WITH
+        params: Dict[str, Any] = {
+            "dt_ini": dt_ini,
+            "dt_fim": dt_fim,
+            **filtros.params,
+        }
+        return self.query_dicts(sql, params)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _performance_sql(use_rollup: bool, filtros: FrozenSet[str], top_n: int) -> str:
+        f = and_filters(filtros)
+
+        if use_rollup:
+            # Agregado diário (AGG_DIARIO_FILIAL): uma varredura agrupada por filial e linha
+            fatos = f"""
+        agg AS (
+            SELECT /*+ MATERIALIZE */ COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL, LINHA,
+              SUM(QTDE) AS QTD, SUM(RECEITA) AS RECEITA, SUM(LUCRO) AS LUCRO
+            FROM AGG_DIARIO_FILIAL
+            WHERE {date_range("DT")}{f}
+            GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL, LINHA
+        ),
+        veic AS (
+            SELECT COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+              QTD AS VEIC_QTD, RECEITA AS VEIC_RECEITA, LUCRO AS VEIC_LUCRO
+            FROM agg WHERE LINHA = 'VEIC'
+        ),
+        pec AS (
+            SELECT COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+              QTD AS PEC_QTD, RECEITA AS PEC_RECEITA, LUCRO AS PEC_LUCRO
+            FROM agg WHERE LINHA = 'PEC'
+        ),
+        srv AS (
+            SELECT COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL,
+              QTD AS SRV_QTD, RECEITA AS SRV_RECEITA, LUCRO AS SRV_LUCRO
+            FROM agg WHERE LINHA = 'SRV'
+        ),"""
+        else:
+            fatos = f"""
         veic AS (
             SELECT
               COD_CONCESSIONARIA,
@@ -27,8 +68,7 @@ class PerformanceFilialRepository(BaseRepository):
               SUM(NVL(VALOR_VENDA,0)) AS VEIC_RECEITA,
               SUM(NVL(LUCRO_VENDA,0)) AS VEIC_LUCRO
             FROM BRZ_HIST_VENDAS_VEICULOS
-            WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+            WHERE {date_range("DT_VENDA")}{f}
             GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
         ),
         pec AS (
@@ -40,8 +80,7 @@ class PerformanceFilialRepository(BaseRepository):
               SUM(NVL(VALOR_VENDA,0)) AS PEC_RECEITA,
               SUM(NVL(LUCRO_VENDA,0)) AS PEC_LUCRO
             FROM BRZ_HIST_VENDAS_PECAS
-            WHERE DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+            WHERE {date_range("DT_VENDA")}{f}
             GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
         ),
         srv AS (
@@ -53,10 +92,13 @@ class PerformanceFilialRepository(BaseRepository):
               SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS SRV_RECEITA,
               SUM(NVL(LUCRO_SERVICO,0)) AS SRV_LUCRO
             FROM BRZ_HIST_SERVICOS
-            WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+            WHERE {date_range("DT_REALIZACAO_SERVICO")}{f}
             GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
-        ),
+        ),"""
+
+        return f"""
+        WITH
+        {fatos}
         est_pec AS (
             SELECT
               COD_CONCESSIONARIA,
@@ -64,7 +106,7 @@ class PerformanceFilialRepository(BaseRepository):
               NOME_FILIAL,
               SUM(NVL(VALOR_PECA_ESTOQUE,0)) AS ESTOQUE_PECAS
             FROM BRZ_ESTOQUE_PECAS
-            WHERE (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+            WHERE 1 = 1{f}
             GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
         ),
         est_veic AS (
@@ -74,7 +116,7 @@ class PerformanceFilialRepository(BaseRepository):
               NOME_FILIAL,
               SUM(NVL(CUSTO_VEICULO,0)) AS ESTOQUE_VEICULOS
             FROM BRZ_ESTOQUE_VEICULOS
-            WHERE (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
+            WHERE 1 = 1{f}
             GROUP BY COD_CONCESSIONARIA, COD_FILIAL, NOME_FILIAL
         ),
         base AS (
@@ -128,12 +170,5 @@ class PerformanceFilialRepository(BaseRepository):
         LEFT JOIN est_veic ev ON ev.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA AND ev.COD_FILIAL = b.COD_FILIAL
         LEFT JOIN est_pec  ep ON ep.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA AND ep.COD_FILIAL = b.COD_FILIAL
         ORDER BY ROI_ESTOQUE DESC NULLS LAST, LUCRO_TOTAL DESC
-        FETCH FIRST {int(top_n)} ROWS ONLY
+        FETCH FIRST {top_n} ROWS ONLY
         """
-
-        params: Dict[str, Any] = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-        }
-        return self.query_dicts(sql, params)
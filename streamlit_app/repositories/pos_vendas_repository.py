@@ -1,95 +1,143 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, List
 
 from repositories.base_repo import BaseRepository
+from repositories.sql_builder import Filters, and_filial_keys, and_filters, date_range
 
 
 class PosVendaRepository(BaseRepository):
 
-    def kpis_servicos(self, dt_ini: date, dt_fim: date,
-                      cod_concessionaria: Optional[int] = None,
-                      cod_filial: Optional[int] = None) -> Dict[str, Any]:
-        sql = """
-        SELECT
-          COUNT(*) AS REGISTROS,
-          SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
-          SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA_SERVICOS,
-          SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO_SERVICOS,
-          CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
-               ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
-          END AS MARGEM_SERVICOS,
-          AVG(NVL(VALOR_TOTAL_SERVICO,0)) AS TICKET_MEDIO_POR_REGISTRO,
-          AVG(NVL(QTDE_SERVICOS,0)) AS QTDE_MEDIA_SERVICOS_POR_REGISTRO
-        FROM BRZ_HIST_SERVICOS
-        WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-          AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-          AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
+    def resumo_servicos(self, dt_ini: date, dt_fim: date,
+                        cod_concessionaria: Optional[int] = None,
+                        cod_filial: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
         """
+        Totais, por departamento e por categoria numa única varredura de
+        BRZ_HIST_SERVICOS (GROUPING SETS). kpis_servicos, por_departamento e
+        por_categoria_servico recortam este resultado: com o mesmo filtro, a
+        página faz uma ida ao banco e as outras duas chamadas saem do cache.
+
+        Returns:
+            {"TOTAL": [1 linha], "DEPARTAMENTO": [...], "CATEGORIA": [...]}
+            (departamentos/categorias completos, sem top_n)
+        """
+        filtros = Filters(cod_concessionaria, cod_filial)
+        sql = self._resumo_servicos_sql(self.use_silver, filtros.active)
 
         params = {
             "dt_ini": dt_ini,
             "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
+            **filtros.params,
         }
-        return self.query_one(sql, params)
+        grupos = self.split_grouping_sets(self.query_dicts(sql, params))
+        return {g: grupos.get(g, []) for g in ("TOTAL", "DEPARTAMENTO", "CATEGORIA")}
 
-    def por_departamento(self, dt_ini: date, dt_fim: date,
-                         cod_concessionaria: Optional[int] = None,
-                         cod_filial: Optional[int] = None,
-                         top_n: int = 20) -> List[Dict[str, Any]]:
-        sql = f"""
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _resumo_servicos_sql(use_silver: bool, filtros: FrozenSet[str]) -> str:
+        if use_silver:
+            # Fato SILVER: soma por SK_SERVICO (chave inteira) e só então junta DIM_SERVICO,
+            # já com uma linha por serviço; médias = soma / registros
+            return f"""
+        WITH f AS (
+          SELECT SK_SERVICO,
+                 COUNT(*) AS REGISTROS,
+                 SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
+                 SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
+                 SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO
+          FROM SLV_FATO_SERVICOS
+          WHERE {date_range("DT_REALIZACAO_SERVICO")}{and_filial_keys(filtros)}
+          GROUP BY SK_SERVICO
+        ),
+        s AS (
+          SELECT NULLIF(d.DEPARTAMENTO_SERVICO, '-') AS DEPARTAMENTO_SERVICO,
+                 NULLIF(d.CATEGORIA_SERVICO, '-') AS CATEGORIA_SERVICO,
+                 f.REGISTROS, f.QTDE_SERVICOS, f.RECEITA, f.LUCRO
+          FROM f
+          JOIN DIM_SERVICO d ON d.SK_SERVICO = f.SK_SERVICO
+        )
+        SELECT
+          CASE GROUPING_ID(DEPARTAMENTO_SERVICO, CATEGORIA_SERVICO)
+               WHEN 3 THEN 'TOTAL'
+               WHEN 1 THEN 'DEPARTAMENTO'
+               ELSE 'CATEGORIA'
+          END AS GRUPO,
+          DEPARTAMENTO_SERVICO,
+          CATEGORIA_SERVICO,
+          NVL(SUM(REGISTROS),0) AS REGISTROS,
+          SUM(QTDE_SERVICOS) AS QTDE_SERVICOS,
+          SUM(RECEITA) AS RECEITA,
+          SUM(LUCRO) AS LUCRO,
+          CASE WHEN SUM(RECEITA) = 0 THEN NULL ELSE SUM(LUCRO)/SUM(RECEITA) END AS MARGEM,
+          SUM(RECEITA)/NULLIF(SUM(REGISTROS),0) AS TICKET_MEDIO,
+          SUM(QTDE_SERVICOS)/NULLIF(SUM(REGISTROS),0) AS QTDE_MEDIA
+        FROM s
+        GROUP BY GROUPING SETS ((), (DEPARTAMENTO_SERVICO), (CATEGORIA_SERVICO))
+        """
+
+        return f"""
         SELECT
+          CASE GROUPING_ID(DEPARTAMENTO_SERVICO, CATEGORIA_SERVICO)
+               WHEN 3 THEN 'TOTAL'
+               WHEN 1 THEN 'DEPARTAMENTO'
+               ELSE 'CATEGORIA'
+          END AS GRUPO,
           DEPARTAMENTO_SERVICO,
+          CATEGORIA_SERVICO,
+          COUNT(*) AS REGISTROS,
           SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
           SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
           SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO,
           CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
                ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
-          END AS MARGEM
+          END AS MARGEM,
+          AVG(NVL(VALOR_TOTAL_SERVICO,0)) AS TICKET_MEDIO,
+          AVG(NVL(QTDE_SERVICOS,0)) AS QTDE_MEDIA
         FROM BRZ_HIST_SERVICOS
-        WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-          AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-          AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
-        GROUP BY DEPARTAMENTO_SERVICO
-        ORDER BY RECEITA DESC NULLS LAST
-        FETCH FIRST {int(top_n)} ROWS ONLY
+        WHERE {date_range("DT_REALIZACAO_SERVICO")}{and_filters(filtros)}
+        GROUP BY GROUPING SETS ((), (DEPARTAMENTO_SERVICO), (CATEGORIA_SERVICO))
         """
-        params = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
+
+    def kpis_servicos(self, dt_ini: date, dt_fim: date,
+                      cod_concessionaria: Optional[int] = None,
+                      cod_filial: Optional[int] = None) -> Dict[str, Any]:
+        total = self.resumo_servicos(dt_ini, dt_fim, cod_concessionaria, cod_filial)["TOTAL"]
+        if not total:
+            return {}
+        t = total[0]
+        return {
+            "REGISTROS": t["REGISTROS"],
+            "QTDE_SERVICOS": t["QTDE_SERVICOS"],
+            "RECEITA_SERVICOS": t["RECEITA"],
+            "LUCRO_SERVICOS": t["LUCRO"],
+            "MARGEM_SERVICOS": t["MARGEM"],
+            "TICKET_MEDIO_POR_REGISTRO": t["TICKET_MEDIO"],
+            "QTDE_MEDIA_SERVICOS_POR_REGISTRO": t["QTDE_MEDIA"],
         }
-        return self.query_dicts(sql, params)
+
+    def por_departamento(self, dt_ini: date, dt_fim: date,
+                         cod_concessionaria: Optional[int] = None,
+                         cod_filial: Optional[int] = None,
+                         top_n: int = 20) -> List[Dict[str, Any]]:
+        local = self.from_slice("por_departamento", dt_ini, dt_fim, cod_concessionaria=cod_concessionaria,
+                                cod_filial=cod_filial, top_n=top_n)
+        if local is not None:
+            return local
+
+        rows = self.resumo_servicos(dt_ini, dt_fim, cod_concessionaria, cod_filial)["DEPARTAMENTO"]
+        return [
+            {k: r[k] for k in ("DEPARTAMENTO_SERVICO", "QTDE_SERVICOS", "RECEITA", "LUCRO", "MARGEM")}
+            for r in self.top(rows, "RECEITA", top_n)
+        ]
 
     def por_categoria_servico(self, dt_ini: date, dt_fim: date,
                              cod_concessionaria: Optional[int] = None,
                              cod_filial: Optional[int] = None,
                              top_n: int = 20) -> List[Dict[str, Any]]:
-        sql = f"""
-        SELECT
-          CATEGORIA_SERVICO,
-          SUM(NVL(QTDE_SERVICOS,0)) AS QTDE_SERVICOS,
-          SUM(NVL(VALOR_TOTAL_SERVICO,0)) AS RECEITA,
-          SUM(NVL(LUCRO_SERVICO,0)) AS LUCRO,
-          CASE WHEN SUM(NVL(VALOR_TOTAL_SERVICO,0)) = 0 THEN NULL
-               ELSE SUM(NVL(LUCRO_SERVICO,0))/SUM(NVL(VALOR_TOTAL_SERVICO,0))
-          END AS MARGEM
-        FROM BRZ_HIST_SERVICOS
-        WHERE DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-          AND (:cod_concessionaria IS NULL OR COD_CONCESSIONARIA = :cod_concessionaria)
-          AND (:cod_filial IS NULL OR COD_FILIAL = :cod_filial)
-        GROUP BY CATEGORIA_SERVICO
-        ORDER BY LUCRO DESC NULLS LAST
-        FETCH FIRST {int(top_n)} ROWS ONLY
-        """
-        params = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
-        }
-        return self.query_dicts(sql, params)
+        rows = self.resumo_servicos(dt_ini, dt_fim, cod_concessionaria, cod_filial)["CATEGORIA"]
+        return [
+            {k: r[k] for k in ("CATEGORIA_SERVICO", "QTDE_SERVICOS", "RECEITA", "LUCRO", "MARGEM")}
+            for r in self.top(rows, "LUCRO", top_n)
+        ]
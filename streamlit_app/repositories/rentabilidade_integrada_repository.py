@@ -1,23 +1,59 @@
 from __future__ import annotations
 
 from datetime import date
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from typing import Optional, Dict, Any, FrozenSet, List, Tuple
 
+from connector.journey import JOURNEY_TABLE, JOURNEY_WINDOWS, window_columns
 from repositories.base_repo import BaseRepository
+from repositories.defaults import PAGE_SIZE
+from repositories.pagination import NULL_DATE, Page, PageSpec, SortColumn
+from repositories.sql_builder import Filters, and_filters, date_range
 
+# Tabela de vendas com margem integrada: padrão = onde o pós-venda mais melhora a margem
+MARGEM_PAGE = PageSpec(
+    sorts=(
+        SortColumn("DELTA_MARGEM", "Δ margem (integrada - veículo)"),
+        SortColumn("DT_VENDA", "Data da venda", NULL_DATE),
+        SortColumn("RECEITA_INTEGRADA", "Receita integrada"),
+        SortColumn("MARGEM_INTEGRADA", "Margem integrada"),
+        SortColumn("RECEITA_VEICULO", "Receita do veículo"),
+    ),
+    key=("ID_VENDA_VEICULO",),
+    search=("NOME_COMPRADOR", "MODELO_VEICULO", "NOME_FILIAL"),
+)
 
-class RentabilidadeIntegradaRepository(BaseRepository):
-    def margem_integrada_por_venda_veiculo(
-        self,
-        dt_ini: date,
-        dt_fim: date,
-        janela_dias: int = 30,
-        cod_concessionaria: Optional[int] = None,
-        cod_filial: Optional[int] = None,
-        limit: int = 200,
-    ) -> List[Dict[str, Any]]:
-        sql = f"""
-        WITH base_venda AS (
+
+def _jornada_ctes(filtros: FrozenSet[str], janela: Optional[int]) -> str:
+    """
+    CTEs até "jornada": uma linha por venda de veículo com receita/lucro da venda e
+    do pós-venda (serviços e peças) na janela. Janela padrão lê AGG_JORNADA_CLIENTE;
+    None calcula ao vivo com :janela_dias (junção por cliente e intervalo de datas);
+    serviços e peças também são limitados a [:dt_ini, :dt_fim + :janela_dias], redundante
+    com a junção mas com data fixa: nas BRZ_HIST_* particionadas só esses meses são lidos.
+    """
+    if janela is not None:
+        colunas = ",\n".join(f"                j.{col} AS {alias}" for col, alias in window_columns(janela).items())
+        return f"""
+        jornada AS (
+            SELECT
+                j.ID_VENDA_VEICULO,
+                j.COD_CONCESSIONARIA,
+                j.COD_FILIAL,
+                j.NOME_FILIAL,
+                j.DT_VENDA,
+                j.NOME_COMPRADOR,
+                j.MARCA_VEICULO,
+                j.MODELO_VEICULO,
+                j.RECEITA_VEICULO,
+                j.LUCRO_VEICULO,
+{colunas}
+            FROM {JOURNEY_TABLE} j
+            WHERE {date_range("j.DT_VENDA")}{and_filters(filtros, "j")}
+        )"""
+
+    return f"""
+        base_venda AS (
             SELECT
                 v.ID_VENDA_VEICULO,
                 v.COD_CONCESSIONARIA,
@@ -25,17 +61,16 @@ class RentabilidadeIntegradaRepository(BaseRepository):
                 v.NOME_FILIAL,
                 v.DT_VENDA,
                 v.NOME_COMPRADOR,
+                v.CLIENTE_HASH,
                 v.MARCA_VEICULO,
                 v.MODELO_VEICULO,
                 SUM(NVL(v.VALOR_VENDA,0)) AS RECEITA_VEICULO,
                 SUM(NVL(v.LUCRO_VENDA,0)) AS LUCRO_VEICULO
             FROM BRZ_HIST_VENDAS_VEICULOS v
-            WHERE v.DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR v.COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR v.COD_FILIAL = :cod_filial)
+            WHERE {date_range("v.DT_VENDA")}{and_filters(filtros, "v")}
             GROUP BY
                 v.ID_VENDA_VEICULO, v.COD_CONCESSIONARIA, v.COD_FILIAL, v.NOME_FILIAL,
-                v.DT_VENDA, v.NOME_COMPRADOR, v.MARCA_VEICULO, v.MODELO_VEICULO
+                v.DT_VENDA, v.NOME_COMPRADOR, v.CLIENTE_HASH, v.MARCA_VEICULO, v.MODELO_VEICULO
         ),
         srv AS (
             SELECT
@@ -44,9 +79,10 @@ class RentabilidadeIntegradaRepository(BaseRepository):
                 SUM(NVL(s.LUCRO_SERVICO,0)) AS LUCRO_SERVICOS
             FROM base_venda b
             LEFT JOIN BRZ_HIST_SERVICOS s
-              ON s.NOME_CLIENTE = b.NOME_COMPRADOR
+              ON s.CLIENTE_HASH = b.CLIENTE_HASH
              AND s.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA
              AND s.DT_REALIZACAO_SERVICO BETWEEN b.DT_VENDA AND (b.DT_VENDA + :janela_dias)
+             AND s.DT_REALIZACAO_SERVICO >= :dt_ini AND s.DT_REALIZACAO_SERVICO < :dt_fim + :janela_dias + 1
             GROUP BY b.ID_VENDA_VEICULO
         ),
         pec AS (
@@ -56,57 +92,143 @@ class RentabilidadeIntegradaRepository(BaseRepository):
                 SUM(NVL(p.LUCRO_VENDA,0)) AS LUCRO_PECAS
             FROM base_venda b
             LEFT JOIN BRZ_HIST_VENDAS_PECAS p
-              ON p.NOME_COMPRADOR = b.NOME_COMPRADOR
+              ON p.CLIENTE_HASH = b.CLIENTE_HASH
              AND p.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA
              AND p.DT_VENDA BETWEEN b.DT_VENDA AND (b.DT_VENDA + :janela_dias)
+             AND p.DT_VENDA >= :dt_ini AND p.DT_VENDA < :dt_fim + :janela_dias + 1
             GROUP BY b.ID_VENDA_VEICULO
-        )
-        SELECT
-            b.COD_CONCESSIONARIA,
-            b.COD_FILIAL,
-            b.NOME_FILIAL,
-            b.DT_VENDA,
-            b.NOME_COMPRADOR,
-            b.MARCA_VEICULO,
-            b.MODELO_VEICULO,
-
-            b.RECEITA_VEICULO,
-            b.LUCRO_VEICULO,
-            CASE WHEN b.RECEITA_VEICULO = 0 THEN NULL ELSE b.LUCRO_VEICULO / b.RECEITA_VEICULO END AS MARGEM_VEICULO,
+        ),
+        jornada AS (
+            SELECT
+                b.ID_VENDA_VEICULO,
+                b.COD_CONCESSIONARIA,
+                b.COD_FILIAL,
+                b.NOME_FILIAL,
+                b.DT_VENDA,
+                b.NOME_COMPRADOR,
+                b.MARCA_VEICULO,
+                b.MODELO_VEICULO,
+                b.RECEITA_VEICULO,
+                b.LUCRO_VEICULO,
+                NVL(s.RECEITA_SERVICOS,0) AS RECEITA_SERVICOS,
+                NVL(s.LUCRO_SERVICOS,0) AS LUCRO_SERVICOS,
+                NVL(p.RECEITA_PECAS,0) AS RECEITA_PECAS,
+                NVL(p.LUCRO_PECAS,0) AS LUCRO_PECAS
+            FROM base_venda b
+            LEFT JOIN srv s ON s.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
+            LEFT JOIN pec p ON p.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
+        )"""
 
-            NVL(s.RECEITA_SERVICOS,0) AS RECEITA_SERVICOS,
-            NVL(s.LUCRO_SERVICOS,0)   AS LUCRO_SERVICOS,
-            CASE WHEN NVL(s.RECEITA_SERVICOS,0) = 0 THEN NULL ELSE NVL(s.LUCRO_SERVICOS,0) / NVL(s.RECEITA_SERVICOS,0) END AS MARGEM_SERVICOS,
 
-            NVL(p.RECEITA_PECAS,0) AS RECEITA_PECAS,
-            NVL(p.LUCRO_PECAS,0)   AS LUCRO_PECAS,
-            CASE WHEN NVL(p.RECEITA_PECAS,0) = 0 THEN NULL ELSE NVL(p.LUCRO_PECAS,0) / NVL(p.RECEITA_PECAS,0) END AS MARGEM_PECAS,
+class RentabilidadeIntegradaRepository(BaseRepository):
+    def margem_integrada_por_venda_veiculo(
+        self,
+        dt_ini: date,
+        dt_fim: date,
+        janela_dias: int = 30,
+        cod_concessionaria: Optional[int] = None,
+        cod_filial: Optional[int] = None,
+        limit: int = 200,
+    ) -> List[Dict[str, Any]]:
+        filtros = Filters(cod_concessionaria, cod_filial)
+        janela = self._journey_window(janela_dias)
+        sql = self._margem_integrada_sql(filtros.active, int(limit), janela)
 
-            ( b.LUCRO_VEICULO + NVL(s.LUCRO_SERVICOS,0) + NVL(p.LUCRO_PECAS,0) ) AS LUCRO_INTEGRADO,
-            ( b.RECEITA_VEICULO + NVL(s.RECEITA_SERVICOS,0) + NVL(p.RECEITA_PECAS,0) ) AS RECEITA_INTEGRADA,
+        params: Dict[str, Any] = {
+            "dt_ini": dt_ini,
+            "dt_fim": dt_fim,
+            **filtros.params,
+        }
+        if janela is None:
+            params["janela_dias"] = int(janela_dias)
 
-            CASE
-              WHEN ( b.RECEITA_VEICULO + NVL(s.RECEITA_SERVICOS,0) + NVL(p.RECEITA_PECAS,0) ) = 0 THEN NULL
-              ELSE ( b.LUCRO_VEICULO + NVL(s.LUCRO_SERVICOS,0) + NVL(p.LUCRO_PECAS,0) )
-                   / ( b.RECEITA_VEICULO + NVL(s.RECEITA_SERVICOS,0) + NVL(p.RECEITA_PECAS,0) )
-            END AS MARGEM_INTEGRADA
+        return self.query_dicts(sql, params)
 
-        FROM base_venda b
-        LEFT JOIN srv s ON s.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
-        LEFT JOIN pec p ON p.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
-        ORDER BY b.DT_VENDA DESC
-        FETCH FIRST {int(limit)} ROWS ONLY
-        """
+    def margem_integrada_pagina(
+        self,
+        dt_ini: date,
+        dt_fim: date,
+        janela_dias: int = 30,
+        cod_concessionaria: Optional[int] = None,
+        cod_filial: Optional[int] = None,
+        sort: Optional[str] = None,
+        descending: Optional[bool] = None,
+        after: Optional[Tuple[Any, ...]] = None,
+        busca: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+    ) -> Page:
+        """Todas as vendas do período com DELTA_MARGEM, uma página por vez (sem o teto de limit)."""
+        filtros = Filters(cod_concessionaria, cod_filial)
+        janela = self._journey_window(janela_dias)
+        sql = self._margem_integrada_page_sql(filtros.active, janela)
 
         params: Dict[str, Any] = {
             "dt_ini": dt_ini,
             "dt_fim": dt_fim,
-            "janela_dias": int(janela_dias),
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
+            **filtros.params,
         }
+        if janela is None:
+            params["janela_dias"] = int(janela_dias)
 
-        return self.query_dicts(sql, params)
+        return self.query_page(sql, params, MARGEM_PAGE, sort, descending, after, busca, page_size)
+
+    def _journey_window(self, janela_dias: int) -> Optional[int]:
+        """Janela padrão servida por AGG_JORNADA_CLIENTE; None = cálculo ao vivo (também sem a tabela)."""
+        janela = int(janela_dias)
+        if self.use_journey and janela in JOURNEY_WINDOWS and self.table_ready(JOURNEY_TABLE):
+            return janela
+        return None
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _margem_integrada_sql(filtros: FrozenSet[str], limit: Optional[int], janela: Optional[int]) -> str:
+        """limit=None: todas as vendas, sem ordem, com ID_VENDA_VEICULO (base da paginação)."""
+        chave = "" if limit is not None else "\n            j.ID_VENDA_VEICULO,"
+        top = "" if limit is None else f"ORDER BY j.DT_VENDA DESC FETCH FIRST {limit} ROWS ONLY"
+        return f"""
+        WITH{_jornada_ctes(filtros, janela)}
+        SELECT{chave}
+            j.COD_CONCESSIONARIA,
+            j.COD_FILIAL,
+            j.NOME_FILIAL,
+            j.DT_VENDA,
+            j.NOME_COMPRADOR,
+            j.MARCA_VEICULO,
+            j.MODELO_VEICULO,
+
+            j.RECEITA_VEICULO,
+            j.LUCRO_VEICULO,
+            CASE WHEN j.RECEITA_VEICULO = 0 THEN NULL ELSE j.LUCRO_VEICULO / j.RECEITA_VEICULO END AS MARGEM_VEICULO,
+
+            j.RECEITA_SERVICOS,
+            j.LUCRO_SERVICOS,
+            CASE WHEN j.RECEITA_SERVICOS = 0 THEN NULL ELSE j.LUCRO_SERVICOS / j.RECEITA_SERVICOS END AS MARGEM_SERVICOS,
+
+            j.RECEITA_PECAS,
+            j.LUCRO_PECAS,
+            CASE WHEN j.RECEITA_PECAS = 0 THEN NULL ELSE j.LUCRO_PECAS / j.RECEITA_PECAS END AS MARGEM_PECAS,
+
+            ( j.LUCRO_VEICULO + j.LUCRO_SERVICOS + j.LUCRO_PECAS ) AS LUCRO_INTEGRADO,
+            ( j.RECEITA_VEICULO + j.RECEITA_SERVICOS + j.RECEITA_PECAS ) AS RECEITA_INTEGRADA,
+
+            CASE
+              WHEN ( j.RECEITA_VEICULO + j.RECEITA_SERVICOS + j.RECEITA_PECAS ) = 0 THEN NULL
+              ELSE ( j.LUCRO_VEICULO + j.LUCRO_SERVICOS + j.LUCRO_PECAS )
+                   / ( j.RECEITA_VEICULO + j.RECEITA_SERVICOS + j.RECEITA_PECAS )
+            END AS MARGEM_INTEGRADA
+
+        FROM jornada j
+        {top}
+        """
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _margem_integrada_page_sql(filtros: FrozenSet[str], janela: Optional[int]) -> str:
+        # Δ da view (integrada - veículo) calculado no banco para ordenar as páginas por ele
+        return f"""
+        SELECT m.*, NVL(m.MARGEM_INTEGRADA,0) - NVL(m.MARGEM_VEICULO,0) AS DELTA_MARGEM
+        FROM ({RentabilidadeIntegradaRepository._margem_integrada_sql(filtros, None, janela)}) m
+        """
 
     def ranking_modelos_rentabilidade_integrada(
         self,
@@ -121,63 +243,36 @@ class RentabilidadeIntegradaRepository(BaseRepository):
         """
         ANÁLISE 2: ranking de modelos por margem integrada (proxy de ROI).
         """
-        sql = f"""
-        WITH base_venda AS (
-            SELECT
-                v.ID_VENDA_VEICULO,
-                v.COD_CONCESSIONARIA,
-                v.COD_FILIAL,
-                v.DT_VENDA,
-                v.NOME_COMPRADOR,
-                v.MARCA_VEICULO,
-                v.MODELO_VEICULO,
-                SUM(NVL(v.VALOR_VENDA,0)) AS RECEITA_VEICULO,
-                SUM(NVL(v.LUCRO_VENDA,0)) AS LUCRO_VEICULO
-            FROM BRZ_HIST_VENDAS_VEICULOS v
-            WHERE v.DT_VENDA BETWEEN :dt_ini AND :dt_fim
-              AND (:cod_concessionaria IS NULL OR v.COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR v.COD_FILIAL = :cod_filial)
-            GROUP BY
-                v.ID_VENDA_VEICULO, v.COD_CONCESSIONARIA, v.COD_FILIAL,
-                v.DT_VENDA, v.NOME_COMPRADOR, v.MARCA_VEICULO, v.MODELO_VEICULO
-        ),
-        srv AS (
-            SELECT
-                b.ID_VENDA_VEICULO,
-                SUM(NVL(s.VALOR_TOTAL_SERVICO,0)) AS RECEITA_SERVICOS,
-                SUM(NVL(s.LUCRO_SERVICO,0)) AS LUCRO_SERVICOS
-            FROM base_venda b
-            LEFT JOIN BRZ_HIST_SERVICOS s
-              ON s.NOME_CLIENTE = b.NOME_COMPRADOR
-             AND s.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA
-             AND s.DT_REALIZACAO_SERVICO BETWEEN b.DT_VENDA AND (b.DT_VENDA + :janela_dias)
-            GROUP BY b.ID_VENDA_VEICULO
-        ),
-        pec AS (
-            SELECT
-                b.ID_VENDA_VEICULO,
-                SUM(NVL(p.VALOR_VENDA,0)) AS RECEITA_PECAS,
-                SUM(NVL(p.LUCRO_VENDA,0)) AS LUCRO_PECAS
-            FROM base_venda b
-            LEFT JOIN BRZ_HIST_VENDAS_PECAS p
-              ON p.NOME_COMPRADOR = b.NOME_COMPRADOR
-             AND p.COD_CONCESSIONARIA = b.COD_CONCESSIONARIA
-             AND p.DT_VENDA BETWEEN b.DT_VENDA AND (b.DT_VENDA + :janela_dias)
-            GROUP BY b.ID_VENDA_VEICULO
-        ),
+        filtros = Filters(cod_concessionaria, cod_filial)
+        janela = self._journey_window(janela_dias)
+        sql = self._ranking_modelos_sql(filtros.active, int(top_n), janela)
+
+        params: Dict[str, Any] = {
+            "dt_ini": dt_ini,
+            "dt_fim": dt_fim,
+            "min_receita_veiculo": float(min_receita_veiculo),
+            **filtros.params,
+        }
+        if janela is None:
+            params["janela_dias"] = int(janela_dias)
+        return self.query_dicts(sql, params)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def _ranking_modelos_sql(filtros: FrozenSet[str], top_n: int, janela: Optional[int]) -> str:
+        return f"""
+        WITH{_jornada_ctes(filtros, janela)},
         integ AS (
             SELECT
-                b.MARCA_VEICULO,
-                b.MODELO_VEICULO,
-                (b.LUCRO_VEICULO + NVL(s.LUCRO_SERVICOS,0) + NVL(p.LUCRO_PECAS,0)) AS LUCRO_INTEGRADO,
-                (b.RECEITA_VEICULO + NVL(s.RECEITA_SERVICOS,0) + NVL(p.RECEITA_PECAS,0)) AS RECEITA_INTEGRADA,
-                b.RECEITA_VEICULO,
-                b.LUCRO_VEICULO,
-                NVL(s.RECEITA_SERVICOS,0) AS RECEITA_SERVICOS,
-                NVL(p.RECEITA_PECAS,0) AS RECEITA_PECAS
-            FROM base_venda b
-            LEFT JOIN srv s ON s.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
-            LEFT JOIN pec p ON p.ID_VENDA_VEICULO = b.ID_VENDA_VEICULO
+                j.MARCA_VEICULO,
+                j.MODELO_VEICULO,
+                (j.LUCRO_VEICULO + j.LUCRO_SERVICOS + j.LUCRO_PECAS) AS LUCRO_INTEGRADO,
+                (j.RECEITA_VEICULO + j.RECEITA_SERVICOS + j.RECEITA_PECAS) AS RECEITA_INTEGRADA,
+                j.RECEITA_VEICULO,
+                j.LUCRO_VEICULO,
+                j.RECEITA_SERVICOS,
+                j.RECEITA_PECAS
+            FROM jornada j
         )
         SELECT
             MARCA_VEICULO,
@@ -195,20 +290,9 @@ class RentabilidadeIntegradaRepository(BaseRepository):
         GROUP BY MARCA_VEICULO, MODELO_VEICULO
         HAVING SUM(RECEITA_VEICULO) >= :min_receita_veiculo
         ORDER BY MARGEM_INTEGRADA DESC NULLS LAST, RECEITA_INTEGRADA DESC
-        FETCH FIRST {int(top_n)} ROWS ONLY
+        FETCH FIRST {top_n} ROWS ONLY
         """
 
-        params: Dict[str, Any] = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "janela_dias": int(janela_dias),
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
-            "min_receita_veiculo": float(min_receita_veiculo),
-        }
-        return self.query_dicts(sql, params)
-    
-
     def fluxo_caixa_proxy(
         self,
         dt_ini: date,
@@ -219,42 +303,62 @@ class RentabilidadeIntegradaRepository(BaseRepository):
         """
         ANÁLISE 3 (proxy): compara capital imobilizado (estoques) com entradas de caixa (receitas) no período.
         """
-        sql = """
-        WITH
-        estoque AS (
+        filtros = Filters(cod_concessionaria, cod_filial)
+        sql = self._fluxo_caixa_sql(self.rollup_ready, filtros.active)
+
+        params: Dict[str, Any] = {
+            "dt_ini": dt_ini,
+            "dt_fim": dt_fim,
+            **filtros.params,
+        }
+        return self.query_dicts(sql, params)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _fluxo_caixa_sql(use_rollup: bool, filtros: FrozenSet[str]) -> str:
+        if use_rollup:
+            # Receitas do agregado diário (AGG_DIARIO_FILIAL), uma leitura para as três linhas
+            entradas = f"""
+        entradas AS (
             SELECT
-                SUM(NVL(ep.VALOR_PECA_ESTOQUE,0)) AS ESTOQUE_PECAS,
-                (SELECT SUM(NVL(ev.CUSTO_VEICULO,0))
-                   FROM BRZ_ESTOQUE_VEICULOS ev
-                  WHERE (:cod_concessionaria IS NULL OR ev.COD_CONCESSIONARIA = :cod_concessionaria)
-                    AND (:cod_filial IS NULL OR ev.COD_FILIAL = :cod_filial)
-                ) AS ESTOQUE_VEICULOS
-            FROM BRZ_ESTOQUE_PECAS ep
-            WHERE (:cod_concessionaria IS NULL OR ep.COD_CONCESSIONARIA = :cod_concessionaria)
-              AND (:cod_filial IS NULL OR ep.COD_FILIAL = :cod_filial)
-        ),
+                SUM(CASE WHEN LINHA = 'VEIC' THEN RECEITA END) AS RECEITA_VENDAS_VEICULOS,
+                SUM(CASE WHEN LINHA = 'PEC' THEN RECEITA END) AS RECEITA_VENDAS_PECAS,
+                SUM(CASE WHEN LINHA = 'SRV' THEN RECEITA END) AS RECEITA_SERVICOS
+            FROM AGG_DIARIO_FILIAL
+            WHERE {date_range("DT")}{and_filters(filtros)}
+        )"""
+        else:
+            entradas = f"""
         entradas AS (
             SELECT
                 (SELECT SUM(NVL(v.VALOR_VENDA,0))
                    FROM BRZ_HIST_VENDAS_VEICULOS v
-                  WHERE v.DT_VENDA BETWEEN :dt_ini AND :dt_fim
-                    AND (:cod_concessionaria IS NULL OR v.COD_CONCESSIONARIA = :cod_concessionaria)
-                    AND (:cod_filial IS NULL OR v.COD_FILIAL = :cod_filial)
+                  WHERE {date_range("v.DT_VENDA")}{and_filters(filtros, "v")}
                 ) AS RECEITA_VENDAS_VEICULOS,
                 (SELECT SUM(NVL(p.VALOR_VENDA,0))
                    FROM BRZ_HIST_VENDAS_PECAS p
-                  WHERE p.DT_VENDA BETWEEN :dt_ini AND :dt_fim
-                    AND (:cod_concessionaria IS NULL OR p.COD_CONCESSIONARIA = :cod_concessionaria)
-                    AND (:cod_filial IS NULL OR p.COD_FILIAL = :cod_filial)
+                  WHERE {date_range("p.DT_VENDA")}{and_filters(filtros, "p")}
                 ) AS RECEITA_VENDAS_PECAS,
                 (SELECT SUM(NVL(s.VALOR_TOTAL_SERVICO,0))
                    FROM BRZ_HIST_SERVICOS s
-                  WHERE s.DT_REALIZACAO_SERVICO BETWEEN :dt_ini AND :dt_fim
-                    AND (:cod_concessionaria IS NULL OR s.COD_CONCESSIONARIA = :cod_concessionaria)
-                    AND (:cod_filial IS NULL OR s.COD_FILIAL = :cod_filial)
+                  WHERE {date_range("s.DT_REALIZACAO_SERVICO")}{and_filters(filtros, "s")}
                 ) AS RECEITA_SERVICOS
             FROM dual
-        )
+        )"""
+
+        return f"""
+        WITH
+        estoque AS (
+            SELECT
+                SUM(NVL(ep.VALOR_PECA_ESTOQUE,0)) AS ESTOQUE_PECAS,
+                (SELECT SUM(NVL(ev.CUSTO_VEICULO,0))
+                   FROM BRZ_ESTOQUE_VEICULOS ev
+                  WHERE 1 = 1{and_filters(filtros, "ev")}
+                ) AS ESTOQUE_VEICULOS
+            FROM BRZ_ESTOQUE_PECAS ep
+            WHERE 1 = 1{and_filters(filtros, "ep")}
+        ),
+        {entradas}
         SELECT 'Capital imobilizado (estoque)' AS TIPO, 'Veículos (custo)' AS ITEM, NVL(e.ESTOQUE_VEICULOS,0) AS VALOR FROM estoque e
         UNION ALL
         SELECT 'Capital imobilizado (estoque)' AS TIPO, 'Peças (valor)' AS ITEM, NVL(e.ESTOQUE_PECAS,0) AS VALOR FROM estoque e
@@ -265,11 +369,3 @@ class RentabilidadeIntegradaRepository(BaseRepository):
         UNION ALL
         SELECT 'Entradas no período' AS TIPO, 'Receita serviços' AS ITEM, NVL(x.RECEITA_SERVICOS,0) AS VALOR FROM entradas x
         """
-
-        params: Dict[str, Any] = {
-            "dt_ini": dt_ini,
-            "dt_fim": dt_fim,
-            "cod_concessionaria": cod_concessionaria,
-            "cod_filial": cod_filial,
-        }
-        return self.query_dicts(sql, params)
\ No newline at end of file
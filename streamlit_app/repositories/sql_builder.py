@@ -0,0 +1,69 @@
+"""
+Montagem de predicados SQL dos repositórios
+
+- Período em intervalo semiaberto: COL >= :dt_ini AND COL < :dt_fim + 1
+  (nada de função sobre a coluna: o índice (COD_CONCESSIONARIA, COD_FILIAL, DT_*)
+  das BRZ_* é usado, e o dia :dt_fim entra inteiro mesmo se a coluna tiver hora)
+- Filtros opcionais de concessionária/filial viram SQL especializado: cada
+  combinação de filtros informados gera um texto próprio, e cada texto tem o
+  seu plano no Oracle. "(:cod_filial IS NULL OR COD_FILIAL = :cod_filial)"
+  obrigava um plano genérico a servir a chamada com e sem filtro
+- Os textos são montados por funções com lru_cache (nos repositórios, uma por
+  método, chave = flags de filtro): a mesma combinação devolve sempre o mesmo
+  SQL, o que mantém o statement cache do connector e o cache de resultados
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Optional
+
+# Bind -> coluna, na ordem em que os predicados são emitidos
+FILTER_COLUMNS: Dict[str, str] = {
+    "cod_concessionaria": "COD_CONCESSIONARIA",
+    "cod_filial": "COD_FILIAL",
+}
+
+
+@dataclass(frozen=True)
+class Filters:
+    """Filtros opcionais de uma chamada (None = sem filtro naquela coluna)."""
+    cod_concessionaria: Optional[int] = None
+    cod_filial: Optional[int] = None
+
+    @property
+    def active(self) -> FrozenSet[str]:
+        """Binds informados: chave da variante de SQL."""
+        return frozenset(name for name in FILTER_COLUMNS if getattr(self, name) is not None)
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Só os binds usados pela variante (o Oracle rejeita bind sem placeholder)."""
+        return {name: getattr(self, name) for name in FILTER_COLUMNS if getattr(self, name) is not None}
+
+
+def date_range(column: str, ini: str = "dt_ini", fim: str = "dt_fim") -> str:
+    """Período fechado [:ini, :fim] em dias, escrito como intervalo semiaberto."""
+    return f"{column} >= :{ini} AND {column} < :{fim} + 1"
+
+
+@lru_cache(maxsize=256)
+def and_filters(active: FrozenSet[str], alias: str = "") -> str:
+    """' AND <alias>.COLUNA = :bind' para cada filtro ativo; '' sem filtros."""
+    prefix = f"{alias}." if alias else ""
+    return "".join(f" AND {prefix}{column} = :{name}"
+                   for name, column in FILTER_COLUMNS.items() if name in active)
+
+
+@lru_cache(maxsize=256)
+def and_filial_keys(active: FrozenSet[str], alias: str = "") -> str:
+    """
+    Mesmos filtros para os fatos SILVER (só SK_FILIAL): ' AND <alias>.SK_FILIAL IN
+    (SELECT SK_FILIAL FROM DIM_FILIAL WHERE ...)'; '' sem filtros.
+    """
+    if not active:
+        return ""
+    prefix = f"{alias}." if alias else ""
+    where = " AND ".join(f"{column} = :{name}" for name, column in FILTER_COLUMNS.items() if name in active)
+    return f" AND {prefix}SK_FILIAL IN (SELECT SK_FILIAL FROM DIM_FILIAL WHERE {where})"
@@ -0,0 +1,172 @@
+"""
+Warm-up do cache de resultados com os filtros padrão do dashboard.
+
+- Enumera os métodos públicos de cada repositório (subclasses de BaseRepository)
+  e monta os argumentos a partir dos defaults: dt_ini/dt_fim da sidebar,
+  default do próprio método e WARMUP_OVERRIDES (repositories/defaults.py)
+- Executa as chamadas em paralelo (poucas threads: o pool do Oracle é compartilhado)
+- As chamadas passam pelo query_dicts normal: a chave de cache (SQL, parâmetros,
+  versão dos dados) é a mesma que o primeiro render vai pedir, e o resultado
+  vai para o cache persistente (outros processos/réplicas) e para o st.cache_data
+  do processo atual
+- Devolve o tempo de cada chamada e de onde veio o resultado (oracle/disk/memory)
+
+Uso: mains/main_cache_warmup.py (depois do ETL) ou [CACHE] warmup_on_start (app.py).
+"""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import os
+import pkgutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import repositories
+from repositories.base_repo import BaseRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, WARMUP_OVERRIDES
+from utils.logger_controller import LoggerController
+from utils.query_telemetry import telemetry
+
+NOME = "CacheWarmup"
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "CacheWarmup.txt")
+logger = LoggerController(logfile)
+
+# Módulos do pacote que não são repositórios
+_SKIP_MODULES = {"base_repo", "defaults", "warmup"}
+
+
+@dataclass
+class WarmupCall:
+    name: str
+    kwargs: Dict[str, Any]
+    fn: Callable[..., Any] = field(repr=False)
+
+
+@dataclass
+class WarmupResult:
+    name: str
+    kwargs: Dict[str, Any]
+    elapsed_ms: float
+    queries: int = 0
+    rows: int = 0
+    tiers: Tuple[str, ...] = ()
+    error: Optional[str] = None
+
+
+def repository_classes() -> List[Type[BaseRepository]]:
+    """Subclasses de BaseRepository definidas no pacote repositories."""
+    classes: Dict[str, Type[BaseRepository]] = {}
+    for mod in pkgutil.iter_modules(repositories.__path__):
+        if mod.name in _SKIP_MODULES:
+            continue
+        module = importlib.import_module(f"repositories.{mod.name}")
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if issubclass(obj, BaseRepository) and obj is not BaseRepository and obj.__module__ == module.__name__:
+                classes[obj.__name__] = obj
+    return [classes[k] for k in sorted(classes)]
+
+
+def default_calls(config_file: str = "config/database.ini") -> List[WarmupCall]:
+    """Uma chamada por método público (ou por variante em WARMUP_OVERRIDES)."""
+    calls: List[WarmupCall] = []
+    for cls in repository_classes():
+        repo = cls(config_file=config_file)
+        for attr, member in vars(cls).items():
+            if attr.startswith("_") or not inspect.isfunction(member):
+                continue
+            name = f"{cls.__name__}.{attr}"
+            params = list(inspect.signature(member).parameters.values())[1:]
+
+            base: Dict[str, Any] = {}
+            missing = []
+            for p in params:
+                if p.name == "dt_ini":
+                    base["dt_ini"] = DEFAULT_DT_INI
+                elif p.name == "dt_fim":
+                    base["dt_fim"] = DEFAULT_DT_FIM
+                elif p.default is inspect.Parameter.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD):
+                    missing.append(p.name)
+
+            for extra in WARMUP_OVERRIDES.get(name, [{}]):
+                kwargs = {**base, **extra}
+                if [m for m in missing if m not in kwargs]:
+                    logger.warning("⚠️ Warm-up ignorou %s: sem valor padrão para %s", name, missing)
+                    continue
+                calls.append(WarmupCall(name, kwargs, getattr(repo, attr)))
+    return calls
+
+
+def _run_one(call: WarmupCall) -> WarmupResult:
+    # Cada chamada vira um "render" próprio na telemetria para separar as queries
+    render_id = telemetry.begin_render(f"warmup:{call.name}")
+    t0 = time.perf_counter()
+    try:
+        call.fn(**call.kwargs)
+        error = None
+    except Exception as e:
+        error = str(e).splitlines()[0] if str(e) else type(e).__name__
+    elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    recs = telemetry.records(render_id)
+    return WarmupResult(
+        name=call.name,
+        kwargs=call.kwargs,
+        elapsed_ms=elapsed_ms,
+        queries=len(recs),
+        rows=sum(r.rows for r in recs),
+        tiers=tuple(r.cache_tier for r in recs),
+        error=error,
+    )
+
+
+def run_warmup(calls: Optional[List[WarmupCall]] = None, max_workers: int = 4,
+               config_file: str = "config/database.ini") -> List[WarmupResult]:
+    """
+    Executa o warm-up em paralelo e devolve um resultado por chamada (ordem de término).
+
+    Args:
+        calls: Chamadas a executar (padrão: default_calls())
+        max_workers: Chamadas simultâneas (manter abaixo do max do pool do Oracle)
+        config_file: database.ini usado pelos repositórios
+    """
+    calls = default_calls(config_file) if calls is None else calls
+    logger.info("🔥 Warm-up iniciado: %s chamadas, %s workers", len(calls), max_workers)
+
+    # Cria o pool antes de abrir as threads (evita várias inicializações concorrentes)
+    BaseRepository(config_file=config_file)._get_connector()
+
+    t0 = time.perf_counter()
+    results: List[WarmupResult] = []
+    with ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="warmup") as pool:
+        futures = [pool.submit(_run_one, c) for c in calls]
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            if res.error:
+                logger.error("❌ Warm-up %s falhou em %.0f ms: %s", res.name, res.elapsed_ms, res.error)
+            else:
+                logger.info("✅ Warm-up %s: %.0f ms | %s queries | %s linhas | %s",
+                            res.name, res.elapsed_ms, res.queries, res.rows, ",".join(res.tiers) or "-")
+
+    logger.info("🏁 Warm-up concluído em %.1f s (%s falhas)",
+                time.perf_counter() - t0, sum(1 for r in results if r.error))
+    return results
+
+
+def format_report(results: List[WarmupResult]) -> str:
+    """Tabela texto com o tempo de cada chamada (mais lentas primeiro)."""
+    lines = [f"{'método':<60} {'ms':>9} {'queries':>7} {'linhas':>8}  origem"]
+    for r in sorted(results, key=lambda r: r.elapsed_ms, reverse=True):
+        extras = {k: v for k, v in r.kwargs.items() if k not in ("dt_ini", "dt_fim")}
+        label = r.name + (f" {extras}" if extras else "")
+        origin = f"ERRO: {r.error}" if r.error else (",".join(r.tiers) or "-")
+        lines.append(f"{label[:60]:<60} {r.elapsed_ms:>9.1f} {r.queries:>7} {r.rows:>8}  {origin}")
+    total = sum(r.elapsed_ms for r in results)
+    lines.append(f"{'soma dos tempos':<60} {total:>9.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+import pandas as pd
+import plotly.io as pio
+import streamlit as st
+
+from utils.downsampling import downsample
+from utils.ini_config import flag, read, section
+from utils.tracing import tracer
+
+# Orçamento de pontos por série e relatório do payload ([CHARTS] em config.ini)
+CHARTS = section(read(Path(__file__).resolve().parents[1] / "config" / "config.ini"), "CHARTS")
+MAX_POINTS = int(CHARTS.get("max_points", 800))
+METHOD = str(CHARTS.get("method", "lttb")).strip().lower()
+SHOW_PAYLOAD = flag(CHARTS, "show_payload", True)
+
+
+def reduce_series(df: pd.DataFrame, x: str, y: str) -> pd.DataFrame:
+    """
+    Série pronta para o gráfico: até MAX_POINTS pontos escolhidos por METHOD
+    (utils/downsampling.py). Só para desenhar: cálculos (forecast, totais)
+    continuam com a série inteira.
+    """
+    reduced, _ = downsample(df, x, y, MAX_POINTS, METHOD)
+    return reduced
+
+
+def plot(fig, view: str, points: Optional[Tuple[int, int]] = None) -> int:
+    """
+    st.plotly_chart com o tamanho do JSON enviado ao navegador no span
+    "view.plot" (payload_kb) e, com show_payload, numa legenda abaixo do gráfico.
+
+    Args:
+        fig: Figura plotly
+        view: Nome da view (atributo do span)
+        points: (pontos da série original, pontos desenhados), quando houve redução
+
+    Returns:
+        Bytes do payload da figura
+    """
+    payload = len(pio.to_json(fig, validate=False).encode("utf-8"))
+    attrs = {"payload_kb": round(payload / 1024, 1)}
+    if points is not None:
+        attrs.update(points_raw=points[0], points=points[1])
+    with tracer.span("view.plot", view=view, chart=fig.layout.title.text, **attrs):
+        st.plotly_chart(fig, use_container_width=True)
+
+    if SHOW_PAYLOAD:
+        reduced = f"{points[0]:,} pontos → {points[1]:,} ({METHOD}) · " if points and points[0] > points[1] else ""
+        st.caption(f"{reduced}{payload / 1024:,.0f} KB enviados".replace(",", "."))
+    return payload
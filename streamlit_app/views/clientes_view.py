@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from datetime import date
-
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
-from repositories.clientes_repository import ClientesRepository
+from connector.rfm import SEGMENTS
+from repositories.clientes_repository import LTV_PAGE, RFM_PAGE, ClientesRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from utils.tracing import tracer
+from views.paged_table import paged_table
 
 
 def _fmt_money(v) -> str:
@@ -23,8 +25,8 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Filtros")
-        dt_ini = st.date_input("Data inicial", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Data final", value=date(2025, 12, 31))
+        dt_ini = st.date_input("Data inicial", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Data final", value=DEFAULT_DT_FIM)
         top_n = st.slider("Top N (LTV)", min_value=10, max_value=200, value=50, step=10)
 
     repo = ClientesRepository()
@@ -54,52 +56,29 @@ def render() -> None:
         orientation="h",
         title="Top clientes por receita total (ciclo completo - proxy)",
     )
-    st.plotly_chart(fig, use_container_width=True)  # ranking -> barras
-
-    st.dataframe(
-        ltv[["CLIENTE", "TRANSACOES", "PRIMEIRA_DATA", "ULTIMA_DATA", "RECEITA_TOTAL", "LUCRO_TOTAL"]],
-        use_container_width=True,
-        hide_index=True,
+    with tracer.span("view.plot", view="clientes", chart=fig.layout.title.text):
+        st.plotly_chart(fig, use_container_width=True)  # ranking -> barras
+
+    # Todos os clientes do período, paginados no banco (o gráfico fica no top N)
+    paged_table(
+        "clientes_ltv", LTV_PAGE,
+        fetch=lambda sort, desc, after, busca: repo.ltv_por_cliente_pagina(
+            dt_ini, dt_fim, sort=sort, descending=desc, after=after, busca=busca),
+        prefetch=repo.prefetch,
+        token=(dt_ini, dt_fim),
+        columns=["CLIENTE", "TRANSACOES", "PRIMEIRA_DATA", "ULTIMA_DATA", "RECEITA_TOTAL", "LUCRO_TOTAL"],
     )
 
     st.divider()
 
     # --- RFM ---
     st.markdown("### RFM e Segmentos")
-    rfm = pd.DataFrame(repo.rfm_base(dt_ini, dt_fim))
-    if rfm.empty:
+    # Scores e segmentos calculados no banco (connector/rfm.py): só o resumo vem para cá
+    seg = pd.DataFrame(repo.rfm_segmentos(dt_ini, dt_fim))
+    if seg.empty:
         st.info("Sem dados para RFM.")
         return
 
-    # Scores por quantis (simples e robusto)
-    # Recency: menor é melhor; Frequency/Monetary: maior é melhor
-    rfm["R_SCORE"] = pd.qcut(rfm["RECENCY_DIAS"].rank(method="first"), 5, labels=[5,4,3,2,1]).astype(int)
-    rfm["F_SCORE"] = pd.qcut(rfm["FREQUENCY"].rank(method="first"), 5, labels=[1,2,3,4,5]).astype(int)
-    rfm["M_SCORE"] = pd.qcut(rfm["MONETARY"].rank(method="first"), 5, labels=[1,2,3,4,5]).astype(int)
-
-    # Segmentação (heurística alinhada ao seu texto)
-    def segment(row):
-        recent = row["R_SCORE"] >= 4
-        freq_high = row["F_SCORE"] >= 4
-        money_high = row["M_SCORE"] >= 4
-
-        if recent and freq_high and money_high:
-            return "VIP"
-        if recent and freq_high and not money_high:
-            return "Crescimento"
-        if (not recent) and (freq_high or money_high):
-            return "Risco"
-        return "Dorminte"
-
-    rfm["SEGMENTO"] = rfm.apply(segment, axis=1)
-
-    seg = rfm.groupby("SEGMENTO", as_index=False).agg(
-        CLIENTES=("CLIENTE", "count"),
-        RECEITA=("MONETARY", "sum"),
-        FREQ_MEDIA=("FREQUENCY", "mean"),
-        RECENCY_MEDIA=("RECENCY_DIAS", "mean"),
-    )
-
     fig2 = px.bar(
         seg.sort_values("CLIENTES", ascending=True),
         x="CLIENTES",
@@ -107,8 +86,33 @@ def render() -> None:
         orientation="h",
         title="Distribuição de clientes por segmento RFM",
     )
-    st.plotly_chart(fig2, use_container_width=True)
+    with tracer.span("view.plot", view="clientes", chart=fig2.layout.title.text):
+        st.plotly_chart(fig2, use_container_width=True)
 
     st.dataframe(seg, use_container_width=True, hide_index=True)
 
+    # Limiares de quintil usados nos scores (persistidos em AGG_RFM_LIMIARES ou do período)
+    lim = repo.rfm_limiares(dt_ini, dt_fim)
+    if lim:
+        origem = (f"limiares gravados em {lim['CALCULADO_EM']:%d/%m/%Y} "
+                  f"(clientes de {lim['DT_INI_REF']:%d/%m/%Y} a {lim['DT_FIM_REF']:%d/%m/%Y})"
+                  if lim.get("CALCULADO_EM") else "limiares do período selecionado")
+        st.caption(
+            f"Scores 1-5 por quintil, {origem}: "
+            f"recência {lim.get('R_P20')}/{lim.get('R_P40')}/{lim.get('R_P60')}/{lim.get('R_P80')} dias · "
+            f"frequência {lim.get('F_P20')}/{lim.get('F_P40')}/{lim.get('F_P60')}/{lim.get('F_P80')} · "
+            f"receita {_fmt_money(lim.get('M_P20'))}/{_fmt_money(lim.get('M_P80'))} (P20/P80)."
+        )
+
+    # Clientes de um segmento, sob demanda e paginados no banco
+    segmento = st.selectbox("Clientes do segmento", options=list(SEGMENTS),
+                            index=0, key="clientes_rfm_segmento")
+    paged_table(
+        "clientes_rfm", RFM_PAGE,
+        fetch=lambda sort, desc, after, busca: repo.rfm_clientes_segmento_pagina(
+            dt_ini, dt_fim, segmento=segmento, sort=sort, descending=desc, after=after, busca=busca),
+        prefetch=repo.prefetch,
+        token=(dt_ini, dt_fim, segmento),
+    )
+
     st.caption("Observação: RFM usa transações agregadas (veículo + peça + serviço) e Recency/Frequency/Monetary do período selecionado.")
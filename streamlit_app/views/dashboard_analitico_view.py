@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from datetime import date
-
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
-from repositories.dashboard_analitico_repository import DashboardAnaliticoRepository
+from repositories.dashboard_analitico_repository import VENDEDOR_PAGE, DashboardAnaliticoRepository
 from repositories.performance_filial_repository import PerformanceFilialRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, ANALITICO_PERFORMANCE_TOP_N
+from utils.tracing import tracer
+from views.lazy_sections import lazy_sections
+from views.paged_table import paged_table
 
 
 def _fmt_money(v) -> str:
@@ -32,8 +34,8 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Filtros")
-        dt_ini = st.date_input("Data inicial", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Data final", value=date(2025, 12, 31))
+        dt_ini = st.date_input("Data inicial", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Data final", value=DEFAULT_DT_FIM)
         top_n = st.slider("Top N", min_value=10, max_value=50, value=20, step=5)
 
         # Metas (MVP: input manual)
@@ -42,10 +44,9 @@ def render() -> None:
         meta_est_pec = st.number_input("Meta estoque peças (valor)", min_value=0.0, value=1000000.0, step=50000.0)
 
     repo = DashboardAnaliticoRepository()
-    tab1, tab2, tab3, tab4 = st.tabs(["Rentabilidade", "Estoque", "Performance Filial", "Sazonalidade"])  # [web:148]
 
     # ---------------- Rentabilidade ----------------
-    with tab1:
+    def rentabilidade() -> None:
         pnl = pd.DataFrame(repo.pnl_mensal(dt_ini, dt_fim))
         if pnl.empty:
             st.info("Sem dados no período.")
@@ -73,7 +74,8 @@ def render() -> None:
                     orientation="h",
                     title="ROI por filial (lucro período / capital em estoque atual) - Top",
                 )
-                st.plotly_chart(fig, use_container_width=True)
+                with tracer.span("view.plot", view="dashboard_analitico", chart=fig.layout.title.text):
+                    st.plotly_chart(fig, use_container_width=True)
 
             vend = pd.DataFrame(repo.lucro_por_vendedor(dt_ini, dt_fim, top_n=top_n))
             if not vend.empty:
@@ -84,10 +86,19 @@ def render() -> None:
                     orientation="h",
                     title="Lucro por vendedor (veículos + peças + serviços) - Top",
                 )
-                st.plotly_chart(fig2, use_container_width=True)
+                with tracer.span("view.plot", view="dashboard_analitico", chart=fig2.layout.title.text):
+                    st.plotly_chart(fig2, use_container_width=True)
+
+                paged_table(
+                    "analitico_vendedores", VENDEDOR_PAGE,
+                    fetch=lambda sort, desc, after, busca: repo.lucro_por_vendedor_pagina(
+                        dt_ini, dt_fim, sort=sort, descending=desc, after=after, busca=busca),
+                    prefetch=repo.prefetch,
+                    token=(dt_ini, dt_fim),
+                )
 
     # ---------------- Estoque ----------------
-    with tab2:
+    def estoque() -> None:
         k = repo.estoque_kpis()
 
         a, b, c = st.columns(3)
@@ -119,7 +130,8 @@ def render() -> None:
                 orientation="h",
                 title="Top 20 peças por valor estocado",
             )
-            st.plotly_chart(fig, use_container_width=True)
+            with tracer.span("view.plot", view="dashboard_analitico", chart=fig.layout.title.text):
+                st.plotly_chart(fig, use_container_width=True)
 
         # Giro (proxy) por categoria
         giro = pd.DataFrame(repo.rotatividade_pecas_categoria_proxy(dt_ini, dt_fim))
@@ -131,7 +143,8 @@ def render() -> None:
                 orientation="h",
                 title="Rotatividade de peças por categoria (proxy)",
             )
-            st.plotly_chart(fig2, use_container_width=True)
+            with tracer.span("view.plot", view="dashboard_analitico", chart=fig2.layout.title.text):
+                st.plotly_chart(fig2, use_container_width=True)
 
         # --- NOVO: Atual vs Histórico (dias em estoque) ---
         st.divider()
@@ -159,14 +172,15 @@ def render() -> None:
                 color="SERIE",
                 title="Dias médios em estoque — atual (snapshot) vs histórico (veículos vendidos)",
             )
-            st.plotly_chart(fig3, use_container_width=True)
+            with tracer.span("view.plot", view="dashboard_analitico", chart=fig3.layout.title.text):
+                st.plotly_chart(fig3, use_container_width=True)
 
     # ---------------- Performance Filial ----------------
-    with tab3:
+    def performance_filial() -> None:
         st.caption("Rankings principais por filial (reuso da tela Performance por Filial).")
 
         perf_repo = PerformanceFilialRepository()
-        perf_rows = perf_repo.performance_por_filial(dt_ini, dt_fim, top_n=200)
+        perf_rows = perf_repo.performance_por_filial(dt_ini, dt_fim, top_n=ANALITICO_PERFORMANCE_TOP_N)
         dfp = pd.DataFrame(perf_rows)
 
         if dfp.empty:
@@ -182,7 +196,8 @@ def render() -> None:
                     orientation="h",
                     title="Top filiais por ROI (lucro/estoque)",
                 )
-                st.plotly_chart(fig_roi, use_container_width=True)
+                with tracer.span("view.plot", view="dashboard_analitico", chart=fig_roi.layout.title.text):
+                    st.plotly_chart(fig_roi, use_container_width=True)
 
             # Top Lucro
             df_lucro = dfp.sort_values("LUCRO_TOTAL", ascending=False).head(top_n)
@@ -194,7 +209,8 @@ def render() -> None:
                     orientation="h",
                     title="Top filiais por lucro total (período)",
                 )
-                st.plotly_chart(fig_lucro, use_container_width=True)
+                with tracer.span("view.plot", view="dashboard_analitico", chart=fig_lucro.layout.title.text):
+                    st.plotly_chart(fig_lucro, use_container_width=True)
 
             # Tabela enxuta (benchmark)
             st.dataframe(
@@ -206,7 +222,7 @@ def render() -> None:
             )
 
     # ---------------- Sazonalidade ----------------
-    with tab4:
+    def sazonalidade() -> None:
         pnl = pd.DataFrame(repo.pnl_mensal(dt_ini, dt_fim))
         if pnl.empty:
             st.info("Sem dados no período.")
@@ -216,13 +232,22 @@ def render() -> None:
 
             last12 = pnl.tail(12)
             fig = px.line(last12, x="MES", y="RECEITA_TOTAL", title="Vendas - últimos 12 meses (receita total)")
-            st.plotly_chart(fig, use_container_width=True)
+            with tracer.span("view.plot", view="dashboard_analitico", chart=fig.layout.title.text):
+                st.plotly_chart(fig, use_container_width=True)
 
             pnl["ANO"] = pnl["MES"].dt.year
             pnl["MESNUM"] = pnl["MES"].dt.month
             if pnl["ANO"].nunique() >= 2:
                 yoy = pnl.groupby(["ANO", "MESNUM"], as_index=False)["RECEITA_TOTAL"].sum()
                 fig2 = px.line(yoy, x="MESNUM", y="RECEITA_TOTAL", color="ANO", title="Comparação vs ano anterior (receita por mês)")
-                st.plotly_chart(fig2, use_container_width=True)
+                with tracer.span("view.plot", view="dashboard_analitico", chart=fig2.layout.title.text):
+                    st.plotly_chart(fig2, use_container_width=True)
 
             st.info("Previsão próximo mês: pode ser feita com regressão linear simples na série mensal (próximo passo), mas não há modelo pronto no dataset.")
+
+    lazy_sections("dashboard_analitico", {
+        "Rentabilidade": rentabilidade,
+        "Estoque": estoque,
+        "Performance Filial": performance_filial,
+        "Sazonalidade": sazonalidade,
+    })
@@ -7,7 +7,12 @@ import pandas as pd
 import streamlit as st
 import plotly.express as px
 
-from repositories.dashboard_preditivo_repository import DashboardPreditivoRepository
+from repositories.dashboard_preditivo_repository import OBSOLETAS_PAGE, DashboardPreditivoRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from utils.tracing import tracer
+from views.charts import plot, reduce_series
+from views.lazy_sections import lazy_sections
+from views.paged_table import paged_table
 
 
 def _make_daily_series(rows: list[dict], dt_ini: date, dt_fim: date) -> pd.DataFrame:
@@ -78,8 +83,8 @@ def _plot_forecast(title: str, hist: pd.DataFrame, forecast: pd.DataFrame) -> No
     fc = forecast.copy()
     fc["DIA"] = future_days
 
-    # junta para plot
-    hist_plot = hist.copy()
+    # junta para plot (histórico longo reduzido ao orçamento de pontos; o forecast já foi calculado)
+    hist_plot = reduce_series(hist, "DIA", "Y")
     hist_plot["TIPO"] = "Histórico"
     hist_plot = hist_plot.rename(columns={"Y": "VALOR"})
 
@@ -89,7 +94,7 @@ def _plot_forecast(title: str, hist: pd.DataFrame, forecast: pd.DataFrame) -> No
 
     df_plot = pd.concat([hist_plot[["DIA", "VALOR", "TIPO"]], fc_plot], ignore_index=True)
     fig = px.line(df_plot, x="DIA", y="VALOR", color="TIPO", title=title)
-    st.plotly_chart(fig, use_container_width=True)
+    plot(fig, "dashboard_preditivo", points=(len(hist) + len(fc_plot), len(df_plot)))
 
     # intervalos como tabela (MVP)
     ci = fc[["DIA", "yhat", "yhat_80_lo", "yhat_80_hi", "yhat_95_lo", "yhat_95_hi"]].tail(15)
@@ -103,17 +108,25 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Configuração")
-        dt_ini = st.date_input("Início histórico", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Fim histórico", value=date(2025, 12, 31))
-        ma_window = st.slider("Janela média móvel (dias)", 3, 30, 7, 1)
-        horizon = st.selectbox("Horizonte", options=[30, 60, 90], index=0)
+        dt_ini = st.date_input("Início histórico", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Fim histórico", value=DEFAULT_DT_FIM)
         dias_media_peca = st.selectbox("Janela consumo peças (dias)", options=[14, 30, 60], index=1)
 
     repo = DashboardPreditivoRepository()
-    tab1, tab2, tab3 = st.tabs(["Forecast Vendas", "Forecast Estoque", "Alertas & Recomendações"])
 
     # ---------- Forecast Vendas ----------
-    with tab1:
+    def forecast_vendas() -> None:
+        # Parâmetros do forecast só afetam esta seção (rerun parcial; queries vêm do cache)
+        p1, p2 = st.columns(2)
+        ma_window = p1.slider("Janela média móvel (dias)", 3, 30, 7, 1)
+        horizon = p2.selectbox("Horizonte", options=[30, 60, 90], index=0)
+
+        res = repo.fan_out({
+            "veiculos": lambda: repo.serie_diaria_veiculos_unidades(dt_ini, dt_fim),
+            "pecas": lambda: repo.serie_diaria_pecas_receita(dt_ini, dt_fim),
+            "servicos": lambda: repo.serie_diaria_servicos_receita(dt_ini, dt_fim),
+        })
+
         c1, c2, c3 = st.columns(3)
         c1.metric("Horizonte (dias)", str(horizon), border=True)
         c2.metric("IC 80%", "P10–P90", border=True)
@@ -121,26 +134,32 @@ def render() -> None:
 
         # Veículos (unidades)
         st.markdown("### Veículos — unidades/dia")
-        s1 = _make_daily_series(repo.serie_diaria_veiculos_unidades(dt_ini, dt_fim), dt_ini, dt_fim)
+        s1 = _make_daily_series(res["veiculos"], dt_ini, dt_fim)
         fc1 = _forecast_ma_with_ci(s1, horizon=horizon, ma_window=ma_window)
         _plot_forecast("Forecast veículos (unidades/dia)", s1.rename(columns={"Y": "Y"}), fc1)
 
         # Peças (receita)
         st.markdown("### Peças — receita/dia")
-        s2 = _make_daily_series(repo.serie_diaria_pecas_receita(dt_ini, dt_fim), dt_ini, dt_fim)
+        s2 = _make_daily_series(res["pecas"], dt_ini, dt_fim)
         fc2 = _forecast_ma_with_ci(s2, horizon=horizon, ma_window=ma_window)
         _plot_forecast("Forecast peças (receita/dia)", s2.rename(columns={"Y": "Y"}), fc2)
 
         # Serviços (receita)
         st.markdown("### Serviços — receita/dia")
-        s3 = _make_daily_series(repo.serie_diaria_servicos_receita(dt_ini, dt_fim), dt_ini, dt_fim)
+        s3 = _make_daily_series(res["servicos"], dt_ini, dt_fim)
         fc3 = _forecast_ma_with_ci(s3, horizon=horizon, ma_window=ma_window)
         _plot_forecast("Forecast serviços (receita/dia)", s3.rename(columns={"Y": "Y"}), fc3)
 
     # ---------- Forecast Estoque ----------
-    with tab2:
+    def forecast_estoque() -> None:
+        # 1ª página das obsoletas junto com o risco: a tabela paginada abaixo sai do cache
+        res = repo.fan_out({
+            "risco": lambda: repo.risco_falta_pecas_30d(dias_media=int(dias_media_peca), top_n=30),
+            "obsoletas": lambda: repo.pecas_obsoletas_pagina(),
+        })
+
         st.markdown("### Peças com risco de falta (próx. 30 dias)")
-        risk = pd.DataFrame(repo.risco_falta_pecas_30d(dias_media=int(dias_media_peca), top_n=30))
+        risk = pd.DataFrame(res["risco"])
         if risk.empty:
             st.info("Nenhuma peça com risco de falta pelo critério atual.")
         else:
@@ -151,25 +170,30 @@ def render() -> None:
                 orientation="h",
                 title="Dias de cobertura estimados (quanto menor, pior)",
             )
-            st.plotly_chart(fig, use_container_width=True)
+            with tracer.span("view.plot", view="dashboard_preditivo", chart=fig.layout.title.text):
+                st.plotly_chart(fig, use_container_width=True)
             st.dataframe(risk, use_container_width=True, hide_index=True)
 
         st.markdown("### Peças obsoletas / paradas")
-        obs = pd.DataFrame(repo.pecas_obsoletas(top_n=50))
-        if obs.empty:
-            st.info("Nenhuma peça marcada como obsoleta (flag) ou com tempo obsoleto alto.")
-        else:
-            st.dataframe(obs, use_container_width=True, hide_index=True)
+        # Estoque obsoleto inteiro, uma página por vez (antes: só as 50 mais antigas)
+        paged_table(
+            "preditivo_obsoletas", OBSOLETAS_PAGE,
+            fetch=lambda sort, desc, after, busca: repo.pecas_obsoletas_pagina(
+                sort=sort, descending=desc, after=after, busca=busca),
+            prefetch=repo.prefetch,
+        )
 
     # ---------- Alertas & Recomendações ----------
-    with tab3:
+    def alertas() -> None:
         st.markdown("### Alertas inteligentes (heurísticos)")
         st.write("- Peça pode faltar em X dias: baseado em dias de cobertura (estoque / consumo recente).")
         st.write("- Peça obsoleta: baseado em flag/tempo obsoleto/dias sem venda.")
         st.write("- Meta de modelo/filial/vendedor: precisa de metas (não existem no banco), pode ser input manual.")
 
         st.markdown("### Recomendações (MVP)")
-        if 'risk' in locals() and not risk.empty:
+        # Mesma chamada da seção de estoque (cache): não depende da outra seção ter rodado
+        risk = pd.DataFrame(repo.risco_falta_pecas_30d(dias_media=int(dias_media_peca), top_n=30))
+        if not risk.empty:
             st.write("Aumentar/Manter/Reduzir (heurística):")
             rec = risk.copy()
             rec["RECOMENDACAO"] = rec["DIAS_COBERTURA"].apply(
@@ -179,3 +203,9 @@ def render() -> None:
                          use_container_width=True, hide_index=True)
         else:
             st.info("Sem recomendações de reposição no momento (nenhum risco detectado).")
+
+    lazy_sections("dashboard_preditivo", {
+        "Forecast Vendas": forecast_vendas,
+        "Forecast Estoque": forecast_estoque,
+        "Alertas & Recomendações": alertas,
+    })
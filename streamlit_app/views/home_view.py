@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-from datetime import date
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
 from repositories.kpi_repository import KpiRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from views.charts import plot, reduce_series
 
 
 def _fmt_money(x) -> str:
@@ -28,12 +29,16 @@ def render() -> None:
 
     c1, c2 = st.columns(2)
     with c1:
-        dt_ini = st.date_input("Data inicial", value=date(2025, 1, 1))
+        dt_ini = st.date_input("Data inicial", value=DEFAULT_DT_INI)
     with c2:
-        dt_fim = st.date_input("Data final", value=date(2025, 12, 31))
+        dt_fim = st.date_input("Data final", value=DEFAULT_DT_FIM)
 
     repo = KpiRepository()
-    kpis = repo.kpis_gerais_periodo(dt_ini, dt_fim)
+    res = repo.fan_out({
+        "kpis": lambda: repo.kpis_gerais_periodo(dt_ini, dt_fim),
+        "receita_mensal": lambda: repo.receita_mensal_total(dt_ini, dt_fim),
+    })
+    kpis = res["kpis"]
 
     receita_total = kpis.get("RECEITA_TOTAL", 0) or 0
     lucro_total = kpis.get("LUCRO_TOTAL", 0) or 0
@@ -65,9 +70,10 @@ def render() -> None:
     v3.metric("Serviços - Receita", _fmt_money(rs), border=True)
     v3.metric("Serviços - Margem", _fmt_pct((ls / rs)) if rs else "-", border=True)
 
-    df = pd.DataFrame(repo.receita_mensal_total(dt_ini, dt_fim))
+    df = pd.DataFrame(res["receita_mensal"])
     if not df.empty:
-        fig = px.line(df, x="MES", y="RECEITA_TOTAL", title="Receita total por mês")
-        st.plotly_chart(fig, use_container_width=True)
+        plot_df = reduce_series(df, "MES", "RECEITA_TOTAL")
+        fig = px.line(plot_df, x="MES", y="RECEITA_TOTAL", title="Receita total por mês")
+        plot(fig, "home", points=(len(df), len(plot_df)))
     else:
         st.info("Sem dados no período selecionado.")
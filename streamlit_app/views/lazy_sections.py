@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Callable, Dict
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from utils.query_telemetry import telemetry
+from utils.tracing import tracer
+
+
+def _section(view: str, label: str, draw: Callable[[], None]) -> Callable[[], None]:
+    @wraps(draw)
+    def run() -> None:
+        ctx = get_script_run_ctx(suppress_warning=True)
+        if ctx is not None and ctx.fragment_ids_this_run:
+            # Rerun só do fragment: app.py não roda, então o render (telemetria)
+            # e o span da seção são abertos aqui
+            telemetry.begin_render(f"{view}:{label}")
+        with tracer.span("view.section", view=view, section=label):
+            draw()
+    return run
+
+
+def lazy_sections(view: str, sections: Dict[str, Callable[[], None]]) -> str:
+    """
+    Substitui st.tabs por seções sob demanda.
+
+    st.tabs executa o corpo de todas as abas a cada rerun (queries e gráficos
+    das abas escondidas inclusive). Aqui um seletor horizontal escolhe a seção
+    e só ela roda. Cada seção vira um st.fragment: widgets dentro dela
+    re-executam apenas a própria seção (widgets da sidebar continuam fazendo
+    rerun completo, e não podem ficar dentro da seção). Num rerun só do
+    fragment a seção abre o próprio render na telemetria, para as queries não
+    ficarem no render anterior da página.
+
+    Args:
+        view: Nome da view (chave do seletor e atributo do span)
+        sections: {rótulo: função sem argumentos que desenha a seção}
+
+    Returns:
+        Rótulo da seção renderizada
+    """
+    labels = list(sections)
+    selected = st.radio(
+        "Seção",
+        options=labels,
+        horizontal=True,
+        key=f"{view}_section",
+        label_visibility="collapsed",
+    )
+    st.fragment(_section(view, selected, sections[selected]))()
+    return selected
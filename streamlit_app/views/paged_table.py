@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+import streamlit as st
+
+from repositories.pagination import Page, PageSpec
+from utils.tracing import tracer
+
+# fetch(sort, descending, after, busca) -> Page: método *_pagina com os filtros da view já aplicados
+Fetch = Callable[[str, bool, Optional[tuple], Optional[str]], Page]
+
+
+def paged_table(
+    key: str,
+    spec: PageSpec,
+    fetch: Fetch,
+    prefetch: Callable[[Callable[[], Page]], Future],
+    token: Any = None,
+    columns: Optional[Sequence[str]] = None,
+    column_config: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Tabela paginada no banco (repositories.pagination): ordenação, busca e
+    Anterior/Próxima buscam só a página pedida, nunca o resultado inteiro.
+
+    Roda como st.fragment: navegar re-executa só a tabela. Enquanto a página
+    atual é exibida, a próxima já é buscada em segundo plano (repo.prefetch);
+    o clique em "Próxima" usa esse resultado.
+
+    Args:
+        key: Prefixo das chaves de widget/session_state (único na view)
+        spec: PageSpec do método (opções de ordenação e busca)
+        fetch: lambda sort, descending, after, busca: repo.metodo_pagina(..., sort=sort, ...)
+        prefetch: repo.prefetch
+        token: Filtros externos (sidebar); mudou => volta para a 1ª página
+        columns: Colunas exibidas (padrão: todas menos as chaves do cursor que não são de busca)
+        column_config: Repassado ao st.dataframe
+    """
+    st.fragment(lambda: _render(key, spec, fetch, prefetch, token, columns, column_config))()
+
+
+def _render(key: str, spec: PageSpec, fetch: Fetch, prefetch: Callable[[Callable[[], Page]], Future],
+            token: Any, columns: Optional[Sequence[str]], column_config: Optional[Dict[str, Any]]) -> None:
+    labels = {col.label: col.name for col in spec.sorts}
+    a, b, c = st.columns([2, 1, 3])
+    sort = labels[a.selectbox("Ordenar por", options=list(labels), key=f"{key}_sort")]
+    descending = b.toggle("Decrescente", value=spec.descending, key=f"{key}_desc")
+    busca = c.text_input("Buscar", key=f"{key}_busca", disabled=not spec.search,
+                         placeholder=", ".join(spec.search).lower()).strip() or None
+
+    # Cursores das páginas já vistas (None = 1ª); recomeça quando filtros/ordem/busca mudam
+    query = (token, sort, descending, busca)
+    state = st.session_state.get(f"{key}_pages")
+    if state is None or state["query"] != query:
+        state = {"query": query, "stack": [None], "next": None}
+        st.session_state[f"{key}_pages"] = state
+    after = state["stack"][-1]
+
+    with tracer.span("view.page", view=key, page=len(state["stack"]), sort=sort):
+        page = _take_prefetched(state, after)
+        if page is None:
+            page = fetch(sort, descending, after, busca)
+
+    df = pd.DataFrame(page.rows)
+    if df.empty:
+        st.info("Nenhuma linha para os filtros/busca atuais.")
+    else:
+        hidden = set(spec.key) - set(spec.search)
+        shown: List[str] = list(columns) if columns else [c for c in df.columns if c not in hidden]
+        st.dataframe(df[[c for c in shown if c in df.columns]], use_container_width=True,
+                     hide_index=True, column_config=column_config)
+
+    prev_col, info_col, next_col = st.columns([1, 4, 1])
+    prev_col.button("◀ Anterior", key=f"{key}_prev", disabled=len(state["stack"]) == 1,
+                    on_click=lambda: state["stack"].pop())
+    info_col.caption(f"Página {len(state['stack'])} · {len(page.rows)} linhas")
+    next_col.button("Próxima ▶", key=f"{key}_next", disabled=not page.has_more,
+                    on_click=lambda: state["stack"].append(page.next_cursor))
+
+    # Próxima página em segundo plano enquanto esta é lida
+    if page.has_more and (state["next"] is None or state["next"][0] != page.next_cursor):
+        cursor = page.next_cursor
+        state["next"] = (cursor, prefetch(lambda: fetch(sort, descending, cursor, busca)))
+
+
+def _take_prefetched(state: Dict[str, Any], after: Optional[tuple]) -> Optional[Page]:
+    """Resultado da busca antecipada se ela foi para este cursor (falha => busca normal)."""
+    pending = state.get("next")
+    if after is None or pending is None or pending[0] != after:
+        return None
+    state["next"] = None
+    try:
+        return pending[1].result()
+    except Exception:
+        return None
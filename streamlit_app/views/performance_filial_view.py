@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from datetime import date
-
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
 from repositories.performance_filial_repository import PerformanceFilialRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, PERFORMANCE_TOP_N
+from utils.tracing import tracer
 
 
 def _fmt_money(v) -> str:
@@ -32,9 +32,9 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Filtros")
-        dt_ini = st.date_input("Data inicial", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Data final", value=date(2025, 12, 31))
-        top_n = st.slider("Top N filiais", min_value=5, max_value=100, value=30, step=5)
+        dt_ini = st.date_input("Data inicial", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Data final", value=DEFAULT_DT_FIM)
+        top_n = st.slider("Top N filiais", min_value=5, max_value=100, value=PERFORMANCE_TOP_N, step=5)
 
     repo = PerformanceFilialRepository()
     rows = repo.performance_por_filial(dt_ini, dt_fim, top_n=top_n)
@@ -66,7 +66,8 @@ def render() -> None:
         orientation="h",
         title="ROI por filial (lucro total / capital em estoque)",
     )
-    st.plotly_chart(fig, use_container_width=True)  # [web:144]
+    with tracer.span("view.plot", view="performance_filial", chart=fig.layout.title.text):
+        st.plotly_chart(fig, use_container_width=True)  # [web:144]
 
     # --- Benchmarking: comparar duas filiais ---
     st.divider()
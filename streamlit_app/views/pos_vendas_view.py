@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from datetime import date
-
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
 from repositories.pos_vendas_repository import PosVendaRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM, POS_VENDAS_TOP_N
+from utils.tracing import tracer
+from views.lazy_sections import lazy_sections
 
 
 def _fmt_money(x) -> str:
@@ -32,16 +33,14 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Filtros")
-        dt_ini = st.date_input("Data inicial", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Data final", value=date(2025, 12, 31))
-        top_n = st.slider("Top N", min_value=5, max_value=30, value=15, step=1)
+        dt_ini = st.date_input("Data inicial", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Data final", value=DEFAULT_DT_FIM)
+        top_n = st.slider("Top N", min_value=5, max_value=30, value=POS_VENDAS_TOP_N, step=1)
 
     repo = PosVendaRepository()
 
-    tab1, tab2, tab3 = st.tabs(["Ticket médio", "Departamento", "Tipo de serviço"])  # [web:148]
-
     # -------- Ticket médio --------
-    with tab1:
+    def ticket_medio() -> None:
         k = repo.kpis_servicos(dt_ini, dt_fim)
 
         a, b, c, d = st.columns(4)
@@ -55,7 +54,7 @@ def render() -> None:
         )
 
     # -------- Departamento --------
-    with tab2:
+    def departamento() -> None:
         rows = repo.por_departamento(dt_ini, dt_fim, top_n=top_n)
         df = pd.DataFrame(rows)
 
@@ -70,7 +69,8 @@ def render() -> None:
                 orientation="h",
                 title="Receita por departamento (Top N)",
             )  # [web:144]
-            st.plotly_chart(fig, use_container_width=True)  # [web:87]
+            with tracer.span("view.plot", view="pos_vendas", chart=fig.layout.title.text):
+                st.plotly_chart(fig, use_container_width=True)  # [web:87]
 
             # Tabela com margem/volume
             st.dataframe(
@@ -82,7 +82,7 @@ def render() -> None:
             st.info("Limitação: 'dias de espera' não existe nas colunas do BRZ_HIST_SERVICOS (sem agendamento/conclusão).")
 
     # -------- Tipo de serviço --------
-    with tab3:
+    def tipo_servico() -> None:
         rows = repo.por_categoria_servico(dt_ini, dt_fim, top_n=top_n)
         df = pd.DataFrame(rows)
 
@@ -96,7 +96,8 @@ def render() -> None:
                 orientation="h",
                 title="Serviços mais lucrativos por categoria (Top N)",
             )  # [web:144]
-            st.plotly_chart(fig, use_container_width=True)  # [web:87]
+            with tracer.span("view.plot", view="pos_vendas", chart=fig.layout.title.text):
+                st.plotly_chart(fig, use_container_width=True)  # [web:87]
 
             st.dataframe(
                 df[["CATEGORIA_SERVICO", "QTDE_SERVICOS", "RECEITA", "LUCRO", "MARGEM"]],
@@ -107,3 +108,9 @@ def render() -> None:
             st.info(
                 "Limitação: 'Receita x Peças Utilizadas' não é calculável pois não há relacionamento explícito de peças usadas em cada serviço no BRZ atual."
             )
+
+    lazy_sections("pos_vendas", {
+        "Ticket médio": ticket_medio,
+        "Departamento": departamento,
+        "Tipo de serviço": tipo_servico,
+    })
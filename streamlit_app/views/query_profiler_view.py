@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pandas as pd
+import streamlit as st
+
+from utils.query_telemetry import telemetry
+
+
+PROFILER_COLS = [
+    "caller", "wall_ms", "execute_ms", "fetch_ms",
+    "rows", "round_trips", "bytes", "cache_tier", "age_s", "endpoint", "sql_id",
+]
+
+
+def _fmt_age(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def render_freshness(container, render_id: int) -> None:
+    """Idade do dado mais antigo exibido no render (e se há refresh em background)."""
+    records = telemetry.records(render_id)
+    ages = [r.age_s for r in records if r.age_s is not None]
+    if not ages:
+        return
+
+    stale = sum(1 for r in records if r.cache_tier == "stale")
+    msg = f"🕒 Dados de até {_fmt_age(max(ages))} atrás"
+    if stale:
+        msg += f" · 🔄 {stale} consulta(s) atualizando em segundo plano"
+    with container:
+        st.caption(msg)
+
+
+def render_panel(container, render_id: int) -> None:
+    """
+    Painel "Query profiler": queries do render atual ordenadas por custo (wall_ms).
+    Recebe um container já posicionado na sidebar, preenchido após a página renderizar.
+    """
+    records = telemetry.records(render_id)
+
+    with container:
+        st.subheader("Query profiler")
+        if not records:
+            st.caption("Nenhuma query executada neste render.")
+            return
+
+        df = pd.DataFrame([r.as_dict() for r in records])
+        df = df.sort_values("wall_ms", ascending=False)
+
+        total_ms = df["wall_ms"].sum()
+        hits = int(df["cache_hit"].sum())
+        st.caption(f"{len(df)} queries | {total_ms:,.0f} ms | cache hit {hits}/{len(df)}")
+
+        st.dataframe(
+            df[PROFILER_COLS].round({"wall_ms": 1, "execute_ms": 1, "fetch_ms": 1, "age_s": 0}),
+            use_container_width=True,
+            hide_index=True,
+        )
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from datetime import date
-
 import pandas as pd
 import streamlit as st
 import plotly.express as px
 
-from repositories.rentabilidade_integrada_repository import RentabilidadeIntegradaRepository
+from repositories.rentabilidade_integrada_repository import MARGEM_PAGE, RentabilidadeIntegradaRepository
+from repositories.defaults import DEFAULT_DT_INI, DEFAULT_DT_FIM
+from utils.tracing import tracer
+from views.paged_table import paged_table
 
 
 def _fmt_money(x) -> str:
@@ -32,8 +33,8 @@ def render() -> None:
 
     with st.sidebar:
         st.subheader("Filtros")
-        dt_ini = st.date_input("Data inicial (venda veículo)", value=date(2025, 1, 1))
-        dt_fim = st.date_input("Data final (venda veículo)", value=date(2025, 12, 31))
+        dt_ini = st.date_input("Data inicial (venda veículo)", value=DEFAULT_DT_INI)
+        dt_fim = st.date_input("Data final (venda veículo)", value=DEFAULT_DT_FIM)
         janela = st.number_input("Janela pós-venda (dias)", min_value=0, max_value=180, value=30, step=5)
         limit = st.number_input("Limite de registros", min_value=50, max_value=2000, value=200, step=50)
 
@@ -57,12 +58,9 @@ def render() -> None:
 
     st.divider()
 
-    # Ordenação para “insight”: veículos com baixa margem na venda mas alta margem integrada
-    df_insight = df.copy()
-    df_insight["DELTA_MARGEM"] = (df_insight["MARGEM_INTEGRADA"].fillna(0) - df_insight["MARGEM_VEICULO"].fillna(0))
-    df_insight = df_insight.sort_values(["DELTA_MARGEM", "RECEITA_VEICULO"], ascending=[False, False])
-
-    st.caption("Top casos onde pós-venda melhora a margem (Δ = integrada - venda veículo)")
+    # Ordenação para “insight”: veículos com baixa margem na venda mas alta margem integrada.
+    # Todas as vendas do período (não só o limite da amostra), ordenadas e paginadas no banco
+    st.caption("Casos onde pós-venda melhora a margem (Δ = integrada - venda veículo)")
     show_cols = [
         "DT_VENDA", "NOME_FILIAL", "NOME_COMPRADOR", "MARCA_VEICULO", "MODELO_VEICULO",
         "RECEITA_VEICULO", "MARGEM_VEICULO",
@@ -71,10 +69,13 @@ def render() -> None:
         "DELTA_MARGEM"
     ]
 
-    st.dataframe(
-        df_insight[show_cols],
-        use_container_width=True,
-        hide_index=True
+    paged_table(
+        "rentabilidade_margem", MARGEM_PAGE,
+        fetch=lambda sort, desc, after, busca: repo.margem_integrada_pagina(
+            dt_ini, dt_fim, janela_dias=int(janela), sort=sort, descending=desc, after=after, busca=busca),
+        prefetch=repo.prefetch,
+        token=(dt_ini, dt_fim, int(janela)),
+        columns=show_cols,
     )
 
     st.divider()
@@ -103,7 +104,8 @@ def render() -> None:
             orientation="h",
             title="Top modelos por margem integrada",
         )
-        st.plotly_chart(fig, use_container_width=True)  # [web:87]
+        with tracer.span("view.plot", view="rentabilidade_integrada", chart=fig.layout.title.text):
+            st.plotly_chart(fig, use_container_width=True)  # [web:87]
 
         st.dataframe(
             df_rank[["MARCA_VEICULO","MODELO_VEICULO","QTD_VENDAS","RECEITA_INTEGRADA","LUCRO_INTEGRADO","MARGEM_INTEGRADA"]],
@@ -130,7 +132,8 @@ def render() -> None:
             barmode="group",
             title="Capital imobilizado vs entradas no período",
         )
-        st.plotly_chart(fig2, use_container_width=True)  # [web:87]
+        with tracer.span("view.plot", view="rentabilidade_integrada", chart=fig2.layout.title.text):
+            st.plotly_chart(fig2, use_container_width=True)  # [web:87]
 
         st.dataframe(df_fc, use_container_width=True, hide_index=True)
 """
\ No newline at end of file
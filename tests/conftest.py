@@ -0,0 +1,12 @@
+"""
+Testes das funções puras (sem Oracle): raiz do projeto e streamlit_app no path,
+como os scripts de mains/ e o app fazem.
+"""
+
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for path in (ROOT, os.path.join(ROOT, 'streamlit_app')):
+    if path not in sys.path:
+        sys.path.append(path)
@@ -0,0 +1,53 @@
+from utils.customer_key import (
+    HASH_COLUMN, KEY_COLUMN, customer_columns, customer_hash, customer_key, fix_mojibake, oracle_records,
+)
+
+
+def test_fix_mojibake():
+    assert fix_mojibake("ANDRÃ‰") == "ANDRÉ"
+    assert fix_mojibake("JoÃ£o") == "João"
+    # Texto correto (ou que não re-decodifica) volta como está
+    assert fix_mojibake("José") == "José"
+    assert fix_mojibake("MARIA") == "MARIA"
+    assert fix_mojibake("") == ""
+    assert fix_mojibake(None) is None
+
+
+def test_customer_key_unifica_acentos_espacos_e_mojibake():
+    esperado = "JOSE SILVA"
+    for nome in ("JOSÉ  SILVA", " jose silva ", "JOSÃ‰ SILVA", "José\tSilva"):
+        assert customer_key(nome) == esperado
+
+
+def test_customer_key_vazio():
+    assert customer_key(None) is None
+    assert customer_key("   ") is None
+
+
+def test_customer_hash_estavel_e_em_63_bits():
+    h = customer_hash("JOSE SILVA")
+    assert h == customer_hash("JOSE SILVA")
+    assert 0 <= h < 2 ** 63
+    assert h != customer_hash("JOSE SILVA JR")
+    assert customer_hash(None) is None
+    assert customer_hash("") is None
+
+
+def test_customer_columns():
+    cols = customer_columns("José Silva")
+    assert cols == {KEY_COLUMN: "JOSE SILVA", HASH_COLUMN: customer_hash("JOSE SILVA")}
+
+
+class _Connector:
+    def __init__(self, columns):
+        self.columns = columns
+
+    def table_columns(self, table_name):
+        return self.columns
+
+
+def test_oracle_records_tira_colunas_ausentes_antes_da_v003():
+    records = [{"NOME_CLIENTE": "A", **customer_columns("A")}]
+    assert oracle_records(_Connector({"NOME_CLIENTE", KEY_COLUMN, HASH_COLUMN}), "BRZ_HIST_SERVICOS", records) is records
+    assert oracle_records(_Connector({"NOME_CLIENTE"}), "BRZ_HIST_SERVICOS", records) == [{"NOME_CLIENTE": "A"}]
+    assert KEY_COLUMN in records[0]
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.downsampling import downsample, lttb_indices, minmax_indices
+
+
+def test_lttb_mantem_pontas_e_tamanho():
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 20)
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_preserva_pico_isolado():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[250] = 100.0
+    assert 250 in lttb_indices(x, y, 20)
+
+
+@pytest.mark.parametrize("n_out", [2, 10, 50])
+def test_lttb_sem_reducao(n_out):
+    x = np.arange(10, dtype=float)
+    assert list(lttb_indices(x, x, n_out)) == list(range(10))
+
+
+def test_minmax_mantem_extremos():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=2000)
+    idx = minmax_indices(y, 100)
+    assert len(idx) <= 100
+    assert idx[0] == 0 and idx[-1] == 1999
+    assert np.all(np.diff(idx) > 0)
+    assert int(np.argmin(y)) in idx and int(np.argmax(y)) in idx
+
+
+def test_minmax_sem_reducao():
+    y = np.arange(10, dtype=float)
+    assert list(minmax_indices(y, 3)) == list(range(10))
+    assert list(minmax_indices(y, 20)) == list(range(10))
+
+
+def test_downsample_dataframe_com_datas():
+    df = pd.DataFrame({
+        "DT": pd.date_range("2020-01-01", periods=3000, freq="D").date,
+        "VALOR": np.arange(3000, dtype=float),
+    }).iloc[::-1]
+    out, reduced = downsample(df, "DT", "VALOR", 300)
+    assert reduced
+    assert len(out) == 300
+    assert out["DT"].is_monotonic_increasing
+    assert out["DT"].iloc[0] == df["DT"].min() and out["DT"].iloc[-1] == df["DT"].max()
+
+
+def test_downsample_abaixo_do_orcamento_e_metodo_invalido():
+    df = pd.DataFrame({"X": range(10), "Y": range(10)})
+    out, reduced = downsample(df, "X", "Y", 100)
+    assert out is df and not reduced
+    with pytest.raises(ValueError):
+        downsample(df, "X", "Y", 5, method="media")
@@ -0,0 +1,21 @@
+from repositories.base_repo import BaseRepository
+
+
+def test_split_grouping_sets_separa_por_rotulo_e_remove_a_coluna():
+    rows = [
+        {"GRUPO": "DEPARTAMENTO", "NOME": "PECAS", "TOTAL": 10},
+        {"GRUPO": "FILIAL", "NOME": "F1", "TOTAL": 7},
+        {"GRUPO": "DEPARTAMENTO", "NOME": "SERVICOS", "TOTAL": 3},
+    ]
+    out = BaseRepository.split_grouping_sets(rows)
+    assert out == {
+        "DEPARTAMENTO": [{"NOME": "PECAS", "TOTAL": 10}, {"NOME": "SERVICOS", "TOTAL": 3}],
+        "FILIAL": [{"NOME": "F1", "TOTAL": 7}],
+    }
+    # As linhas de entrada não são alteradas
+    assert rows[0]["GRUPO"] == "DEPARTAMENTO"
+
+
+def test_split_grouping_sets_coluna_customizada_e_vazio():
+    assert BaseRepository.split_grouping_sets([{"G": "A", "X": 1}], column="G") == {"A": [{"X": 1}]}
+    assert BaseRepository.split_grouping_sets([]) == {}
@@ -0,0 +1,71 @@
+import pytest
+
+from repositories.pagination import (
+    SORT_COLUMN, PageSpec, SortColumn, escape_like, keyset_sql, page_params, to_page,
+)
+
+SPEC = PageSpec(
+    sorts=(SortColumn("VALOR", "Valor"), SortColumn("NOME", "Nome", null="' '")),
+    key=("ID",),
+    search=("NOME", "CIDADE"),
+)
+BASE = "SELECT ID, NOME, CIDADE, VALOR FROM T"
+
+
+def _norm(sql):
+    return " ".join(sql.split())
+
+
+def test_keyset_sql_primeira_pagina():
+    sql = _norm(keyset_sql(BASE, SPEC, "VALOR", True, False, False, 50))
+    assert "NVL(q.VALOR, -1E30) AS PG_SORT" in sql
+    assert "WHERE" not in sql
+    assert sql.endswith("ORDER BY PG_SORT DESC, ID DESC FETCH FIRST 51 ROWS ONLY")
+
+
+def test_keyset_sql_cursor_e_busca():
+    sql = _norm(keyset_sql(BASE, SPEC, "NOME", False, True, True, 10))
+    assert "NVL(q.NOME, ' ') AS PG_SORT" in sql
+    assert "(UPPER(NOME) LIKE :pg_busca ESCAPE '\\' OR UPPER(CIDADE) LIKE :pg_busca ESCAPE '\\')" in sql
+    assert "(PG_SORT > :pg_c0 OR (PG_SORT = :pg_c0 AND ID > :pg_c1))" in sql
+    assert "ORDER BY PG_SORT ASC, ID ASC FETCH FIRST 11 ROWS ONLY" in sql
+
+
+def test_keyset_sql_ordenacao_desconhecida_usa_a_padrao():
+    assert keyset_sql(BASE, SPEC, "DROP", True, False, False, 5) == keyset_sql(BASE, SPEC, "VALOR", True, False, False, 5)
+
+
+def test_page_params():
+    assert page_params(SPEC, None, None) == {}
+    assert page_params(SPEC, (10, 7), " ana ") == {"pg_c0": 10, "pg_c1": 7, "pg_busca": "%ANA%"}
+    assert page_params(PageSpec(SPEC.sorts, SPEC.key), None, "ana") == {}
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("50%", "50\\%"),
+    ("A_B", "A\\_B"),
+    ("C:\\X", "C:\\\\X"),
+    ("SEM CURINGA", "SEM CURINGA"),
+])
+def test_escape_like(texto, esperado):
+    assert escape_like(texto) == esperado
+
+
+def test_to_page_com_proxima_pagina():
+    rows = [{"ID": i, SORT_COLUMN: 100 - i} for i in range(4)]
+    page = to_page(rows, SPEC, "VALOR", True, 3)
+    assert [r["ID"] for r in page.rows] == [0, 1, 2]
+    assert all(SORT_COLUMN not in r for r in page.rows)
+    assert page.next_cursor == (98, 2)
+    assert page.has_more
+    # As linhas de entrada não são alteradas
+    assert SORT_COLUMN in rows[0]
+
+
+def test_to_page_ultima_pagina():
+    page = to_page([{"ID": 1, SORT_COLUMN: 5}], SPEC, "XX", False, 3)
+    assert page.rows == [{"ID": 1}]
+    assert page.next_cursor is None
+    assert not page.has_more
+    assert page.sort == "VALOR"
+    assert page.descending is False
@@ -0,0 +1,71 @@
+import datetime as dt
+import os
+from decimal import Decimal
+
+import pytest
+
+from utils.result_cache import DiskResultCache, ResultCache, create_result_cache, result_key
+
+
+def test_result_key_ignora_espacos_e_ordem_dos_params():
+    a = result_key("SELECT 1\n  FROM DUAL", {"a": 1, "b": 2}, (("BRZ", 3),))
+    b = result_key("SELECT 1 FROM DUAL", {"b": 2, "a": 1}, (("BRZ", 3),))
+    assert a == b
+    assert len(a) == 40
+
+
+def test_result_key_muda_com_params_e_versao():
+    base = result_key("SELECT 1 FROM DUAL", {"a": 1}, (("BRZ", 3),))
+    assert result_key("SELECT 1 FROM DUAL", {"a": 2}, (("BRZ", 3),)) != base
+    assert result_key("SELECT 1 FROM DUAL", {"a": 1}, (("BRZ", 4),)) != base
+    # repr distingue 1 de 1.0 e de "1"
+    assert result_key("SELECT 1 FROM DUAL", {"a": "1"}, (("BRZ", 3),)) != base
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskResultCache(str(tmp_path / "results"), max_mb=1)
+
+
+def test_round_trip_arrow(cache):
+    rows = [
+        {"DT": dt.date(2024, 1, 1), "VALOR": Decimal("10.50"), "NOME": "ANDRÉ", "QTD": 3},
+        {"DT": dt.date(2024, 1, 2), "VALOR": None, "NOME": None, "QTD": 4},
+    ]
+    cache.put("k", rows, fetched_at=123.5)
+    got = cache.get("k")
+    assert got.rows == rows
+    assert got.fetched_at == 123.5
+    assert (cache.directory / "k.arrow").exists()
+
+
+def test_int_e_float_na_mesma_coluna_voltam_exatos(cache):
+    rows = [{"A": 1}, {"A": 1.5}]
+    cache.put("k", rows)
+    got = cache.get("k").rows
+    assert got == rows
+    assert type(got[0]["A"]) is int
+    assert (cache.directory / "k.pkl").exists()
+
+
+def test_miss_e_arquivo_corrompido(cache):
+    assert cache.get("nada") is None
+    (cache.directory / "ruim.arrow").write_bytes(b"nao e arrow")
+    assert cache.get("ruim") is None
+    assert not (cache.directory / "ruim.arrow").exists()
+
+
+def test_despejo_lru_mantem_o_mais_recente(tmp_path):
+    cache = DiskResultCache(str(tmp_path), max_mb=0.05)
+    rows = [{"TXT": os.urandom(500).hex(), "I": i} for i in range(20)]
+    for i in range(10):
+        cache.put(f"k{i}", rows)
+    assert cache.get("k9") is not None
+    assert sum(1 for p in tmp_path.iterdir() if not p.name.startswith(".")) < 10
+
+
+def test_create_result_cache(tmp_path):
+    assert type(create_result_cache("none")) is ResultCache
+    assert isinstance(create_result_cache(" DISK ", directory=str(tmp_path)), DiskResultCache)
+    with pytest.raises(ValueError):
+        create_result_cache("redis")
@@ -0,0 +1,18 @@
+import datetime as dt
+
+from connector.rollups import affected_dates
+
+
+def test_affected_dates_distintos_e_ordenados():
+    records = [
+        {"DT_VENDA": dt.date(2024, 3, 2)},
+        {"DT_VENDA": dt.date(2024, 3, 1)},
+        {"DT_VENDA": dt.date(2024, 3, 2)},
+    ]
+    assert affected_dates(records, "DT_VENDA") == [dt.date(2024, 3, 1), dt.date(2024, 3, 2)]
+
+
+def test_affected_dates_ignora_nulos_e_coluna_ausente():
+    records = [{"DT_VENDA": None}, {"OUTRA": dt.date(2024, 1, 1)}, {"DT_VENDA": dt.date(2024, 1, 5)}]
+    assert affected_dates(records, "DT_VENDA") == [dt.date(2024, 1, 5)]
+    assert affected_dates([], "DT_VENDA") == []
@@ -0,0 +1,101 @@
+"""
+StaleWhileRevalidate - Serve o último resultado conhecido e atualiza em segundo plano
+- Índice em memória (LRU limitado) do último resultado de cada (SQL, parâmetros),
+  com a versão dos dados e o instante em que foi buscado
+- Quando a chave atual muda só pela janela de tempo (SYSDATE/TTL), o resultado
+  anterior é servido na hora e um worker busca o novo; quem chama decide quais
+  mudanças de chave admitem o resultado anterior (o dashboard: nunca carga nova)
+- Concorrência limitada (ThreadPoolExecutor) e deduplicação: vários usuários na
+  mesma chave vencida disparam uma única query
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+@dataclass
+class Entry:
+    rows: List[Dict[str, Any]]
+    versions: tuple
+    fetched_at: float
+
+    @property
+    def age_s(self) -> float:
+        return max(time.time() - self.fetched_at, 0.0)
+
+
+class StaleWhileRevalidate:
+    def __init__(self, max_workers: int = 2, max_entries: int = 500, on_error: Optional[Callable] = None):
+        """
+        Args:
+            max_workers: Refreshes simultâneos no máximo (protege o Oracle)
+            max_entries: Quantos (SQL, parâmetros) manter no índice de últimos resultados
+            on_error: Callback(base_key, exc) para falhas do refresh em background
+        """
+        self.max_entries = max_entries
+        self.on_error = on_error
+        self._latest: "OrderedDict[Hashable, Entry]" = OrderedDict()
+        self._inflight: Set[Tuple[Hashable, tuple]] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="swr")
+
+    # -------------------------
+    # Índice de últimos resultados
+    # -------------------------
+    def remember(self, base_key: Hashable, versions: tuple, rows: List[Dict[str, Any]],
+                 fetched_at: Optional[float] = None) -> None:
+        entry = Entry(rows, versions, fetched_at if fetched_at is not None else time.time())
+        with self._lock:
+            self._latest[base_key] = entry
+            self._latest.move_to_end(base_key)
+            while len(self._latest) > self.max_entries:
+                self._latest.popitem(last=False)
+
+    def latest(self, base_key: Hashable) -> Optional[Entry]:
+        with self._lock:
+            entry = self._latest.get(base_key)
+            if entry is not None:
+                self._latest.move_to_end(base_key)
+            return entry
+
+    # -------------------------
+    # Refresh em background
+    # -------------------------
+    def is_refreshing(self, base_key: Hashable, versions: tuple) -> bool:
+        with self._lock:
+            return (base_key, versions) in self._inflight
+
+    def refresh(self, base_key: Hashable, versions: tuple,
+                fetch: Callable[[], Tuple[List[Dict[str, Any]], Optional[float]]]) -> bool:
+        """
+        Agenda fetch() para a chave nova; retorna False se já havia refresh em andamento.
+        fetch() devolve (linhas, fetched_at) e o resultado entra no índice ao terminar.
+        """
+        token = (base_key, versions)
+        with self._lock:
+            if token in self._inflight:
+                return False
+            self._inflight.add(token)
+
+        def run() -> None:
+            try:
+                rows, fetched_at = fetch()
+                self.remember(base_key, versions, rows, fetched_at)
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(base_key, e)
+            finally:
+                with self._lock:
+                    self._inflight.discard(token)
+
+        self._executor.submit(run)
+        return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -15,6 +15,7 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils.logger_controller import LoggerController
+from utils.tracing import tracer, traced
 
 NOME = "csv_handler"
 
@@ -51,6 +52,7 @@ class CSVHandler:
     # -------------------------
     # Public API
     # -------------------------
+    @traced("csv.read_csv")
     def read_csv(
         self,
         file_path: Union[str, Path],
@@ -86,8 +88,8 @@ class CSVHandler:
         encoding = self._detect_encoding(path, sample_size_bytes=sample_size_bytes)
         delimiter = self._detect_delimiter(path, encoding=encoding, sample_size_bytes=sample_size_bytes)
 
-        self.logger.info(f"[CSVHandler] Lendo arquivo: {path}")
-        self.logger.info(f"[CSVHandler] Encoding: {encoding} | Delimiter: '{delimiter}'")
+        self.logger.info("[CSVHandler] Lendo arquivo: %s", path)
+        self.logger.info("[CSVHandler] Encoding: %s | Delimiter: '%s'", encoding, delimiter)
 
         # Pandas: engine python é mais tolerante com separadores e linhas fora do padrão
         # on_bad_lines:
@@ -128,7 +130,7 @@ class CSVHandler:
         # Detectar headers duplicados (muito comum quando CSV vem com coluna repetida)
         duplicates = self._find_duplicate_columns(df.columns)
         if duplicates:
-            self.logger.info(f"[CSVHandler] Atenção: colunas duplicadas detectadas: {duplicates}")
+            self.logger.warning("[CSVHandler] Atenção: colunas duplicadas detectadas: %s", duplicates)
 
         # Tentativa de auditoria de rejeitados:
         # pandas não expõe diretamente as linhas "puladas" por on_bad_lines='skip'.
@@ -143,10 +145,11 @@ class CSVHandler:
                     expected_n_fields=len(columns_original),
                     output_path=rejected_path,
                 )
-                self.logger.info(f"[CSVHandler] Rejeitados (heurística): {rejected_path}")
+                self.logger.info("[CSVHandler] Rejeitados (heurística): %s", rejected_path)
             except Exception as e:
-                self.logger.error(f"[CSVHandler] Falha ao gerar rejeitados: {e}")
+                self.logger.error("[CSVHandler] Falha ao gerar rejeitados: %s", e)
 
+        tracer.current().set(file=path.name, rows=len(df), encoding=encoding, delimiter=delimiter)
         return CSVReadResult(
             df=df,
             delimiter=delimiter,
@@ -0,0 +1,100 @@
+# utils/customer_key.py
+
+"""
+Chave normalizada de cliente (CLIENTE_KEY) e substituto numérico (CLIENTE_HASH)
+
+Calculadas uma vez no ETL e gravadas nas três tabelas de histórico
+(NOME_COMPRADOR em veículos/peças, NOME_CLIENTE em serviços), com índice.
+Os repositórios cruzam clientes por CLIENTE_HASH em vez de UPPER(TRIM(nome))
+linha a linha, que nenhum índice atendia.
+
+Normalização (na ordem):
+1. Reparo de mojibake (fix_mojibake, o mesmo que os controllers aplicam aos
+   nomes), para o nome quebrado e o correto gerarem a mesma chave
+2. Remoção de acentos, espaços nas pontas e espaços repetidos no meio
+3. Maiúsculas
+
+Quebra em relação ao UPPER(TRIM(nome)) anterior: 'JOSÉ  SILVA', 'JOSE SILVA' e
+'JOSÃ‰ SILVA' passam a ser o mesmo cliente, então contagens e rankings por cliente
+(LTV, RFM, funil, jornada) mudam em relação aos relatórios de antes da V003.
+Linhas sem chave não entram nesses cruzamentos: depois da migração V003, rodar
+mains/main_backfill_cliente_key.py (a mesma função em Python; a regra não tem
+equivalente exato em SQL) e, se a normalização mudar, de novo com --all.
+
+Enquanto a V003 não criou as colunas, oracle_records() tira CLIENTE_KEY/CLIENTE_HASH
+do INSERT e a carga segue (a cópia Parquet mantém as colunas).
+
+CLIENTE_HASH = 63 bits do BLAKE2b da chave: cabe em NUMBER(19)/BIGINT, é estável
+entre execuções e máquinas (não usa hash() do Python) e a colisão é desprezível
+para o volume de clientes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict, List, Optional
+
+KEY_COLUMN = "CLIENTE_KEY"
+HASH_COLUMN = "CLIENTE_HASH"
+CUSTOMER_COLUMNS = (KEY_COLUMN, HASH_COLUMN)
+
+# Coluna de nome do cliente em cada tabela de histórico
+NAME_COLUMNS: Dict[str, str] = {
+    "BRZ_HIST_VENDAS_VEICULOS": "NOME_COMPRADOR",
+    "BRZ_HIST_VENDAS_PECAS": "NOME_COMPRADOR",
+    "BRZ_HIST_SERVICOS": "NOME_CLIENTE",
+}
+
+_SPACES_RE = re.compile(r"\s+")
+
+
+def fix_mojibake(s: Optional[str]) -> Optional[str]:
+    """
+    Corrige UTF-8 lido como Latin-1/CP1252 ('ANDRÃ‰' -> 'ANDRÉ', 'JoÃ£o' -> 'João').
+    Texto que não é mojibake (nem re-decodifica como UTF-8) volta como está.
+    """
+    if not s:
+        return s
+    for encoding in ("latin1", "cp1252"):
+        try:
+            return s.encode(encoding).decode("utf-8")
+        except Exception:
+            continue
+    return s
+
+
+def customer_key(name: Optional[str]) -> Optional[str]:
+    """Nome do cliente -> chave normalizada (None para nome vazio)."""
+    if name is None:
+        return None
+    s = fix_mojibake(str(name))
+    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    s = _SPACES_RE.sub(" ", s).strip().upper()
+    return s or None
+
+
+def customer_hash(key: Optional[str]) -> Optional[int]:
+    """Chave normalizada -> inteiro positivo de 63 bits."""
+    if not key:
+        return None
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") >> 1
+
+
+def customer_columns(name: Optional[str]) -> Dict[str, Any]:
+    """{CLIENTE_KEY, CLIENTE_HASH} de um nome, no formato dos registros BRZ_*."""
+    key = customer_key(name)
+    return {KEY_COLUMN: key, HASH_COLUMN: customer_hash(key)}
+
+
+def oracle_records(connector: Any, table_name: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Registros para o INSERT no Oracle: os mesmos se a tabela já tem CLIENTE_KEY/CLIENTE_HASH,
+    senão cópias sem as duas colunas (connector.table_columns: colunas do schema corrente).
+    """
+    columns = connector.table_columns(table_name)
+    if all(c in columns for c in CUSTOMER_COLUMNS):
+        return records
+    return [{k: v for k, v in r.items() if k not in CUSTOMER_COLUMNS} for r in records]
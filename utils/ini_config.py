@@ -0,0 +1,38 @@
+"""
+Leitura das seções opcionais dos .ini (config/database.ini e streamlit_app/config/config.ini)
+- section(): seção ou {} se ausente (os .get com padrão continuam valendo)
+- flag(): "1", "true", "yes" ou "on" (sem diferenciar maiúsculas) = ligado
+- enabled_section(): seção de um componente opcional se enabled = true, senão None
+  (base dos from_config dos componentes do ETL)
+"""
+
+from __future__ import annotations
+
+import configparser
+from typing import Any, Mapping, Optional, Union
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+
+
+def read(config_file: Any) -> configparser.ConfigParser:
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    return config
+
+
+def section(config: configparser.ConfigParser, name: str) -> Union[configparser.SectionProxy, Mapping[str, str]]:
+    """Seção [name], ou {} se o .ini não a tem."""
+    return config[name] if config.has_section(name) else {}
+
+
+def flag(values: Mapping[str, str], key: str, default: bool = False) -> bool:
+    """Valor booleano de uma chave da seção (ausente = default)."""
+    return str(values.get(key, str(default))).strip().lower() in TRUE_VALUES
+
+
+def enabled_section(config_file: Any, name: str) -> Optional[configparser.SectionProxy]:
+    """Seção [name] do .ini se enabled = true; None se ausente ou desligada."""
+    config = read(config_file)
+    if not config.has_section(name) or not flag(config[name], "enabled"):
+        return None
+    return config[name]
@@ -1,107 +1,254 @@
 """
-LoggerController - P## `utils/logger_controller.py` – **Baseado no seu padrão**
+LoggerController - Logging de baixo overhead
+Logs individuais por componente em logs/[componente].txt
+Formato: [data] [nível] [usuário@host] [arquivo] [função:linha] [mensagem]
 
-```python
-
-LoggerController - Baseado no seu padrão logger_controller.py
-Logs individuais por classe em logs/[classe].txt
-Formato: [data] [usuário] [nome_código] [caminho] [função] [linha] [status]
+- Um logger por componente (sem propagação): cada mensagem vai só para o seu arquivo
+- Formatação preguiçosa: logger.info("x=%s", x) só formata se o nível estiver habilitado
+- Gate de nível global via AUTOS_LOG_LEVEL (padrão INFO) ou set_level()
+- Usuário/host resolvidos uma única vez por processo
+- I/O de arquivo fora do caminho quente: QueueHandler -> QueueListener (thread de background)
+- shutdown() esvazia a fila; o próximo log religa a thread (depois do exit, escreve direto)
 """
 
-import os
+import atexit
+import getpass
 import logging
-from datetime import datetime
+import logging.handlers
+import os
+import queue
+import socket
+import threading
 from pathlib import Path
-from inspect import currentframe, stack
+from typing import Dict, Optional
+
+
+# -------------------------
+# Identidade do processo (resolvida uma vez)
+# -------------------------
+def _resolve_user() -> str:
+    try:
+        return os.getlogin()
+    except OSError:
+        try:
+            return getpass.getuser()
+        except Exception:
+            return "unknown"
+
+
+USER = _resolve_user()
+HOST = socket.gethostname()
+
+DATEFMT = '%Y-%m-%d %H:%M:%S'
+LOG_FORMAT = (
+    '%(asctime)s - %(levelname)s - '
+    + f'{USER}@{HOST}'.replace('%', '%%')
+    + ' - %(filename)s - %(funcName)s:%(lineno)d - %(message)s'
+)
+
+# Status usados no padrão antigo (logger.log(..., "ERRO!!!", ...)) -> nível
+_STATUS_LEVELS = (
+    ("ERRO", logging.ERROR),
+    ("ERROR", logging.ERROR),
+    ("AVISO", logging.WARNING),
+    ("WARN", logging.WARNING),
+    ("DEBUG", logging.DEBUG),
+)
+
+
+def _status_level(status: str) -> int:
+    s = (status or "").upper()
+    for prefix, level in _STATUS_LEVELS:
+        if s.startswith(prefix):
+            return level
+    return logging.INFO
+
+
+def _env_level() -> int:
+    level = logging.getLevelName(os.environ.get("AUTOS_LOG_LEVEL", "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+# -------------------------
+# Escritor em background (um único thread para todos os arquivos)
+# -------------------------
+class _FileRouter(logging.Handler):
+    """Entrega cada record ao FileHandler do seu componente (record.name)."""
+
+    def __init__(self):
+        super().__init__()
+        self._files: Dict[str, logging.Handler] = {}
+        self._files_lock = threading.Lock()
+
+    def register(self, logger_name: str, logfile: str, fmt: str = LOG_FORMAT) -> None:
+        with self._files_lock:
+            if logger_name in self._files:
+                return
+            handler = logging.FileHandler(logfile, encoding='utf-8', delay=True)
+            handler.setFormatter(logging.Formatter(fmt, datefmt=DATEFMT))
+            self._files[logger_name] = handler
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self._files.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+    def close(self) -> None:
+        with self._files_lock:
+            for handler in self._files.values():
+                handler.close()
+        super().close()
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    A fila é do próprio processo (sem pickle), então o record segue sem
+    pré-formatação: msg % args e o traceback são montados na thread de background.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if _listener is None:
+            if _exiting:
+                # Interpretador encerrando: sem thread nova, escreve no próprio chamador
+                _router.handle(record)
+                return
+            _ensure_listener()
+        self.queue.put_nowait(record)
+
+
+_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_router = _FileRouter()
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+_exiting = False
+_level = _env_level()
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is not None:
+        return
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_queue, _router, respect_handler_level=False)
+            _listener.start()
+
+
+def shutdown() -> None:
+    """
+    Esvazia a fila e para a thread de background. Pode ser chamado mais de uma
+    vez; o próximo log (de qualquer logger já criado) religa a thread.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+    _router.flush()
+
+
+@atexit.register
+def _shutdown_at_exit() -> None:
+    global _exiting
+    _exiting = True
+    shutdown()
+
+
+def set_level(level) -> None:
+    """Ajusta o nível de todos os componentes (ex.: "DEBUG", logging.WARNING)."""
+    global _level
+    _level = logging.getLevelName(level) if isinstance(level, str) else int(level)
+    for name in list(_router._files):
+        if name.startswith("autos."):
+            logging.getLogger(name).setLevel(_level)
+
+
+def queued_logger(name: str, logfile: str, fmt: str = LOG_FORMAT,
+                  level: int = logging.INFO) -> logging.Logger:
+    """
+    Logger padrão do logging ligado ao escritor em background.
+    Usado por quem precisa de outro formato de linha (ex.: JSON lines da telemetria).
+    """
+    logger = logging.getLogger(name)
+    logger.setLevel(level)
+    logger.propagate = False
+    _router.register(name, logfile, fmt)
+    if not any(isinstance(h, _DeferredQueueHandler) for h in logger.handlers):
+        logger.addHandler(_DeferredQueueHandler(_queue))
+    _ensure_listener()
+    return logger
 
 
 class LoggerController:
     def __init__(self, logfile: str):
         """
         Args:
-            logfile: Caminho completo do arquivo de log
+            logfile: Caminho completo do arquivo de log (o nome do arquivo vira o componente)
         """
         self.logfile = logfile
+        self.component = Path(logfile).stem
         self._create_logger()
-    
+
     def _create_logger(self):
-        """Cria logger com formato específico"""
-        self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.setLevel(logging.DEBUG)
-        
-        # Formatter igual ao seu padrão
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(filename)s - %(funcName)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        # Handler para arquivo específico da classe
-        file_handler = logging.FileHandler(self.logfile, encoding='utf-8')
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
-
-        # Proteção contra handlers duplicados
-        if not self.logger.handlers:
-            self.logger.addHandler(file_handler)
-        
-        # Console também
-        #console_handler = logging.StreamHandler()
-        #console_handler.setFormatter(formatter)
-        #self.logger.addHandler(console_handler)
-    
-    def log(self, codename: str, codepath: str, functionname: str, linenumber: int, 
+        """Logger próprio do componente, escrevendo via fila em background"""
+        self.logger = queued_logger(f"autos.{self.component}", self.logfile, level=_level)
+
+    def is_enabled(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def log(self, codename: str, codepath: str, functionname: str, linenumber: int,
             status: str, message: str = ""):
         """
-        Log no formato exato do seu código
-        
-        Args:
-            codename: Nome do código/classe
-            codepath: Caminho do arquivo
-            functionname: Nome da função
-            linenumber: Número da linha
-            status: Status (SUCCESS, ERROR, WARNING, etc)
-            message: Mensagem adicional
+        Compatibilidade com o padrão antigo (codename, codepath, função, linha, status).
+        O status define o nível; nada é formatado se o nível estiver desabilitado.
         """
-        # Pega usuário atual (igual ao seu código)
-        user = os.getlogin()
-        
-        log_message = (
-            f"User: {user} | Code Name: {codename} | "
-            f"Code Path: {codepath} | Function Name: {functionname} | "
-            f"Line Number: {linenumber} | Status: {status}"
-        )
-        
+        level = _status_level(status)
+        if not self.logger.isEnabledFor(level):
+            return
         if message:
-            log_message += f" | {message}"
-        
-        self.logger.debug(log_message)
-    
-    def info(self, message: str):
-        self.logger.info(message)
-    
-    def error(self, message: str):
-        self.logger.error(message)
-    
-    def debug(self, message: str):
-        self.logger.debug(message)
+            self.logger.log(level, "Code Name: %s | Code Path: %s | Function Name: %s | Line Number: %s | Status: %s | %s",
+                            codename, codepath, functionname, linenumber, status.strip(), message, stacklevel=2)
+        else:
+            self.logger.log(level, "Code Name: %s | Code Path: %s | Function Name: %s | Line Number: %s | Status: %s",
+                            codename, codepath, functionname, linenumber, status.strip(), stacklevel=2)
+
+    # stacklevel=2: função/linha registradas são as de quem chamou o LoggerController
+    def debug(self, message: str, *args):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(message, *args, stacklevel=2)
+
+    def info(self, message: str, *args):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(message, *args, stacklevel=2)
+
+    def warning(self, message: str, *args):
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning(message, *args, stacklevel=2)
+
+    def error(self, message: str, *args):
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error(message, *args, stacklevel=2)
 
 
 # Factory para criar logger por classe
 def create_logger(log_directory: str = "logs", class_name: str = "Main"):
     """
     Cria LoggerController para uma classe específica
-    
+
     Args:
         log_directory: Pasta base dos logs
         class_name: Nome da classe
-    
+
     Returns:
         LoggerController instanciado
     """
     # Garantir que diretório existe
     Path(log_directory).mkdir(exist_ok=True)
-    
+
     # Arquivo: logs/[class_name].txt
     logfile = os.path.join(log_directory, f"{class_name}.txt")
-    
+
     return LoggerController(logfile)
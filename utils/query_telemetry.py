@@ -0,0 +1,123 @@
+# utils/query_telemetry.py
+
+"""
+QueryTelemetry - Telemetria por chamada SQL
+- Um registro por query (tempos, linhas, round trips, bytes, cache hit/miss, método chamador)
+- Buffer circular em memória (últimas N queries) para o painel "Query profiler"
+- Log estruturado (JSON lines) em logs/query_telemetry.jsonl
+"""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import itertools
+import json
+import os
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from utils.logger_controller import queued_logger
+
+
+NOME = "QueryTelemetry"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "query_telemetry.jsonl")
+
+# Render (página) corrente - cada rerun do Streamlit roda numa thread própria
+_current_render: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("query_render_id", default=None)
+_current_page: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("query_page", default=None)
+
+
+@dataclass
+class QueryRecord:
+    caller: str
+    sql_id: str
+    sql_preview: str
+    wall_ms: float
+    execute_ms: float = 0.0
+    fetch_ms: float = 0.0
+    rows: int = 0
+    round_trips: int = 0
+    bytes: int = 0
+    cache_hit: bool = False
+    cache_tier: str = ""
+    endpoint: str = ""
+    age_s: Optional[float] = None
+    page: Optional[str] = None
+    render_id: Optional[int] = None
+    ts: str = field(default_factory=lambda: datetime.now().isoformat(timespec="milliseconds"))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def sql_id(sql: str) -> str:
+    """Identificador curto e estável do texto SQL (para agrupar no log)."""
+    return hashlib.sha1(" ".join(sql.split()).encode("utf-8")).hexdigest()[:12]
+
+
+class _JsonLine:
+    """Serializa o registro só quando o writer em background formata a linha."""
+    __slots__ = ("rec",)
+
+    def __init__(self, rec: QueryRecord):
+        self.rec = rec
+
+    def __str__(self) -> str:
+        return json.dumps(self.rec.as_dict(), ensure_ascii=False, default=str)
+
+
+class QueryTelemetry:
+    def __init__(self, capacity: int = 1000, logfile: str = logfile):
+        self._buffer: Deque[QueryRecord] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._render_ids = itertools.count(1)
+
+        # Escrita do JSON lines fica na thread de background do LoggerController
+        self._log = queued_logger(NOME, logfile, fmt="%(message)s")
+
+    # -------------------------
+    # Render / página
+    # -------------------------
+    def begin_render(self, page: str) -> int:
+        """Marca o início de um render de página; as queries seguintes ficam associadas a ele."""
+        render_id = next(self._render_ids)
+        _current_render.set(render_id)
+        _current_page.set(page)
+        return render_id
+
+    # -------------------------
+    # Registro
+    # -------------------------
+    def record(self, rec: QueryRecord) -> None:
+        if rec.render_id is None:
+            rec.render_id = _current_render.get()
+            rec.page = _current_page.get()
+
+        with self._lock:
+            self._buffer.append(rec)
+        self._log.info("%s", _JsonLine(rec))
+
+    # -------------------------
+    # Consulta
+    # -------------------------
+    def records(self, render_id: Optional[int] = None) -> List[QueryRecord]:
+        with self._lock:
+            items = list(self._buffer)
+        if render_id is None:
+            return items
+        return [r for r in items if r.render_id == render_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buffer.clear()
+
+
+# Singleton do processo
+telemetry = QueryTelemetry()
@@ -0,0 +1,223 @@
+"""
+ResultCache - Cache persistente de resultados de queries (compartilhado entre processos)
+- Backends plugáveis: "none" (desligado) e "disk"
+- Chave: hash do SQL normalizado + parâmetros + versão dos dados (CTL_DATA_VERSION)
+- Disco: Arrow IPC (Feather v2, colunar e comprimido); pickle para
+  resultados que o Arrow não consegue tipar sem mudar os valores (ex.: coluna
+  NUMBER com int e float misturados voltaria toda como float)
+- Escrita atômica (arquivo temporário + os.replace): leitores de outros
+  processos nunca veem arquivo pela metade
+- Limite de tamanho com despejo LRU (mtime atualizado a cada hit); só um
+  processo despeja por vez (lock por arquivo)
+- Sobrevive a restart/redeploy: o primeiro render já encontra os resultados
+- Cada entrada guarda o instante da busca no Oracle (idade exibida no dashboard)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pyarrow vem com o streamlit; sem ele o disco usa só pickle
+    pa = None
+    feather = None
+
+
+def result_key(sql: str, params: Dict[str, Any], versions: tuple) -> str:
+    """Chave estável entre processos (não depende de hash() randomizado do Python)."""
+    payload = json.dumps(
+        [" ".join(sql.split()), sorted((k, repr(v)) for k, v in (params or {}).items()), repr(versions)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResult:
+    rows: List[Dict[str, Any]]
+    fetched_at: float
+
+
+class ResultCache:
+    """Interface dos backends."""
+
+    name = "none"
+
+    def get(self, key: str) -> Optional[CachedResult]:
+        return None
+
+    def put(self, key: str, rows: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+
+class DiskResultCache(ResultCache):
+    name = "disk"
+
+    ARROW_EXT = ".arrow"
+    PICKLE_EXT = ".pkl"
+    LOCK_NAME = ".evict.lock"
+    STALE_LOCK_S = 30.0
+
+    def __init__(self, directory: str, max_mb: float = 512.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+
+    # -------------------------
+    # Leitura
+    # -------------------------
+    def get(self, key: str) -> Optional[CachedResult]:
+        for ext in (self.ARROW_EXT, self.PICKLE_EXT):
+            path = self.directory / f"{key}{ext}"
+            try:
+                if ext == self.ARROW_EXT:
+                    if feather is None:
+                        continue
+                    table = feather.read_table(path, memory_map=False)
+                    meta = table.schema.metadata or {}
+                    fetched_at = float(meta.get(b"fetched_at", path.stat().st_mtime))
+                    rows = table.to_pylist()
+                else:
+                    with open(path, "rb") as f:
+                        payload = pickle.load(f)
+                    rows, fetched_at = payload["rows"], payload["fetched_at"]
+            except (FileNotFoundError, OSError):
+                continue
+            except Exception:
+                # Arquivo corrompido/incompatível: descarta e trata como miss
+                self._unlink(path)
+                continue
+
+            self._touch(path)
+            return CachedResult(rows, fetched_at)
+        return None
+
+    # -------------------------
+    # Escrita
+    # -------------------------
+    def put(self, key: str, rows: List[Dict[str, Any]], fetched_at: Optional[float] = None) -> None:
+        data, ext = self._serialize(rows, time.time() if fetched_at is None else fetched_at)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=ext)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.directory / f"{key}{ext}")
+        except Exception:
+            self._unlink(Path(tmp))
+            raise
+        self._evict_if_needed()
+
+    def _serialize(self, rows: List[Dict[str, Any]], fetched_at: float):
+        if pa is not None and self._uniform_types(rows):
+            try:
+                table = pa.Table.from_pylist(rows).replace_schema_metadata({"fetched_at": repr(fetched_at)})
+                sink = pa.BufferOutputStream()
+                feather.write_feather(table, sink, compression="zstd")
+                return sink.getvalue().to_pybytes(), self.ARROW_EXT
+            except (pa.ArrowException, TypeError, ValueError):
+                pass
+        payload = {"rows": rows, "fetched_at": fetched_at}
+        return pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), self.PICKLE_EXT
+
+    @staticmethod
+    def _uniform_types(rows: List[Dict[str, Any]]) -> bool:
+        """
+        True se cada coluna tem um único tipo Python (None à parte).
+
+        O Arrow tipa a coluna inteira com um tipo só: {'A': 1} e {'A': 1.5} na
+        mesma coluna viram double e o 1 voltaria do cache como 1.0.
+        """
+        seen: Dict[str, type] = {}
+        for row in rows:
+            for col, value in row.items():
+                if value is None:
+                    continue
+                if seen.setdefault(col, type(value)) is not type(value):
+                    return False
+        return True
+
+    # -------------------------
+    # Despejo LRU
+    # -------------------------
+    def _evict_if_needed(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total += st.st_size
+
+        if total <= self.max_bytes or not self._acquire_lock():
+            return
+        try:
+            # Mais antigos (menos usados) primeiro, até voltar a 90% do limite
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                self._unlink(Path(path))
+                total -= size
+        finally:
+            self._unlink(self.directory / self.LOCK_NAME)
+
+    def _acquire_lock(self) -> bool:
+        lock = self.directory / self.LOCK_NAME
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            # Lock esquecido por um processo que morreu no meio do despejo
+            try:
+                if time.time() - lock.stat().st_mtime > self.STALE_LOCK_S:
+                    self._unlink(lock)
+            except OSError:
+                pass
+            return False
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.is_file():
+                self._unlink(Path(entry.path))
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+BACKENDS = {
+    "none": lambda **_: ResultCache(),
+    "disk": lambda directory="cache/results", max_mb=512.0, **_: DiskResultCache(directory, float(max_mb)),
+}
+
+
+def create_result_cache(backend: str = "none", **options: Any) -> ResultCache:
+    """Instancia o backend configurado ([CACHE] backend = none | disk)."""
+    try:
+        return BACKENDS[backend.strip().lower()](**options)
+    except KeyError:
+        raise ValueError(f"❌ Backend de cache desconhecido: {backend} (use {', '.join(BACKENDS)})")
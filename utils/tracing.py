@@ -0,0 +1,212 @@
+# utils/tracing.py
+
+"""
+Tracing - Spans aninhados para ETL e renders do dashboard
+- tracer.span("nome", **atributos) como context manager (ou @traced como decorator)
+- Aninhamento via contextvars (cada thread/rerun do Streamlit tem o seu contexto)
+- Amostragem na raiz (head sampling): a decisão vale para a árvore inteira,
+  spans de traces não amostrados custam só um lookup de contextvar
+- Saída em logs/traces.jsonl no formato Trace Event do Chrome (ph "X"),
+  escrita pela thread de background do LoggerController
+
+Taxa de amostragem: AUTOS_TRACE_SAMPLE_RATE (padrão 0.1) ou set_sample_rate().
+
+Flame chart:
+    python utils/tracing.py logs/traces.jsonl logs/trace.json [--trace <trace_id>]
+    e abrir logs/trace.json em https://ui.perfetto.dev ou chrome://tracing
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import functools
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Ajuste do path para manter compatível com o padrão usado no connector
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.logger_controller import queued_logger
+
+NOME = "Tracing"
+
+logdirectory = r"logs"
+os.makedirs(logdirectory, exist_ok=True)
+logfile = os.path.join(logdirectory, "traces.jsonl")
+
+# Relógio: perf_counter para durações, ancorado no epoch para o "ts" do trace
+_EPOCH_OFFSET_S = time.time() - time.perf_counter()
+
+
+def _env_rate() -> float:
+    try:
+        return min(max(float(os.environ.get("AUTOS_TRACE_SAMPLE_RATE", "0.1")), 0.0), 1.0)
+    except ValueError:
+        return 0.1
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "attrs", "sampled")
+
+    def __init__(self, name: str, trace_id: str = "", span_id: int = 0,
+                 parent_id: Optional[int] = None, attrs: Optional[Dict[str, Any]] = None,
+                 sampled: bool = True):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attrs = attrs if attrs is not None else {}
+        self.sampled = sampled
+
+    def set(self, **attrs: Any) -> None:
+        """Adiciona atributos ao span (ignorado se o trace não foi amostrado)."""
+        if self.sampled:
+            self.attrs.update(attrs)
+
+
+# Marcador de trace não amostrado: propaga a decisão para os filhos
+_UNSAMPLED = Span("unsampled", sampled=False)
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("trace_span", default=None)
+
+
+class _TraceEvent:
+    """Serializa o evento só na thread de background."""
+    __slots__ = ("span", "ts_us", "dur_us", "tid")
+
+    def __init__(self, span: Span, ts_us: float, dur_us: float, tid: int):
+        self.span = span
+        self.ts_us = ts_us
+        self.dur_us = dur_us
+        self.tid = tid
+
+    def __str__(self) -> str:
+        span = self.span
+        args = {"trace_id": span.trace_id, "span_id": span.span_id, "parent_id": span.parent_id}
+        args.update(span.attrs)
+        return json.dumps({
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": round(self.ts_us, 1),
+            "dur": round(self.dur_us, 1),
+            "pid": os.getpid(),
+            "tid": self.tid,
+            "args": args,
+        }, ensure_ascii=False, default=str)
+
+
+class Tracer:
+    def __init__(self, sample_rate: Optional[float] = None, logfile: str = logfile):
+        self.sample_rate = _env_rate() if sample_rate is None else sample_rate
+        self._span_ids = itertools.count(1)
+        self._log = queued_logger(NOME, logfile, fmt="%(message)s")
+
+    @contextmanager
+    def span(self, name: str, sample: Optional[float] = None, **attrs: Any) -> Iterator[Span]:
+        """
+        Abre um span filho do span corrente (ou a raiz de um novo trace).
+
+        Args:
+            name: Nome do span ("etapa.subetapa"; o prefixo vira a categoria no flame chart)
+            sample: Taxa de amostragem só para spans raiz (sobrepõe a taxa global)
+            **attrs: Atributos iniciais (linhas, tabela, página...)
+        """
+        parent = _current.get()
+
+        if parent is None:
+            rate = self.sample_rate if sample is None else sample
+            if rate <= 0.0 or (rate < 1.0 and random.random() >= rate):
+                token = _current.set(_UNSAMPLED)
+                try:
+                    yield _UNSAMPLED
+                finally:
+                    _current.reset(token)
+                return
+            trace_id = uuid.uuid4().hex[:16]
+            parent_id = None
+        elif not parent.sampled:
+            yield parent
+            return
+        else:
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+
+        span = Span(name, trace_id, next(self._span_ids), parent_id, attrs)
+        token = _current.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            _current.reset(token)
+            self._log.info("%s", _TraceEvent(span, (start + _EPOCH_OFFSET_S) * 1e6,
+                                             (end - start) * 1e6, threading.get_ident()))
+
+    def traced(self, name: Optional[str] = None, **attrs: Any):
+        """Decorator: envolve a função num span (nome padrão = Classe.metodo)."""
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, **attrs):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def current() -> Span:
+        """Span corrente (ou o marcador não amostrado); permite span.set(...) em qualquer ponto."""
+        return _current.get() or _UNSAMPLED
+
+    def set_sample_rate(self, rate: float) -> None:
+        self.sample_rate = min(max(float(rate), 0.0), 1.0)
+
+
+# Singleton do processo
+tracer = Tracer()
+traced = tracer.traced
+
+
+# -------------------------
+# Exportação para o flame chart
+# -------------------------
+def export_chrome_trace(jsonl_path: str, out_path: str, trace_id: Optional[str] = None) -> int:
+    """Converte o JSON lines em {"traceEvents": [...]} (Perfetto / chrome://tracing)."""
+    events: List[Dict[str, Any]] = []
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            ev = json.loads(line)
+            if trace_id and ev.get("args", {}).get("trace_id") != trace_id:
+                continue
+            events.append(ev)
+
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    return len(events)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta logs/traces.jsonl para o formato do Chrome/Perfetto")
+    parser.add_argument("jsonl", nargs="?", default=logfile)
+    parser.add_argument("out", nargs="?", default=os.path.join(logdirectory, "trace.json"))
+    parser.add_argument("--trace", default=None, help="Filtra um trace_id")
+    a = parser.parse_args()
+    n = export_chrome_trace(a.jsonl, a.out, a.trace)
+    print(f"[tracing] {n} eventos exportados para {a.out}")
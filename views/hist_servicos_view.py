@@ -12,4 +12,7 @@ class HistServicosView:
         self.controller = controller or HistServicosController()
 
     def run(self, csv_path: str) -> int:
-        return self.controller.run(csv_path)
\ No newline at end of file
+        return self.controller.run(csv_path)
+
+    def run_backfill(self, csv_path: str) -> int:
+        return self.controller.run_backfill(csv_path)
\ No newline at end of file
@@ -12,3 +12,6 @@ class HistVendasPecasView:
 
     def run(self, csv_path: str) -> int:
         return self.controller.run(csv_path)
+
+    def run_backfill(self, csv_path: str) -> int:
+        return self.controller.run_backfill(csv_path)